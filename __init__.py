@@ -8,3 +8,16 @@ Phase 1: Replicates the functionality of checked_bash.py as a pre-tool-use hook.
 """
 
 __version__ = '0.1.0'
+
+
+# Public names by module, imported on first use, so running the hook (python -m toolguard.hook)
+# does not load the engine
+_EXPORTS = {'EvaluationContext': 'toolguard.context', 'PolicyEngine': 'toolguard.engine'}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,163 @@
+"""
+Trust checks of the persistent cache directory.
+
+Entries of the cache directory (TOOLGUARD_CACHE_DIR) feed decisions: a
+cached parse result decides which sub-commands are matched against the
+deny patterns. An agent that can write the directory could plant entries
+that hide denied commands, so the hook only uses a cache directory that
+is outside the project, owned by the user and not writable by group or
+others, and every entry is authenticated with a key kept outside the
+project (see load_cache_key()). Entries whose signature does not verify
+are ignored like missing ones.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import stat
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Key file, relative to the home directory
+KEY_FILE = Path('.config') / 'toolguard' / 'cache.key'
+
+# Bytes of a newly generated key
+KEY_SIZE = 32
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    """Check whether a resolved path is root or below it."""
+    return path == root or root in path.parents
+
+
+def _check_private(path: Path, what: str) -> Optional[str]:
+    """Check that an existing path is owned by the user and not writable by group or others."""
+    try:
+        info = os.stat(path)
+    except OSError as e:
+        return f'{what} {path} cannot be read: {e}'
+    getuid = getattr(os, 'getuid', None)
+    if getuid is not None and info.st_uid != getuid():
+        return f'{what} {path} is not owned by the current user'
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return f'{what} {path} is writable by group or others'
+    return None
+
+
+def check_cache_dir(
+    cache_dir: Union[str, Path], project_root: Optional[Union[str, Path]] = None
+) -> Optional[str]:
+    """
+    Check whether a cache directory may be trusted, creating it if missing.
+
+    Args:
+        cache_dir: The persistent cache directory
+        project_root: Project root the agent works in (None: not known)
+
+    Returns:
+        Why the directory cannot be trusted, or None if it can
+    """
+    cache_dir = Path(cache_dir)
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        resolved = cache_dir.resolve()
+    except OSError as e:
+        return f'Cache directory {cache_dir} cannot be created: {e}'
+    if project_root is not None and _is_within(resolved, Path(project_root).resolve()):
+        return f'Cache directory {cache_dir} is inside the project {project_root}'
+    return _check_private(resolved, 'Cache directory')
+
+
+def load_cache_key(home: Union[str, Path], project_root: Optional[Union[str, Path]] = None) -> Optional[bytes]:
+    """
+    Load the key authenticating cache entries, creating it on first use.
+
+    The key lives in the home directory (KEY_FILE), readable only by the user.
+
+    Args:
+        home: Home directory of the user
+        project_root: Project root the agent works in (None: not known)
+
+    Returns:
+        The key, or None if it cannot be stored outside the project or is not private
+    """
+    path = Path(home) / KEY_FILE
+    if project_root is not None and _is_within(path.resolve(), Path(project_root).resolve()):
+        return None
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        logger.debug(f'Failed to create cache key: {e}')
+        return None
+    else:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(secrets.token_bytes(KEY_SIZE))
+    try:
+        if _check_private(path, 'Cache key') is not None or os.stat(path).st_mode & (stat.S_IRGRP | stat.S_IROTH):
+            return None
+        key = path.read_bytes()
+    except OSError:
+        return None
+    return key if len(key) >= KEY_SIZE else None
+
+
+def trusted_cache(
+    cache_dir: Optional[Union[str, Path]], home: Union[str, Path], project_root: Optional[Union[str, Path]] = None
+) -> Tuple[Optional[Path], Optional[bytes], Optional[str]]:
+    """
+    Get the cache directory and key to use, if the directory may be trusted.
+
+    Args:
+        cache_dir: The configured cache directory (None: no cache)
+        home: Home directory of the user
+        project_root: Project root the agent works in (None: not known)
+
+    Returns:
+        Tuple of (cache_dir, key, problem): cache_dir and key are None, and
+        problem says why, when the directory must not be used
+    """
+    if not cache_dir:
+        return None, None, None
+    problem = check_cache_dir(cache_dir, project_root)
+    if problem is None:
+        key = load_cache_key(home, project_root)
+        if key is not None:
+            return Path(cache_dir), key, None
+        problem = f'No private cache key could be stored in {Path(home) / KEY_FILE}'
+    return None, None, problem
+
+
+def sign(key: bytes, payload: bytes) -> str:
+    """
+    Sign a cache entry.
+
+    Args:
+        key: Key from load_cache_key()
+        payload: Serialized entry
+
+    Returns:
+        Hex HMAC-SHA256 of the payload
+    """
+    return hmac.new(key, payload, hashlib.sha256).hexdigest()
+
+
+def verify(key: bytes, payload: bytes, signature: object) -> bool:
+    """
+    Check the signature of a cache entry.
+
+    Args:
+        key: Key from load_cache_key()
+        payload: Serialized entry
+        signature: Signature stored with the entry
+
+    Returns:
+        True if the signature is the one sign() gives the payload
+    """
+    return isinstance(signature, str) and hmac.compare_digest(sign(key, payload), signature)
@@ -5,10 +5,45 @@ This module provides permission checking for compound bash commands,
 validating each sub-command and returning the strictest permission decision.
 """
 
-from typing import List, Tuple
+import os
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import chain
+from typing import Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from toolguard.parser.command_extractor import extract_commands
-from toolguard.permissions import check_permission
+from toolguard.normalization import expand_tilde
+from toolguard.parser.command_ast import READ, WRITE, Command
+from toolguard.parser.command_extractor import (
+    LEAF,
+    WRAPPER,
+    extract_commands,
+    extract_structured_commands,
+    extract_tagged_commands,
+    iter_commands,
+    iter_structured_commands,
+    iter_tagged_commands,
+)
+from toolguard.parser.heredoc import Heredoc, split_heredocs
+from toolguard.parser.parse_cache import ParseCache
+from toolguard.permissions import (
+    check_body_permission,
+    check_deny_permission,
+    check_file_path_permission,
+    check_permission,
+    match_command,
+)
+from toolguard.policy import CompiledPolicy, CompilerSettings, compile_policy
+
+# Pattern lists longer than this are scanned in chunks by the parallel evaluator
+DEFAULT_PARTITION_SIZE = 64
+
+# Kind of a redirection target check, next to the LEAF and WRAPPER command checks
+REDIRECT = 'redirect'
+
+# File path tool whose rules govern a redirection target, by the target's access
+REDIRECT_TOOLS = {WRITE: 'Write', READ: 'Read'}
+
+# Redirection targets that are devices, not files
+DEVICE_PATHS = frozenset(('/dev/null', '/dev/stdin', '/dev/stdout', '/dev/stderr', '/dev/tty'))
 
 
 def check_compound_permission(
@@ -17,18 +52,51 @@ def check_compound_permission(
     deny_patterns: List[str],
     ask_patterns: List[str] = None,
     extended_syntax: bool = True,
+    leaf_only_allow: bool = False,
+    path_rules: Optional[Mapping[str, Tuple[List[str], List[str]]]] = None,
+    cwd: Optional[str] = None,
+    home: Optional[str] = None,
+    parse_cache: Optional[ParseCache] = None,
+    parser_backend: Optional[str] = None,
+    compiler: Optional[CompilerSettings] = None,
 ) -> Tuple[str, str]:
     """
     Check permissions for a compound bash command.
 
     This function extracts individual commands from a compound command line
-    and checks each against the permission patterns. It returns the strictest
-    permission decision according to the following rules:
+    and checks each against the permission patterns. Sub-commands are
+    extracted lazily, so checking stops at the first denied sub-command.
+    It returns the strictest permission decision according to the following
+    rules:
 
     - If ANY command is denied → deny the entire command
     - Else if ANY command requires ask → ask for the entire command
     - Else if ALL commands are allowed → allow the entire command
 
+    By default every extracted text must be allowed, including wrappers such
+    as the subshell `(cd /tmp && rm file)` and its body `cd /tmp && rm file`.
+    With leaf_only_allow, wrappers are only checked against the deny patterns
+    (which can still hit them) and allow checks run on the leaf commands.
+
+    Here-document bodies read as data are left out of the extracted commands
+    (see parser/heredoc.py): they need no allow pattern, but the deny
+    patterns still see them, the [body] patterns on the body and the command
+    patterns on the line of the command reading it, body included. A body
+    read by a shell or interpreter (`bash <<EOF`) stays in its command.
+
+    With path_rules, the file a redirection writes (`>`, `>>`) is checked
+    against the Write() glob rules and the file it reads (`<`) against the
+    Read() rules, as the file tools check their file_path. The targets come
+    from the structured commands of the same parse (see
+    extract_structured_commands()), so `echo x > ~/.ssh/config` is denied
+    by `Write(~/.ssh/**)` in the same walk that checks `echo x`. A tool
+    missing from path_rules leaves its redirections unchecked, and device
+    targets such as /dev/null are never checked.
+
+    Parsing and policy compilation use the settings of the process (see
+    hook.configure_evaluation()) unless parse_cache, parser_backend and
+    compiler are given, as a PolicyEngine gives its own.
+
     Args:
         command: The bash command line (may be compound)
         allow_patterns: List of patterns that allow commands
@@ -36,6 +104,14 @@ def check_compound_permission(
         ask_patterns: List of patterns that require asking (currently unused,
                      reserved for future Phase 3 implementation)
         extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        leaf_only_allow: If True, match wrappers against deny patterns only
+        path_rules: Optional (allow_patterns, deny_patterns) file path globs by tool
+                    name ('Write', 'Read') that redirection targets are checked against
+        cwd: Directory relative redirection targets are resolved against
+        home: Home directory ~ stands for in commands, redirection targets and path rules (None: the user's home)
+        parse_cache: Parse-result cache (None: the shared cache, see configure_parse_cache())
+        parser_backend: CANOPY or DESCENT (None: the configured backend)
+        compiler: Policy compiler settings (None: those of the process, see configure_policy_compiler())
 
     Returns:
         Tuple of (decision, reason) where:
@@ -52,47 +128,354 @@ def check_compound_permission(
         >>> check_compound_permission('cat file | grep pattern', ['cat *', 'grep *'], [])
         ('allow', 'All sub-commands in compound command are allowed')
     """
-    # Extract individual commands
-    commands = extract_commands(command)
+    # Extract individual commands lazily, so a deny stops the tree walk
+    if path_rules:
+        # Redirection targets are checked in the same walk, from the structure of each command
+        commands = (
+            (cmd.text, cmd.kind if leaf_only_allow else LEAF, cmd)
+            for cmd in iter_structured_commands(command, parser_backend, parse_cache)
+        )
+    elif leaf_only_allow:
+        commands = ((cmd, kind, None) for cmd, kind in iter_tagged_commands(command, parse_cache, parser_backend))
+    else:
+        commands = ((cmd, LEAF, None) for cmd in iter_commands(command, parse_cache, parser_backend))
+    first = next(commands, None)
+
+    # If no commands extracted, deny
+    if first is None:
+        return 'deny', 'No valid commands found in command line'
+
+    # Patterns are parsed (and the deny prefilter built) once per configuration
+    policy = compile_policy(allow_patterns, deny_patterns, extended_syntax, compiler)
+
+    # Payloads left out of the extracted commands are still matched by the deny patterns
+    for heredoc in split_heredocs(command)[1]:
+        decision, reason = _check_heredoc(policy, heredoc, home)
+        if decision == 'deny':
+            commands.close()
+            return decision, reason
+
+    # If only one command without checked redirections, use regular permission check
+    second = next(commands, None)
+    if second is None and not any(_redirect_rules(first[2], path_rules)):
+        return policy.check(first[0], first[2].words if first[2] is not None else None, home)
+
+    # Check each sub-command, in order
+    checked = _check_sub_commands(
+        policy, chain((first, second) if second else (first,), commands), path_rules, cwd, home
+    )
+    try:
+        return _strictest_decision(checked)
+    finally:
+        commands.close()
+
+
+def check_compound_permission_parallel(
+    command: str,
+    allow_patterns: List[str],
+    deny_patterns: List[str],
+    ask_patterns: List[str] = None,
+    extended_syntax: bool = True,
+    leaf_only_allow: bool = False,
+    path_rules: Optional[Mapping[str, Tuple[List[str], List[str]]]] = None,
+    cwd: Optional[str] = None,
+    home: Optional[str] = None,
+    parse_cache: Optional[ParseCache] = None,
+    parser_backend: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    partition_size: int = DEFAULT_PARTITION_SIZE,
+) -> Tuple[str, str]:
+    """
+    Check permissions for a compound bash command, evaluating concurrently.
+
+    Returns exactly what check_compound_permission() returns. All
+    sub-commands are extracted up front, and every sub-command's deny and
+    allow scans are submitted to a thread pool, with pattern lists longer
+    than partition_size split into chunks scanned independently. Results
+    are combined in configured order: the first matching chunk gives the
+    first matching pattern, and the first denied sub-command wins (pending
+    scans are then cancelled). Redirection targets are checked against
+    path_rules as check_compound_permission() checks them, in the calling
+    thread: a path check is a few glob matches, cheaper than a hand-off.
+
+    The scans only call match_command(), which has no shared state, so on
+    a free-threaded build (python3.14t) they run truly in parallel. With
+    the GIL, or for short commands and small policies, thread hand-off
+    costs more than it saves (see tmp/bench_compound.py).
+
+    Args:
+        command: The bash command line (may be compound)
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        ask_patterns: Reserved, see check_compound_permission()
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        leaf_only_allow: If True, match wrappers against deny patterns only
+        path_rules: Optional (allow_patterns, deny_patterns) file path globs by tool
+                    name ('Write', 'Read') that redirection targets are checked against
+        cwd: Directory relative redirection targets are resolved against
+        home: Home directory ~ stands for in commands, redirection targets and path rules (None: the user's home)
+        parse_cache: Parse-result cache (None: the shared cache, see configure_parse_cache())
+        parser_backend: CANOPY or DESCENT (None: the configured backend)
+        executor: Executor to run scans on (a temporary pool is created if None)
+        max_workers: Worker count for the temporary pool
+        partition_size: Maximum patterns per scan task (0 disables partitioning)
+
+    Returns:
+        Tuple of (decision, reason), as check_compound_permission()
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return check_compound_permission_parallel(
+                command,
+                allow_patterns,
+                deny_patterns,
+                ask_patterns,
+                extended_syntax,
+                leaf_only_allow,
+                path_rules,
+                cwd,
+                home,
+                parse_cache,
+                parser_backend,
+                executor=pool,
+                partition_size=partition_size,
+            )
+
+    if path_rules:
+        commands = [
+            (cmd.text, cmd.kind if leaf_only_allow else LEAF, cmd)
+            for cmd in extract_structured_commands(command, parse_cache, parser_backend)
+        ]
+    elif leaf_only_allow:
+        commands = [(cmd, kind, None) for cmd, kind in extract_tagged_commands(command, parse_cache, parser_backend)]
+    else:
+        commands = [(cmd, LEAF, None) for cmd in extract_commands(command, parse_cache, parser_backend)]
 
     # If no commands extracted, deny
     if not commands:
         return 'deny', 'No valid commands found in command line'
 
-    # If only one command, use regular permission check
+    # A single command always gets the full check
+    single = len(commands) == 1 and not any(_redirect_rules(commands[0][2], path_rules))
     if len(commands) == 1:
-        return check_permission(commands[0], allow_patterns, deny_patterns, extended_syntax)
+        commands = [(commands[0][0], LEAF, commands[0][2])]
+
+    for heredoc in split_heredocs(command)[1]:
+        decision, reason = check_body_permission(heredoc.body, deny_patterns, extended_syntax)
+        if decision == 'allow':
+            decision, reason = check_deny_permission(heredoc.text, deny_patterns, extended_syntax, home)
+        if decision == 'deny':
+            return decision, reason
+
+    # A text is scanned once per kind, as in _check_sub_commands()
+    deny_chunks = _partition(deny_patterns, partition_size)
+    allow_chunks = _partition(allow_patterns, partition_size)
+    scans = {}
+    for cmd, kind, _structured in commands:
+        if (cmd, kind) not in scans:
+            scans[(cmd, kind)] = (
+                [executor.submit(match_command, cmd, chunk, extended_syntax, home) for chunk in deny_chunks],
+                [executor.submit(match_command, cmd, chunk, extended_syntax, home) for chunk in allow_chunks]
+                if kind == LEAF
+                else [],
+            )
+
+    def first_match(futures: List[Future]) -> List[str]:
+        """Get the first matching pattern of an ordered scan, as a pattern list."""
+        for future in futures:
+            matched, pattern = future.result()
+            if matched:
+                return [pattern]
+        return []
+
+    def checked_results() -> Iterator[Tuple[str, str, str, str]]:
+        reported = set()
+        for cmd, kind, structured in commands:
+            if (cmd, kind) not in reported:
+                reported.add((cmd, kind))
+                deny_scan, allow_scan = scans[(cmd, kind)]
+                # Re-check against the matched patterns only, to build the exact sequential result
+                yield (
+                    cmd,
+                    kind,
+                    *_check_sub_command_reference(
+                        cmd, kind, first_match(allow_scan), first_match(deny_scan), extended_syntax, home
+                    ),
+                )
+            for tool_name, path, (allow_paths, deny_paths) in _redirect_rules(structured, path_rules, cwd, home):
+                decision, reason = check_file_path_permission(path, allow_paths, deny_paths, home)
+                yield f'{tool_name}({path})', REDIRECT, decision, reason
 
-    # Check each sub-command
-    denied_commands = []
-    ask_commands = []
-    allowed_commands = []
+    try:
+        if single:
+            _cmd, _kind, decision, reason = next(checked_results())
+            return decision, reason
+        return _strictest_decision(checked_results())
+    finally:
+        for deny_scan, allow_scan in scans.values():
+            for future in chain(deny_scan, allow_scan):
+                future.cancel()
 
-    for cmd in commands:
-        decision, reason = check_permission(cmd, allow_patterns, deny_patterns, extended_syntax)
 
+def _partition(patterns: List[str], partition_size: int) -> List[List[str]]:
+    """Split a pattern list into ordered chunks of at most partition_size patterns."""
+    if not patterns:
+        return []
+    if partition_size <= 0 or len(patterns) <= partition_size:
+        return [patterns]
+    return [patterns[i : i + partition_size] for i in range(0, len(patterns), partition_size)]
+
+
+def _check_sub_command(
+    policy: CompiledPolicy,
+    cmd: str,
+    kind: str,
+    words: Optional[Sequence[str]] = None,
+    home: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Check one extracted command; wrappers are allowed through their leaves, but can still be denied."""
+    if kind == WRAPPER:
+        return policy.check_deny(cmd, words, home)
+    return policy.check(cmd, words, home)
+
+
+def _check_heredoc(policy: CompiledPolicy, heredoc: Heredoc, home: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Check a here-document whose body was left out of the extracted commands.
+
+    The body is matched by the [body] patterns, and the line of the command
+    reading it, body included, by the command deny patterns, as if the body
+    had been extracted with the command; it needs no allow pattern.
+    """
+    if policy.body_deny:
+        decision, reason = policy.check_body(heredoc.body)
         if decision == 'deny':
-            denied_commands.append((cmd, reason))
-        elif decision == 'ask':
-            # Note: Phase 1 doesn't have 'ask' responses, but Phase 3 will
-            ask_commands.append((cmd, reason))
-        else:
-            allowed_commands.append((cmd, reason))
+            return decision, reason
+    return policy.check_deny(heredoc.text, home=home)
+
+
+def _check_sub_commands(
+    policy: CompiledPolicy,
+    commands: Iterable[Tuple[str, str, Optional[Command]]],
+    path_rules: Optional[Mapping[str, Tuple[List[str], List[str]]]],
+    cwd: Optional[str],
+    home: Optional[str] = None,
+) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Check (text, kind, structured command or None) sub-commands and their redirection targets, in order.
+
+    A text is checked once per kind: a leaf whose text was already checked
+    in full (as a wrapper, without leaf_only_allow) only has its redirection
+    targets checked.
+    """
+    checked = set()
+    for cmd, kind, structured in commands:
+        if (cmd, kind) not in checked:
+            checked.add((cmd, kind))
+            words = structured.words if structured else None
+            yield (cmd, kind, *_check_sub_command(policy, cmd, kind, words, home))
+        for tool_name, path, (allow_patterns, deny_patterns) in _redirect_rules(structured, path_rules, cwd, home):
+            decision, reason = check_file_path_permission(path, allow_patterns, deny_patterns, home)
+            yield f'{tool_name}({path})', REDIRECT, decision, reason
+
+
+def _redirect_rules(
+    structured: Optional[Command],
+    path_rules: Optional[Mapping[str, Tuple[List[str], List[str]]]],
+    cwd: Optional[str] = None,
+    home: Optional[str] = None,
+) -> Iterator[Tuple[str, str, Tuple[List[str], List[str]]]]:
+    """Yield (tool name, path, rules) for each redirection target of a command that a tool's rules govern."""
+    if structured is None or not path_rules:
+        return
+    for redirect in structured.redirects:
+        tool_name = REDIRECT_TOOLS.get(redirect.access)
+        rules = path_rules.get(tool_name) if tool_name else None
+        if rules is None:
+            continue
+        path = redirect_path(redirect.target, cwd, home)
+        if path in DEVICE_PATHS or path.startswith('/dev/fd/'):
+            continue
+        yield tool_name, path, rules
+
+
+def redirect_path(target: str, cwd: Optional[str] = None, home: Optional[str] = None) -> str:
+    """
+    Get the file path a redirection target names, as file path rules see it.
+
+    A leading ~ is expanded and a relative target is resolved against cwd.
+    Only the directory the command line starts in is known: a `cd` earlier
+    in the line is not followed. Variables are not expanded.
+
+    Args:
+        target: Redirection target, quotes removed (Redirect.target)
+        cwd: Directory the command line runs in (None: keep relative paths relative)
+        home: Home directory ~ stands for (None: the user's home)
+
+    Returns:
+        The normalized file path
+
+    Example:
+        >>> redirect_path('out/../log.txt', '/work')
+        '/work/log.txt'
+    """
+    path = expand_tilde(target, home)
+    if cwd and not os.path.isabs(path):
+        path = os.path.join(cwd, path)
+    return os.path.normpath(path)
+
+
+def _check_sub_command_reference(
+    cmd: str,
+    kind: str,
+    allow_patterns: List[str],
+    deny_patterns: List[str],
+    extended_syntax: bool,
+    home: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Check one extracted command with the uncompiled reference functions."""
+    if kind == WRAPPER:
+        return check_deny_permission(cmd, deny_patterns, extended_syntax, home)
+    return check_permission(cmd, allow_patterns, deny_patterns, extended_syntax, home)
 
-    # Apply strictest policy:
-    # 1. Any deny → deny entire command
-    if denied_commands:
-        cmd, reason = denied_commands[0]
-        return 'deny', f'Compound command contains denied sub-command: {cmd} ({reason})'
+
+def _strictest_decision(checked: Iterable[Tuple[str, str, str, str]]) -> Tuple[str, str]:
+    """
+    Combine (command, kind, decision, reason) results of the sub-commands.
+
+    Consumes the results in order and returns on the first deny.
+    """
+    ask_command = None
+    checked_texts = set()
+    leaf_count = 0
+
+    for cmd, kind, decision, reason in checked:
+        if kind == LEAF:
+            leaf_count += 1
+        if kind != REDIRECT:
+            checked_texts.add(cmd)
+
+        # Apply strictest policy:
+        # 1. Any deny → deny entire command (the first deny wins, so stop here)
+        if decision == 'deny':
+            return 'deny', f'Compound command contains denied sub-command: {cmd} ({reason})'
+        if decision == 'ask' and ask_command is None:
+            # Note: Phase 1 doesn't have 'ask' responses, but Phase 3 will
+            ask_command = (cmd, reason)
 
     # 2. Any ask → ask for entire command
     # (Reserved for Phase 3 - interactive permission system)
-    if ask_commands:
-        cmd, reason = ask_commands[0]
+    if ask_command:
+        cmd, reason = ask_command
         return 'ask', f'Compound command contains sub-command requiring approval: {cmd} ({reason})'
 
+    # Nothing was allow-checked (fail closed)
+    if not leaf_count:
+        return 'deny', 'No valid commands found in command line'
+
     # 3. All allowed → allow entire command
-    return 'allow', f'All {len(commands)} sub-commands in compound command are allowed'
+    return 'allow', f'All {len(checked_texts)} sub-commands in compound command are allowed'
 
 
 def get_command_breakdown(command: str) -> List[str]:
@@ -11,10 +11,19 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+if TYPE_CHECKING:
+    from toolguard.context import EvaluationContext
 
-def find_project_root(start_dir: Path = None) -> Path:
+# Permission list names recognised in the "permissions" section of a config file
+PERMISSION_TYPES = ('allow', 'deny', 'ask')
+
+# Parsed config files keyed by (path, format), with the (mtime_ns, size) signature they were read at
+_config_file_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], dict]] = {}
+
+
+def find_project_root(start_dir: Path = None, home: Path = None) -> Path:
     """
     Find the project root by searching for pyproject.toml or .git directory.
 
@@ -23,6 +32,7 @@ def find_project_root(start_dir: Path = None) -> Path:
 
     Args:
         start_dir: Directory to start searching from. Defaults to current working directory.
+        home: Home directory the search stops at. Defaults to the user's home directory.
 
     Returns:
         Path to project root
@@ -30,8 +40,8 @@ def find_project_root(start_dir: Path = None) -> Path:
     Raises:
         RuntimeError: If project root cannot be found
     """
-    current = Path(start_dir) if start_dir else Path.cwd()
-    home = Path.home()
+    start = current = Path(start_dir) if start_dir else Path.cwd()
+    home = Path(home) if home is not None else Path.home()
 
     while True:
         # Check for project markers
@@ -42,13 +52,15 @@ def find_project_root(start_dir: Path = None) -> Path:
         if current == home or current == current.parent:
             raise RuntimeError(
                 'Project root not found. Searched for pyproject.toml or .git directory '
-                f'from {Path.cwd()} up to {current}. Something is badly wrong.'
+                f'from {start} up to {current}. Something is badly wrong.'
             )
 
         current = current.parent
 
 
-def discover_config_files(start_dir: Path = None) -> List[Tuple[Path, str, str]]:
+def discover_config_files(
+    start_dir: Path = None, context: Optional['EvaluationContext'] = None
+) -> List[Tuple[Path, str, str]]:
     """
     Discover all applicable config files in priority order.
 
@@ -66,6 +78,7 @@ def discover_config_files(start_dir: Path = None) -> List[Tuple[Path, str, str]]
 
     Args:
         start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context giving the default start directory and the home directory
 
     Returns:
         List of (Path, source_type, format) tuples where:
@@ -73,10 +86,13 @@ def discover_config_files(start_dir: Path = None) -> List[Tuple[Path, str, str]]
         - format is 'json' or 'toml'
     """
     config_files = []
+    home = context.home if context is not None else Path.home()
+    if start_dir is None and context is not None:
+        start_dir = context.cwd
 
     # Try to find project root
     try:
-        project_root = find_project_root(start_dir)
+        project_root = find_project_root(start_dir, home)
         project_claude_dir = project_root / '.claude'
     except RuntimeError:
         # No project root found - skip project-level configs
@@ -98,7 +114,7 @@ def discover_config_files(start_dir: Path = None) -> List[Tuple[Path, str, str]]
         )
 
     # User level
-    user_claude_dir = Path.home() / '.claude'
+    user_claude_dir = home / '.claude'
     candidates.extend(
         [
             (user_claude_dir, 'toolguard_hook.local', 'toolguard_hook', True),
@@ -133,11 +149,208 @@ def discover_config_files(start_dir: Path = None) -> List[Tuple[Path, str, str]]
     return config_files
 
 
+def read_config_file(file_path: Path, file_format: str = 'json') -> dict:
+    """
+    Read and parse a single config file (JSON or TOML).
+
+    Parsed results are kept per process and reused for as long as the file's
+    modification time and size are unchanged, so the several loaders that run
+    during one hook invocation (governed tools, permissions, validation) read
+    each file from disk only once.
+
+    Args:
+        file_path: Path to the config file
+        file_format: Either 'json' or 'toml'
+
+    Returns:
+        Parsed config dictionary (treat as read-only, it may be shared)
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        json.JSONDecodeError: If file contains invalid JSON
+        tomllib.TOMLDecodeError: If file contains invalid TOML
+    """
+    key = (str(file_path), file_format)
+    try:
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except (OSError, TypeError, ValueError):
+        signature = None
+
+    if signature is not None:
+        cached = _config_file_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    if file_format == 'toml':
+        import tomllib
+
+        with open(file_path, 'rb') as f:
+            config = tomllib.load(f)
+    else:
+        with open(file_path, 'r') as f:
+            config = json.load(f)
+
+    if signature is not None:
+        _config_file_cache[key] = (signature, config)
+    return config
+
+
+def parse_permission_entry(permission: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a permission entry into its tool name and pattern.
+
+    Examples:
+        'Bash(git status:*)' -> ('Bash', 'git status:*')
+        'Read(/tmp/**)' -> ('Read', '/tmp/**')
+        'WebSearch' -> None
+
+    Args:
+        permission: Permission entry from a config file
+
+    Returns:
+        Tuple of (tool_name, pattern), or None if the entry has no ToolName(pattern) form
+    """
+    if not isinstance(permission, str) or not permission.endswith(')'):
+        return None
+    tool_name, separator, rest = permission.partition('(')
+    if not separator or not tool_name:
+        return None
+    return tool_name, rest[:-1]
+
+
+def classify_permissions(config: dict) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Classify every permission entry of a config by tool in a single pass.
+
+    Args:
+        config: Parsed config dictionary
+
+    Returns:
+        Dict mapping tool name to {'allow': [...], 'deny': [...], 'ask': [...]}
+        pattern lists (patterns without the ToolName( ) wrapper, in file order)
+
+    Example:
+        >>> classify_permissions({'permissions': {'allow': ['Bash(ls:*)', 'Read(/tmp/**)']}})
+        {'Bash': {'allow': ['ls:*'], 'deny': [], 'ask': []}, 'Read': {'allow': ['/tmp/**'], 'deny': [], 'ask': []}}
+    """
+    tool_permissions: Dict[str, Dict[str, List[str]]] = {}
+
+    permissions = config.get('permissions', {}) if isinstance(config, dict) else {}
+    if not isinstance(permissions, dict):
+        return tool_permissions
+
+    for perm_type in PERMISSION_TYPES:
+        entries = permissions.get(perm_type, [])
+        if not isinstance(entries, list):
+            continue
+        for perm in entries:
+            parsed = parse_permission_entry(perm)
+            if parsed is None:
+                continue
+            tool_name, pattern = parsed
+            buckets = tool_permissions.get(tool_name)
+            if buckets is None:
+                buckets = tool_permissions[tool_name] = {name: [] for name in PERMISSION_TYPES}
+            buckets[perm_type].append(pattern)
+
+    return tool_permissions
+
+
+def merge_tool_permissions(
+    tool_permissions_list: List[Dict[str, Dict[str, List[str]]]],
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Merge per-tool permissions from multiple sources using simple union.
+
+    Args:
+        tool_permissions_list: List of dicts as returned by classify_permissions()
+
+    Returns:
+        Merged dict with duplicates removed (order preserved from first occurrence)
+    """
+    merged: Dict[str, Dict[str, List[str]]] = {}
+    seen: Dict[Tuple[str, str], set] = {}
+
+    for tool_permissions in tool_permissions_list:
+        for tool_name, buckets in tool_permissions.items():
+            merged_buckets = merged.get(tool_name)
+            if merged_buckets is None:
+                merged_buckets = merged[tool_name] = {name: [] for name in PERMISSION_TYPES}
+            for perm_type in PERMISSION_TYPES:
+                seen_patterns = seen.setdefault((tool_name, perm_type), set())
+                for pattern in buckets.get(perm_type, []):
+                    if pattern not in seen_patterns:
+                        seen_patterns.add(pattern)
+                        merged_buckets[perm_type].append(pattern)
+
+    return merged
+
+
+def load_tool_permissions_from_files(config_files: List[Tuple[Path, str, str]]) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Load and merge the permissions of every tool from a list of config files.
+
+    Each file is read once and all of its entries are bucketed by tool, so command
+    tools and file path tools are served from the same parsed structure.
+
+    Args:
+        config_files: List of (Path, source_type, format) tuples, as returned by
+                      discover_config_files()
+
+    Returns:
+        Dict mapping tool name to {'allow': [...], 'deny': [...], 'ask': [...]}
+    """
+    tool_permissions_list = []
+    for path, source_type, fmt in config_files:
+        try:
+            config = read_config_file(path, fmt)
+        except Exception as e:
+            print(f'Warning: Invalid {fmt.upper()} in {path}: {e}', file=sys.stderr)
+            continue
+        tool_permissions_list.append(classify_permissions(config))
+
+    return merge_tool_permissions(tool_permissions_list)
+
+
+def load_tool_permissions(
+    start_dir: Path = None, context: Optional['EvaluationContext'] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Discover config files and load the permissions of every tool in one pass.
+
+    Args:
+        start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context (see discover_config_files())
+
+    Returns:
+        Dict mapping tool name to {'allow': [...], 'deny': [...], 'ask': [...]}
+    """
+    return load_tool_permissions_from_files(discover_config_files(start_dir, context))
+
+
+def get_tool_patterns(tool_permissions: Dict[str, Dict[str, List[str]]], tool_name: str) -> Tuple[List[str], List[str]]:
+    """
+    Get the allow and deny patterns for one tool from classified permissions.
+
+    Args:
+        tool_permissions: Dict as returned by classify_permissions() or load_tool_permissions()
+        tool_name: Tool to get patterns for (e.g. 'Bash', 'Read')
+
+    Returns:
+        Tuple of (allow_patterns, deny_patterns)
+    """
+    buckets = tool_permissions.get(tool_name)
+    if not buckets:
+        return [], []
+    return list(buckets['allow']), list(buckets['deny'])
+
+
 def load_permissions_from_file(
     file_path: Path, source_type: str, file_format: str = 'json', strict: bool = False
 ) -> Tuple[List[str], List[str]]:
     """
-    Load permissions from a single config file (JSON or TOML).
+    Load Bash permissions from a single config file (JSON or TOML).
 
     Args:
         file_path: Path to the config file
@@ -154,40 +367,14 @@ def load_permissions_from_file(
         tomllib.TOMLDecodeError: If file contains invalid TOML (only if strict=True)
     """
     try:
-        if file_format == 'toml':
-            import tomllib
-
-            with open(file_path, 'rb') as f:
-                config = tomllib.load(f)
-        else:
-            with open(file_path, 'r') as f:
-                config = json.load(f)
+        config = read_config_file(file_path, file_format)
     except (json.JSONDecodeError, Exception) as e:
         if strict:
             raise
         print(f'Warning: Invalid {file_format.upper()} in {file_path}: {e}', file=sys.stderr)
         return [], []
 
-    permissions = config.get('permissions', {})
-
-    allow_patterns = []
-    deny_patterns = []
-
-    # Extract patterns from allow list
-    for perm in permissions.get('allow', []):
-        if isinstance(perm, str) and perm.startswith('Bash(') and perm.endswith(')'):
-            # Extract the pattern between "Bash(" and ")"
-            pattern = perm[5:-1]  # Remove "Bash(" and ")"
-            allow_patterns.append(pattern)
-
-    # Extract patterns from deny list
-    for perm in permissions.get('deny', []):
-        if isinstance(perm, str) and perm.startswith('Bash(') and perm.endswith(')'):
-            # Extract the pattern between "Bash(" and ")"
-            pattern = perm[5:-1]  # Remove "Bash(" and ")"
-            deny_patterns.append(pattern)
-
-    return allow_patterns, deny_patterns
+    return get_tool_patterns(classify_permissions(config), 'Bash')
 
 
 def merge_permissions(permissions_list: List[Tuple[List[str], List[str]]]) -> Tuple[List[str], List[str]]:
@@ -239,14 +426,7 @@ def load_governed_tools_from_file(file_path: Path, file_format: str = 'json') ->
         List of tool names to govern, or empty list if not found/invalid
     """
     try:
-        if file_format == 'toml':
-            import tomllib
-
-            with open(file_path, 'rb') as f:
-                config = tomllib.load(f)
-        else:
-            with open(file_path, 'r') as f:
-                config = json.load(f)
+        config = read_config_file(file_path, file_format)
     except (FileNotFoundError, json.JSONDecodeError, Exception):
         return []
 
@@ -285,7 +465,21 @@ def merge_governed_tools(tools_lists: List[List[str]]) -> List[str]:
     return unique_tools
 
 
-def load_governed_tools(start_dir: Path = None) -> List[str]:
+def settings_path_override(context: Optional['EvaluationContext'] = None) -> Optional[str]:
+    """
+    Get the settings file that replaces config discovery (CLAUDE_SETTINGS_PATH), if set.
+
+    Args:
+        context: Evaluation context whose environment is read (None: os.environ)
+
+    Returns:
+        The settings file path, or None
+    """
+    environ = context.env if context is not None else os.environ
+    return environ.get('CLAUDE_SETTINGS_PATH') or None
+
+
+def load_governed_tools(start_dir: Path = None, context: Optional['EvaluationContext'] = None) -> List[str]:
     """
     Load list of tools to govern from config files.
 
@@ -296,12 +490,14 @@ def load_governed_tools(start_dir: Path = None) -> List[str]:
 
     Args:
         start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context giving CLAUDE_SETTINGS_PATH and the config discovery
+            (None: read from the process)
 
     Returns:
         List of tool names to govern (default: ["Bash"])
     """
     # Check if CLAUDE_SETTINGS_PATH is set (backward compatible)
-    settings_path = os.environ.get('CLAUDE_SETTINGS_PATH')
+    settings_path = settings_path_override(context)
     if settings_path:
         # When using CLAUDE_SETTINGS_PATH, only look for adjacent toolguard_hook.json
         settings_dir = Path(settings_path).parent
@@ -315,7 +511,7 @@ def load_governed_tools(start_dir: Path = None) -> List[str]:
         return ['Bash']
 
     # Discover config files in hierarchy
-    config_files = discover_config_files(start_dir)
+    config_files = discover_config_files(start_dir, context)
 
     # Filter to only toolguard_hook files
     hook_files = [(path, fmt) for path, source_type, fmt in config_files if source_type == 'toolguard_hook']
@@ -339,7 +535,9 @@ def load_governed_tools(start_dir: Path = None) -> List[str]:
     return merge_governed_tools(tools_lists)
 
 
-def load_permissions(start_dir: Path = None) -> Tuple[List[str], List[str]]:
+def load_permissions(
+    start_dir: Path = None, context: Optional['EvaluationContext'] = None
+) -> Tuple[List[str], List[str]]:
     """
     Load and parse permissions from Claude Code settings files.
 
@@ -352,6 +550,8 @@ def load_permissions(start_dir: Path = None) -> Tuple[List[str], List[str]]:
 
     Args:
         start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context giving CLAUDE_SETTINGS_PATH and the config discovery
+            (None: read from the process)
 
     Returns:
         Tuple of (allow_patterns, deny_patterns) where each is a list of strings
@@ -359,7 +559,7 @@ def load_permissions(start_dir: Path = None) -> Tuple[List[str], List[str]]:
     Raises:
         SystemExit: If CLAUDE_SETTINGS_PATH is set but file cannot be loaded
     """
-    settings_path = os.environ.get('CLAUDE_SETTINGS_PATH')
+    settings_path = settings_path_override(context)
 
     # If CLAUDE_SETTINGS_PATH is set, load from that file AND adjacent toolguard_hook files
     if settings_path:
@@ -398,7 +598,7 @@ def load_permissions(start_dir: Path = None) -> Tuple[List[str], List[str]]:
         return merge_permissions(permissions_list)
 
     # Discover config files in hierarchy
-    config_files = discover_config_files(start_dir)
+    config_files = discover_config_files(start_dir, context)
 
     if not config_files:
         print('Warning: No config files found in hierarchy', file=sys.stderr)
@@ -418,18 +618,9 @@ def load_permissions(start_dir: Path = None) -> Tuple[List[str], List[str]]:
     for path, source_type, fmt in config_files:
         print(f'  - {path} [{source_type}, {fmt}]', file=sys.stderr)
 
-    # Load permissions from all discovered files
-    permissions_list = []
-    for path, source_type, fmt in config_files:
-        try:
-            perms = load_permissions_from_file(path, source_type, fmt)
-            permissions_list.append(perms)
-        except Exception as e:
-            print(f'Warning: Failed to load {path}: {e}', file=sys.stderr)
-            continue
-
-    # Merge all permissions
-    allow_patterns, deny_patterns = merge_permissions(permissions_list)
+    # Load permissions of all tools from all discovered files, then take the Bash bucket
+    tool_permissions = load_tool_permissions_from_files(config_files)
+    allow_patterns, deny_patterns = get_tool_patterns(tool_permissions, 'Bash')
 
     print(f'Loaded {len(allow_patterns)} allow patterns, {len(deny_patterns)} deny patterns', file=sys.stderr)
 
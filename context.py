@@ -0,0 +1,104 @@
+"""
+Evaluation context of toolguard decisions.
+
+A decision depends on process state: the home directory (~ in patterns and
+the user-level config files), the working directory (project discovery and
+relative paths), environment variables (CLAUDE_SETTINGS_PATH, TOOLGUARD_*,
+CHECKED_BASH_*) and the environment configuration built from them. An
+EvaluationContext reads this state once into an immutable value that is
+passed down the call chain, so functions given a context read nothing from
+the process. Hosts that evaluate several projects in one process (see
+PolicyEngine in engine.py) hold one context per project and can use them
+from any thread.
+
+Functions that take an optional context read the process state themselves
+when it is None, as before contexts existed.
+"""
+
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Union
+
+from toolguard.env_config import get_env_config
+
+
+class EvaluationContext:
+    """
+    Home, working directory, project root, environment and configuration of decisions.
+
+    Instances are immutable: replace() returns a changed copy. The
+    environment and configuration are read-only snapshots.
+    """
+
+    __slots__ = ('home', 'cwd', 'project_root', 'env', 'config')
+
+    def __init__(
+        self,
+        home: Union[str, Path],
+        cwd: Union[str, Path],
+        project_root: Optional[Union[str, Path]] = None,
+        env: Optional[Mapping[str, str]] = None,
+        config: Optional[Mapping[str, Any]] = None,
+    ):
+        """
+        Create a context from explicit values.
+
+        Args:
+            home: Home directory of the user
+            cwd: Working directory (where project discovery starts)
+            project_root: Project root (None: not known)
+            env: Environment variables (None: none)
+            config: Environment configuration, as from get_env_config() (None: empty)
+        """
+        object.__setattr__(self, 'home', Path(home))
+        object.__setattr__(self, 'cwd', Path(cwd))
+        object.__setattr__(self, 'project_root', Path(project_root) if project_root is not None else None)
+        object.__setattr__(self, 'env', MappingProxyType(dict(env or {})))
+        object.__setattr__(self, 'config', MappingProxyType(dict(config or {})))
+
+    @classmethod
+    def capture(
+        cls,
+        cwd: Optional[Union[str, Path]] = None,
+        env: Optional[Mapping[str, str]] = None,
+        config: Optional[Mapping[str, Any]] = None,
+    ) -> 'EvaluationContext':
+        """
+        Read the context from the process.
+
+        Args:
+            cwd: Working directory (None: the process working directory)
+            env: Environment variables (None: a snapshot of os.environ)
+            config: Environment configuration (None: loaded with get_env_config() for this context)
+
+        Returns:
+            The context; its project root is the one of the configuration
+        """
+        context = cls(Path.home(), cwd if cwd else Path.cwd(), env=os.environ if env is None else env)
+        if config is None:
+            config = get_env_config(context)
+        return context.replace(project_root=config.get('project_root'), config=config)
+
+    def replace(self, **changes: Any) -> 'EvaluationContext':
+        """
+        Get a copy of the context with some values changed.
+
+        Args:
+            **changes: New values by name (home, cwd, project_root, env, config)
+
+        Returns:
+            The new context
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return EvaluationContext(**values)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'EvaluationContext is immutable (use replace() to change {name})')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'EvaluationContext is immutable (cannot delete {name})')
+
+    def __repr__(self) -> str:
+        return f'EvaluationContext(home={self.home!r}, cwd={self.cwd!r}, project_root={self.project_root!r})'
@@ -0,0 +1,134 @@
+"""
+Wall-clock budget for one hook decision.
+
+A pathological input (an enormous heredoc, deeply nested `$( )`, a huge
+transcript) can make parsing, matching or the transcript scan run for a long
+time while the agent waits for the hook. A DecisionBudget bounds the whole
+decision:
+
+- on POSIX, in the main thread, a one-shot SIGALRM timer interrupts whatever
+  runs when the budget expires, pure Python or the regex engine (which checks
+  for signals while it backtracks)
+- stage boundaries and waits for background stages check the deadline too,
+  which is all that is enforced where no timer is available
+
+Expiry raises DecisionBudgetExceeded, naming the stage that was running.
+It derives from BaseException, like KeyboardInterrupt, so that the
+`except Exception` fallbacks of the pipeline cannot swallow it.
+"""
+
+import signal
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class DecisionBudgetExceeded(BaseException):
+    """The decision ran longer than its budget."""
+
+    def __init__(self, stage: str, budget_ms: float):
+        super().__init__(f'Decision exceeded the {budget_ms:g} ms time budget during {stage}')
+        self.stage = stage
+        self.budget_ms = budget_ms
+
+
+class DecisionBudget:
+    """A deadline for one decision, with the name of the stage running."""
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Start timing a decision; the budget itself is set by arm().
+
+        Args:
+            start: time.perf_counter() value the budget counts from (default now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.budget_ms: Optional[float] = None
+        self.deadline = float('inf')
+        self.stage = 'startup'
+        self._armed = False
+        self._handler_installed = False
+        self._previous_handler = None
+
+    def arm(self, budget_ms: Optional[float]) -> None:
+        """
+        Set the budget, counted from the start, and start the timer if possible.
+
+        Args:
+            budget_ms: Budget of the whole decision in milliseconds (None or 0 disables it)
+
+        Raises:
+            DecisionBudgetExceeded: If the budget is already spent
+        """
+        if not budget_ms:
+            return
+        self.budget_ms = budget_ms
+        self.deadline = self.start + budget_ms / 1000
+        self.check()
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGALRM, self._expire)
+            self._handler_installed = True
+            self._armed = True
+            signal.setitimer(signal.ITIMER_REAL, max(self.remaining(), 1e-6))
+
+    def disarm(self) -> None:
+        """Stop the timer; the decision is made. Safe to call more than once."""
+        self._armed = False
+        if self._handler_installed:
+            self._handler_installed = False
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+        self.deadline = float('inf')
+
+    def enter(self, stage: str) -> None:
+        """
+        Start a stage, checking the deadline first.
+
+        Args:
+            stage: Stage name reported if the budget runs out
+
+        Raises:
+            DecisionBudgetExceeded: If the budget is spent
+        """
+        self.check()
+        self.stage = stage
+
+    def check(self) -> None:
+        """Raise DecisionBudgetExceeded if the budget is spent."""
+        if time.perf_counter() > self.deadline:
+            raise DecisionBudgetExceeded(self.stage, self.budget_ms)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a budget."""
+        if self.deadline == float('inf'):
+            return None
+        return max(self.deadline - time.perf_counter(), 0.0)
+
+    def wait(self, future: 'Future[T]', stage: str) -> T:
+        """
+        Wait for a background stage, at most until the deadline.
+
+        Args:
+            future: Future of the stage
+            stage: Stage name reported if the budget runs out
+
+        Returns:
+            The stage's result
+
+        Raises:
+            DecisionBudgetExceeded: If the budget runs out first
+        """
+        self.enter(stage)
+        try:
+            return future.result(timeout=self.remaining())
+        except FutureTimeoutError:
+            raise DecisionBudgetExceeded(stage, self.budget_ms) from None
+
+    def _expire(self, signum, frame) -> None:
+        """SIGALRM handler."""
+        if self._armed:
+            self._armed = False
+            raise DecisionBudgetExceeded(self.stage, self.budget_ms)
@@ -0,0 +1,225 @@
+"""
+In-process policy engine for toolguard.
+
+The hook (hook.py) runs as a new process for every tool call, so it loads
+the configuration and compiles the policy on each call. Hosts that run
+Python for a long time anyway, such as an MCP server that executes
+commands or an IDE plugin, can embed a PolicyEngine instead: it loads the
+configuration of one project once, and a check is a function call on the
+compiled policy, with the decisions and reasons of hook.main().
+
+Example:
+    engine = PolicyEngine('/path/to/project')
+    decision, reason = engine.check_command('git status && rm -rf /')
+    # ('deny', 'Compound command contains denied sub-command: rm -rf / (Command matches deny pattern: rm *)')
+    decision, reason = engine.check_path('Read', '/tmp/notes.txt')
+    # ('allow', 'Path matches allow pattern: /tmp/**')
+    engine.reload_if_changed()  # e.g. before each tool call, or on a timer
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, List, Mapping, Optional, Tuple, Union
+
+from toolguard.compound import check_compound_permission
+from toolguard.config import discover_config_files, load_governed_tools, load_permissions, settings_path_override
+from toolguard.context import EvaluationContext
+from toolguard.hook import FILE_PATH_TOOLS, load_evaluation_settings, load_file_path_patterns, load_redirect_rules
+from toolguard.parser.parse_cache import ParseCache
+from toolguard.permissions import check_file_path_permission
+from toolguard.policy import compile_policy
+from toolguard.policy_analysis import apply_policy_review
+
+# Signature of a config file: (path, modification time, size), or (path, None, None) if missing
+FileSignature = Tuple[str, Optional[int], Optional[int]]
+
+
+class _Configuration:
+    """One loaded configuration of a project; replaced as a whole on reload."""
+
+    __slots__ = ('signature', 'governed_tools', 'allow_patterns', 'deny_patterns', 'file_patterns', 'redirect_rules')
+
+    def __init__(
+        self,
+        signature: Tuple[FileSignature, ...],
+        governed_tools: List[str],
+        allow_patterns: List[str],
+        deny_patterns: List[str],
+        file_patterns: Mapping[str, Tuple[List[str], List[str]]],
+        redirect_rules: Mapping[str, Tuple[List[str], List[str]]],
+    ):
+        self.signature = signature
+        self.governed_tools = governed_tools
+        self.allow_patterns = allow_patterns
+        self.deny_patterns = deny_patterns
+        self.file_patterns = file_patterns
+        self.redirect_rules = redirect_rules
+
+
+class PolicyEngine:
+    """
+    Toolguard decisions for one project, in process.
+
+    Checks read one loaded configuration, which reload_if_changed() replaces
+    as a whole, so checks may run on several threads while a reload happens.
+    The home directory, environment variables and configuration come from
+    the engine's evaluation context, read once when the engine is created,
+    so engines of several projects can run side by side in one process.
+    Command parsing and policy compilation follow the engine's environment
+    configuration (see hook.load_evaluation_settings()), with policies
+    compiled to generated code unless policy_codegen is disabled. Each
+    engine keeps these settings and its own parse cache and passes them to
+    every check, so creating an engine never changes the settings of the
+    process or of other engines.
+    """
+
+    def __init__(
+        self,
+        project_root: Union[str, Path],
+        env_config: Optional[Mapping[str, Any]] = None,
+        context: Optional[EvaluationContext] = None,
+    ):
+        """
+        Load and compile the configuration of a project.
+
+        Args:
+            project_root: Directory config files are discovered from (as the cwd of hook input)
+            env_config: Environment configuration dict (None: read with get_env_config())
+            context: Evaluation context (None: captured from the process, see EvaluationContext.capture());
+                its cwd is replaced by project_root, and env_config, if given, replaces its config
+        """
+        self.project_root = Path(project_root)
+        if context is None:
+            context = EvaluationContext.capture(self.project_root, config=env_config)
+        else:
+            context = context.replace(cwd=self.project_root)
+            if env_config is not None:
+                context = context.replace(config=env_config)
+        self.context = context
+        self._reload_lock = threading.Lock()
+        self._settings = load_evaluation_settings(self.env_config, long_running=True, home=self.context.home)
+        self._parse_cache = ParseCache(cache_dir=self._settings.cache_dir, key=self._settings.cache_key)
+        self._configuration = self._load(self._signature())
+
+    @property
+    def env_config(self) -> Mapping[str, Any]:
+        """The environment configuration of the engine's context."""
+        return self.context.config
+
+    def check_command(
+        self, command: str, tool_name: str = 'Bash', cwd: Optional[Union[str, Path]] = None
+    ) -> Tuple[str, str]:
+        """
+        Check a command, as the hook checks the command of a command tool.
+
+        Args:
+            command: The bash command line (may be compound)
+            tool_name: The command tool (e.g. 'Bash' or an MCP terminal tool)
+            cwd: Directory the command runs in, for redirection targets (None: the project root)
+
+        Returns:
+            Tuple of (decision, reason)
+        """
+        configuration = self._configuration
+        if tool_name not in configuration.governed_tools:
+            return 'allow', f'Not a governed tool (governed: {", ".join(configuration.governed_tools)})'
+        if not command:
+            return 'deny', 'No command provided in tool input'
+        if not configuration.allow_patterns:
+            return 'deny', 'No Bash permissions found in settings - all commands blocked'
+        return check_compound_permission(
+            command,
+            configuration.allow_patterns,
+            configuration.deny_patterns,
+            [],
+            self.env_config.get('extended_syntax', True),
+            leaf_only_allow=self.env_config.get('leaf_only_allow', False),
+            path_rules=configuration.redirect_rules,
+            cwd=str(cwd if cwd is not None else self.project_root),
+            home=str(self.context.home),
+            parse_cache=self._parse_cache,
+            parser_backend=self._settings.parser_backend,
+            compiler=self._settings.compiler,
+        )
+
+    def check_path(self, tool_name: str, file_path: str) -> Tuple[str, str]:
+        """
+        Check a file path, as the hook checks the file_path of a file tool.
+
+        Args:
+            tool_name: The file tool (Read, Write or Edit)
+            file_path: The file path the tool would access
+
+        Returns:
+            Tuple of (decision, reason)
+
+        Raises:
+            ValueError: If tool_name is not a file path tool
+        """
+        if tool_name not in FILE_PATH_TOOLS:
+            expected = ', '.join(sorted(FILE_PATH_TOOLS))
+            raise ValueError(f'Not a file path tool: {tool_name} (expected one of {expected})')
+        configuration = self._configuration
+        if tool_name not in configuration.governed_tools:
+            return 'allow', f'Not a governed tool (governed: {", ".join(configuration.governed_tools)})'
+        if not file_path:
+            return 'deny', 'No file_path provided in tool input'
+        allow_patterns, deny_patterns = configuration.file_patterns[tool_name]
+        if not allow_patterns:
+            return 'deny', f'No {tool_name} permissions found in settings - all operations blocked'
+        return check_file_path_permission(file_path, allow_patterns, deny_patterns, self.context.home)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the configuration if a config file was added, removed or modified.
+
+        Config files are compared by modification time and size, so a check
+        costs one stat() per candidate file.
+
+        Returns:
+            True if the configuration was reloaded
+        """
+        with self._reload_lock:
+            signature = self._signature()
+            if signature == self._configuration.signature:
+                return False
+            self._configuration = self._load(signature)
+            return True
+
+    def _signature(self) -> Tuple[FileSignature, ...]:
+        """Get the signatures of the config files the configuration is loaded from."""
+        paths = [path for path, _source_type, _fmt in discover_config_files(context=self.context)]
+        settings_path = settings_path_override(self.context)
+        if settings_path:
+            settings_dir = Path(settings_path).parent
+            paths.extend(
+                (Path(settings_path), settings_dir / 'toolguard_hook.toml', settings_dir / 'toolguard_hook.json')
+            )
+        signatures = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signatures.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signatures.append((str(path), None, None))
+        return tuple(signatures)
+
+    def _load(self, signature: Tuple[FileSignature, ...]) -> _Configuration:
+        """Load the configuration, with the loaders of the hook."""
+        context = self.context
+        governed_tools = load_governed_tools(context=context)
+        allow_patterns, deny_patterns = load_permissions(context=context)
+        settings = self._settings
+        allow_patterns, deny_patterns = apply_policy_review(
+            allow_patterns, deny_patterns, self.env_config, settings.cache_dir, settings.cache_key
+        )
+        if allow_patterns:
+            # Compiled now, so the first check does not pay for it (checks get it from the policy cache)
+            extended_syntax = self.env_config.get('extended_syntax', True)
+            compile_policy(allow_patterns, deny_patterns, extended_syntax, settings.compiler)
+        file_patterns = {
+            tool_name: load_file_path_patterns(tool_name, context=context) for tool_name in FILE_PATH_TOOLS
+        }
+        redirect_rules = load_redirect_rules(governed_tools, context=context)
+        return _Configuration(signature, governed_tools, allow_patterns, deny_patterns, file_patterns, redirect_rules)
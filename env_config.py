@@ -7,10 +7,16 @@ Provides centralized configuration loading from environment variables and .env f
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple
 
+from toolguard.linear_regex import DEFAULT_REGEX_BUDGET_MS
+from toolguard.parser.command_extractor import CANOPY, PARSER_BACKENDS
 
-def find_project_root(start_dir: Optional[Path] = None) -> Optional[Path]:
+if TYPE_CHECKING:
+    from toolguard.context import EvaluationContext
+
+
+def find_project_root(start_dir: Optional[Path] = None, home: Optional[Path] = None) -> Optional[Path]:
     """
     Find the project root by searching for .git or pyproject.toml.
 
@@ -19,12 +25,13 @@ def find_project_root(start_dir: Optional[Path] = None) -> Optional[Path]:
 
     Args:
         start_dir: Starting directory for search (defaults to current directory)
+        home: Home directory the search stops at (defaults to the user's home)
 
     Returns:
         Path to project root, or None if not found
     """
-    current = start_dir if start_dir else Path.cwd()
-    home = Path.home()
+    current = Path(start_dir) if start_dir else Path.cwd()
+    home = Path(home) if home is not None else Path.home()
 
     while True:
         # Check for project markers
@@ -88,7 +95,9 @@ def load_env_file(project_root: Path, source_root: str = '') -> Dict[str, str]:
     return env_vars
 
 
-def get_bool_env(name: str, default: bool, env_vars: Optional[Dict[str, str]] = None) -> bool:
+def get_bool_env(
+    name: str, default: bool, env_vars: Optional[Dict[str, str]] = None, environ: Optional[Mapping[str, str]] = None
+) -> bool:
     """
     Get a boolean environment variable with case-insensitive parsing.
 
@@ -104,12 +113,13 @@ def get_bool_env(name: str, default: bool, env_vars: Optional[Dict[str, str]] =
         name: Environment variable name
         default: Default value if not found
         env_vars: Optional dict of variables from .env file
+        environ: Environment variables (defaults to os.environ)
 
     Returns:
         Boolean value
     """
     # Check environment variable first (highest priority)
-    value = os.environ.get(name)
+    value = (os.environ if environ is None else environ).get(name)
 
     # Fall back to env_vars dict (from .env file)
     if value is None and env_vars:
@@ -131,50 +141,149 @@ def get_bool_env(name: str, default: bool, env_vars: Optional[Dict[str, str]] =
         return default
 
 
-def get_env_config() -> Dict[str, any]:
+def get_float_env(
+    name: str,
+    default: Optional[float],
+    env_vars: Optional[Dict[str, str]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Optional[float]:
+    """
+    Get a non-negative number from an environment variable.
+
+    Same precedence as get_bool_env(). Invalid or negative values warn and
+    use the default.
+
+    Args:
+        name: Environment variable name
+        default: Default value if not found
+        env_vars: Optional dict of variables from .env file
+        environ: Environment variables (defaults to os.environ)
+
+    Returns:
+        Float value
+    """
+    value = (os.environ if environ is None else environ).get(name)
+    if value is None and env_vars:
+        value = env_vars.get(name)
+    if value is None:
+        return default
+
+    try:
+        number = float(value)
+    except ValueError:
+        number = -1.0
+    if not number >= 0:
+        print(f'Warning: Invalid number for {name}: {value}. Using default: {default}', file=sys.stderr)
+        return default
+    return number
+
+
+def get_choice_env(
+    name: str,
+    default: str,
+    choices: Tuple[str, ...],
+    env_vars: Optional[Dict[str, str]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> str:
+    """
+    Get one of a fixed set of names from an environment variable (case-insensitive).
+
+    Same precedence as get_bool_env(). Other values warn and use the default.
+
+    Args:
+        name: Environment variable name
+        default: Default value if not found
+        choices: Allowed values, in lower case
+        env_vars: Optional dict of variables from .env file
+        environ: Environment variables (defaults to os.environ)
+
+    Returns:
+        One of choices
+    """
+    value = (os.environ if environ is None else environ).get(name)
+    if value is None and env_vars:
+        value = env_vars.get(name)
+    if value is None:
+        return default
+
+    if value.lower() not in choices:
+        allowed = ', '.join(choices)
+        print(
+            f'Warning: Invalid value for {name}: {value} (one of {allowed}). Using default: {default}', file=sys.stderr
+        )
+        return default
+    return value.lower()
+
+
+def get_env_config(context: Optional['EvaluationContext'] = None) -> Dict[str, any]:
     """
     Load all toolguard configuration from environment variables and .env file.
 
     Environment variables take precedence over .env file values.
 
+    Args:
+        context: Evaluation context whose environment, working directory and home directory
+            are used (None: those of the process)
+
     Returns:
         Dictionary with all config values:
         - logging_enabled: bool
         - log_dir: Path
         - extended_syntax: bool
+        - leaf_only_allow: bool (allow-check only leaf commands of compound commands)
+        - policy_codegen: bool (generate Python code for policies in long-running processes, see engine.py)
+        - prune_patterns: bool (drop unreachable, subsumed and shadowed patterns before checking)
+        - usage_ordering: bool (evaluate allow patterns most-hit first, using counts saved in cache_dir)
+        - linear_regex: bool (search [regex] patterns with the linear-time engine)
+        - regex_budget_ms: float (time budget of one linear-time regex search)
+        - decision_budget_ms: float or None (time budget of a whole hook decision, disabled when unset)
+        - parser_backend: str (parser of command extraction, 'canopy' or 'descent')
         - project_root: Path
         - source_root: str
         - create_log_dir: bool
+        - cache_dir: Path or None (persistent cache directory, disabled when unset)
     """
+    environ = context.env if context is not None else os.environ
+    cwd = context.cwd if context is not None else None
+    home = context.home if context is not None else None
+
     # Get project root (explicit or auto-detect)
-    project_root_str = os.environ.get('TOOLGUARD_PROJECT_ROOT')
+    project_root_str = environ.get('TOOLGUARD_PROJECT_ROOT')
     if project_root_str:
-        project_root = Path(project_root_str).expanduser().resolve()
+        project_root = _expand_user(project_root_str, home).resolve()
     else:
-        project_root = find_project_root()
+        project_root = find_project_root(cwd, home)
         if project_root is None:
             # No project root found - use current directory
-            project_root = Path.cwd()
+            project_root = cwd if cwd is not None else Path.cwd()
 
     # Get source root (for .env file location)
-    source_root = os.environ.get('TOOLGUARD_SOURCE_ROOT', '')
+    source_root = environ.get('TOOLGUARD_SOURCE_ROOT', '')
 
     # Load .env file
     env_vars = load_env_file(project_root, source_root)
 
     # Get configuration values
-    logging_enabled = get_bool_env('TOOLGUARD_LOGGING_ENABLED', True, env_vars)
-    extended_syntax = get_bool_env('TOOLGUARD_EXTENDED_SYNTAX', True, env_vars)
-    create_log_dir = get_bool_env('TOOLGUARD_CREATE_LOG_DIR', False, env_vars)
+    logging_enabled = get_bool_env('TOOLGUARD_LOGGING_ENABLED', True, env_vars, environ)
+    extended_syntax = get_bool_env('TOOLGUARD_EXTENDED_SYNTAX', True, env_vars, environ)
+    leaf_only_allow = get_bool_env('TOOLGUARD_LEAF_ONLY_ALLOW', False, env_vars, environ)
+    policy_codegen = get_bool_env('TOOLGUARD_POLICY_CODEGEN', True, env_vars, environ)
+    prune_patterns = get_bool_env('TOOLGUARD_PRUNE_PATTERNS', False, env_vars, environ)
+    usage_ordering = get_bool_env('TOOLGUARD_USAGE_ORDERING', False, env_vars, environ)
+    linear_regex = get_bool_env('TOOLGUARD_LINEAR_REGEX', False, env_vars, environ)
+    regex_budget_ms = get_float_env('TOOLGUARD_REGEX_BUDGET_MS', DEFAULT_REGEX_BUDGET_MS, env_vars, environ)
+    decision_budget_ms = get_float_env('TOOLGUARD_DECISION_BUDGET_MS', None, env_vars, environ)
+    parser_backend = get_choice_env('TOOLGUARD_PARSER', CANOPY, PARSER_BACKENDS, env_vars, environ)
+    create_log_dir = get_bool_env('TOOLGUARD_CREATE_LOG_DIR', False, env_vars, environ)
 
     # Get log directory
-    log_dir_str = os.environ.get('TOOLGUARD_LOG_DIR')
+    log_dir_str = environ.get('TOOLGUARD_LOG_DIR')
     if log_dir_str is None and env_vars:
         log_dir_str = env_vars.get('TOOLGUARD_LOG_DIR')
 
     if log_dir_str:
         # Explicit log directory specified
-        log_dir = Path(log_dir_str).expanduser()
+        log_dir = _expand_user(log_dir_str, home)
         if not log_dir.is_absolute():
             # Relative to project root
             log_dir = project_root / log_dir
@@ -182,11 +291,39 @@ def get_env_config() -> Dict[str, any]:
         # Default: {project_root}/logs
         log_dir = project_root / 'logs'
 
+    # Get persistent cache directory (optional)
+    cache_dir_str = environ.get('TOOLGUARD_CACHE_DIR')
+    if cache_dir_str is None and env_vars:
+        cache_dir_str = env_vars.get('TOOLGUARD_CACHE_DIR')
+
+    cache_dir = None
+    if cache_dir_str:
+        cache_dir = _expand_user(cache_dir_str, home)
+        if not cache_dir.is_absolute():
+            # Relative to project root
+            cache_dir = project_root / cache_dir
+
     return {
         'logging_enabled': logging_enabled,
         'log_dir': log_dir.resolve(),
         'extended_syntax': extended_syntax,
+        'leaf_only_allow': leaf_only_allow,
+        'policy_codegen': policy_codegen,
+        'prune_patterns': prune_patterns,
+        'usage_ordering': usage_ordering,
+        'linear_regex': linear_regex,
+        'regex_budget_ms': regex_budget_ms,
+        'decision_budget_ms': decision_budget_ms,
+        'parser_backend': parser_backend,
         'project_root': project_root,
         'source_root': source_root,
         'create_log_dir': create_log_dir,
+        'cache_dir': cache_dir,
     }
+
+
+def _expand_user(path: str, home: Optional[Path]) -> Path:
+    """Expand a leading ~ of a path with the given home directory (None: the user's home)."""
+    if home is not None and (path == '~' or path.startswith('~/')):
+        return Path(home) / path[2:]
+    return Path(path).expanduser()
@@ -15,19 +15,42 @@ Exit code: Always 0 (errors communicated via JSON output)
 """
 
 import json
+import os
 import sys
-from pathlib import PurePath
-from typing import Any, Dict, List, Tuple
-
-from toolguard.compound import check_compound_permission
-from toolguard.config import discover_config_files, find_project_root, load_governed_tools, load_permissions
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from toolguard.cache_trust import trusted_cache
+from toolguard.compound import REDIRECT_TOOLS, check_compound_permission
+from toolguard.config import (
+    discover_config_files,
+    find_project_root,
+    get_tool_patterns,
+    load_governed_tools,
+    load_permissions,
+    load_tool_permissions_from_files,
+    read_config_file,
+)
+from toolguard.context import EvaluationContext
 from toolguard.env_config import get_env_config
-from toolguard.error_log import log_warning
+from toolguard.error_log import log_error, log_warning
+from toolguard.linear_regex import DEFAULT_REGEX_BUDGET_MS
 from toolguard.log_writer import log_command
-from toolguard.normalization import expand_tilde
+from toolguard.permissions import check_file_path_permission
+from toolguard.parser.command_extractor import (
+    CANOPY,
+    PARSER_BACKENDS,
+    configure_parse_cache,
+    configure_parser_backend,
+    extract_structured_commands,
+)
+from toolguard.policy import CompilerSettings, configure_policy_compiler
+from toolguard.policy_analysis import apply_policy_review
 from toolguard.subagent import identify_current_agent
-from toolguard.toml_config import load_toml_config
+from toolguard.usage_stats import load_hit_counts
 from toolguard.config_validation import validate_permissions
+from toolguard.decision_budget import DecisionBudget, DecisionBudgetExceeded
 
 # Tools that operate on file paths (use GLOB matching)
 FILE_PATH_TOOLS = {'Read', 'Write', 'Edit'}
@@ -35,13 +58,16 @@ FILE_PATH_TOOLS = {'Read', 'Write', 'Edit'}
 # Tools that execute commands (use compound command parsing)
 COMMAND_TOOLS = {'Bash', 'mcp__jetbrains__execute_terminal_command', 'mcp__local-tools__checked_bash'}
 
-# Module-level flag to ensure validation runs only once per session
-_validation_done = False
+# Worker threads for the I/O stages of a hook call (env, config, transcript)
+IO_WORKERS = 3
+
+# Characters of a slow input recorded in the error log
+SLOW_INPUT_EXCERPT = 500
 
 
-def _run_startup_validation(env_config: Dict[str, Any], start_dir: str = None) -> None:
+def _run_startup_validation(context: EvaluationContext) -> None:
     """
-    Run configuration validation once at startup.
+    Run configuration validation at startup (once per hook process).
 
     Loads full config from discovered files and validates permissions.
     Logs warnings for:
@@ -50,24 +76,18 @@ def _run_startup_validation(env_config: Dict[str, Any], start_dir: str = None) -
     - Ungoverned tools in permissions
 
     Args:
-        env_config: Environment configuration dict with log_dir
-        start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context; its config gives the log_dir, and config files are discovered from its cwd
     """
-    global _validation_done
-    if _validation_done:
-        return
-    _validation_done = True
-
     # Get log directory from env config
-    log_dir = env_config.get('log_dir')
+    log_dir = context.config.get('log_dir')
     if not log_dir:
         try:
-            log_dir = find_project_root(start_dir) / 'logs'
+            log_dir = find_project_root(context.cwd, context.home) / 'logs'
         except RuntimeError:
             return  # Can't log without log dir
 
     # Discover config files and check for duplicates
-    config_files = discover_config_files(start_dir)
+    config_files = discover_config_files(context=context)
 
     # Check for duplicate TOML+JSON at same level
     seen_bases = {}  # base_name -> (path, format)
@@ -98,11 +118,7 @@ def _run_startup_validation(env_config: Dict[str, Any], start_dir: str = None) -
             continue
 
         try:
-            if file_format == 'toml':
-                config = load_toml_config(path)
-            else:
-                with open(path, 'r') as f:
-                    config = json.load(f)
+            config = read_config_file(path, file_format)
 
             # Merge governed_tools
             if 'governed_tools' in config:
@@ -200,94 +216,202 @@ def create_hook_output(decision: str, reason: str) -> Dict[str, Any]:
     }
 
 
-def load_file_path_patterns(tool_name: str, start_dir: str = None) -> Tuple[List[str], List[str]]:
+def load_file_path_patterns(
+    tool_name: str, start_dir: str = None, context: Optional[EvaluationContext] = None
+) -> Tuple[List[str], List[str]]:
     """
     Load allow/deny patterns for file path tools (Read, Write, Edit).
 
-    Extracts patterns like 'Read(/tmp/**)' from the permissions config.
+    Extracts patterns like 'Read(/tmp/**)' from the permissions config. Each config
+    file is read once and classified for all tools by the unified loader.
 
     Args:
         tool_name: The tool name to load patterns for (Read, Write, or Edit)
         start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context (see discover_config_files())
 
     Returns:
         Tuple of (allow_patterns, deny_patterns) - path patterns without tool prefix
     """
-    config_files = discover_config_files(start_dir)
+    tool_permissions = load_tool_permissions_from_files(discover_config_files(start_dir, context))
+    return get_tool_patterns(tool_permissions, tool_name)
 
-    allow_patterns = []
-    deny_patterns = []
 
-    prefix = f'{tool_name}('
-    suffix = ')'
+def load_redirect_rules(
+    governed_tools: Iterable[str], start_dir: str = None, context: Optional[EvaluationContext] = None
+) -> Dict[str, Tuple[List[str], List[str]]]:
+    """
+    Load the file path rules that govern the redirection targets of commands.
 
-    for file_path, source_type, file_format in config_files:
-        try:
-            if file_format == 'toml':
-                config = load_toml_config(file_path)
-            else:
-                with open(file_path, 'r') as f:
-                    config = json.load(f)
-        except (json.JSONDecodeError, IOError, Exception):
-            continue
+    The file a command writes with `>` is checked against the Write() rules,
+    and the file it reads with `<` against the Read() rules (see
+    check_compound_permission()), when the tool is governed and has patterns.
 
-        permissions = config.get('permissions', {})
+    Args:
+        governed_tools: Tools the hook governs
+        start_dir: Directory to start searching for project root from. Defaults to cwd.
+        context: Evaluation context (see discover_config_files())
 
-        # Extract patterns for this tool from allow list
-        for perm in permissions.get('allow', []):
-            if isinstance(perm, str) and perm.startswith(prefix) and perm.endswith(suffix):
-                # Extract the path pattern between "ToolName(" and ")"
-                pattern = perm[len(prefix) : -1]
-                if pattern not in allow_patterns:
-                    allow_patterns.append(pattern)
+    Returns:
+        Dict mapping 'Write'/'Read' to (allow_patterns, deny_patterns)
+    """
+    tool_names = [tool_name for tool_name in REDIRECT_TOOLS.values() if tool_name in governed_tools]
+    if not tool_names:
+        return {}
+    tool_permissions = load_tool_permissions_from_files(discover_config_files(start_dir, context))
+    rules = {}
+    for tool_name in tool_names:
+        allow_patterns, deny_patterns = get_tool_patterns(tool_permissions, tool_name)
+        if allow_patterns or deny_patterns:
+            rules[tool_name] = (allow_patterns, deny_patterns)
+    return rules
+
+
+class EvaluationSettings:
+    """Command parsing and policy compilation settings built from an environment configuration."""
+
+    __slots__ = ('cache_dir', 'cache_key', 'parser_backend', 'compiler')
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path],
+        cache_key: Optional[bytes],
+        parser_backend: str,
+        compiler: CompilerSettings,
+    ):
+        self.cache_dir = cache_dir
+        self.cache_key = cache_key
+        self.parser_backend = parser_backend
+        self.compiler = compiler
+
+
+def load_evaluation_settings(
+    env_config: Mapping[str, Any], long_running: bool = False, home: Optional[Path] = None
+) -> EvaluationSettings:
+    """
+    Build the command parsing and policy compilation settings of an environment configuration.
 
-        # Extract patterns for this tool from deny list
-        for perm in permissions.get('deny', []):
-            if isinstance(perm, str) and perm.startswith(prefix) and perm.endswith(suffix):
-                pattern = perm[len(prefix) : -1]
-                if pattern not in deny_patterns:
-                    deny_patterns.append(pattern)
+    The cache directory is only used if it may be trusted (see cache_trust.py);
+    otherwise the problem is logged and the settings go without it. Nothing
+    is configured: the hook applies the settings to its process (see
+    configure_evaluation()), and a PolicyEngine keeps its own.
 
-    return allow_patterns, deny_patterns
+    Args:
+        env_config: Environment configuration dict (see get_env_config())
+        long_running: True if the process checks many commands with each policy (see PolicyEngine),
+            so that generating policy code pays off
+        home: Home directory of the user, where the cache key is kept (None: that of the process)
 
+    Returns:
+        The settings; cache_dir and cache_key (the key signing its entries) are None without a
+        trusted cache directory
 
-def check_file_path_permission(file_path: str, allow_patterns: List[str], deny_patterns: List[str]) -> Tuple[str, str]:
+    Raises:
+        ValueError: If the parser backend is unknown
     """
-    Check if a file path is permitted based on allow and deny patterns.
+    parser_backend = env_config.get('parser_backend', CANOPY)
+    if parser_backend not in PARSER_BACKENDS:
+        expected = ', '.join(PARSER_BACKENDS)
+        raise ValueError(f'Unknown parser backend: {parser_backend!r} (expected one of {expected})')
+
+    cache_dir, key, problem = trusted_cache(
+        env_config.get('cache_dir'), home if home is not None else Path.home(), env_config.get('project_root')
+    )
+    if problem and env_config.get('log_dir'):
+        log_warning(
+            f'Not using the cache directory: {problem}',
+            'Set TOOLGUARD_CACHE_DIR to a directory outside the project that only you can write.',
+            env_config['log_dir'],
+        )
+
+    # Policy code is compiled in process and never cached on disk, so a one-shot hook interprets the policy
+    # Usage ordering reads the hit counts saved by `python -m toolguard.usage_stats`
+    hit_counts = None
+    if env_config.get('usage_ordering', False) and cache_dir:
+        hit_counts = load_hit_counts(cache_dir)
+    compiler = CompilerSettings(
+        codegen=bool(long_running and env_config.get('policy_codegen', True)),
+        hit_counts=hit_counts,
+        linear_regex=env_config.get('linear_regex', False),
+        regex_budget_ms=env_config.get('regex_budget_ms', DEFAULT_REGEX_BUDGET_MS),
+    )
+    return EvaluationSettings(cache_dir, key, parser_backend, compiler)
+
+
+def configure_evaluation(
+    env_config: Mapping[str, Any], home: Optional[Path] = None
+) -> Tuple[Optional[Path], Optional[bytes]]:
+    """
+    Configure command parsing and policy compilation of this process from the environment configuration.
 
-    Uses GLOB pattern matching with proper globstar (**) support via PurePath.full_match().
+    For the one-shot hook process: the settings (see load_evaluation_settings())
+    become those of every parse and compile_policy() call of the process.
 
     Args:
-        file_path: The file path to check
-        allow_patterns: List of glob patterns that allow access
-        deny_patterns: List of glob patterns that deny access
+        env_config: Environment configuration dict (see get_env_config())
+        home: Home directory of the user, where the cache key is kept (None: that of the process)
 
     Returns:
-        Tuple of (decision, reason) where decision is 'allow' or 'deny'
+        Tuple of (cache_dir, key): the trusted cache directory and the key signing its entries,
+        or (None, None)
     """
-    # Expand tilde in file path for matching
-    expanded_path = expand_tilde(file_path)
+    settings = load_evaluation_settings(env_config, home=home)
 
-    # Check deny list first
-    for pattern in deny_patterns:
-        expanded_pattern = expand_tilde(pattern)
-        try:
-            if PurePath(expanded_path).full_match(expanded_pattern):
-                return 'deny', f'Path matches deny pattern: {pattern}'
-        except (ValueError, TypeError):
-            continue
+    # Persist parse results across hook invocations when a cache directory is configured
+    if settings.cache_dir:
+        configure_parse_cache(cache_dir=settings.cache_dir, key=settings.cache_key)
+    configure_parser_backend(settings.parser_backend)
+
+    compiler = settings.compiler
+    configure_policy_compiler(
+        codegen=compiler.codegen,
+        hit_counts=compiler.hit_counts,
+        linear_regex=compiler.linear_regex,
+        regex_budget_ms=compiler.regex_budget_ms,
+    )
+    return settings.cache_dir, settings.cache_key
 
-    # Check allow list
-    for pattern in allow_patterns:
-        expanded_pattern = expand_tilde(pattern)
-        try:
-            if PurePath(expanded_path).full_match(expanded_pattern):
-                return 'allow', f'Path matches allow pattern: {pattern}'
-        except (ValueError, TypeError):
-            continue
 
-    # Default: deny (not explicitly allowed)
-    return 'deny', 'Path does not match any allow patterns'
+def _agent_info(agent_future: 'Future[Dict[str, Any]]', budget: DecisionBudget) -> str:
+    """
+    Get the agent label for log entries from the background transcript scan.
+
+    Args:
+        agent_future: Future of identify_current_agent()
+        budget: Budget of the decision, bounding the wait for the scan
+
+    Returns:
+        Subagent name, or 'main'
+    """
+    agent_context = budget.wait(agent_future, 'transcript scan')
+    return agent_context['subagent_name'] if agent_context['agent_type'] == 'subagent' else 'main'
+
+
+def _log_budget_overrun(error: DecisionBudgetExceeded, hook_data: Dict[str, Any], env_config: Dict[str, Any]) -> None:
+    """
+    Record a decision that ran over its budget, with the slow input, in the decision and error logs.
+
+    Args:
+        error: The budget overrun, naming the stage that was running
+        hook_data: Parsed hook input
+        env_config: Environment configuration dict
+    """
+    tool_name = hook_data.get('tool_name', '')
+    tool_input = hook_data.get('tool_input') or {}
+    if tool_name in FILE_PATH_TOOLS:
+        target = f'{tool_name}({tool_input.get("file_path", "")})'
+    else:
+        target = str(tool_input.get('command', ''))
+    log_command(target, 'refused', [f'decision time budget exceeded during {error.stage}'], config=env_config)
+
+    log_dir = env_config.get('log_dir')
+    if log_dir:
+        excerpt = target[:SLOW_INPUT_EXCERPT] + ('...' if len(target) > SLOW_INPUT_EXCERPT else '')
+        log_error(
+            f'{error} ({tool_name} input of {len(target)} characters): {excerpt}',
+            f'Check why the {error.stage} stage is slow for this input, or raise TOOLGUARD_DECISION_BUDGET_MS.',
+            log_dir,
+        )
 
 
 def main() -> None:
@@ -305,12 +429,23 @@ def main() -> None:
     8. Log decision
     9. Output decision as JSON to stdout
 
+    The independent I/O stages overlap on a small thread pool: the .env file
+    is read while stdin is parsed, and the transcript scan (only needed for
+    logging) and permission loading run while the command is parsed. No
+    decision depends on the overlap; every result is awaited before use.
+
+    With TOOLGUARD_DECISION_BUDGET_MS set, the decision (counted from the
+    start of the hook) is bounded: when the budget runs out in any stage, the
+    command is denied and the stage and input are recorded in the error log.
+
     Exit codes:
     - Always exits with 0 (errors communicated via JSON)
     """
+    budget = DecisionBudget()
+    pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='toolguard-io')
     try:
-        # Load environment configuration
-        env_config = get_env_config()
+        # Load environment configuration (in the background while stdin is parsed)
+        env_future = pool.submit(get_env_config)
 
         # Parse hook input first to get cwd
         hook_data = parse_hook_input()
@@ -319,40 +454,57 @@ def main() -> None:
         tool_input = hook_data['tool_input']
         cwd = hook_data.get('cwd', None)
 
-        # Run startup validation (once per session) using cwd from hook input
-        _run_startup_validation(env_config, cwd)
+        # Read the process state once: the stages below get home, cwd and environment from the context
+        env_config = env_future.result()
+        context = EvaluationContext.capture(cwd, config=env_config)
 
         # Load list of governed tools (using cwd from hook input for project discovery)
-        governed_tools = load_governed_tools(cwd)
+        governed_future = pool.submit(load_governed_tools, cwd, context)
+
+        # The budget counts from the start of the hook, so reading the input counts too
+        budget.arm(env_config.get('decision_budget_ms'))
+        budget.enter('config loading')
+        # Run startup validation using cwd from hook input
+        _run_startup_validation(context)
+
+        governed_tools = budget.wait(governed_future, 'config loading')
 
         # Only handle tools in the governed list
         if tool_name not in governed_tools:
             # Not a governed tool - allow (other hooks handle other tools)
+            budget.disarm()
             output = create_hook_output('allow', f'Not a governed tool (governed: {", ".join(governed_tools)})')
             print(json.dumps(output))
             sys.exit(0)
 
-        # Identify current agent context (used for logging)
+        # Identify current agent context (used for logging, scanned in the background)
         transcript_path = hook_data.get('transcript_path', '')
-        agent_context = identify_current_agent(transcript_path)
-        agent_info = agent_context['subagent_name'] if agent_context['agent_type'] == 'subagent' else 'main'
+        agent_future = pool.submit(identify_current_agent, transcript_path)
 
         # Handle file path tools (Read, Write, Edit)
         if tool_name in FILE_PATH_TOOLS:
             file_path = tool_input.get('file_path', '')
             if not file_path:
+                agent_info = _agent_info(agent_future, budget)
+                budget.disarm()
                 output = create_hook_output('deny', 'No file_path provided in tool input')
                 log_command(
-                    f'{tool_name}()', 'refused', ['no file_path provided'], extra_info=agent_info, config=env_config
+                    f'{tool_name}()',
+                    'refused',
+                    ['no file_path provided'],
+                    extra_info=agent_info,
+                    context=context,
                 )
                 print(json.dumps(output))
                 sys.exit(0)
 
             # Load patterns for this specific tool
-            allow_patterns, deny_patterns = load_file_path_patterns(tool_name, cwd)
+            allow_patterns, deny_patterns = load_file_path_patterns(tool_name, cwd, context)
+            agent_info = _agent_info(agent_future, budget)
 
             if not allow_patterns:
                 # No allow patterns - deny (fail closed)
+                budget.disarm()
                 reason = f'No {tool_name} permissions found in settings - all operations blocked'
                 output = create_hook_output('deny', reason)
                 log_command(
@@ -360,21 +512,23 @@ def main() -> None:
                     'refused',
                     ['no allow patterns configured'],
                     extra_info=agent_info,
-                    config=env_config,
+                    context=context,
                 )
                 print(json.dumps(output))
                 sys.exit(0)
 
             # Check file path permission using GLOB matching
-            decision, reason = check_file_path_permission(file_path, allow_patterns, deny_patterns)
+            budget.enter('matching')
+            decision, reason = check_file_path_permission(file_path, allow_patterns, deny_patterns, context.home)
+            budget.disarm()
 
             # Log the decision
             log_target = f'{tool_name}({file_path})'
             if decision == 'allow':
-                log_command(log_target, 'executed', extra_info=agent_info, config=env_config)
+                log_command(log_target, 'executed', extra_info=agent_info, context=context)
             else:
                 violated_rules = [reason.split(': ', 1)[1] if ': ' in reason else reason]
-                log_command(log_target, 'refused', violated_rules, extra_info=agent_info, config=env_config)
+                log_command(log_target, 'refused', violated_rules, extra_info=agent_info, context=context)
 
             output = create_hook_output(decision, reason)
             print(json.dumps(output))
@@ -383,39 +537,79 @@ def main() -> None:
         # Handle command tools (Bash, MCP terminals)
         command = tool_input.get('command', '')
         if not command:
+            agent_info = _agent_info(agent_future, budget)
+            budget.disarm()
             output = create_hook_output('deny', 'No command provided in tool input')
-            log_command(command, 'refused', ['no command provided'], extra_info=agent_info, config=env_config)
+            log_command(command, 'refused', ['no command provided'], extra_info=agent_info, context=context)
             print(json.dumps(output))
             sys.exit(0)
 
         # Load permissions from settings (using cwd from hook input for project discovery)
-        allow_patterns, deny_patterns = load_permissions(cwd)
+        permissions_future = pool.submit(load_permissions, cwd, context)
+        redirect_rules_future = pool.submit(load_redirect_rules, governed_tools, cwd, context)
+
+        cache_dir, cache_key = configure_evaluation(env_config, home=context.home)
+
+        # Parse the command while permissions load; the check below reads the parse cache
+        # (or the kept structure, when redirection targets are checked)
+        budget.enter('parsing')
+        extract_structured_commands(command)
+
+        allow_patterns, deny_patterns = budget.wait(permissions_future, 'config loading')
+        redirect_rules = budget.wait(redirect_rules_future, 'config loading')
+        agent_info = _agent_info(agent_future, budget)
 
         if not allow_patterns:
             # No allow patterns - deny everything (fail closed)
+            budget.disarm()
             reason = 'No Bash permissions found in settings - all commands blocked'
             output = create_hook_output('deny', reason)
-            log_command(command, 'refused', ['no allow patterns configured'], extra_info=agent_info, config=env_config)
+            log_command(command, 'refused', ['no allow patterns configured'], extra_info=agent_info, context=context)
             print(json.dumps(output))
             sys.exit(0)
 
+        budget.enter('policy review')
+        allow_patterns, deny_patterns = apply_policy_review(
+            allow_patterns, deny_patterns, env_config, cache_dir, cache_key
+        )
+
         # Check permission (handles both simple and compound commands)
+        budget.enter('matching')
         extended_syntax = env_config.get('extended_syntax', True)
-        decision, reason = check_compound_permission(command, allow_patterns, deny_patterns, [], extended_syntax)
+        decision, reason = check_compound_permission(
+            command,
+            allow_patterns,
+            deny_patterns,
+            [],
+            extended_syntax,
+            leaf_only_allow=env_config.get('leaf_only_allow', False),
+            path_rules=redirect_rules,
+            cwd=cwd,
+            home=str(context.home),
+        )
+        budget.disarm()
 
         # Log the decision with agent identification
         if decision == 'allow':
-            log_command(command, 'executed', extra_info=agent_info, config=env_config)
+            log_command(command, 'executed', extra_info=agent_info, context=context)
         else:
             # Extract violated rule from reason for logging
             violated_rules = [reason.split(': ', 1)[1] if ': ' in reason else reason]
-            log_command(command, 'refused', violated_rules, extra_info=agent_info, config=env_config)
+            log_command(command, 'refused', violated_rules, extra_info=agent_info, context=context)
 
         # Create and output decision
         output = create_hook_output(decision, reason)
         print(json.dumps(output))
         sys.exit(0)
 
+    except DecisionBudgetExceeded as e:
+        # Out of time - deny (fail closed) and record what was slow
+        budget.disarm()
+        output = create_hook_output('deny', str(e))
+        print(json.dumps(output))
+        _log_budget_overrun(e, hook_data, env_config)
+        sys.exit(0)
+
     except json.JSONDecodeError as e:
         # JSON parsing error - deny with error message
         error_reason = f'Failed to parse hook input: {str(e)}'
@@ -438,6 +632,17 @@ def main() -> None:
         print(f'Error: {error_reason}', file=sys.stderr)
         sys.exit(0)
 
+    finally:
+        # Nothing pending is needed once a decision is out
+        budget.disarm()
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        # Background stages abandoned by a budget overrun must not hold up the exit
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
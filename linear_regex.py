@@ -0,0 +1,483 @@
+"""
+Bounded-time regex matching for toolguard [regex] rules.
+
+Python's re module backtracks, so a rule with nested or overlapping
+quantifiers (`(\\w+\\s?)+$`, `(a|aa)*c`) can take exponential time on an
+adversarial command, and the hook blocks the agent while it runs. This module
+provides:
+
+- redos_risks(): a static check for the regex shapes that backtrack
+  catastrophically, used by policy_analysis.py to warn at policy load
+- LinearRegex: a Thompson NFA simulation (Pike VM without captures) for the
+  regex subset that does not need backtracking. It only answers whether the
+  regex matches somewhere in the text, like `re.search(...) is not None`,
+  in O(len(text) * len(program)) time, and raises RegexBudgetExceeded when
+  a search runs longer than its time budget
+
+Supported: literals, `.`, character classes (with `\\d`, `\\s`, `\\w`),
+groups, alternation, greedy and lazy repeats, and the anchors `^`, `$`, `\\A`,
+`\\Z` and `\\b`, under the MULTILINE, DOTALL and VERBOSE flags. Backreferences,
+lookarounds, atomic groups, possessive repeats, `\\B`, case-insensitive and
+ASCII matching and scoped flags are not; compile_linear() returns None for
+them and callers keep re.
+"""
+
+import re
+import time
+from typing import Callable, FrozenSet, List, Optional, Tuple
+
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parser
+except ImportError:  # pragma: no cover - the linear engine and analysis are optional
+    _sre_constants = _sre_parser = None
+
+# Default time budget of one regex search, in milliseconds
+DEFAULT_REGEX_BUDGET_MS = 50.0
+
+# Largest NFA program compiled; bounded repeats are expanded, so `a{1,5000}` is left to re
+MAX_PROGRAM_SIZE = 5000
+
+# Characters between two checks of the deadline
+_DEADLINE_INTERVAL = 128
+
+# Global flags the NFA implements (UNICODE is implied for str patterns)
+_SUPPORTED_FLAGS = re.UNICODE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+# Characters sampled to decide whether two non-literal classes overlap
+_SAMPLE_CHARS = [chr(code) for code in range(0x250)] + ['\u2003', '\u3000', '\u0660', '\u4e00']
+
+# NFA instructions
+_CHAR, _SPLIT, _JMP, _ASSERT, _MATCH = range(5)
+
+
+class RegexBudgetExceeded(Exception):
+    """A regex search ran longer than its time budget."""
+
+    def __init__(self, pattern: str, budget_ms: float):
+        super().__init__(f'Regex search exceeded {budget_ms:g} ms: {pattern}')
+        self.pattern = pattern
+        self.budget_ms = budget_ms
+
+
+class _Unsupported(Exception):
+    """The regex uses a feature outside the linear-time subset."""
+
+
+def _is_word(ch: str) -> bool:
+    """Unicode word character, as matched by \\w."""
+    return ch.isalnum() or ch == '_'
+
+
+_CATEGORIES = {
+    'CATEGORY_DIGIT': str.isdecimal,
+    'CATEGORY_NOT_DIGIT': lambda ch: not ch.isdecimal(),
+    'CATEGORY_SPACE': str.isspace,
+    'CATEGORY_NOT_SPACE': lambda ch: not ch.isspace(),
+    'CATEGORY_WORD': _is_word,
+    'CATEGORY_NOT_WORD': lambda ch: not _is_word(ch),
+}
+
+
+class _CharSet:
+    """A character predicate, with its characters when there are finitely many."""
+
+    __slots__ = ('test', 'chars')
+
+    def __init__(self, test: Callable[[str], bool], chars: Optional[FrozenSet[str]] = None):
+        self.test = test
+        self.chars = chars
+
+    def overlaps(self, other: '_CharSet') -> bool:
+        """Check whether some character is in both sets (sampled for non-literal classes)."""
+        if self.chars is not None and other.chars is not None:
+            return not self.chars.isdisjoint(other.chars)
+        if self.chars is not None:
+            return any(other.test(ch) for ch in self.chars)
+        if other.chars is not None:
+            return any(self.test(ch) for ch in other.chars)
+        return any(self.test(ch) and other.test(ch) for ch in _SAMPLE_CHARS)
+
+
+def _literal_set(chars: FrozenSet[str]) -> _CharSet:
+    return _CharSet(chars.__contains__, chars)
+
+
+def _class_set(items: list) -> _CharSet:
+    """Build the set of an IN class item list."""
+    negate = False
+    chars = set()
+    tests = []
+    for op, av in items:
+        name = str(op)
+        if name == 'NEGATE':
+            negate = True
+        elif name == 'LITERAL':
+            chars.add(chr(av))
+        elif name == 'RANGE':
+            low, high = av
+            if high - low < 256:
+                chars.update(chr(code) for code in range(low, high + 1))
+            else:
+                tests.append(lambda ch, low=low, high=high: low <= ord(ch) <= high)
+        elif name == 'CATEGORY' and str(av) in _CATEGORIES:
+            tests.append(_CATEGORIES[str(av)])
+        else:
+            raise _Unsupported(name)
+
+    frozen = frozenset(chars)
+    if not tests and not negate:
+        return _literal_set(frozen)
+    if not tests:
+        return _CharSet(lambda ch: ch not in frozen)
+
+    def test(ch: str) -> bool:
+        return (ch in frozen or any(t(ch) for t in tests)) != negate
+
+    return _CharSet(test)
+
+
+def _char_set(op, av, flags: int) -> Optional[_CharSet]:
+    """Get the set of a single-character item, or None if the item is not one."""
+    name = str(op)
+    if name == 'LITERAL':
+        return _literal_set(frozenset(chr(av)))
+    if name == 'NOT_LITERAL':
+        excluded = chr(av)
+        return _CharSet(lambda ch: ch != excluded)
+    if name == 'ANY':
+        if flags & re.DOTALL:
+            return _CharSet(lambda ch: True)
+        return _CharSet(lambda ch: ch != '\n')
+    if name == 'IN':
+        return _class_set(av)
+    return None
+
+
+def _parse(pattern: str):
+    """Parse a regex, rejecting global flags the NFA does not implement."""
+    if _sre_parser is None:
+        raise _Unsupported('no regex parser')
+    parsed = _sre_parser.parse(pattern)
+    if parsed.state.flags & ~_SUPPORTED_FLAGS:
+        raise _Unsupported('flags')
+    return parsed
+
+
+class _Compiler:
+    """Compile a parsed regex to NFA instructions."""
+
+    def __init__(self, flags: int):
+        self.flags = flags
+        self.program: List[list] = []
+
+    def emit(self, *instruction) -> int:
+        if len(self.program) >= MAX_PROGRAM_SIZE:
+            raise _Unsupported('program size')
+        self.program.append(list(instruction))
+        return len(self.program) - 1
+
+    def sequence(self, items) -> None:
+        for op, av in items:
+            self.item(op, av)
+
+    def item(self, op, av) -> None:
+        name = str(op)
+        char_set = _char_set(op, av, self.flags)
+        if char_set is not None:
+            self.emit(_CHAR, char_set.test)
+        elif name == 'SUBPATTERN':
+            _group, add_flags, del_flags, items = av
+            if (add_flags | del_flags) & ~re.VERBOSE:
+                raise _Unsupported('scoped flags')
+            self.sequence(items)
+        elif name == 'BRANCH':
+            self.branch(av[1])
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT'):
+            # Laziness only changes which match is found, not whether one is
+            self.repeat(*av)
+        elif name == 'AT':
+            at = str(av)
+            if at not in ('AT_BEGINNING', 'AT_BEGINNING_STRING', 'AT_END', 'AT_END_STRING', 'AT_BOUNDARY'):
+                raise _Unsupported(at)
+            self.emit(_ASSERT, at)
+        else:
+            raise _Unsupported(name)
+
+    def branch(self, alternatives) -> None:
+        jumps = []
+        for alternative in alternatives[:-1]:
+            split = self.emit(_SPLIT, None, None)
+            self.program[split][1] = len(self.program)
+            self.sequence(alternative)
+            jumps.append(self.emit(_JMP, None))
+            self.program[split][2] = len(self.program)
+        self.sequence(alternatives[-1])
+        for jump in jumps:
+            self.program[jump][1] = len(self.program)
+
+    def repeat(self, low: int, high: int, items) -> None:
+        for _ in range(low):
+            self.sequence(items)
+        if high == _sre_constants.MAXREPEAT:
+            loop = self.emit(_SPLIT, None, None)
+            self.program[loop][1] = len(self.program)
+            self.sequence(items)
+            self.emit(_JMP, loop)
+            self.program[loop][2] = len(self.program)
+            return
+        splits = []
+        for _ in range(high - low):
+            splits.append(self.emit(_SPLIT, None, None))
+            self.program[splits[-1]][1] = len(self.program)
+            self.sequence(items)
+        for split in splits:
+            self.program[split][2] = len(self.program)
+
+
+class LinearRegex:
+    """A regex searched by NFA simulation, in time linear in the text length."""
+
+    def __init__(self, pattern: str, budget_ms: Optional[float] = DEFAULT_REGEX_BUDGET_MS):
+        """
+        Compile a regex to an NFA program.
+
+        Args:
+            pattern: Regex source, in re syntax
+            budget_ms: Time budget of one search in milliseconds (None for no budget)
+
+        Raises:
+            re.error: If the regex is invalid
+            ValueError: If the regex is outside the supported subset
+        """
+        try:
+            parsed = _parse(pattern)
+            compiler = _Compiler(parsed.state.flags)
+            compiler.sequence(parsed)
+            compiler.emit(_MATCH)
+        except _Unsupported as e:
+            raise ValueError(f'Regex is not supported by the linear engine ({e}): {pattern}') from None
+        self.pattern = pattern
+        self.budget_ms = budget_ms
+        self.multiline = bool(parsed.state.flags & re.MULTILINE)
+        self._program = [tuple(instruction) for instruction in compiler.program]
+
+    def _assert(self, at: str, text: str, pos: int) -> bool:
+        """Check a zero-width assertion at a position."""
+        n = len(text)
+        if at == 'AT_BEGINNING_STRING':
+            return pos == 0
+        if at == 'AT_END_STRING':
+            return pos == n
+        if at == 'AT_BEGINNING':
+            return pos == 0 or (self.multiline and text[pos - 1] == '\n')
+        if at == 'AT_END':
+            if self.multiline:
+                return pos == n or text[pos] == '\n'
+            return pos == n or (pos == n - 1 and text[pos] == '\n')
+        # AT_BOUNDARY
+        before = pos > 0 and _is_word(text[pos - 1])
+        after = pos < n and _is_word(text[pos])
+        return before != after
+
+    def _add(self, threads: list, seen: set, pc: int, text: str, pos: int) -> bool:
+        """Add a thread and every thread reachable without consuming input; True on a match."""
+        program = self._program
+        stack = [pc]
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            instruction = program[pc]
+            op = instruction[0]
+            if op == _CHAR:
+                threads.append(instruction[1])
+                threads.append(pc + 1)
+            elif op == _SPLIT:
+                stack.append(instruction[2])
+                stack.append(instruction[1])
+            elif op == _JMP:
+                stack.append(instruction[1])
+            elif op == _ASSERT:
+                if self._assert(instruction[1], text, pos):
+                    stack.append(pc + 1)
+            else:
+                return True
+        return False
+
+    def search(self, text: str) -> Optional[bool]:
+        """
+        Search for a match anywhere in the text.
+
+        Args:
+            text: The text to search
+
+        Returns:
+            True if the regex matches somewhere in the text, else None (like
+            `re.search(pattern, text)` compared to None)
+
+        Raises:
+            RegexBudgetExceeded: If the search runs longer than the time budget
+        """
+        deadline = None if self.budget_ms is None else time.perf_counter() + self.budget_ms / 1000
+        # Flat [test, next_pc, test, next_pc, ...] list of threads waiting for a character
+        threads: list = []
+        seen: set = set()
+        for pos in range(len(text) + 1):
+            # Unanchored search: a new thread starts at every position
+            if self._add(threads, seen, 0, text, pos):
+                return True
+            if pos == len(text):
+                break
+            if deadline is not None and pos % _DEADLINE_INTERVAL == 0 and time.perf_counter() > deadline:
+                raise RegexBudgetExceeded(self.pattern, self.budget_ms)
+            ch = text[pos]
+            next_threads: list = []
+            next_seen: set = set()
+            for i in range(0, len(threads), 2):
+                if threads[i](ch) and self._add(next_threads, next_seen, threads[i + 1], text, pos + 1):
+                    return True
+            threads, seen = next_threads, next_seen
+        return None
+
+
+def compile_linear(pattern: str, budget_ms: Optional[float] = DEFAULT_REGEX_BUDGET_MS) -> Optional[LinearRegex]:
+    """
+    Compile a regex for the linear engine if it is in the supported subset.
+
+    Args:
+        pattern: Regex source, in re syntax
+        budget_ms: Time budget of one search in milliseconds (None for no budget)
+
+    Returns:
+        The compiled LinearRegex, or None if the regex is invalid or unsupported
+    """
+    try:
+        return LinearRegex(pattern, budget_ms)
+    except (ValueError, re.error, RecursionError, OverflowError):
+        return None
+
+
+def _first(items, flags: int) -> Tuple[List[_CharSet], bool]:
+    """Get the sets of characters a sequence can start with, and whether it can match empty."""
+    first: List[_CharSet] = []
+    for op, av in items:
+        item_first, nullable = _item_first(op, av, flags)
+        first.extend(item_first)
+        if not nullable:
+            return first, False
+    return first, True
+
+
+def _item_first(op, av, flags: int) -> Tuple[List[_CharSet], bool]:
+    name = str(op)
+    try:
+        char_set = _char_set(op, av, flags)
+    except _Unsupported:
+        # Case-insensitive ranges and the like: assume any character
+        char_set = _CharSet(lambda ch: True)
+    if char_set is not None:
+        return [char_set], False
+    if name == 'SUBPATTERN':
+        return _first(av[3], flags)
+    if name == 'ATOMIC_GROUP':
+        return _first(av, flags)
+    if name == 'BRANCH':
+        first: List[_CharSet] = []
+        nullable = False
+        for alternative in av[1]:
+            alternative_first, alternative_nullable = _first(alternative, flags)
+            first.extend(alternative_first)
+            nullable = nullable or alternative_nullable
+        return first, nullable
+    if name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+        low, _high, items = av
+        first, nullable = _first(items, flags)
+        return first, nullable or low == 0
+    if name in ('AT', 'ASSERT', 'ASSERT_NOT'):
+        return [], True
+    # Backreferences and conditionals can start with anything
+    return [_CharSet(lambda ch: True)], True
+
+
+def _overlap(sets: List[_CharSet], others: List[_CharSet]) -> bool:
+    return any(a.overlaps(b) for a in sets for b in others)
+
+
+def _scan(items, follow: List[_CharSet], in_loop: bool, flags: int, risks: List[str]) -> None:
+    """
+    Look for ambiguous repeats in a sequence.
+
+    Args:
+        items: Parsed sequence
+        follow: Sets of characters that can follow the sequence within the
+            innermost enclosing repeat (including its next iteration)
+        in_loop: Whether the sequence is inside a repeat that can run more than once
+        flags: Global regex flags
+        risks: Found risks, appended to
+    """
+    items = list(items)
+    for index, (op, av) in enumerate(items):
+        name = str(op)
+        if not in_loop and name not in ('MAX_REPEAT', 'MIN_REPEAT', 'SUBPATTERN', 'BRANCH', 'ATOMIC_GROUP'):
+            continue
+        rest_first, rest_nullable = _first(items[index + 1 :], flags)
+        item_follow = rest_first + follow if rest_nullable else rest_first
+
+        if name == 'SUBPATTERN':
+            _scan(av[3], item_follow, in_loop, flags, risks)
+        elif name == 'BRANCH':
+            alternatives = []
+            for alternative in av[1]:
+                alternative_first, alternative_nullable = _first(alternative, flags)
+                alternatives.append(alternative_first + item_follow if alternative_nullable else alternative_first)
+            if in_loop and any(
+                _overlap(a, b) for i, a in enumerate(alternatives) for b in alternatives[i + 1 :]
+            ):
+                risks.append('alternatives that can start with the same character inside a repeat')
+            for alternative in av[1]:
+                _scan(alternative, item_follow, in_loop, flags, risks)
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT'):
+            low, high, body = av
+            body_first, _ = _first(body, flags)
+            if in_loop and low < high and _overlap(body_first, item_follow):
+                risks.append('a repeat nested in another repeat, where both can match the same characters')
+            if high > 1:
+                # The body can be followed by its own next iteration
+                _scan(body, body_first + item_follow, True, flags, risks)
+            else:
+                _scan(body, item_follow, in_loop, flags, risks)
+
+
+def redos_risks(pattern: str) -> List[str]:
+    """
+    Find regex shapes that can make a backtracking search take exponential time.
+
+    Flags a repeat nested in another repeat when the characters it matches
+    can also continue the enclosing repeat (`(a+)+`, `(\\w+\\s?)*`, `(.*a){20}`),
+    and an alternation inside a repeat whose alternatives can start with the
+    same character (`(a|aa)*`). Non-literal classes are compared on a sample
+    of characters, so the check is a heuristic: it can miss risks in exotic
+    classes and flag safe regexes.
+
+    Args:
+        pattern: Regex source, in re syntax
+
+    Returns:
+        Descriptions of the risks found (empty if none, or if the regex is invalid)
+
+    Examples:
+        >>> redos_risks('(a+)+$')
+        ['a repeat nested in another repeat, where both can match the same characters']
+        >>> redos_risks('^curl .*\\\\| *(ba)?sh')
+        []
+    """
+    if _sre_parser is None:
+        return []
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except (re.error, RecursionError, OverflowError):
+        return []
+    risks: List[str] = []
+    _scan(parsed, [], False, parsed.state.flags, risks)
+    return list(dict.fromkeys(risks))
@@ -0,0 +1,92 @@
+"""
+Multi-literal substring search for toolguard.
+
+An Aho-Corasick automaton finds which of many literal strings occur in a text
+in a single pass over the text, independent of the number of literals. The
+compiled policies (policy.py) use it to select the patterns whose literal
+segments all occur in a command, so that only those run the full match.
+
+Pure Python: transitions are per-state dicts, failure links and outputs are
+flat lists indexed by state.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Automaton over a fixed set of literals.
+
+    Example:
+        >>> automaton = AhoCorasick(['rm', '.env', 'sudo'])
+        >>> sorted(automaton.find_all('cat dir/.env && rm x'))
+        [0, 1]
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        """
+        Build the automaton.
+
+        Args:
+            literals: Non-empty literal strings; ids are their positions in this sequence
+        """
+        self.literals: Tuple[str, ...] = tuple(literals)
+        if any(not literal for literal in self.literals):
+            raise ValueError('Literals must be non-empty')
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        # Trie of all literals
+        for literal_id, literal in enumerate(self.literals):
+            state = 0
+            for ch in literal:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(literal_id)
+
+        # Failure links, breadth first, merging the outputs of each link target
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                fail[next_state] = goto[link].get(ch, 0)
+                outputs[next_state].extend(outputs[fail[next_state]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs: List[Tuple[int, ...]] = [tuple(out) for out in outputs]
+
+    def find_all(self, text: str) -> FrozenSet[int]:
+        """
+        Find which literals occur in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Ids of the literals occurring anywhere in the text
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return frozenset(found)
@@ -8,10 +8,13 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from toolguard.config import find_project_root
 
+if TYPE_CHECKING:
+    from toolguard.context import EvaluationContext
+
 
 def log_command(
     command_str: str,
@@ -20,6 +23,7 @@ def log_command(
     log_dir: Optional[Path] = None,
     extra_info: Optional[str] = None,
     config: Optional[dict] = None,
+    context: Optional['EvaluationContext'] = None,
 ) -> None:
     """
     Log command execution to file if logging is enabled.
@@ -35,19 +39,25 @@ def log_command(
                  directory directly instead of resolving from environment or project root.
         extra_info: Optional additional info to include in the log entry (e.g., agent identification)
         config: Optional environment config dict (from get_env_config())
+        context: Optional evaluation context; gives the config when config is None, and the
+                 environment variables and project root otherwise read from the process
     """
+    if config is None and context is not None and context.config:
+        config = context.config
+    environ = context.env if context is not None else os.environ
+
     # Check if logging is enabled (backward compatibility with CHECKED_BASH_LOGGING_ON)
     if config is not None:
         logging_on = config.get('logging_enabled', True)
     else:
-        logging_on = os.environ.get('CHECKED_BASH_LOGGING_ON', 'true').lower() == 'true'
+        logging_on = environ.get('CHECKED_BASH_LOGGING_ON', 'true').lower() == 'true'
 
     if not logging_on:
         return
 
     try:
         # Get logging configuration
-        logging_format = os.environ.get('CHECKED_BASH_LOGGING_FORMAT', 'markdown').lower()
+        logging_format = environ.get('CHECKED_BASH_LOGGING_FORMAT', 'markdown').lower()
 
         # Resolve log directory path
         if log_dir is not None:
@@ -76,11 +86,14 @@ def log_command(
                     return
         else:
             # Backward compatibility: use environment variables
-            logging_dir = os.environ.get('CHECKED_BASH_LOGGING_DIR', 'logs')
+            logging_dir = environ.get('CHECKED_BASH_LOGGING_DIR', 'logs')
             if Path(logging_dir).is_absolute():
                 log_dir_path = Path(logging_dir)
             else:
-                project_root = find_project_root()
+                if context is not None:
+                    project_root = context.project_root or find_project_root(context.cwd, context.home)
+                else:
+                    project_root = find_project_root()
                 log_dir_path = project_root / logging_dir
 
             # Check directory exists (old behavior - exit on error)
@@ -6,10 +6,12 @@ to a canonical form, enabling consistent matching across different path represen
 
 from pathlib import Path
 import re
-from typing import Optional
+from typing import List, Optional, Sequence
 
+from .parser.command_ast import split_words
 
-def normalize_path(path: str, project_root: Optional[Path] = None) -> str:
+
+def normalize_path(path: str, project_root: Optional[Path] = None, home: Optional[Path] = None) -> str:
     """Normalize a path to canonical form for pattern matching.
 
     Normalization steps:
@@ -21,6 +23,7 @@ def normalize_path(path: str, project_root: Optional[Path] = None) -> str:
     Args:
         path: The path to normalize
         project_root: Optional project root for relative path expansion
+        home: Home directory shortened to ~ (defaults to the user's home)
 
     Returns:
         Normalized path string
@@ -56,7 +59,7 @@ def normalize_path(path: str, project_root: Optional[Path] = None) -> str:
         pass
 
     # Step 3: Convert /Users/<username>/... to ~/...
-    home = Path.home()
+    home = Path(home) if home is not None else Path.home()
     try:
         path_obj = Path(path)
         # Check if path is under home directory
@@ -89,7 +92,7 @@ def normalize_path(path: str, project_root: Optional[Path] = None) -> str:
     return path
 
 
-def expand_tilde(path: str) -> str:
+def expand_tilde(path: str, home: Optional[Path] = None) -> str:
     """Expand ~ to actual home path for GLOB pattern matching.
 
     This is specifically for GLOB patterns where we need to expand ~ to
@@ -97,6 +100,7 @@ def expand_tilde(path: str) -> str:
 
     Args:
         path: Path potentially containing ~ prefix
+        home: Home directory ~ stands for (defaults to the user's home)
 
     Returns:
         Path with ~ expanded to home directory
@@ -108,7 +112,7 @@ def expand_tilde(path: str) -> str:
     if not path or not path.startswith('~'):
         return path
 
-    home = str(Path.home())
+    home = str(home if home is not None else Path.home())
 
     if path == '~':
         return home
@@ -120,7 +124,7 @@ def expand_tilde(path: str) -> str:
     return path
 
 
-def normalize_command(command: str, project_root: Optional[Path] = None) -> str:
+def normalize_command(command: str, project_root: Optional[Path] = None, home: Optional[Path] = None) -> str:
     """Normalize paths within a command string.
 
     This function identifies path-like tokens in a command string and normalizes them.
@@ -136,6 +140,7 @@ def normalize_command(command: str, project_root: Optional[Path] = None) -> str:
     Args:
         command: The command string to normalize
         project_root: Optional project root for relative path expansion
+        home: Home directory shortened to ~ (defaults to the user's home)
 
     Returns:
         Command with normalized paths
@@ -151,11 +156,29 @@ def normalize_command(command: str, project_root: Optional[Path] = None) -> str:
     if not command:
         return command
 
-    # Split command into tokens
-    tokens = command.split()
+    # Split command into words; quoted strings stay whole
+    return ' '.join(normalize_words(split_words(command), project_root, home))
+
+
+def normalize_words(
+    words: Sequence[str], project_root: Optional[Path] = None, home: Optional[Path] = None
+) -> List[str]:
+    """Normalize the path-like words of a command.
+
+    The per-word step of normalize_command(), for callers that already split
+    the command (see split_words() in parser/command_ast.py).
+
+    Args:
+        words: The command's words as written; the first one is the command itself
+        project_root: Optional project root for relative path expansion
+        home: Home directory shortened to ~ (defaults to the user's home)
+
+    Returns:
+        The words with normalized paths
+    """
     normalized_tokens = []
 
-    for i, token in enumerate(tokens):
+    for i, token in enumerate(words):
         # Skip the first token (command itself) and flags
         if i == 0 or token.startswith('-'):
             normalized_tokens.append(token)
@@ -177,10 +200,10 @@ def normalize_command(command: str, project_root: Optional[Path] = None) -> str:
 
         if is_path:
             # Try to normalize it as a path
-            normalized = normalize_path(token, project_root)
+            normalized = normalize_path(token, project_root, home)
             normalized_tokens.append(normalized)
         else:
             # Not a path, keep as-is
             normalized_tokens.append(token)
 
-    return ' '.join(normalized_tokens)
+    return normalized_tokens
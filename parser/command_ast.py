@@ -0,0 +1,317 @@
+"""
+Structured form of the commands extracted from a command line.
+
+Both parser backends parse a simple command into items: words, command
+substitutions and redirections, each a span of the input (simple_command
+in bash_parser.peg). build_command() turns these spans into a Command
+holding what a permission check needs without splitting strings again:
+
+    argv           the words bash passes to the command, quotes removed
+    redirects      the redirections, with targets classified as read or write
+    substitutions  the text of the command substitutions in the command
+    words          argv and redirections in input order, for matching
+
+Adjacent items with no spacing between them form one word (`x=$(ls)` is
+one argument), as in bash. Variables and substitutions are not expanded:
+their text stays in the word. The builder only looks at the items the
+parser accepted, so the operator and target of a redirection are found by
+anchored patterns, never by searching the command text.
+
+Commands that come as text only are split into words by split_words(),
+one compiled pattern that keeps quoted strings and escaped spaces in their
+word, where str.split() would cut them.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# Access of a redirection
+READ = 'read'  # < file
+WRITE = 'write'  # > file, >> file, 2> file
+DUPLICATE = 'duplicate'  # n>&m, n<&m: no file is opened
+HEREDOC = 'heredoc'  # << delimiter: the input follows the command
+
+# Operator of a redirection item; the target follows after optional spacing
+_REDIRECT = re.compile(r'(?P<fd>[0-9]*+)(?P<operator>>>|>&|<&|<<-?|>|<)[ \t]*+')
+
+# Delimiter word of a here-document, followed by the rest of its line
+_HEREDOC_DELIMITER = re.compile(r'\'[^\']*+\'|"(?:\\[\s\S]|[^"\\])*+"|[a-zA-Z_][a-zA-Z0-9_]*+')
+
+# Escapes of $'...' strings with a single-character result
+_ANSI_C_ESCAPES = {
+    'a': '\a',
+    'b': '\b',
+    'e': '\x1b',
+    'E': '\x1b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    'v': '\v',
+    '\\': '\\',
+    "'": "'",
+    '"': '"',
+    '?': '?',
+}
+
+# Characters a backslash escapes inside double quotes
+_DOUBLE_ESCAPES = frozenset('$`"\\\n')
+
+# A shell word as written: quoted strings, escapes, $(...) without nested parentheses, and other
+# non-space characters; a quote or $( that is never closed is an ordinary character
+_WORD = re.compile(
+    r"""(?:[^\s'"\\$]++|'[^']*+'|\$'(?:\\[\s\S]|[^'\\])*+'|"(?:\\[\s\S]|[^"\\])*+"|\\[\s\S]|\$\([^()]*+\)|\S)++"""
+)
+
+
+class Redirect:
+    """One redirection of a simple command."""
+
+    __slots__ = ('fd', 'operator', 'target', 'access')
+
+    def __init__(self, fd: Optional[int], operator: str, target: str, access: str):
+        # Explicit file descriptor number (`2>`), None for the default one
+        self.fd = fd
+        self.operator = operator
+        # File path with quotes removed, fd number of a duplication, or here-document delimiter
+        self.target = target
+        self.access = access
+
+    def __repr__(self) -> str:
+        return f'Redirect({self.fd!r}, {self.operator!r}, {self.target!r}, {self.access!r})'
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Redirect) and self._key() == other._key()
+
+    def _key(self) -> Tuple[Optional[int], str, str, str]:
+        return self.fd, self.operator, self.target, self.access
+
+
+class Command:
+    """
+    One extracted command, as matched against permission patterns.
+
+    Wrappers (subshells, brace groups and their bodies, and the bodies of
+    command substitutions) have no words of their own: their commands are
+    extracted separately, so argv and redirects are empty and words is None.
+    """
+
+    __slots__ = ('text', 'kind', 'argv', 'redirects', 'substitutions', 'words')
+
+    def __init__(
+        self,
+        text: str,
+        kind: str,
+        argv: Tuple[str, ...] = (),
+        redirects: Tuple[Redirect, ...] = (),
+        substitutions: Tuple[str, ...] = (),
+        words: Optional[Tuple[str, ...]] = None,
+    ):
+        self.text = text
+        self.kind = kind
+        self.argv = argv
+        self.redirects = redirects
+        self.substitutions = substitutions
+        self.words = words
+
+    @property
+    def reads(self) -> List[str]:
+        """Paths the command's redirections read."""
+        return [redirect.target for redirect in self.redirects if redirect.access == READ]
+
+    @property
+    def writes(self) -> List[str]:
+        """Paths the command's redirections write."""
+        return [redirect.target for redirect in self.redirects if redirect.access == WRITE]
+
+    def __repr__(self) -> str:
+        return f'Command({self.text!r}, {self.kind!r}, argv={self.argv!r}, redirects={self.redirects!r})'
+
+
+def split_words(command: str) -> List[str]:
+    """
+    Split a command into its words, as written.
+
+    Unlike str.split(), quoted strings ('...', "...", $'...'), escaped
+    characters and simple $(...) substitutions stay in their word with
+    their quotes; unquote() removes them. Unlike shlex.split(), any input
+    splits: an unterminated quote is kept as an ordinary character.
+
+    Args:
+        command: A simple command
+
+    Returns:
+        The words
+
+    Example:
+        >>> split_words('cat "my dir/.env" -n')
+        ['cat', '"my dir/.env"', '-n']
+    """
+    if "'" not in command and '"' not in command and '\\' not in command and '$' not in command:
+        # Nothing to keep together: the words are the whitespace-separated runs
+        return command.split()
+    return _WORD.findall(command)
+
+
+def unquote(word: str) -> str:
+    """
+    Remove the quotes and escapes of a word, as bash does before running a command.
+
+    Single quotes keep their content, $'...' strings decode their escapes,
+    and a backslash keeps the next character (inside double quotes, only
+    before $ ` " \\ and newline). Variables and substitutions are kept as text.
+
+    Args:
+        word: A word of a command line
+
+    Returns:
+        The word without quoting
+    """
+    if "'" not in word and '"' not in word and '\\' not in word:
+        return word
+    pieces = []
+    pos = 0
+    size = len(word)
+    while pos < size:
+        char = word[pos]
+        if char == "'":
+            end = word.find("'", pos + 1)
+            end = size if end < 0 else end
+            pieces.append(word[pos + 1 : end])
+            pos = end + 1
+        elif char == '$' and word.startswith("$'", pos):
+            pos = _ansi_c_string(word, pos + 2, pieces)
+        elif char == '"':
+            pos = _double_quoted(word, pos + 1, pieces)
+        elif char == '\\' and pos + 1 < size:
+            pieces.append(word[pos + 1])
+            pos += 2
+        elif char == '$' and word.startswith('$(', pos):
+            end = _substitution_end(word, pos + 2)
+            pieces.append(word[pos:end])
+            pos = end
+        else:
+            pieces.append(char)
+            pos += 1
+    return ''.join(pieces)
+
+
+def _ansi_c_string(word: str, pos: int, pieces: List[str]) -> int:
+    """Decode a $'...' string from after its opening quote; returns the offset after it."""
+    size = len(word)
+    while pos < size and word[pos] != "'":
+        if word[pos] == '\\' and pos + 1 < size:
+            escaped = word[pos + 1]
+            pieces.append(_ANSI_C_ESCAPES.get(escaped, '\\' + escaped))
+            pos += 2
+        else:
+            pieces.append(word[pos])
+            pos += 1
+    return pos + 1
+
+
+def _double_quoted(word: str, pos: int, pieces: List[str]) -> int:
+    """Copy a double-quoted string from after its opening quote; returns the offset after it."""
+    size = len(word)
+    while pos < size and word[pos] != '"':
+        char = word[pos]
+        if char == '\\' and pos + 1 < size and word[pos + 1] in _DOUBLE_ESCAPES:
+            pieces.append(word[pos + 1])
+            pos += 2
+        elif char == '$' and word.startswith('$(', pos):
+            # A substitution may hold quotes of its own
+            end = _substitution_end(word, pos + 2)
+            pieces.append(word[pos:end])
+            pos = end
+        else:
+            pieces.append(char)
+            pos += 1
+    return pos + 1
+
+
+def _substitution_end(word: str, pos: int) -> int:
+    """Offset after the `)` closing a $( substitution whose body starts at pos."""
+    depth = 1
+    size = len(word)
+    while pos < size:
+        char = word[pos]
+        if char == '\\':
+            pos += 2
+            continue
+        if char == "'" or char == '"':
+            end = word.find(char, pos + 1)
+            pos = size if end < 0 else end + 1
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return size
+
+
+def build_command(
+    text: str, input: str, items: Sequence[Tuple[int, int]], substitutions: Sequence[str], kind: str
+) -> Command:
+    """
+    Build the structured form of a simple command from the spans of its items.
+
+    Args:
+        text: The command's extracted text
+        input: The parsed command line
+        items: (start, end) of each redirection, substitution and word, in order;
+            an end may include the spacing after the item
+        substitutions: Inner text of each command substitution of the command
+        kind: LEAF (see command_extractor.py)
+
+    Returns:
+        The Command
+    """
+    argv: List[str] = []
+    words: List[str] = []
+    redirects: List[Redirect] = []
+    word: Optional[List[str]] = None
+    word_end = -1
+    for start, end in items:
+        item = input[start:end].rstrip(' \t')
+        match = _REDIRECT.match(item)
+        if match is not None:
+            word = None
+            redirect, content = _redirect(item, match)
+            redirects.append(redirect)
+            if redirect.access == DUPLICATE:
+                words.append(item)
+            else:
+                words.extend((item[: match.end('operator')], redirect.target))
+            # The rest of a here-document line holds more words of the command
+            argv.extend(content)
+            words.extend(content)
+            continue
+        if word is not None and start == word_end:
+            # No spacing since the previous word: one word for bash
+            word.append(item)
+            argv[-1] = words[-1] = unquote(''.join(word))
+        else:
+            word = [item]
+            argv.append(unquote(item))
+            words.append(argv[-1])
+        word_end = start + len(item)
+    return Command(text, kind, tuple(argv), tuple(redirects), tuple(substitutions), tuple(words))
+
+
+def _redirect(item: str, match: 're.Match[str]') -> Tuple[Redirect, List[str]]:
+    """Classify the redirection of an item; also returns the words after a here-document delimiter."""
+    fd = int(match.group('fd')) if match.group('fd') else None
+    operator = match.group('operator')
+    rest = item[match.end() :]
+    if operator.startswith('<<'):
+        delimiter = _HEREDOC_DELIMITER.match(rest)
+        delimiter_text = delimiter.group() if delimiter is not None else rest
+        # The grammar reads the rest of the line (heredoc_content) as one item
+        content = [unquote(word) for word in rest[len(delimiter_text) :].split()]
+        return Redirect(fd, operator, unquote(delimiter_text), HEREDOC), content
+    if operator in ('>&', '<&'):
+        return Redirect(fd, operator, rest, DUPLICATE), []
+    return Redirect(fd, operator, unquote(rest), READ if operator == '<' else WRITE), []
@@ -4,19 +4,100 @@ Command extraction module for bash compound commands.
 This module provides functionality to extract individual commands
 from compound bash command lines for security permission checking.
 
-Uses the Canopy-generated PEG parser to walk the AST tree.
-All extraction is done via pure tree walking - NO Python string parsing.
+Uses the Canopy-generated PEG parser to walk the AST tree, or the
+hand-written recursive-descent parser for the same grammar (see
+configure_parser_backend()). All extraction is done via pure tree
+walking - NO Python string parsing.
+The one exception is here-document bodies, which a PEG grammar cannot
+delimit: they are cut from the command line before it is parsed (see
+heredoc.py), so only the command head is parsed and extracted.
+
+The parse cache and backend are shared by the process unless a caller
+passes its own, as a PolicyEngine does for its project.
 """
 
 import logging
-from typing import List, Set
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from toolguard.parser import bash_parser
+from toolguard.parser import bash_parser, bash_parser_fast, recursive_descent
+from toolguard.parser.command_ast import Command, build_command
+from toolguard.parser.heredoc import split_heredocs
+from toolguard.parser.parse_cache import DEFAULT_MAX_ENTRIES, ParseCache
 
 logger = logging.getLogger(__name__)
 
+# Kinds of extracted commands
+LEAF = 'leaf'  # A simple command, as executed
+WRAPPER = 'wrapper'  # Text containing other commands (subshell, brace group or compound body)
 
-def extract_commands(command_line: str) -> List[str]:
+# Parser backends of extract_commands(); both accept the grammar of bash_parser.peg and extract the same commands
+CANOPY = 'canopy'  # The Canopy-generated packrat parser (bash_parser_fast.py)
+DESCENT = 'descent'  # The hand-written lexer and recursive-descent parser (recursive_descent.py)
+PARSER_BACKENDS = (CANOPY, DESCENT)
+
+# Shared parse-result cache used by extract_commands()
+_parse_cache = ParseCache()
+
+# Parser used on cache misses, see configure_parser_backend()
+_parser_backend = CANOPY
+
+# (command line, backend, commands) of the last complete structured extraction, see iter_structured_commands()
+_last_structured: Optional[Tuple[str, str, Tuple[Command, ...]]] = None
+
+
+def configure_parse_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES, cache_dir: Optional[Union[str, Path]] = None, key: Optional[bytes] = None
+) -> ParseCache:
+    """
+    Replace the shared parse-result cache used by extract_commands().
+
+    Args:
+        max_entries: Maximum number of command lines kept in memory (0 disables the memory tier)
+        cache_dir: Optional directory for persistent entries (None keeps the cache in process only)
+        key: Key signing persistent entries (None keeps the cache in process only)
+
+    Returns:
+        The new cache instance
+    """
+    global _parse_cache
+    _parse_cache = ParseCache(max_entries, cache_dir, key)
+    return _parse_cache
+
+
+def configure_parser_backend(backend: str = CANOPY) -> None:
+    """
+    Select the parser used by extract_commands() on parse cache misses.
+
+    Both backends parse the grammar of bash_parser.peg and extract the same
+    commands (grammar_fuzz.py checks this on generated commands), so cached
+    results are shared between them.
+
+    Args:
+        backend: CANOPY or DESCENT
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    global _parser_backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f'Unknown parser backend: {backend!r} (expected one of {", ".join(PARSER_BACKENDS)})')
+    _parser_backend = backend
+
+
+def get_parse_cache_stats() -> Dict[str, Union[int, float]]:
+    """
+    Get hit-rate statistics of the shared parse-result cache.
+
+    Returns:
+        Dict with hits, disk_hits, misses, entries and hit_rate
+    """
+    return _parse_cache.stats()
+
+
+def extract_commands(
+    command_line: str, cache: Optional[ParseCache] = None, backend: Optional[str] = None
+) -> List[str]:
     """
     Extract individual commands from a compound bash command line.
 
@@ -31,12 +112,17 @@ def extract_commands(command_line: str) -> List[str]:
     - Subshells: (...)
     - Brace groups: { ...; }
 
+    Here-document bodies are not commands and are left out (see heredoc.py).
+
     The function uses the Canopy PEG parser to parse the command line
     and walks the AST tree to extract all commands. All parsing is done
-    by the PEG parser - this function only walks the tree.
+    by the PEG parser - this function only walks the tree. Results are
+    cached by exact command text (see configure_parse_cache()).
 
     Args:
         command_line: The bash command line to parse
+        cache: Parse-result cache to use (None: the shared cache, see configure_parse_cache())
+        backend: CANOPY or DESCENT (None: the configured backend)
 
     Returns:
         List of individual command strings
@@ -60,26 +146,277 @@ def extract_commands(command_line: str) -> List[str]:
         extract_commands('(cd /tmp && rm file)')
         ['(cd /tmp && rm file)', 'cd /tmp && rm file', 'cd /tmp', 'rm file']
     """
+    return list(_unique_texts(extract_tagged_commands(command_line, cache, backend)))
+
+
+def extract_tagged_commands(
+    command_line: str, cache: Optional[ParseCache] = None, backend: Optional[str] = None
+) -> List[Tuple[str, str]]:
+    """
+    Extract commands from a compound bash command line, tagged by kind.
+
+    Each command is paired with LEAF (a simple command) or WRAPPER (a
+    subshell, brace group or compound body that contains other commands).
+    A text is only repeated when it first appears as a wrapper and later as
+    a leaf, e.g. the body of `$(git status)`, so that every leaf is present.
+
+    Args:
+        command_line: The bash command line to parse
+        cache: Parse-result cache to use (None: the shared cache, see configure_parse_cache())
+        backend: CANOPY or DESCENT (None: the configured backend)
+
+    Returns:
+        List of (command, kind) tuples
+
+    Example:
+        extract_tagged_commands('(cd /tmp && rm file)')
+        [('(cd /tmp && rm file)', 'wrapper'), ('cd /tmp && rm file', 'wrapper'),
+         ('cd /tmp', 'leaf'), ('rm file', 'leaf')]
+    """
     if not command_line or not command_line.strip():
         return []
 
+    # Repeat command lines skip the PEG parse entirely
+    cache = cache or _parse_cache
+    cached = cache.get(command_line)
+    if cached is not None:
+        return cached
+
+    # Only the head is parsed; here-document bodies are payload, not commands
+    head = split_heredocs(command_line)[0]
     try:
-        tree = bash_parser.parse(command_line)
-        return _extract_from_tree(tree)
+        commands = list(_parse_tagged(head, backend))
     except bash_parser.ParseError as e:
         # Parser failed - log and return original command as safety net
-        logger.warning(f'Parse failed for command: {command_line[:100]} - {e}')
-        return [command_line.strip()] if command_line.strip() else []
+        logger.warning(f'Parse failed for command: {head[:100]} - {e}')
+        commands = [(head.strip(), LEAF)]
+    except Exception as e:
+        # Unexpected error - log and return original (not cached, may be transient)
+        logger.error(f'Unexpected error parsing command: {e}')
+        return [(head.strip(), LEAF)] if head.strip() else []
+
+    cache.put(command_line, commands)
+    return commands
+
+
+def iter_commands(
+    command_line: str, cache: Optional[ParseCache] = None, backend: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Lazily extract individual commands from a compound bash command line.
+
+    Yields the same commands, in the same order, as extract_commands(), but
+    walks the parse tree only as far as the consumer iterates. Permission
+    checks use this to stop at the first denied sub-command without visiting
+    the rest of the tree. The result is added to the parse cache only when
+    the iteration runs to completion.
+
+    Args:
+        command_line: The bash command line to parse
+        cache: Parse-result cache to use (None: the shared cache, see configure_parse_cache())
+        backend: CANOPY or DESCENT (None: the configured backend)
+
+    Yields:
+        Individual command strings
+
+    Example:
+        next(iter_commands('rm -rf / && git status'))
+        'rm -rf /'
+    """
+    yield from _unique_texts(iter_tagged_commands(command_line, cache, backend))
+
+
+def iter_tagged_commands(
+    command_line: str, cache: Optional[ParseCache] = None, backend: Optional[str] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily extract commands tagged by kind (see extract_tagged_commands()).
+
+    Args:
+        command_line: The bash command line to parse
+        cache: Parse-result cache to use (None: the shared cache, see configure_parse_cache())
+        backend: CANOPY or DESCENT (None: the configured backend)
+
+    Yields:
+        (command, kind) tuples
+    """
+    if not command_line or not command_line.strip():
+        return
+
+    cache = cache or _parse_cache
+    cached = cache.get(command_line)
+    if cached is not None:
+        yield from cached
+        return
+
+    head = split_heredocs(command_line)[0]
+    try:
+        tagged_commands = _parse_tagged(head, backend)
+    except bash_parser.ParseError as e:
+        # Parser failed - log and return original command as safety net
+        logger.warning(f'Parse failed for command: {head[:100]} - {e}')
+        commands = [(head.strip(), LEAF)]
+        cache.put(command_line, commands)
+        yield from commands
+        return
+    except Exception as e:
+        # Unexpected error - log and return original (not cached, may be transient)
+        logger.error(f'Unexpected error parsing command: {e}')
+        yield head.strip(), LEAF
+        return
+
+    commands = []
+    for item in tagged_commands:
+        commands.append(item)
+        yield item
+    cache.put(command_line, commands)
+
+
+def _parse_tagged(head: str, backend: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Parse a command line with a parser backend; the tree is walked as the result is iterated.
+
+    Args:
+        head: Command line without here-document bodies
+        backend: CANOPY or DESCENT (None: the configured backend)
+
+    Returns:
+        Iterator of (command, kind) tuples, as yielded by _iter_tagged_from_tree()
+
+    Raises:
+        bash_parser.ParseError: If the command line does not parse
+    """
+    if (backend or _parser_backend) == DESCENT:
+        walk = _walk_descent(recursive_descent.parse(head), True)
+        return ((text, kind) for text, kind, _node in _drop_repeats(walk))
+    # Diagnostics-free parse; error messages are only built if parsing fails
+    return _iter_tagged_from_tree(bash_parser_fast.parse(head))
+
+
+def extract_structured_commands(
+    command_line: str, cache: Optional[ParseCache] = None, backend: Optional[str] = None
+) -> List[Command]:
+    """
+    Extract commands in structured form: argv, redirections and substitutions.
+
+    Yields the commands of extract_tagged_commands(), in the same order and
+    with the same texts and kinds, each as a Command (see command_ast.py).
+    The structure is built from the parse tree of the configured backend,
+    so the words of a command are never split from its text again. The
+    parse cache only holds texts: the structure of the last command line
+    is kept (while the cache is enabled), so a check that follows an early
+    parse of the same line does not parse it again, and a structured
+    extraction also fills the parse cache.
+
+    A command line that does not parse is returned as one LEAF command with
+    no words (words is None), like the text fallback of extract_commands().
+
+    Args:
+        command_line: The bash command line to parse
+        cache: Parse-result cache to use (None: the shared cache, see configure_parse_cache())
+        backend: CANOPY or DESCENT (None: the configured backend)
+
+    Returns:
+        List of Command objects
+
+    Example:
+        extract_structured_commands('echo hi > ~/notes.txt')[0].writes
+        ['~/notes.txt']
+    """
+    return list(iter_structured_commands(command_line, backend, cache))
+
+
+def iter_structured_commands(
+    command_line: str, backend: Optional[str] = None, cache: Optional[ParseCache] = None
+) -> Iterator[Command]:
+    """
+    Lazily extract commands in structured form (see extract_structured_commands()).
+
+    Args:
+        command_line: The bash command line to parse
+        backend: CANOPY or DESCENT (None: the configured backend)
+        cache: Parse-result cache to use (None: the shared cache, see configure_parse_cache())
+
+    Yields:
+        Command objects
+    """
+    global _last_structured
+    if not command_line or not command_line.strip():
+        return
+
+    backend = backend or _parser_backend
+    last = _last_structured
+    if last is not None and last[0] == command_line and last[1] == backend:
+        yield from last[2]
+        return
+
+    head = split_heredocs(command_line)[0]
+    commands: List[Command] = []
+    try:
+        if backend == DESCENT:
+            tree = recursive_descent.parse(head)
+            walk = _walk_descent(tree, True)
+        else:
+            tree = bash_parser_fast.parse(head)
+            walk = _walk_compound(tree.compound_command, True)
+    except bash_parser.ParseError as e:
+        logger.warning(f'Parse failed for command: {head[:100]} - {e}')
+        commands.append(Command(head.strip(), LEAF))
+        yield commands[0]
     except Exception as e:
-        # Unexpected error - log and return original
+        # Not kept, may be transient
         logger.error(f'Unexpected error parsing command: {e}')
-        return [command_line.strip()] if command_line.strip() else []
+        if head.strip():
+            yield Command(head.strip(), LEAF)
+        return
+    else:
+        for text, kind, node in _drop_repeats(walk):
+            if node is None:
+                command = Command(text, kind)
+            elif isinstance(node, recursive_descent.SimpleCommand):
+                substitutions = tuple(_inner_text(substitution.body) for substitution in node.substitutions)
+                command = build_command(text, head, node.items, substitutions, kind)
+            else:
+                items = [(item.offset, item.end) for item in node.elements]
+                substitutions = tuple(_inner_text(inner) for inner in _substitution_bodies(node))
+                command = build_command(text, head, items, substitutions, kind)
+            commands.append(command)
+            yield command
+
+    # Only a complete extraction is kept
+    cache = cache or _parse_cache
+    if cache.max_entries > 0:
+        _last_structured = command_line, backend, tuple(commands)
+    cache.put(command_line, [(command.text, command.kind) for command in commands])
+
+
+def _unique_texts(tagged_commands) -> Iterator[str]:
+    """Drop the kinds and the repeated texts of a tagged command sequence."""
+    seen_texts: Set[str] = set()
+    for text, _kind in tagged_commands:
+        if text not in seen_texts:
+            seen_texts.add(text)
+            yield text
 
 
 def _extract_from_tree(node, include_wrappers: bool = True) -> List[str]:
     """
     Extract commands from the parse tree by walking it.
 
+    Args:
+        node: The parse tree node to walk
+        include_wrappers: If True, include subshell/brace group wrapper text in results
+
+    Returns:
+        List of command strings extracted from the tree
+    """
+    return list(_unique_texts(_iter_tagged_from_tree(node, include_wrappers)))
+
+
+def _iter_tagged_from_tree(node, include_wrappers: bool = True) -> Iterator[Tuple[str, str]]:
+    """
+    Walk the parse tree lazily, yielding (command, kind) as they are reached.
+
     This function walks the Canopy parse tree and extracts individual
     commands. It handles:
     - Simple commands (single executable)
@@ -88,151 +425,178 @@ def _extract_from_tree(node, include_wrappers: bool = True) -> List[str]:
     - Command substitutions: both wrapper (e.g., "$(cmd)") and inner commands
 
     The tree walking is PURE - it only examines node types and attributes.
-    NO string parsing is performed.
+    NO string parsing is performed. Nodes of the fast parser slice their text
+    from the input when it is read (see derive_parsers.py), so only the texts
+    yielded here are ever copied. Parts of the tree after the point where
+    the consumer stops iterating are never visited.
+
+    The walk keeps its own stack instead of recursing, so nesting depth is
+    bounded by memory rather than the interpreter recursion limit, and every
+    node is visited once.
 
     Args:
         node: The parse tree node to walk
         include_wrappers: If True, include subshell/brace group wrapper text in results
 
-    Returns:
-        List of command strings extracted from the tree
+    Yields:
+        (command, kind) tuples in tree order; a text is repeated only when it
+        was first yielded as a wrapper and is later reached as a leaf
     """
-    commands: List[str] = []
-    # Track seen command texts to avoid duplicates
-    seen_texts: Set[str] = set()
-
-    def add_command(text: str) -> None:
-        """Add a command if not already seen."""
+    # Start extraction from the top-level compound_command
+    if not hasattr(node, 'compound_command') or node.compound_command is None:
+        return
+    for text, kind, _node in _drop_repeats(_walk_compound(node.compound_command, include_wrappers)):
+        yield text, kind
+
+
+def _drop_repeats(tagged_commands: Iterator[Tuple[str, str, object]]) -> Iterator[Tuple[str, str, object]]:
+    """Strip the texts of a tree walk and drop empty and repeated ones."""
+    # Track seen command texts to avoid duplicates. A text seen only as a
+    # wrapper is yielded again as a leaf, so leaf-only checks never miss it.
+    seen_leaves: Set[str] = set()
+    seen_wrappers: Set[str] = set()
+    for text, kind, node in tagged_commands:
         text = text.strip()
-        if text and text not in seen_texts:
-            seen_texts.add(text)
-            commands.append(text)
-
-    def extract_from_compound(compound_node) -> None:
-        """
-        Extract commands from a compound_command node.
-
-        A compound_command contains pipelines connected by control operators.
-        We need to find all pipeline_elements and extract their commands.
-        """
-        if compound_node is None:
-            return
-
-        # Get the first pipeline via .pipeline attribute
-        if hasattr(compound_node, 'pipeline') and compound_node.pipeline is not None:
-            extract_from_pipeline(compound_node.pipeline)
-
-        # Also walk elements to find additional pipelines (after control operators)
-        if hasattr(compound_node, 'elements') and compound_node.elements:
-            for elem in compound_node.elements:
-                # Elements may contain pipelines (after && || ; etc)
-                if hasattr(elem, 'pipeline') and elem.pipeline is not None:
-                    extract_from_pipeline(elem.pipeline)
-                # Recurse into elements that might have nested pipelines
-                if hasattr(elem, 'elements') and elem.elements:
-                    for subelem in elem.elements:
-                        if hasattr(subelem, 'pipeline') and subelem.pipeline is not None:
-                            extract_from_pipeline(subelem.pipeline)
-
-    def extract_from_pipeline(pipeline_node) -> None:
-        """
-        Extract commands from a pipeline node.
-
-        A pipeline contains pipeline_elements connected by pipes.
-        """
-        if pipeline_node is None:
-            return
-
-        # Get the first pipeline_element
-        if hasattr(pipeline_node, 'pipeline_element') and pipeline_node.pipeline_element is not None:
-            extract_from_pipeline_element(pipeline_node.pipeline_element)
-
-        # Walk elements recursively to find additional pipeline_elements (after pipes)
-        def find_pipeline_elements(node) -> None:
-            if node is None:
-                return
-            if hasattr(node, 'pipeline_element') and node.pipeline_element is not None:
-                extract_from_pipeline_element(node.pipeline_element)
-            if hasattr(node, 'elements') and node.elements:
-                for elem in node.elements:
-                    find_pipeline_elements(elem)
-
-        if hasattr(pipeline_node, 'elements') and pipeline_node.elements:
-            for elem in pipeline_node.elements:
-                find_pipeline_elements(elem)
-
-    def extract_from_pipeline_element(pe_node) -> None:
-        """
-        Extract commands from a pipeline_element node.
-
-        A pipeline_element is either:
-        - A simple_command (leaf command)
-        - A subshell: (...) with nested compound_command
-        - A brace_group: { ...; } with nested compound_command
-        """
-        if pe_node is None:
-            return
-
-        # Check if this is a subshell or brace_group (has nested compound_command)
-        if hasattr(pe_node, 'compound_command') and pe_node.compound_command is not None:
-            # This is a subshell or brace_group
-            if include_wrappers:
-                # Add the wrapper text (e.g., "(cmd)" or "{ cmd; }")
-                wrapper_text = pe_node.text.strip() if hasattr(pe_node, 'text') else ''
-                add_command(wrapper_text)
-
-                # Add the inner compound text (e.g., "cmd1 && cmd2")
-                inner = pe_node.compound_command
-                inner_text = inner.text.strip() if hasattr(inner, 'text') else ''
-                # Strip trailing semicolon for brace groups
-                if inner_text.endswith(';'):
-                    inner_text = inner_text[:-1].strip()
-                add_command(inner_text)
-
-            # Recurse into the compound_command to get leaf commands
-            extract_from_compound(pe_node.compound_command)
+        if not text or text in seen_leaves:
+            continue
+        if kind == LEAF:
+            seen_leaves.add(text)
+        elif text in seen_wrappers:
+            continue
         else:
-            # This is a simple_command - extract its text
-            cmd_text = pe_node.text.strip() if hasattr(pe_node, 'text') else ''
-            add_command(cmd_text)
-
-            # Check elements for command substitutions within the simple command
-            if hasattr(pe_node, 'elements') and pe_node.elements:
-                for elem in pe_node.elements:
-                    extract_substitutions_from_element(elem)
-
-    def extract_substitutions_from_element(elem) -> None:
-        """
-        Extract command substitutions from within a simple_command element.
-
-        Command substitutions ($(...) or `...`) contain nested compound_commands.
-        """
-        if elem is None:
-            return
-
-        # Check if this element has a compound_command (it's a substitution)
-        if hasattr(elem, 'compound_command') and elem.compound_command is not None:
-            # Add the inner compound text (e.g., "cmd1 && cmd2" or "cmd1 | cmd2")
-            inner = elem.compound_command
-            inner_text = inner.text.strip() if hasattr(inner, 'text') else ''
-            # Strip trailing semicolon for brace groups
-            if inner_text.endswith(';'):
-                inner_text = inner_text[:-1].strip()
-            add_command(inner_text)
-
-            # Recurse into the compound_command to extract nested commands
-            extract_from_compound(inner)
-
-        # Also check nested elements (substitutions can be deeply nested)
-        if hasattr(elem, 'elements') and elem.elements:
-            for subelem in elem.elements:
-                extract_substitutions_from_element(subelem)
+            seen_wrappers.add(text)
+        yield text, kind, node
 
-    # Start extraction from the top-level compound_command
-    if hasattr(node, 'compound_command') and node.compound_command is not None:
-        extract_from_compound(node.compound_command)
 
-    return commands
+# Work items of _walk_compound(): what to do with the node popped from the stack
+_COMPOUND = 0  # compound_command: pipelines connected by control operators
+_PIPELINE_ELEMENT = 1  # subshell, brace group or simple command
+_SUBSTITUTIONS = 2  # part of a simple command that may contain $(...) or `...`
+
+
+def _labelled(node, label: str) -> List:
+    """
+    Collect the children of a repetition rule reached through a label.
+
+    compound_command is `pipeline (control_op pipeline)*` and pipeline is
+    `pipeline_element (pipe pipeline_element)*`: the first child is a label
+    of the node itself, the others are labels of the repeated sequences.
+    """
+    children = []
+    first = getattr(node, label, None)
+    if first is not None:
+        children.append(first)
+    for elem in getattr(node, 'elements', None) or ():
+        if elem is first:
+            continue
+        child = getattr(elem, label, None)
+        if child is not None:
+            children.append(child)
+        for subelem in getattr(elem, 'elements', None) or ():
+            child = getattr(subelem, label, None)
+            if child is not None:
+                children.append(child)
+    return children
+
+
+def _inner_text(compound_node) -> str:
+    """Text of a nested compound_command without the trailing semicolon of a brace group."""
+    inner_text = getattr(compound_node, 'text', '').strip()
+    if inner_text.endswith(';'):
+        inner_text = inner_text[:-1]
+    return inner_text
+
+
+def _walk_compound(compound_node, include_wrappers: bool) -> Iterator[Tuple[str, str, object]]:
+    """
+    Yield (command, kind, node) for every command of a compound_command, in tree order.
+
+    Children are pushed in reverse so that they are popped in order. Nested
+    compound commands (of subshells, brace groups and substitutions) are
+    walked only through their compound_command node, never a second time
+    through the elements of the construct that holds them.
+
+    Args:
+        compound_node: compound_command node to walk
+        include_wrappers: If True, include subshell/brace group wrapper text in results
+
+    Yields:
+        (command, kind, node) tuples, possibly repeated; node is the
+        simple_command node of a leaf, None for a wrapper
+    """
+    stack = [(_COMPOUND, compound_node)]
+    while stack:
+        action, node = stack.pop()
+        if action == _COMPOUND:
+            pipelines = _labelled(node, 'pipeline')
+            elements = [element for pipeline in pipelines for element in _labelled(pipeline, 'pipeline_element')]
+            stack.extend((_PIPELINE_ELEMENT, element) for element in reversed(elements))
+            continue
+
+        inner = getattr(node, 'compound_command', None)
+        if action == _PIPELINE_ELEMENT:
+            if inner is not None:
+                # A subshell or brace group
+                if include_wrappers:
+                    # The wrapper text (e.g., "(cmd)" or "{ cmd; }") and the inner compound text
+                    yield getattr(node, 'text', ''), WRAPPER, None
+                    yield _inner_text(inner), WRAPPER, None
+                stack.append((_COMPOUND, inner))
+            else:
+                # A simple command; its elements may contain command substitutions
+                yield getattr(node, 'text', ''), LEAF, node
+                stack.extend((_SUBSTITUTIONS, elem) for elem in reversed(getattr(node, 'elements', None) or ()))
+        elif inner is not None:
+            # A command substitution: the inner compound text (e.g., "cmd1 && cmd2")
+            yield _inner_text(inner), WRAPPER, None
+            stack.append((_COMPOUND, inner))
+        else:
+            # Substitutions can be nested in other elements, e.g. double-quoted strings
+            stack.extend((_SUBSTITUTIONS, elem) for elem in reversed(getattr(node, 'elements', None) or ()))
+
+
+def _walk_descent(compound, include_wrappers: bool) -> Iterator[Tuple[str, str, object]]:
+    """
+    Yield (command, kind, node) for a tree of the recursive-descent parser, like _walk_compound().
+
+    Args:
+        compound: recursive_descent.Compound to walk
+        include_wrappers: If True, include subshell/brace group wrapper text in results
+
+    Yields:
+        (command, kind, node) tuples, possibly repeated; node is the SimpleCommand of a leaf
+    """
+    stack = [compound]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, recursive_descent.Compound):
+            stack.extend(reversed([element for pipeline in node.pipelines for element in pipeline]))
+        elif isinstance(node, recursive_descent.SimpleCommand):
+            yield node.text, LEAF, node
+            stack.extend(reversed(node.substitutions))
+        elif isinstance(node, recursive_descent.Group):
+            if include_wrappers:
+                yield node.text, WRAPPER, None
+                yield _inner_text(node.body), WRAPPER, None
+            stack.append(node.body)
+        else:
+            # A command substitution
+            yield _inner_text(node.body), WRAPPER, None
+            stack.append(node.body)
+
+
+def _substitution_bodies(simple_node) -> List:
+    """The compound_command nodes of the substitutions of a simple_command, not nested in another."""
+    bodies = []
+    stack = list(reversed(getattr(simple_node, 'elements', None) or ()))
+    while stack:
+        node = stack.pop()
+        inner = getattr(node, 'compound_command', None)
+        if inner is not None:
+            bodies.append(inner)
+        else:
+            stack.extend(reversed(getattr(node, 'elements', None) or ()))
+    return bodies
 
 
 # Legacy compatibility - maintain old function names
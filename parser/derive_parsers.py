@@ -0,0 +1,313 @@
+"""
+Derive specialised parser variants from the Canopy-generated parser.
+
+Canopy emits one generic packrat parser (bash_parser.py), which must not be
+edited by hand. This script reads that output and writes bash_parser_fast.py,
+the variant used by command extraction for the common, successful case:
+
+- No error diagnostics: Canopy records an expected-set entry on every failed
+  alternative, and resets the set whenever the failure offset advances. That
+  allocation churn happens even for inputs that parse successfully, while the
+  expected set is only used to format a ParseError message. The fast variant
+  drops all of it; when parsing fails, the input is re-parsed by
+  bash_parser.parse(), which raises the ParseError with the full message.
+- Windowed memo: the packrat memo (`_cache`) keeps every rule result at
+  every offset for the whole input. The fast variant drops it at committed
+  cut points, i.e. each accepted `control_op pipeline` of the top-level
+  compound command. A PEG repetition never gives back an accepted
+  iteration, and nothing after the top-level compound command can fail, so
+  no entry behind the cut is read again. The few entries at the cut (the
+  lookahead that ended the last pipeline) are recomputed once. Memo memory
+  is then bounded by the longest top-level pipeline, not by the input.
+- Offset-based tree: every Canopy TreeNode stores `self._input[start:end]`
+  as its text, a copy per node, so nested nodes copy their span again at
+  every level. Fast-variant nodes store the shared input and their (start,
+  end) offsets in `__slots__`, and slice `text` only when it is read.
+  Terminal nodes share one empty `elements` tuple.
+- Nested first: the recursive-descent parser uses a dozen Python frames per
+  level of `$( )`, `( )`, `{ }` or backticks, so deeply nested input raised
+  RecursionError. When the input nests deeper than `_nesting_limit`, the
+  fast variant first parses compound_command at every offset where one can
+  start, last offset first. Nested commands start after their enclosing
+  one, so each of these parses finds its nested commands in the memo and
+  recurses one level only; the final parse then reads every nested command
+  from the memo. A packrat memo entry depends only on the rule and the
+  offset, so the tree is the same; offsets where no command starts only
+  memoize a failure. The memo window is off for such inputs, as the cut
+  would drop the entries.
+
+Usage (run again after every regeneration of bash_parser.py with Canopy):
+
+    python -m toolguard.parser.derive_parsers
+"""
+
+import ast
+import sys
+from pathlib import Path
+from typing import List
+
+PARSER_DIR = Path(__file__).parent
+SOURCE_PATH = PARSER_DIR / 'bash_parser.py'
+FAST_PATH = PARSER_DIR / 'bash_parser_fast.py'
+
+HEADER = '''# This file was derived from toolguard/parser/bash_parser.py by derive_parsers.py
+# DO NOT EDIT DIRECTLY - regenerate with: python -m toolguard.parser.derive_parsers
+#
+# Fast variant of the Canopy parser without error diagnostics. On failure the
+# input is re-parsed by bash_parser.parse(), which raises the ParseError.
+'''
+
+FAST_IMPORTS = 'from toolguard.parser.bash_parser import parse as parse_with_diagnostics'
+
+FAST_PARSE_METHOD = '''
+def parse(self):
+    # The top-level compound command starts after the leading spacing
+    self._top = self._input_size - len(self._input.lstrip(' \\t'))
+    self._read_nested_first()
+    tree = self._read_command_line()
+    if tree is not FAILURE and self._offset == self._input_size:
+        return tree
+    return parse_with_diagnostics(self._input, self._actions, self._types)
+'''
+
+
+# Class attribute of the fast Parser; set to False to keep the whole memo (see tmp/bench_parser_memory.py)
+MEMO_WINDOW_ATTRIBUTE = '_memo_window = True'
+
+# Class attributes of the fast Parser: the nesting depth from which nested commands are parsed first, and the
+# tokens that may open (followed by the spacing before the nested command) or close a nesting level
+NESTING_ATTRIBUTES = '''
+_nesting_limit = 16
+_nesting_tokens = re.compile('(?:\\\\$\\\\(|[({`])[ \\t]*|[)}]')
+'''
+
+# Method of the fast Parser called by parse() before the top-level rule
+NESTED_FIRST_METHOD = '''
+def _read_nested_first(self):
+    # Quotes are ignored: an extra offset only memoizes a failure
+    depth, deepest, starts = (0, 0, [])
+    for match in self._nesting_tokens.finditer(self._input):
+        token = match.group()
+        if token in ')}':
+            depth = max(depth - 1, 0)
+            continue
+        if token[0] != '`':
+            depth += 1
+            deepest = max(deepest, depth)
+        starts.append(match.end())
+    if deepest < self._nesting_limit:
+        return
+    self._memo_window = False
+    for start in reversed(starts):
+        self._offset = start
+        self._read_compound_command()
+    self._offset = 0
+'''
+
+# Statement inserted after each accepted iteration of the top-level compound command
+MEMO_CUT = '''
+if self._memo_window and index0 == self._top:
+    self._cache = defaultdict(dict)
+'''
+
+
+# Tree node base class of the fast parser: text is sliced from the shared input on access
+LAZY_TREE_NODE = '''
+class TreeNode(object):
+    __slots__ = ('input', 'offset', 'end', 'elements')
+
+    def __init__(self, input, offset, elements, end):
+        self.input = input
+        self.offset = offset
+        self.elements = elements
+        self.end = end
+
+    @property
+    def text(self):
+        return self.input[self.offset:self.end]
+
+    def __iter__(self):
+        for el in self.elements:
+            yield el
+'''
+
+
+def _is_failure_bookkeeping(node: ast.AST) -> bool:
+    """Check whether a statement is an `if self._offset <op> self._failure:` bookkeeping block."""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    test = node.test
+    return (
+        isinstance(test.left, ast.Attribute)
+        and test.left.attr == '_offset'
+        and len(test.comparators) == 1
+        and isinstance(test.comparators[0], ast.Attribute)
+        and test.comparators[0].attr == '_failure'
+    )
+
+
+def _is_diagnostics_state(node: ast.AST) -> bool:
+    """Check whether a statement initialises self._failure or self._expected."""
+    return (
+        isinstance(node, ast.Assign)
+        and len(node.targets) == 1
+        and isinstance(node.targets[0], ast.Attribute)
+        and node.targets[0].attr in ('_failure', '_expected')
+    )
+
+
+class _StripDiagnostics(ast.NodeTransformer):
+    """Remove expected-set bookkeeping from every statement list."""
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        super().generic_visit(node)
+        for field in ('body', 'orelse'):
+            statements = getattr(node, field, None)
+            if not isinstance(statements, list):
+                continue
+            kept = [
+                stmt for stmt in statements if not _is_failure_bookkeeping(stmt) and not _is_diagnostics_state(stmt)
+            ]
+            if not kept and field == 'body':
+                kept = [ast.Pass()]
+            setattr(node, field, kept)
+        return node
+
+
+def _is_accept(node: ast.AST) -> bool:
+    """Check whether a statement is `if addressN is not FAILURE: elementsN.append(addressN) else: break`."""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    if not isinstance(node.test.ops[0], ast.IsNot) or not node.body:
+        return False
+    if len(node.orelse) != 1 or not isinstance(node.orelse[0], ast.Break):
+        return False
+    first = node.body[0]
+    return (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Call)
+        and isinstance(first.value.func, ast.Attribute)
+        and first.value.func.attr == 'append'
+    )
+
+
+def _add_memo_cut(method: ast.FunctionDef) -> None:
+    """Drop the memo after each accepted `control_op pipeline` of the top-level compound command."""
+    loops = [node for node in ast.walk(method) if isinstance(node, ast.While)]
+    accepts = [stmt for stmt in loops[0].body if _is_accept(stmt)] if len(loops) == 1 else []
+    if len(accepts) != 1:
+        raise ValueError('Unexpected shape of _read_compound_command, cannot add the memo cut')
+    accepts[0].body.extend(ast.parse(MEMO_CUT).body)
+
+
+def _is_input_slice(node: ast.AST) -> bool:
+    """Check whether an expression is `self._input[start:end]`."""
+    return (
+        isinstance(node, ast.Subscript)
+        and isinstance(node.value, ast.Attribute)
+        and node.value.attr == '_input'
+        and isinstance(node.slice, ast.Slice)
+        and node.slice.upper is not None
+    )
+
+
+class _OffsetTreeNodes(ast.NodeTransformer):
+    """Build tree nodes from the shared input and offsets instead of substring copies."""
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if not (isinstance(node.func, ast.Name) and node.func.id.startswith('TreeNode')):
+            return node
+        if len(node.args) != 3 or not _is_input_slice(node.args[0]):
+            raise ValueError(f'Unexpected tree node construction: {ast.unparse(node)}')
+        text, offset, elements = node.args
+        if isinstance(elements, ast.List) and not elements.elts:
+            # Terminals share the empty tuple instead of allocating a list each
+            elements = ast.Tuple(elts=[], ctx=ast.Load())
+        node.args = [text.value, offset, elements, text.slice.upper]
+        return node
+
+
+def _offset_subclass(node: ast.ClassDef) -> None:
+    """Give a TreeNode subclass the (input, offset, elements, end) signature and slots for its labels."""
+    init = next(item for item in node.body if isinstance(item, ast.FunctionDef) and item.name == '__init__')
+    init.args.args = [ast.arg(name) for name in ('self', 'input', 'offset', 'elements', 'end')]
+    labels = []
+    for stmt in init.body:
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            # super(TreeNodeN, self).__init__(...)
+            stmt.value.args = [ast.Name(name) for name in ('input', 'offset', 'elements', 'end')]
+        elif isinstance(stmt, ast.Assign):
+            labels.extend(target.attr for target in stmt.targets if isinstance(target, ast.Attribute))
+    slots = ast.parse(f'__slots__ = {tuple(labels)!r}').body
+    node.body = slots + node.body
+
+
+def _render(statements: List[ast.stmt]) -> str:
+    """Unparse module-level statements, with two blank lines around classes and functions (PEP 8)."""
+    parts = []
+    previous = None
+    for node in statements:
+        if previous is not None:
+            definitions = (ast.ClassDef, ast.FunctionDef)
+            parts.append('\n\n\n' if isinstance(node, definitions) or isinstance(previous, definitions) else '\n')
+        parts.append(ast.unparse(ast.fix_missing_locations(node)))
+        previous = node
+    return ''.join(parts)
+
+
+def derive_fast_parser(source: str) -> str:
+    """
+    Build the source of the diagnostics-free parser variant.
+
+    Args:
+        source: Source of the Canopy-generated bash_parser.py
+
+    Returns:
+        Source of bash_parser_fast.py
+    """
+    tree = _OffsetTreeNodes().visit(_StripDiagnostics().visit(ast.parse(source)))
+
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == 'TreeNode':
+            node = ast.parse(LAZY_TREE_NODE).body[0]
+        elif isinstance(node, ast.ClassDef) and any(
+            isinstance(base, ast.Name) and base.id == 'TreeNode' for base in node.bases
+        ):
+            _offset_subclass(node)
+        # Errors are raised (and formatted) by the diagnostic parser
+        if isinstance(node, ast.ClassDef) and node.name == 'ParseError':
+            continue
+        if isinstance(node, ast.FunctionDef) and node.name == 'format_error':
+            continue
+        if isinstance(node, ast.ClassDef) and node.name == 'Parser':
+            node.body = (
+                ast.parse(MEMO_WINDOW_ATTRIBUTE + '\n' + NESTING_ATTRIBUTES).body
+                + [
+                    ast.parse(FAST_PARSE_METHOD).body[0]
+                    if isinstance(item, ast.FunctionDef) and item.name == 'parse'
+                    else item
+                    for item in node.body
+                ]
+                + ast.parse(NESTED_FIRST_METHOD).body
+            )
+        if isinstance(node, ast.ClassDef) and node.name == 'Grammar':
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == '_read_compound_command':
+                    _add_memo_cut(item)
+        body.append(node)
+        if isinstance(node, ast.ImportFrom) and node.module == 'collections':
+            body.extend(ast.parse(FAST_IMPORTS).body)
+
+    return HEADER + '\n' + _render(body) + '\n'
+
+
+def main() -> None:
+    """Regenerate bash_parser_fast.py from bash_parser.py."""
+    FAST_PATH.write_text(derive_fast_parser(SOURCE_PATH.read_text()))
+    print(f'Wrote {FAST_PATH}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+"""
+Differential fuzzer of the parser backends of command extraction.
+
+Generates random command lines from the rules of bash_parser.peg, and
+mutates some of them (inserted delimiters, dropped or repeated characters)
+so that rejected input is covered too. Each command line is extracted with
+both backends (see configure_parser_backend() in command_extractor.py):
+both must accept or reject it, and yield the same (command, kind) list.
+
+The grammar file is read by a small reader for the subset of Canopy syntax
+it uses: rules `name <- expression` with ordered choice `/`, sequences,
+`* + ?` repeats, `! &` lookaheads, grouping, string literals, character
+classes and `.`. A negative lookahead before `.` narrows the characters
+`.` draws from (`!delimiter .` draws no delimiter); other lookaheads are
+ignored, which is one source of rejected input. Nesting is limited by a depth budget: a choice only picks
+alternatives whose shallowest derivation fits in what is left of it.
+
+Usage (a long run; the unit tests run a short one):
+
+    python -m toolguard.parser.grammar_fuzz [count] [seed]
+"""
+
+import ast
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from toolguard.parser.bash_parser import ParseError
+from toolguard.parser.command_extractor import CANOPY, DESCENT, _parse_tagged
+
+GRAMMAR_PATH = Path(__file__).parent / 'bash_parser.peg'
+
+# Characters for `.` and negated classes; delimiters are frequent to reach the edge cases
+ALPHABET = 'abcdefghijklmnoprstuvwxyz' + 'ABCXYZ' + '0123456789' + '_-./~=:@%+,#!?*' + ' \t\n' + '$\'"\\`|&;<>(){}'
+MUTATION_CHARACTERS = ' $\'"\\`|&;<>(){}\n'
+
+_META_TOKEN = re.compile(
+    r'\s+|#[^\n]*'
+    r'|(?P<arrow><-)|(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)'
+    r'|(?P<string>"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')'
+    r'|(?P<cls>\[(?:\\.|[^\]\\])*\])'
+    r'|(?P<op>[./()*+?!&])'
+)
+
+# Expressions are tuples: ('literal', text), ('class', characters), ('any',), ('rule', name),
+# ('sequence', [expr]), ('choice', [expr]), ('repeat', expr, minimum, maximum), ('lookahead', expr), ('not', expr)
+Expression = tuple
+
+
+def _meta_tokens(source: str) -> List[Tuple[str, str]]:
+    """Split a grammar file into (kind, text) tokens."""
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        match = _META_TOKEN.match(source, pos)
+        if match is None:
+            raise ValueError(f'Unexpected grammar syntax at offset {pos}: {source[pos : pos + 20]!r}')
+        if match.lastgroup:
+            tokens.append((match.lastgroup, match.group()))
+        pos = match.end()
+    return tokens
+
+
+def _class_characters(text: str) -> str:
+    """The characters of a character class, from the alphabet for a negated class."""
+    body = text[1:-1].encode().decode('unicode_escape')
+    negated = body.startswith('^')
+    if negated:
+        body = body[1:]
+    characters = set()
+    index = 0
+    while index < len(body):
+        if index + 2 < len(body) and body[index + 1] == '-':
+            characters.update(chr(code) for code in range(ord(body[index]), ord(body[index + 2]) + 1))
+            index += 3
+        else:
+            characters.add(body[index])
+            index += 1
+    if negated:
+        return ''.join(char for char in ALPHABET if char not in characters)
+    return ''.join(sorted(characters))
+
+
+class _GrammarReader:
+    """Recursive-descent reader of the rule expressions."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else ('end', '')
+
+    def rules(self) -> Dict[str, Expression]:
+        rules = {}
+        if self.peek() == ('name', 'grammar'):
+            self.pos += 2
+        while self.peek()[0] != 'end':
+            kind, name = self.peek()
+            if kind != 'name' or self.peek(1)[0] != 'arrow':
+                raise ValueError(f'Expected a rule definition, found {name!r}')
+            self.pos += 2
+            rules[name] = self.choice()
+        return rules
+
+    def choice(self) -> Expression:
+        alternatives = [self.sequence()]
+        while self.peek() == ('op', '/'):
+            self.pos += 1
+            alternatives.append(self.sequence())
+        return alternatives[0] if len(alternatives) == 1 else ('choice', alternatives)
+
+    def sequence(self) -> Expression:
+        items = []
+        while True:
+            kind, text = self.peek()
+            # A name followed by <- starts the next rule
+            if kind == 'end' or (kind == 'op' and text in '/)') or self.peek(1)[0] == 'arrow':
+                break
+            items.append(self.prefixed())
+        return items[0] if len(items) == 1 else ('sequence', items)
+
+    def prefixed(self) -> Expression:
+        if self.peek() in (('op', '!'), ('op', '&')):
+            kind = 'not' if self.peek()[1] == '!' else 'lookahead'
+            self.pos += 1
+            return (kind, self.suffixed())
+        return self.suffixed()
+
+    def suffixed(self) -> Expression:
+        expression = self.primary()
+        kind, text = self.peek()
+        if kind == 'op' and text in '*+?':
+            self.pos += 1
+            minimum, maximum = {'*': (0, 3), '+': (1, 3), '?': (0, 1)}[text]
+            return ('repeat', expression, minimum, maximum)
+        return expression
+
+    def primary(self) -> Expression:
+        kind, text = self.peek()
+        self.pos += 1
+        if kind == 'name':
+            return ('rule', text)
+        if kind == 'string':
+            return ('literal', ast.literal_eval(text))
+        if kind == 'cls':
+            return ('class', _class_characters(text))
+        if (kind, text) == ('op', '.'):
+            return ('any',)
+        if (kind, text) == ('op', '('):
+            expression = self.choice()
+            if self.peek() != ('op', ')'):
+                raise ValueError('Unbalanced parenthesis in grammar')
+            self.pos += 1
+            return expression
+        raise ValueError(f'Unexpected grammar token {text!r}')
+
+
+def load_grammar(path: Path = GRAMMAR_PATH) -> Dict[str, Expression]:
+    """
+    Read the rules of a PEG grammar file.
+
+    Args:
+        path: Grammar file (bash_parser.peg by default)
+
+    Returns:
+        Dict of rule name to expression tuple
+    """
+    rules = _GrammarReader(_meta_tokens(path.read_text())).rules()
+    return {name: _narrow(expression, rules) for name, expression in rules.items()}
+
+
+def _first_characters(expression: Expression, rules: Dict[str, Expression], seen: frozenset = frozenset()) -> str:
+    """Characters a match of an expression may start with (an over-approximation)."""
+    kind = expression[0]
+    if kind == 'literal':
+        return expression[1][:1]
+    if kind == 'class':
+        return expression[1]
+    if kind == 'any':
+        return ALPHABET
+    if kind == 'rule':
+        name = expression[1]
+        return '' if name in seen else _first_characters(rules[name], rules, seen | {name})
+    if kind == 'choice':
+        return ''.join(_first_characters(item, rules, seen) for item in expression[1])
+    if kind == 'sequence':
+        return _first_characters(expression[1][0], rules, seen)
+    if kind == 'repeat':
+        return _first_characters(expression[1], rules, seen)
+    return ''
+
+
+def _narrow(expression: Expression, rules: Dict[str, Expression]) -> Expression:
+    """Replace each `!expression .` with a class of the characters the lookahead does not reject."""
+    kind = expression[0]
+    if kind == 'sequence':
+        items = [_narrow(item, rules) for item in expression[1]]
+        if len(items) == 2 and items[0][0] == 'not' and items[1] == ('any',):
+            rejected = set(_first_characters(items[0][1], rules))
+            return ('class', ''.join(char for char in ALPHABET if char not in rejected))
+        return ('sequence', items)
+    if kind == 'choice':
+        return ('choice', [_narrow(item, rules) for item in expression[1]])
+    if kind == 'repeat':
+        return ('repeat', _narrow(expression[1], rules)) + expression[2:]
+    return expression
+
+
+class CommandGenerator:
+    """Random command lines derived from grammar rules."""
+
+    def __init__(self, rules: Dict[str, Expression], rng: random.Random, max_depth: int = 16):
+        self.rules = rules
+        self.rng = rng
+        self.max_depth = max_depth
+        self.heights = self._min_heights()
+
+    def _min_heights(self) -> Dict[str, float]:
+        """Smallest rule nesting of a derivation of each rule, by fixpoint iteration."""
+        heights = {name: float('inf') for name in self.rules}
+        changed = True
+        while changed:
+            changed = False
+            for name, expression in self.rules.items():
+                height = 1 + self._height(expression, heights)
+                if height < heights[name]:
+                    heights[name] = height
+                    changed = True
+        return heights
+
+    def _height(self, expression: Expression, heights: Dict[str, float]) -> float:
+        kind = expression[0]
+        if kind == 'rule':
+            return heights[expression[1]]
+        if kind == 'sequence':
+            return max((self._height(item, heights) for item in expression[1]), default=0)
+        if kind == 'choice':
+            return min(self._height(item, heights) for item in expression[1])
+        if kind == 'repeat':
+            return self._height(expression[1], heights) if expression[2] else 0
+        return 0
+
+    def generate(self, rule: str = 'command_line') -> str:
+        """Derive one string from a rule."""
+        parts: List[str] = []
+        # Explicit stack of (expression, depth); generation must not depend on the recursion limit either
+        stack = [(('rule', rule), 0)]
+        while stack:
+            expression, depth = stack.pop()
+            kind = expression[0]
+            if kind == 'literal':
+                parts.append(expression[1])
+            elif kind == 'class':
+                parts.append(self.rng.choice(expression[1]))
+            elif kind == 'any':
+                parts.append(self.rng.choice(ALPHABET))
+            elif kind == 'rule':
+                stack.append((self.rules[expression[1]], depth + 1))
+            elif kind == 'sequence':
+                stack.extend((item, depth) for item in reversed(expression[1]))
+            elif kind == 'choice':
+                stack.append((self._choose(expression[1], depth), depth))
+            elif kind == 'repeat':
+                _kind, item, minimum, maximum = expression
+                # Fewer repeats deeper down keep the command lines short
+                if depth > self.max_depth // 2:
+                    maximum = min(maximum, minimum + 1)
+                count = self.rng.randint(minimum, maximum)
+                if self._height(item, self.heights) > self.max_depth - depth:
+                    count = minimum
+                stack.extend((item, depth) for _ in range(count))
+        return ''.join(parts)
+
+    def _choose(self, alternatives: List[Expression], depth: int) -> Expression:
+        fitting = [item for item in alternatives if self._height(item, self.heights) <= self.max_depth - depth]
+        if fitting:
+            return self.rng.choice(fitting)
+        return min(alternatives, key=lambda item: self._height(item, self.heights))
+
+
+def mutate(command: str, rng: random.Random) -> str:
+    """Apply one to three random character edits."""
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randint(0, len(command))
+        edit = rng.random()
+        if edit < 0.5:
+            command = command[:pos] + rng.choice(MUTATION_CHARACTERS) + command[pos:]
+        elif edit < 0.75:
+            command = command[:pos] + command[pos + 1 :]
+        else:
+            command = command[:pos] + command[pos : pos + rng.randint(1, 6)] * 2 + command[pos + 6 :]
+    return command
+
+
+def extract_with(backend: str, command: str) -> Optional[List[Tuple[str, str]]]:
+    """Extract tagged commands with one backend; None if the command line does not parse."""
+    try:
+        return list(_parse_tagged(command, backend))
+    except ParseError:
+        return None
+
+
+def differences(commands: Iterator[str]) -> Iterator[Tuple[str, object, object]]:
+    """
+    Yield (command, canopy result, descent result) for every command the backends disagree on.
+
+    Args:
+        commands: Command lines to extract
+
+    Yields:
+        Command lines with different results; a result is None when the command line is rejected
+    """
+    for command in commands:
+        expected = extract_with(CANOPY, command)
+        actual = extract_with(DESCENT, command)
+        if expected != actual:
+            yield command, expected, actual
+
+
+def generated_commands(count: int, seed: int, mutation_rate: float = 0.3) -> Iterator[str]:
+    """
+    Generate command lines from bash_parser.peg.
+
+    Args:
+        count: Number of command lines
+        seed: Random seed, for reproducible runs
+        mutation_rate: Share of command lines that are mutated
+
+    Yields:
+        Command lines
+    """
+    rng = random.Random(seed)
+    generator = CommandGenerator(load_grammar(), rng)
+    for _ in range(count):
+        # Shallow derivations are mostly accepted, deep ones mostly rejected somewhere
+        generator.max_depth = rng.randint(8, 16)
+        command = generator.generate()
+        yield mutate(command, rng) if rng.random() < mutation_rate else command
+
+
+def main() -> None:
+    """Fuzz both backends and report the command lines they disagree on."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    failures = 0
+    for command, expected, actual in differences(generated_commands(count, seed)):
+        failures += 1
+        print(f'{command!r}\n  canopy:  {expected}\n  descent: {actual}')
+    print(f'{count} command lines, {failures} differences', file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
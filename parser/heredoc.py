@@ -0,0 +1,238 @@
+"""
+Here-document bodies of bash command lines.
+
+A here-document body runs from the line after the command that opens it
+(`cat > file <<'EOF'`) to a line holding only its delimiter. A PEG grammar
+cannot match a terminator chosen by the input, so bodies are found by this
+small lexer before the command line is parsed. Only the rest of the command
+line, its head, is parsed and extracted, so allow matching and path
+normalization scale with the head, not with the payload. Deny patterns
+still see the payload: `[body]` patterns match the body (see patterns.py),
+and command deny patterns match the line of the command that reads it,
+body included (Heredoc.text).
+
+A body stays in the head, matched as before, when it may run commands:
+when the command line that reads it names a shell or interpreter
+(`bash <<EOF`, `cat <<EOF | sh`, `ssh host <<EOF`), when it holds `$(...)`
+or backticks that bash expands (unquoted delimiter), or when no terminator
+line ends it.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+# Characters ending an unquoted delimiter word
+_WORD_END = frozenset(' \t\n;&|<>()')
+
+# A word naming a program that runs its input as code; a body read on such a line is never split off
+_INTERPRETER = re.compile(
+    r'(?:^|(?<=[\s/|;&()`"\'=]))'
+    r'(?:(?:ba|da|z|k|c|tc|fi|a|r|s)?sh|python[0-9.]*|pypy[0-9.]*|node(?:js)?|deno|bun|perl[0-9.]*|ruby|irb'
+    r'|php|lua[0-9.]*|tclsh|wish|osascript|pwsh|powershell|Rscript|julia|eval|exec|source|\.|xargs|parallel)'
+    r'(?=$|[\s|;&()<>`"\'])'
+)
+
+
+class Heredoc:
+    """One here-document: its delimiter and body."""
+
+    __slots__ = ('delimiter', 'body', 'expands', 'executed', 'text', 'start', 'end')
+
+    def __init__(
+        self, delimiter: str, body: str, expands: bool, executed: bool, text: str, start: int, end: int
+    ):
+        self.delimiter = delimiter
+        self.body = body
+        # True for an unquoted delimiter: bash expands $VAR, $(...) and `...` in the body
+        self.expands = expands
+        # True if the command line reading the body names a shell or interpreter
+        self.executed = executed
+        # The command line holding the operator, with the body and the terminator line
+        self.text = text
+        # Span of the body and its terminator line in the command line
+        self.start = start
+        self.end = end
+
+    @property
+    def inert(self) -> bool:
+        """True if running the command cannot run anything written in the body."""
+        return not (self.executed or (self.expands and ('$(' in self.body or '`' in self.body)))
+
+
+def split_heredocs(command_line: str) -> Tuple[str, List[Heredoc]]:
+    """
+    Split a command line into its head and its inert here-document bodies.
+
+    Args:
+        command_line: The bash command line
+
+    Returns:
+        Tuple of (head, heredocs): the command line without the bodies of
+        the returned heredocs and their terminator lines (the command line
+        itself if there are none), and the heredocs in order
+
+    Example:
+        head, heredocs = split_heredocs("cat > notes.txt <<'EOF'\\nhello\\nEOF\\ngit add notes.txt")
+        head == 'cat > notes.txt <<\\'EOF\\'\\ngit add notes.txt'
+        heredocs[0].body == 'hello'
+    """
+    if '<<' not in command_line or '\n' not in command_line:
+        # No operator, or nowhere for a body to start
+        return command_line, []
+
+    heredocs = _scan(command_line)
+    inert = [heredoc for heredoc in heredocs if heredoc.inert]
+    if not inert:
+        return command_line, []
+
+    pieces = []
+    position = 0
+    for heredoc in inert:
+        pieces.append(command_line[position : heredoc.start])
+        position = heredoc.end
+    pieces.append(command_line[position:])
+    return ''.join(pieces), inert
+
+
+def heredoc_bodies(command_line: str) -> List[str]:
+    """
+    Get the inert here-document bodies of a command line (see split_heredocs()).
+
+    Args:
+        command_line: The bash command line
+
+    Returns:
+        List of bodies, in order
+    """
+    return [heredoc.body for heredoc in split_heredocs(command_line)[1]]
+
+
+def _scan(text: str) -> List[Heredoc]:
+    """
+    Find the terminated here-documents of a command line, tracking quotes,
+    escapes, comments and arithmetic `(( ))`, where `<<` is no redirection.
+    """
+    heredocs: List[Heredoc] = []
+    # (delimiter, expands, strip_tabs, line start) of operators whose body starts at the next newline
+    pending: List[Tuple[str, bool, bool, int]] = []
+    quote: Optional[str] = None
+    arithmetic = 0
+    # Start of the line being scanned (a line continuation does not end it)
+    line_start = 0
+    length = len(text)
+    i = 0
+    while i < length:
+        c = text[i]
+        if quote == "'":
+            if c == "'":
+                quote = None
+        elif quote == '"':
+            if c == '\\':
+                i += 1
+            elif c == '"':
+                quote = None
+        elif arithmetic:
+            if c == '(':
+                arithmetic += 1
+            elif c == ')':
+                arithmetic -= 1
+        elif c == '\\':
+            # Escaped character, or a line continuation
+            i += 1
+        elif c in '\'"':
+            quote = c
+        elif c == '(' and text.startswith('((', i):
+            arithmetic = 2
+            i += 1
+        elif c == '#' and (i == 0 or text[i - 1] in ' \t\n;&|('):
+            # Comment to the end of the line
+            newline = text.find('\n', i)
+            i = length if newline == -1 else newline
+            continue
+        elif c == '<' and text.startswith('<<', i):
+            if text.startswith('<<<', i):
+                # Here-string, not a here-document
+                i += 3
+                continue
+            i = _read_operator(text, i + 2, pending, line_start)
+            continue
+        elif c == '\n' and pending:
+            end = _read_bodies(text, i, pending, heredocs)
+            pending = []
+            if end is None:
+                # Unterminated: bash reads to the end, but leave it to the parser
+                break
+            i = end
+            line_start = i + 1
+            continue
+        elif c == '\n':
+            line_start = i + 1
+        i += 1
+    return heredocs
+
+
+def _read_operator(text: str, i: int, pending: List[Tuple[str, bool, bool, int]], line_start: int) -> int:
+    """Read the `-` and delimiter word after `<<`, returning the index after them."""
+    strip_tabs = text.startswith('-', i)
+    if strip_tabs:
+        i += 1
+    while i < len(text) and text[i] in ' \t':
+        i += 1
+
+    delimiter = []
+    quoted = False
+    while i < len(text) and text[i] not in _WORD_END:
+        c = text[i]
+        if c in '\'"':
+            close = text.find(c, i + 1)
+            if close == -1:
+                return i
+            delimiter.append(text[i + 1 : close])
+            quoted = True
+            i = close + 1
+        elif c == '\\' and i + 1 < len(text):
+            delimiter.append(text[i + 1])
+            quoted = True
+            i += 2
+        else:
+            delimiter.append(c)
+            i += 1
+
+    word = ''.join(delimiter)
+    if word and (quoted or word[0].isalpha() or word[0] == '_'):
+        pending.append((word, not quoted, strip_tabs, line_start))
+    return i
+
+
+def _read_bodies(
+    text: str, newline: int, pending: List[Tuple[str, bool, bool, int]], heredocs: List[Heredoc]
+) -> Optional[int]:
+    """
+    Read the bodies of the pending operators, which start after the newline at
+    index newline. Returns the index of the newline ending the last terminator
+    line (or the end of the text), or None if a body is not terminated.
+    """
+    position = newline + 1
+    operators_end = newline
+    for delimiter, expands, strip_tabs, line_start in pending:
+        # The body goes to the command holding the operator, and through pipes to others on its line
+        executed = _INTERPRETER.search(text, line_start, operators_end) is not None
+        body_start = position
+        while True:
+            if position > len(text):
+                return None
+            line_end = text.find('\n', position)
+            if line_end == -1:
+                line_end = len(text)
+            line = text[position:line_end]
+            if (line.lstrip('\t') if strip_tabs else line) == delimiter:
+                body = text[body_start : max(position - 1, body_start)]
+                # The head keeps the newline that ends the command line
+                heredocs.append(
+                    Heredoc(delimiter, body, expands, executed, text[line_start:line_end], newline, line_end)
+                )
+                newline = line_end
+                position = line_end + 1
+                break
+            position = line_end + 1
+    return newline
@@ -0,0 +1,106 @@
+"""
+Tokenizer of the recursive-descent bash parser (see recursive_descent.py).
+
+Between two tokens the grammar of bash_parser.peg allows spaces and tabs
+and nothing else, and no rule needs them, so one compiled pattern skips the
+spacing and matches the next token. The pattern mirrors the PEG rules: its
+alternatives are tried in the order of the grammar's ordered choices, and
+repeats are possessive (`*+`, `++`), because a PEG repetition never gives
+back what it consumed. A regex that backtracked could accept input the
+grammar rejects (`$'a\\'` ends at the escaped quote for the grammar).
+
+Only three places depend on context, and have their own patterns: the path
+after a redirection operator (path characters, not word characters), the
+delimiter and rest of line of a here-document, and the inside of a
+double-quoted string, which may hold command substitutions and is then
+parsed character by character.
+"""
+
+import re
+from typing import Tuple
+
+# var_ref: $name, ${name} or ${name:-default}, and the special parameters $? $$ $! $# $@ $* $0-$9 $-
+_VAR_REF = r'\$(?:[a-zA-Z_][a-zA-Z0-9_]*+|\{[a-zA-Z_][a-zA-Z0-9_]*+(?::[-+=?][^}]*+)?+\}|[?$!#@*0-9-])'
+
+# unquoted_word: escaped characters, variable references and characters other than delimiters
+_UNQUOTED_WORD = r'(?:\\[\s\S]|' + _VAR_REF + r'|[^ \t\n\r|&;<>(){}$`"\'])++'
+
+# Double-quoted string without command substitutions; other strings are parsed by the parser
+_SIMPLE_DOUBLE = r'"(?:\\[\s\S]|' + _VAR_REF + r'|\$(?!\()|[^"\\$`])*+"'
+
+# Token kinds
+AND = 'and_op'  # &&
+OR = 'or_op'  # ||
+PIPE = 'pipe'  # |
+BACKGROUND = 'background'  # &
+SEMICOLON = 'semicolon'  # ;
+SUBSHELL = 'subshell'  # (
+BRACE = 'brace'  # {
+CLOSE_PAREN = 'close_paren'  # )
+CLOSE_BRACE = 'close_brace'  # }
+DOLLAR_PAREN = 'dollar_paren'  # $(
+BACKTICK = 'backtick'  # `
+FD_DUP = 'fd_dup'  # 2>&1, n>&m, n<&m
+REDIRECT = 'redirect'  # > >> < with an optional fd number; a path follows
+HEREDOC = 'heredoc'  # << or <<-; a delimiter follows
+QUOTED = 'quoted'  # '...', $'...' or "..." without command substitutions
+DOUBLE_QUOTE = 'double_quote'  # " of a string to parse character by character
+WORD = 'word'  # Unquoted word with escapes and variable references
+END = 'end'  # End of input
+ERROR = 'error'  # Anything else (newlines, a lone $, unterminated quotes)
+
+TOKEN = re.compile(
+    r'[ \t]*+(?:'
+    r'(?P<and_op>&&)|(?P<or_op>\|\|)|(?P<pipe>\|)|(?P<background>&)|(?P<semicolon>;)'
+    r'|(?P<subshell>\()|(?P<brace>\{)|(?P<close_paren>\))|(?P<close_brace>\})'
+    r'|(?P<dollar_paren>\$\()|(?P<backtick>`)'
+    # n>&m before n> so that the path of `2>` is not tried at `&`, where it always fails
+    r'|(?P<fd_dup>2>&1|[0-9]++[<>]&[0-9]++)'
+    r'|(?P<redirect>[0-9]*+(?:>>|>(?!>))|<(?!<))'
+    r'|(?P<heredoc><<-?)'
+    r"|(?P<quoted>'[^']*+'|\$'(?:\\[\s\S]|[^'])*+'|" + _SIMPLE_DOUBLE + ')'
+    r'|(?P<double_quote>")'
+    r'|(?P<word>' + _UNQUOTED_WORD + ')'
+    r'|(?P<end>\Z)|(?P<error>)'
+    r')'
+)
+
+# A word where a redirection with an fd number failed (`2>$x` is the word 2, then a failing redirection)
+UNQUOTED_WORD = re.compile(_UNQUOTED_WORD)
+
+# file_path after a redirection operator: quoted, or a path start followed by path characters
+PATH = re.compile(
+    r"[ \t]*+(?:'[^']*+'|" + _SIMPLE_DOUBLE + r'|(?P<double_quote>")|[/~.a-zA-Z_](?:[a-zA-Z0-9_./-]|\\[\s\S])*+)'
+)
+
+# heredoc_delimiter after << or <<-, and the rest of the line (heredoc_content)
+HEREDOC_DELIMITER = re.compile(
+    r"[ \t]*+(?:'[^']*+'|" + _SIMPLE_DOUBLE + r'|(?P<double_quote>")|[a-zA-Z_][a-zA-Z0-9_]*+)'
+)
+HEREDOC_CONTENT = re.compile(r'[ \t]*+[^\n\r]*+')
+
+# reserved_word: the first matching word commits, so `done` is not reserved (`do` matches, then `n` follows)
+RESERVED_WORD = re.compile(r'(?>if|then|else|elif|fi|case|esac|for|while|until|do|done|in|function)(?![a-zA-Z0-9_])')
+
+# Inside a double-quoted string: a run of plain characters, and the elements tried before a single character
+DOUBLE_TEXT = re.compile(r'[^"\\$`]++')
+DOUBLE_ELEMENT = re.compile(r'\\[\s\S]|' + _VAR_REF)
+
+# Offsets where a nested compound command may start, for parsing deep input nested first
+NESTING = re.compile(r'\$\(|[({`]|(?P<close>[)}])')
+
+
+def scan(text: str, pos: int) -> Tuple[str, int, int]:
+    """
+    Match the token after the spacing at pos.
+
+    Args:
+        text: The command line
+        pos: Offset to scan from
+
+    Returns:
+        (kind, start, end) of the token; ERROR tokens are empty
+    """
+    match = TOKEN.match(text, pos)
+    kind = match.lastgroup
+    return kind, match.start(kind), match.end()
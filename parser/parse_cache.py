@@ -0,0 +1,219 @@
+"""
+Parse-result cache for command extraction.
+
+The same compound command lines recur across a session (for example
+`cd src && uv run pytest -x`), so command extraction keeps the extracted
+sub-command lists (each command tagged as leaf or wrapper) in an LRU cache
+keyed by the exact command text. The cache works in process and can optionally persist entries on disk, which is what
+makes it useful for the hook, since every hook invocation is a new process.
+
+Disk entries are keyed by the command text plus a grammar version hash (the
+generated parser and the extractor source), so regenerating the parser or
+changing the extraction logic never serves stale results. They are signed
+with a key kept outside the cache directory (see cache_trust.py), so an
+entry planted by whoever can write the directory is never served.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from toolguard.cache_trust import sign, verify
+
+logger = logging.getLogger(__name__)
+
+# Default number of command lines kept in memory
+DEFAULT_MAX_ENTRIES = 512
+
+# Source files whose content defines the extraction output: the parsers, the extractor and the
+# modules it builds results with (heredoc.py decides which part of a command line is parsed)
+_VERSIONED_SOURCES = (
+    'bash_parser.py',
+    'bash_parser_fast.py',
+    'command_ast.py',
+    'command_extractor.py',
+    'heredoc.py',
+    'lexer.py',
+    'recursive_descent.py',
+)
+
+_grammar_version: Optional[str] = None
+
+
+def grammar_version() -> str:
+    """
+    Get a hash identifying the current parser and extractor implementation.
+
+    Returns:
+        Hex digest of the parser and command extractor sources
+    """
+    global _grammar_version
+    if _grammar_version is None:
+        digest = hashlib.sha256()
+        parser_dir = Path(__file__).parent
+        for name in _VERSIONED_SOURCES:
+            try:
+                digest.update((parser_dir / name).read_bytes())
+            except OSError:
+                digest.update(name.encode())
+        _grammar_version = digest.hexdigest()
+    return _grammar_version
+
+
+def _is_tagged_command(item) -> bool:
+    """Check whether a decoded disk item is a [text, kind] pair."""
+    return isinstance(item, list) and len(item) == 2 and all(isinstance(part, str) for part in item)
+
+
+class ParseCache:
+    """
+    LRU cache of extracted (text, kind) sub-command lists keyed by command text.
+
+    Thread-safe. Hit/miss counters are available through stats().
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: Optional[Union[str, Path]] = None,
+        key: Optional[bytes] = None,
+    ):
+        """
+        Create a parse cache.
+
+        Args:
+            max_entries: Maximum number of command lines kept in memory (0 disables the memory tier)
+            cache_dir: Optional directory for persistent entries (None disables the disk tier)
+            key: Key signing persistent entries (see cache_trust.load_cache_key()); the disk tier
+                is disabled without one
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir and key else None
+        self.key = key
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def get(self, command_line: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Look up the extracted commands for a command line.
+
+        Args:
+            command_line: Exact command text
+
+        Returns:
+            A fresh list of extracted (text, kind) commands, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(command_line)
+            if entry is not None:
+                self._entries.move_to_end(command_line)
+                self._hits += 1
+                return list(entry)
+
+        entry = self._read_disk(command_line)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(command_line, entry)
+        return list(entry)
+
+    def put(self, command_line: str, commands: List[Tuple[str, str]]) -> None:
+        """
+        Store the extracted commands for a command line.
+
+        Args:
+            command_line: Exact command text
+            commands: (text, kind) commands extracted from it
+        """
+        entry = tuple((text, kind) for text, kind in commands)
+        with self._lock:
+            self._store(command_line, entry)
+        self._write_disk(command_line, entry)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = 0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get hit-rate statistics.
+
+        Returns:
+            Dict with hits, disk_hits, misses, entries and hit_rate (0.0 - 1.0)
+        """
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'entries': len(self._entries),
+                'hit_rate': (self._hits + self._disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def _store(self, command_line: str, entry: tuple) -> None:
+        """Insert into the memory tier, evicting the least recently used entries (lock held)."""
+        if self.max_entries <= 0:
+            return
+        self._entries[command_line] = entry
+        self._entries.move_to_end(command_line)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, command_line: str) -> Optional[Path]:
+        """Get the file holding the disk entry for a command line."""
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(command_line.encode('utf-8', 'surrogatepass')).hexdigest()
+        return self.cache_dir / 'parse' / grammar_version()[:16] / key[:2] / f'{key}.json'
+
+    def _payload(self, command_line: str, commands: list) -> bytes:
+        """Serialize what the signature of a disk entry covers."""
+        return json.dumps([grammar_version(), command_line, commands]).encode('utf-8', 'surrogatepass')
+
+    def _read_disk(self, command_line: str) -> Optional[tuple]:
+        """Read a disk entry, ignoring missing, corrupt, colliding or unsigned files."""
+        path = self._disk_path(command_line)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('command') != command_line:
+            return None
+        commands = data.get('commands')
+        if not isinstance(commands, list) or not all(_is_tagged_command(cmd) for cmd in commands):
+            return None
+        if not verify(self.key, self._payload(command_line, commands), data.get('signature')):
+            return None
+        return tuple((text, kind) for text, kind in commands)
+
+    def _write_disk(self, command_line: str, entry: tuple) -> None:
+        """Write a disk entry atomically; failures only disable persistence for this entry."""
+        path = self._disk_path(command_line)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            commands = [list(command) for command in entry]
+            signature = sign(self.key, self._payload(command_line, commands))
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'command': command_line, 'commands': commands, 'signature': signature}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f'Failed to persist parse cache entry: {e}')
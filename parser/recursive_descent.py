@@ -0,0 +1,317 @@
+"""
+Hand-written recursive-descent parser for the grammar of bash_parser.peg.
+
+An alternative to the Canopy-generated packrat parser for command
+extraction (see configure_parser_backend() in command_extractor.py). It
+accepts exactly the language of bash_parser.peg and yields the same
+extracted commands, which grammar_fuzz.py checks on commands generated
+from the grammar. Tokens come from one compiled pattern (lexer.py), so a
+word or an operator costs one regex match instead of a rule call per
+character, and the tree holds only what extraction reads:
+
+    Compound      pipelines connected by && || ; & (compound_command)
+    Group         a subshell (...) or brace group { ...; } and its Compound
+    SimpleCommand a command with the spans of its items and its command substitutions
+    Substitution  $(...) or `...` and its Compound
+
+A pipeline is a list of Group and SimpleCommand elements. Every node keeps
+the input and its span, and slices its text only when it is read. The PEG
+grammar never backtracks into a finished alternative, so the parser only
+needs one choice point (a redirection whose path fails is read as a word)
+and the results of nested compound commands, which it keeps by offset.
+Like the fast Canopy parser, input nested deeper than NESTING_LIMIT levels
+is parsed nested first (see derive_parsers.py), so recursion stays bounded.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from toolguard.parser import lexer
+from toolguard.parser.bash_parser import ParseError
+
+# Nesting depth from which nested compound commands are parsed first, innermost first
+NESTING_LIMIT = 16
+
+# Token kinds that separate pipelines (control_op), and that may end a compound command
+_CONTROL_OPS = frozenset((lexer.AND, lexer.OR, lexer.SEMICOLON, lexer.BACKGROUND))
+_TRAILING_OPS = frozenset((lexer.SEMICOLON, lexer.BACKGROUND))
+
+# Token kinds that start a word of a simple command (command_word)
+_WORDS = frozenset((lexer.WORD, lexer.QUOTED, lexer.DOUBLE_QUOTE))
+
+
+class Compound:
+    """Pipelines connected by control operators."""
+
+    __slots__ = ('input', 'start', 'end', 'pipelines')
+
+    def __init__(self, input: str, start: int, end: int, pipelines: List[List['Element']]):
+        self.input = input
+        self.start = start
+        self.end = end
+        self.pipelines = pipelines
+
+    @property
+    def text(self) -> str:
+        return self.input[self.start : self.end]
+
+
+class Group:
+    """A subshell or brace group."""
+
+    __slots__ = ('input', 'start', 'end', 'body')
+
+    def __init__(self, input: str, start: int, end: int, body: Compound):
+        self.input = input
+        self.start = start
+        self.end = end
+        self.body = body
+
+    @property
+    def text(self) -> str:
+        return self.input[self.start : self.end]
+
+
+class SimpleCommand:
+    """A simple command; substitutions are those not nested in another substitution, in input order."""
+
+    __slots__ = ('input', 'start', 'end', 'items', 'substitutions')
+
+    def __init__(
+        self, input: str, start: int, end: int, items: List[Tuple[int, int]], substitutions: List['Substitution']
+    ):
+        self.input = input
+        self.start = start
+        self.end = end
+        # (start, end) of each redirection, substitution and word, without the spacing after it
+        self.items = items
+        self.substitutions = substitutions
+
+    @property
+    def text(self) -> str:
+        return self.input[self.start : self.end]
+
+
+class Substitution:
+    """A command substitution."""
+
+    __slots__ = ('body',)
+
+    def __init__(self, body: Compound):
+        self.body = body
+
+
+Element = Union[Group, SimpleCommand]
+
+
+class Parser:
+    """Parser of one command line."""
+
+    def __init__(self, text: str):
+        self.text = text
+        # Nested compound commands by the offset after their opening token (None: no command there)
+        self._nested: Dict[int, Optional[Compound]] = {}
+
+    def parse(self) -> Compound:
+        """
+        Parse the whole command line (command_line).
+
+        Returns:
+            The top-level compound command
+
+        Raises:
+            ParseError: If the command line is not in the language of the grammar
+        """
+        self._parse_nested_first()
+        result = self._compound(0)
+        if result is not None:
+            kind, _start, end = lexer.scan(self.text, result.end)
+            if kind == lexer.END:
+                return result
+            pos = _start
+        else:
+            pos = lexer.scan(self.text, 0)[1]
+        raise ParseError(f'Unexpected input at offset {pos}: {self.text[pos : pos + 20]!r}')
+
+    def _parse_nested_first(self) -> None:
+        """Parse the nested compound commands of deeply nested input, last offset first."""
+        depth = deepest = 0
+        starts = []
+        for match in lexer.NESTING.finditer(self.text):
+            if match.lastgroup:
+                depth = max(depth - 1, 0)
+                continue
+            if match.group() != '`':
+                depth += 1
+                deepest = max(deepest, depth)
+            starts.append(match.end())
+        if deepest >= NESTING_LIMIT:
+            for start in reversed(starts):
+                self._nested_compound(start)
+
+    def _nested_compound(self, pos: int) -> Optional[Compound]:
+        """Parse the compound command after an opening token, at most once per offset."""
+        try:
+            return self._nested[pos]
+        except KeyError:
+            result = self._nested[pos] = self._compound(pos)
+            return result
+
+    def _compound(self, pos: int) -> Optional[Compound]:
+        """Parse `pipeline (control_op pipeline)* (trailing_background / trailing_semicolon)?`."""
+        text = self.text
+        pipeline = self._pipeline(pos)
+        if pipeline is None:
+            return None
+        start = pipeline[0].start
+        pipelines = [pipeline]
+        end = pipeline[-1].end
+        while True:
+            kind, _start, op_end = lexer.scan(text, end)
+            if kind not in _CONTROL_OPS:
+                break
+            pipeline = self._pipeline(op_end)
+            if pipeline is None:
+                if kind in _TRAILING_OPS:
+                    end = op_end
+                break
+            pipelines.append(pipeline)
+            end = pipeline[-1].end
+        return Compound(text, start, end, pipelines)
+
+    def _pipeline(self, pos: int) -> Optional[List[Element]]:
+        """Parse `pipeline_element (pipe pipeline_element)*`."""
+        element = self._element(pos)
+        if element is None:
+            return None
+        pipeline = [element]
+        while True:
+            kind, _start, end = lexer.scan(self.text, element.end)
+            if kind != lexer.PIPE:
+                return pipeline
+            element = self._element(end)
+            if element is None:
+                return pipeline
+            pipeline.append(element)
+
+    def _element(self, pos: int) -> Optional[Element]:
+        """Parse `subshell / brace_group / simple_command`."""
+        kind, start, end = lexer.scan(self.text, pos)
+        if kind == lexer.SUBSHELL or kind == lexer.BRACE:
+            body = self._nested_compound(end)
+            if body is None:
+                return None
+            close_kind, _close_start, close_end = lexer.scan(self.text, body.end)
+            if close_kind != (lexer.CLOSE_PAREN if kind == lexer.SUBSHELL else lexer.CLOSE_BRACE):
+                return None
+            return Group(self.text, start, close_end, body)
+        return self._simple_command(kind, start, end)
+
+    def _simple_command(self, kind: str, start: int, end: int) -> Optional[SimpleCommand]:
+        """Parse `(redirection / cmd_substitution / command_word)+` from its first token."""
+        text = self.text
+        substitutions: List[Substitution] = []
+        items: List[Tuple[int, int]] = []
+        while True:
+            if kind == lexer.REDIRECT:
+                item_end = self._path(end, substitutions)
+                if item_end < 0:
+                    # The grammar reads the fd number of a redirection whose path fails as a word
+                    word = lexer.UNQUOTED_WORD.match(text, start)
+                    item_end = word.end() if word is not None else -1
+            elif kind == lexer.FD_DUP:
+                item_end = end
+            elif kind == lexer.HEREDOC:
+                item_end = self._heredoc(end, substitutions)
+            elif kind == lexer.DOLLAR_PAREN or kind == lexer.BACKTICK:
+                item_end = self._substitution(kind, end, substitutions)
+            elif kind in _WORDS and not lexer.RESERVED_WORD.match(text, start):
+                item_end = end if kind != lexer.DOUBLE_QUOTE else self._double_quoted(end, substitutions)
+            else:
+                item_end = -1
+            if item_end < 0:
+                break
+            items.append((start, item_end))
+            kind, start, end = lexer.scan(text, item_end)
+        if not items:
+            return None
+        return SimpleCommand(text, items[0][0], items[-1][1], items, substitutions)
+
+    def _path(self, pos: int, substitutions: List[Substitution]) -> int:
+        """Parse the file_path of a redirection; returns its end, or -1."""
+        match = lexer.PATH.match(self.text, pos)
+        if match is None:
+            return -1
+        if match.lastgroup:
+            return self._double_quoted(match.end(), substitutions)
+        return match.end()
+
+    def _heredoc(self, pos: int, substitutions: List[Substitution]) -> int:
+        """Parse the heredoc_delimiter and heredoc_content after << or <<-; returns the end, or -1."""
+        match = lexer.HEREDOC_DELIMITER.match(self.text, pos)
+        if match is None:
+            return -1
+        end = self._double_quoted(match.end(), substitutions) if match.lastgroup else match.end()
+        if end < 0:
+            return -1
+        return lexer.HEREDOC_CONTENT.match(self.text, end).end()
+
+    def _substitution(self, kind: str, pos: int, substitutions: List[Substitution]) -> int:
+        """Parse a command substitution after its opening token; returns its end, or -1."""
+        body = self._nested_compound(pos)
+        if body is None:
+            return -1
+        close_kind, _start, end = lexer.scan(self.text, body.end)
+        if close_kind != (lexer.CLOSE_PAREN if kind == lexer.DOLLAR_PAREN else lexer.BACKTICK):
+            return -1
+        substitutions.append(Substitution(body))
+        return end
+
+    def _double_quoted(self, pos: int, substitutions: List[Substitution]) -> int:
+        """
+        Parse the double_content and closing quote of a string that may hold substitutions.
+
+        Args:
+            pos: Offset after the opening quote
+            substitutions: List the string's substitutions are appended to
+
+        Returns:
+            The offset after the closing quote, or -1 (the list is then unchanged)
+        """
+        text = self.text
+        size = len(text)
+        mark = len(substitutions)
+        while pos < size:
+            char = text[pos]
+            if char == '"':
+                return pos + 1
+            match = lexer.DOUBLE_TEXT.match(text, pos) or lexer.DOUBLE_ELEMENT.match(text, pos)
+            if match is not None:
+                pos = match.end()
+                continue
+            if char == '$' or char == '`':
+                opener, _start, end = lexer.scan(text, pos)
+                if opener == lexer.DOLLAR_PAREN or opener == lexer.BACKTICK:
+                    end = self._substitution(opener, end, substitutions)
+                    if end >= 0:
+                        pos = end
+                        continue
+            # A $ or ` that starts no substitution is a plain character
+            pos += 1
+        del substitutions[mark:]
+        return -1
+
+
+def parse(text: str) -> Compound:
+    """
+    Parse a command line.
+
+    Args:
+        text: The command line
+
+    Returns:
+        The top-level compound command
+
+    Raises:
+        ParseError: If the command line is not in the language of the grammar
+    """
+    return Parser(text).parse()
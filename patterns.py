@@ -6,6 +6,10 @@ Supports four pattern types:
 - REGEX: Patterns prefixed with [regex] for regular expression matching
 - GLOB: Patterns prefixed with [glob] for true glob matching with globstar support
 - NATIVE: Patterns prefixed with [native] for word-level wildcard matching
+
+Patterns prefixed with [body] (e.g. `[body][regex]BEGIN .*PRIVATE KEY`) are
+matched against here-document bodies instead of commands; the rest of the
+pattern is parsed as above.
 """
 
 import re
@@ -17,6 +21,10 @@ from typing import Tuple
 from .normalization import expand_tilde
 
 
+# Prefix of patterns matched against here-document bodies (see parser/heredoc.py)
+BODY_PREFIX = '[body]'
+
+
 class PatternType(Enum):
     """Type of pattern for command matching."""
 
@@ -59,6 +67,34 @@ def parse_pattern(pattern_str: str, extended_syntax: bool = True) -> Tuple[Patte
         return PatternType.DEFAULT, pattern_str
 
 
+def is_body_pattern(pattern_str: str, extended_syntax: bool = True) -> bool:
+    """
+    Check if a pattern is matched against here-document bodies instead of commands.
+
+    Args:
+        pattern_str: The pattern string
+        extended_syntax: If False, [body] is not a prefix either
+
+    Returns:
+        True if the pattern starts with [body]
+    """
+    return extended_syntax and pattern_str.strip().startswith(BODY_PREFIX)
+
+
+def parse_body_pattern(pattern_str: str, extended_syntax: bool = True) -> Tuple[PatternType, str]:
+    """
+    Parse a [body] pattern: the prefix is dropped and the rest parsed by parse_pattern().
+
+    Args:
+        pattern_str: The pattern string, starting with [body]
+        extended_syntax: Passed to parse_pattern()
+
+    Returns:
+        Tuple of (PatternType, pattern), matched against a body with match_pattern()
+    """
+    return parse_pattern(pattern_str.strip()[len(BODY_PREFIX) :], extended_syntax)
+
+
 def match_pattern(pattern_type: PatternType, pattern: str, command: str) -> bool:
     """
     Match a command against a pattern using the specified pattern type.
@@ -7,16 +7,22 @@ Replicates the exact matching logic from checked_bash.py including:
 - Special handling for path component patterns
 - Command:args pattern separation
 - Extended pattern support (REGEX and GLOB)
+- Here-document body patterns ([body]), which commands never match
+- File path globs of the file tools (Read, Write, Edit)
 """
 
 import fnmatch
-from typing import List, Tuple, Optional
+from pathlib import Path, PurePath
+from typing import List, Optional, Sequence, Tuple
 
-from .patterns import parse_pattern, match_pattern, PatternType
-from .normalization import normalize_command
+from .patterns import is_body_pattern, parse_body_pattern, parse_pattern, match_pattern, PatternType
+from .normalization import expand_tilde, normalize_command, normalize_words
+from .parser.command_ast import split_words, unquote
 
 
-def normalize_path_in_command(command_str: str) -> str:
+def normalize_path_in_command(
+    command_str: str, tokens: Optional[Sequence[str]] = None, home: Optional[Path] = None
+) -> str:
     """
     Normalize paths in a command to canonical form.
 
@@ -31,6 +37,8 @@ def normalize_path_in_command(command_str: str) -> str:
 
     Args:
         command_str: The command string to normalize
+        tokens: The command's words as written, if already split (split_words())
+        home: Home directory shortened to ~ (defaults to the user's home)
 
     Returns:
         Normalized command string with canonical paths
@@ -44,7 +52,10 @@ def normalize_path_in_command(command_str: str) -> str:
         'ls ./mydir'
     """
     # First apply comprehensive normalization from normalization.py
-    result = normalize_command(command_str)
+    if tokens is None:
+        result = normalize_command(command_str, home=home)
+    else:
+        result = ' '.join(normalize_words(tokens, home=home))
 
     # Additionally, for backwards compatibility, add ./ prefix to args
     # that don't start with ., /, -, or ~
@@ -59,7 +70,7 @@ def normalize_path_in_command(command_str: str) -> str:
     return result
 
 
-def contains_path_component(command_str: str, component: str) -> bool:
+def contains_path_component(command_str: str, component: str, words: Optional[Sequence[str]] = None) -> bool:
     """
     Check if a command contains a specific path component.
 
@@ -68,34 +79,30 @@ def contains_path_component(command_str: str, component: str) -> bool:
     Args:
         command_str: The command string to check
         component: The path component to search for
+        words: The command's words with quotes removed, if already split
+            (from the parser, or unquote() of split_words())
 
     Returns:
         True if the component is found in any path argument, False otherwise
     """
-    # Remove the command part, focus on arguments
-    parts = command_str.split(None, 1)
-    if len(parts) < 2:
+    # The component must be written as is, which the deny prefilter of compiled policies relies on
+    if component not in command_str:
         return False
+    if words is None:
+        # `cat "my dir/.env"` has one argument, and no quote sticks to the component
+        words = [unquote(word) for word in split_words(command_str)]
 
-    args = parts[1]
-
-    # Check if the component appears as:
+    # Check if the component appears in an argument as:
     # - Exact match: "cat .env"
     # - After a slash: "cat dir/.env" or "cat /path/.env"
     # - Before a slash: "cat .env/file"
     # - In the middle: "cat dir/.env/file"
-
-    # Split args by spaces to handle multiple arguments
-    for arg in args.split():
-        # Split by path separators
-        path_parts = arg.replace('\\', '/').split('/')
-        if component in path_parts:
-            return True
-
-    return False
+    return any(component in arg.replace('\\', '/').split('/') for arg in words[1:])
 
 
-def match_command(command_str: str, patterns: List[str], extended_syntax: bool = True) -> Tuple[bool, Optional[str]]:
+def match_command(
+    command_str: str, patterns: List[str], extended_syntax: bool = True, home: Optional[Path] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Check if the command matches any of the patterns.
 
@@ -107,6 +114,8 @@ def match_command(command_str: str, patterns: List[str], extended_syntax: bool =
     - Extended REGEX: "[regex]^git (log|diff|status).*" for regex matching
     - Extended GLOB: "[glob]/Users/*/projects/**/*.py" for true glob matching
 
+    [body] patterns only match here-document bodies (see check_body_permission()) and are skipped.
+
     Wildcards:
     - * matches any characters within a path component
     - ** matches any characters including path separators (treated as * for fnmatch)
@@ -115,73 +124,152 @@ def match_command(command_str: str, patterns: List[str], extended_syntax: bool =
         command_str: The command string to match
         patterns: List of patterns to match against
         extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        home: Home directory ~ stands for in the normalized command (defaults to the user's home)
 
     Returns:
         Tuple of (matched: bool, matched_pattern: str or None)
     """
     # Try matching with both original and normalized command
-    command_variants = [command_str, normalize_path_in_command(command_str)]
+    command_variants = [command_str, normalize_path_in_command(command_str, home=home)]
 
     for pattern in patterns:
+        if is_body_pattern(pattern, extended_syntax):
+            continue
         # Parse pattern to determine type
         pattern_type, actual_pattern = parse_pattern(pattern, extended_syntax)
+        if match_parsed_pattern(pattern_type, actual_pattern, command_str, command_variants):
+            return True, pattern
 
-        # REGEX and GLOB patterns bypass all DEFAULT logic
-        if pattern_type == PatternType.REGEX or pattern_type == PatternType.GLOB:
-            # Match directly against command (no normalization, no colon syntax)
-            if match_pattern(pattern_type, actual_pattern, command_str):
-                return True, pattern
-            continue
+    return False, None
 
-        # DEFAULT pattern type - use existing logic
-        # Special handling for path component patterns like "**/.env/**"
-        # These are patterns that want to match a specific path component anywhere
-        if actual_pattern.startswith('**/') and actual_pattern.endswith('/**'):
-            # Extract the component between **/ and /**
-            component = actual_pattern[3:-3]
-            if contains_path_component(command_str, component):
-                return True, pattern
-            continue
 
-        # Normalize ** to * for fnmatch (fnmatch doesn't distinguish them)
-        pattern_normalized = actual_pattern.replace('**', '*')
-
-        if ':' in pattern_normalized:
-            # Pattern like "git log:*" or "cat ./*:*"
-            # Split into command pattern and args pattern
-            cmd_pattern, args_pattern = pattern_normalized.split(':', 1)
-            cmd_pattern = cmd_pattern.strip()
-            args_pattern = args_pattern.strip()
-
-            for cmd_var in command_variants:
-                # If args pattern is * or empty, just match the command prefix
-                if args_pattern in ('*', '**', ''):
-                    # Match command prefix more flexibly
-                    # Extract the base command from the pattern (e.g., "cat" from "cat ./*")
-                    pattern_parts = cmd_pattern.split(None, 1)
-                    base_cmd = pattern_parts[0]
-
-                    # Check if command starts with the same base command
-                    if cmd_var.startswith(base_cmd + ' ') or cmd_var == base_cmd:
-                        # Now check if the full command matches the pattern
-                        if fnmatch.fnmatch(cmd_var, cmd_pattern + '*'):
-                            return True, pattern
-                else:
-                    # More specific args pattern - match the full command
-                    full_pattern = cmd_pattern + ' ' + args_pattern
-                    if fnmatch.fnmatch(cmd_var, full_pattern):
-                        return True, pattern
-        else:
-            # No colon - match the entire command string
-            for cmd_var in command_variants:
-                if fnmatch.fnmatch(cmd_var, pattern_normalized):
-                    return True, pattern
+def match_parsed_pattern(
+    pattern_type: PatternType,
+    actual_pattern: str,
+    command_str: str,
+    command_variants: Sequence[str],
+    words: Optional[Sequence[str]] = None,
+) -> bool:
+    """
+    Check if a command matches a single parsed pattern.
+
+    This is the per-pattern step of match_command(), shared with compiled
+    policies (see policy.py) so both apply exactly the same rules.
 
-    return False, None
+    Args:
+        pattern_type: Type returned by parse_pattern()
+        actual_pattern: Pattern text returned by parse_pattern()
+        command_str: The command string to match
+        command_variants: The command and its normalized form
+        words: The command's words from the parser, if any (for path component patterns)
+
+    Returns:
+        True if the command matches the pattern, False otherwise
+    """
+    # REGEX and GLOB patterns bypass all DEFAULT logic
+    if pattern_type == PatternType.REGEX or pattern_type == PatternType.GLOB:
+        # Match directly against command (no normalization, no colon syntax)
+        return match_pattern(pattern_type, actual_pattern, command_str)
+
+    # DEFAULT pattern type - use existing logic
+    # Special handling for path component patterns like "**/.env/**"
+    # These are patterns that want to match a specific path component anywhere
+    if actual_pattern.startswith('**/') and actual_pattern.endswith('/**'):
+        # Extract the component between **/ and /**
+        component = actual_pattern[3:-3]
+        return contains_path_component(command_str, component, words)
+
+    # Normalize ** to * for fnmatch (fnmatch doesn't distinguish them)
+    pattern_normalized = actual_pattern.replace('**', '*')
+
+    if ':' in pattern_normalized:
+        # Pattern like "git log:*" or "cat ./*:*"
+        # Split into command pattern and args pattern
+        cmd_pattern, args_pattern = pattern_normalized.split(':', 1)
+        cmd_pattern = cmd_pattern.strip()
+        args_pattern = args_pattern.strip()
+
+        for cmd_var in command_variants:
+            # If args pattern is * or empty, just match the command prefix
+            if args_pattern in ('*', '**', ''):
+                # Match command prefix more flexibly
+                # Extract the base command from the pattern (e.g., "cat" from "cat ./*")
+                pattern_parts = cmd_pattern.split(None, 1)
+                base_cmd = pattern_parts[0]
+
+                # Check if command starts with the same base command
+                if cmd_var.startswith(base_cmd + ' ') or cmd_var == base_cmd:
+                    # Now check if the full command matches the pattern
+                    if fnmatch.fnmatch(cmd_var, cmd_pattern + '*'):
+                        return True
+            else:
+                # More specific args pattern - match the full command
+                full_pattern = cmd_pattern + ' ' + args_pattern
+                if fnmatch.fnmatch(cmd_var, full_pattern):
+                    return True
+    else:
+        # No colon - match the entire command string
+        for cmd_var in command_variants:
+            if fnmatch.fnmatch(cmd_var, pattern_normalized):
+                return True
+
+    return False
+
+
+def check_deny_permission(
+    command: str, deny_patterns: List[str], extended_syntax: bool = True, home: Optional[Path] = None
+) -> Tuple[str, str]:
+    """
+    Check a command against the deny patterns only.
+
+    Used for text that is never executed as-is (e.g. a subshell wrapper),
+    which can still hit a deny pattern but is allowed through its leaves.
+
+    Args:
+        command: The bash command to check
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        home: Home directory ~ stands for in the normalized command (defaults to the user's home)
+
+    Returns:
+        Tuple of (decision, reason) where decision is 'deny' on a match, else 'allow'
+    """
+    if deny_patterns:
+        matched, pattern = match_command(command, deny_patterns, extended_syntax, home)
+        if matched:
+            return 'deny', f'Command matches deny pattern: {pattern}'
+    return 'allow', 'Command does not match any deny patterns'
+
+
+def check_body_permission(body: str, deny_patterns: List[str], extended_syntax: bool = True) -> Tuple[str, str]:
+    """
+    Check a here-document body against the [body] deny patterns.
+
+    Bodies are payload, not commands: only [body] patterns match them, and
+    they need no allow pattern (the command reading them does).
+
+    Args:
+        body: The here-document body
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, there are no [body] patterns
+
+    Returns:
+        Tuple of (decision, reason) where decision is 'deny' on a match, else 'allow'
+    """
+    for pattern in deny_patterns:
+        if is_body_pattern(pattern, extended_syntax):
+            pattern_type, actual_pattern = parse_body_pattern(pattern, extended_syntax)
+            if match_pattern(pattern_type, actual_pattern, body):
+                return 'deny', f'Here-document body matches deny pattern: {pattern}'
+    return 'allow', 'Here-document body does not match any deny patterns'
 
 
 def check_permission(
-    command: str, allow_patterns: List[str], deny_patterns: List[str], extended_syntax: bool = True
+    command: str,
+    allow_patterns: List[str],
+    deny_patterns: List[str],
+    extended_syntax: bool = True,
+    home: Optional[Path] = None,
 ) -> Tuple[str, str]:
     """
     Check if a command is permitted based on allow and deny patterns.
@@ -196,21 +284,63 @@ def check_permission(
         allow_patterns: List of patterns that allow commands
         deny_patterns: List of patterns that deny commands
         extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        home: Home directory ~ stands for in the normalized command (defaults to the user's home)
 
     Returns:
         Tuple of (decision, reason) where decision is 'allow' or 'deny'
         and reason is a human-readable explanation
     """
     # Check deny list first - if it matches, reject immediately
-    if deny_patterns:
-        matched, pattern = match_command(command, deny_patterns, extended_syntax)
-        if matched:
-            return 'deny', f'Command matches deny pattern: {pattern}'
+    decision, reason = check_deny_permission(command, deny_patterns, extended_syntax, home)
+    if decision == 'deny':
+        return decision, reason
 
     # Check if command is allowed
-    matched, pattern = match_command(command, allow_patterns, extended_syntax)
+    matched, pattern = match_command(command, allow_patterns, extended_syntax, home)
     if matched:
         return 'allow', f'Command matches allow pattern: {pattern}'
 
     # Default: deny (not explicitly allowed)
     return 'deny', 'Command does not match any allow patterns'
+
+
+def check_file_path_permission(
+    file_path: str, allow_patterns: List[str], deny_patterns: List[str], home: Optional[Path] = None
+) -> Tuple[str, str]:
+    """
+    Check if a file path is permitted based on allow and deny patterns.
+
+    Uses GLOB pattern matching with proper globstar (**) support via PurePath.full_match().
+
+    Args:
+        file_path: The file path to check
+        allow_patterns: List of glob patterns that allow access
+        deny_patterns: List of glob patterns that deny access
+        home: Home directory ~ stands for (defaults to the user's home)
+
+    Returns:
+        Tuple of (decision, reason) where decision is 'allow' or 'deny'
+    """
+    # Expand tilde in file path for matching
+    expanded_path = expand_tilde(file_path, home)
+
+    # Check deny list first
+    for pattern in deny_patterns:
+        expanded_pattern = expand_tilde(pattern, home)
+        try:
+            if PurePath(expanded_path).full_match(expanded_pattern):
+                return 'deny', f'Path matches deny pattern: {pattern}'
+        except (ValueError, TypeError):
+            continue
+
+    # Check allow list
+    for pattern in allow_patterns:
+        expanded_pattern = expand_tilde(pattern, home)
+        try:
+            if PurePath(expanded_path).full_match(expanded_pattern):
+                return 'allow', f'Path matches allow pattern: {pattern}'
+        except (ValueError, TypeError):
+            continue
+
+    # Default: deny (not explicitly allowed)
+    return 'deny', 'Path does not match any allow patterns'
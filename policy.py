@@ -0,0 +1,901 @@
+"""
+Compiled permission policies for toolguard.
+
+check_permission() re-parses every pattern and re-normalizes the command for
+each pattern list on every call. A compiled policy does the per-pattern work
+once, when the patterns are loaded, and evaluates a command through a
+CommandView that computes the normalized variant at most once.
+
+Deny lists are also prefiltered: each pattern gets its required literals,
+substrings that every command matching the pattern must contain (for example
+`rm -rf` for `rm -rf:*`, `.env` for `**/.env/**`, or `npm ` and ` install`
+for `[native]npm * install`). The longest literal of each pattern goes into
+one regex alternation, so a command that contains none of them skips every
+gated pattern with a single scan. Otherwise an Aho-Corasick automaton over
+all literals finds, in one pass, the patterns whose literals all occur, and
+only those run the full match. Patterns without an extractable literal (GLOB
+patterns, `[...]` classes, case-insensitive regexes) always run.
+
+Each pattern is also specialized by shape when it is compiled. The fnmatch
+test of a DEFAULT pattern becomes `==`, `str.startswith`, `str.endswith` or
+`in` when its wildcards allow it (`git status`, `git *`, `*.log`, `*secret*`),
+and a regex compiled once otherwise; REGEX patterns are compiled once too,
+by re or, when enabled, by the linear-time engine of linear_regex.py. A
+linear-time search that runs over its budget fails closed: check() and
+check_deny() deny the command.
+
+[body] patterns are kept apart from the command lists and only checked
+against here-document bodies, by check_body().
+
+How policies are built (generated code, usage ordering, regex engine) is
+given by CompilerSettings. compile_policy() uses the settings it is passed,
+or those of the process (see configure_policy_compiler()), and caches
+policies by patterns and settings, so callers with different settings,
+such as two PolicyEngines, share the cache without affecting each other.
+
+Results are identical to check_permission(), which remains the reference
+implementation; patterns that cannot be specialized are matched through
+permissions.match_parsed_pattern().
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .linear_regex import DEFAULT_REGEX_BUDGET_MS, RegexBudgetExceeded, compile_linear
+from .literal_matcher import AhoCorasick
+from .patterns import PatternType, is_body_pattern, match_pattern, parse_body_pattern, parse_pattern
+from .permissions import contains_path_component, match_parsed_pattern, normalize_path_in_command
+from .parser.command_ast import split_words, unquote
+
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parser
+except ImportError:  # pragma: no cover - regex literals are an optimization only
+    _sre_constants = _sre_parser = None
+
+logger = logging.getLogger(__name__)
+
+# fnmatch folds case on case-insensitive platforms, so literals only gate there if it does not
+_CASE_SENSITIVE_FNMATCH = os.path.normcase('A') == 'A'
+
+# Pattern shapes reported by CompiledPattern.shape
+SHAPE_EXACT = 'exact'
+SHAPE_PREFIX = 'prefix'
+SHAPE_SUFFIX = 'suffix'
+SHAPE_CONTAINS = 'contains'
+SHAPE_ANY = 'any'
+SHAPE_REGEX = 'regex'
+SHAPE_PATH_COMPONENT = 'path_component'
+SHAPE_NEVER = 'never'
+SHAPE_REFERENCE = 'reference'
+
+# Number of compiled policies kept (one per distinct allow/deny configuration and settings)
+POLICY_CACHE_SIZE = 32
+
+
+class CompilerSettings:
+    """How compile_policy() builds a policy; equal settings build equal policies."""
+
+    __slots__ = ('codegen', 'hit_counts', 'linear_regex', 'regex_budget_ms', '_key')
+
+    def __init__(
+        self,
+        codegen: bool = True,
+        hit_counts: Optional[Mapping[str, int]] = None,
+        linear_regex: bool = False,
+        regex_budget_ms: Optional[float] = DEFAULT_REGEX_BUDGET_MS,
+    ):
+        """
+        Create compiler settings.
+
+        Args:
+            codegen: If True, generate Python code for each policy (see
+                policy_codegen.py); if False, interpret the compiled pattern lists,
+                which is the reference behavior and easier to debug
+            hit_counts: Optional past match counts by allow pattern (see
+                usage_stats.py). When set, policies are interpreted with the allow
+                list evaluated most-hit first, and codegen is not used
+            linear_regex: If True, search [regex] patterns with the linear-time
+                engine (see linear_regex.py) where their syntax allows it
+            regex_budget_ms: Time budget of one linear-time regex search in
+                milliseconds (None for no budget)
+        """
+        self.codegen = codegen
+        self.hit_counts = dict(hit_counts) if hit_counts is not None else None
+        self.linear_regex = linear_regex
+        self.regex_budget_ms = regex_budget_ms
+        counts = tuple(sorted(self.hit_counts.items())) if self.hit_counts is not None else None
+        self._key = (codegen, counts, linear_regex, regex_budget_ms)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompilerSettings) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+
+# Settings of compile_policy() calls that pass none, see configure_policy_compiler()
+_settings = CompilerSettings()
+
+
+class CommandView:
+    """
+    A command and its matching variants, computed lazily and at most once.
+
+    The raw command is what REGEX/GLOB patterns see; DEFAULT patterns also
+    try the path-normalized form (see normalize_path_in_command()). The
+    command is split into words once (split_words()), and the same words
+    serve normalization, path component checks and the first-word index.
+    Path component checks use the parser's words when they are known (see
+    parser/command_ast.py). Paths under home are normalized to ~ (None: the
+    user's home).
+    """
+
+    __slots__ = ('raw', 'home', '_words', '_tokens', '_first_word', '_normalized')
+
+    def __init__(self, raw: str, words: Optional[Sequence[str]] = None, home: Optional[Union[str, Path]] = None):
+        self.raw = raw
+        self.home = home
+        self._words = words
+        self._tokens: Optional[List[str]] = None
+        self._first_word: Optional[str] = None
+        self._normalized: Optional[str] = None
+
+    @property
+    def tokens(self) -> List[str]:
+        """The command's words as written."""
+        if self._tokens is None:
+            self._tokens = split_words(self.raw)
+        return self._tokens
+
+    @property
+    def words(self) -> Sequence[str]:
+        """The command's words with quotes removed."""
+        if self._words is None:
+            self._words = [unquote(token) for token in self.tokens]
+        return self._words
+
+    @property
+    def first_word(self) -> str:
+        """The first whitespace-delimited word of the raw command ('' if none), as patterns are indexed by."""
+        if self._first_word is None:
+            # A word as written ends at unquoted whitespace, so its own first part is the raw first word
+            parts = self._tokens[0].split(None, 1) if self._tokens else self.raw.split(None, 1)
+            self._first_word = parts[0] if parts else ''
+        return self._first_word
+
+    @property
+    def normalized(self) -> str:
+        """The command with paths normalized to canonical form."""
+        if self._normalized is None:
+            self._normalized = normalize_path_in_command(self.raw, self.tokens, self.home)
+        return self._normalized
+
+    @property
+    def variants(self) -> Tuple[str, str]:
+        """The raw and normalized command, in match_command() order."""
+        return self.raw, self.normalized
+
+
+class CompiledPattern:
+    """
+    A pattern parsed once, with its specialized matcher and its required
+    literals (empty if it has none).
+    """
+
+    __slots__ = ('pattern', 'pattern_type', 'actual_pattern', 'shape', 'word', 'matches', 'literals', 'literal_ids')
+
+    def __init__(self, pattern: str, extended_syntax: bool = True, settings: Optional[CompilerSettings] = None):
+        self.pattern = pattern
+        self.pattern_type, self.actual_pattern = parse_pattern(pattern, extended_syntax)
+        plan = plan_pattern(self.pattern_type, self.actual_pattern)
+        # First word of every command the pattern can match, or None
+        self.word = plan[3]
+        # matches(view) -> bool, with the same result as match_parsed_pattern()
+        self.shape, self.matches = specialize_pattern(self.pattern_type, self.actual_pattern, plan, settings)
+        self.literals = required_literals(self.pattern_type, self.actual_pattern)
+        # Ids of the literals in the owning list's automaton
+        self.literal_ids: FrozenSet[int] = frozenset()
+
+    @property
+    def literal(self) -> Optional[str]:
+        """The longest required literal, or None."""
+        return _longest(self.literals)
+
+
+class CompiledPatternList:
+    """
+    An ordered pattern list that reports the first match, like match_command().
+
+    With prefilter enabled, patterns with a required literal that is absent
+    from the command are skipped without being matched.
+
+    With hit counts (see usage_stats.py), patterns are tried most-hit first
+    among those that can match the command's first word. When one matches,
+    only the earlier patterns (in configured order) not tried yet are checked,
+    so the reported match is still the first one in configured order.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str],
+        extended_syntax: bool = True,
+        prefilter: bool = False,
+        hit_counts: Optional[Mapping[str, int]] = None,
+        settings: Optional[CompilerSettings] = None,
+    ):
+        """
+        Compile a pattern list.
+
+        Args:
+            patterns: Patterns in configured order
+            extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+            prefilter: If True, gate patterns on their required literals
+            hit_counts: Optional past match counts by pattern, to order evaluation by usage
+            settings: Regex engine settings (None: those of the process)
+
+        [body] patterns are left out; they never match commands.
+        """
+        self.patterns: List[CompiledPattern] = [
+            CompiledPattern(p, extended_syntax, settings) for p in patterns if not is_body_pattern(p, extended_syntax)
+        ]
+        self._ungated = self.patterns
+        self._literal_re = None
+        self._automaton = None
+        self._usage_by_word: Optional[Dict[str, List[Tuple[int, CompiledPattern]]]] = None
+        self._usage_generic: List[Tuple[int, CompiledPattern]] = []
+
+        if hit_counts is not None and not prefilter:
+            self._order_by_usage(hit_counts)
+
+        if prefilter:
+            gated = [p for p in self.patterns if p.literals]
+            if gated:
+                self._ungated = [p for p in self.patterns if not p.literals]
+                # Longest first, so the alternation never stops at a shorter prefix it does not need
+                longest = sorted({p.literal for p in gated}, key=len, reverse=True)
+                self._literal_re = re.compile('|'.join(re.escape(lit) for lit in longest))
+
+                literal_ids = {}
+                for compiled in gated:
+                    compiled.literal_ids = frozenset(
+                        literal_ids.setdefault(lit, len(literal_ids)) for lit in compiled.literals
+                    )
+                self._automaton = AhoCorasick(literal_ids)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _order_by_usage(self, hit_counts: Mapping[str, int]) -> None:
+        """Build the per-word evaluation orders, most-hit first."""
+
+        def usage_key(entry: Tuple[int, CompiledPattern]) -> Tuple[int, int]:
+            index, compiled = entry
+            return -hit_counts.get(compiled.pattern, 0), index
+
+        indexed = list(enumerate(self.patterns))
+        # Patterns bound to a first word only ever match commands starting with it
+        self._usage_generic = sorted((e for e in indexed if e[1].word is None), key=usage_key)
+        self._usage_by_word = {
+            word: sorted((e for e in indexed if e[1].word in (None, word)), key=usage_key)
+            for word in {compiled.word for compiled in self.patterns if compiled.word is not None}
+        }
+
+    def _first_match_by_usage(self, view: CommandView) -> Optional[str]:
+        """Find the first match in configured order, trying the most-hit patterns first."""
+        candidates = self._usage_by_word.get(view.first_word, self._usage_generic)
+        for position, (index, compiled) in enumerate(candidates):
+            if compiled.matches(view):
+                # Earlier patterns not tried yet could still be the first match in configured order
+                for _, earlier in sorted((e for e in candidates[position + 1 :] if e[0] < index), key=itemgetter(0)):
+                    if earlier.matches(view):
+                        return earlier.pattern
+                return compiled.pattern
+        return None
+
+    def first_match(self, view: CommandView) -> Optional[str]:
+        """
+        Find the first pattern, in configured order, that matches the command.
+
+        Args:
+            view: The command to match
+
+        Returns:
+            The matching pattern string, or None
+        """
+        if self._usage_by_word is not None:
+            return self._first_match_by_usage(view)
+        if self._literal_re is None:
+            candidates = self.patterns
+        elif self._literal_re.search(view.raw) or self._literal_re.search(view.normalized):
+            # One automaton pass per variant finds every literal present
+            present = self._automaton.find_all(view.raw)
+            if view.normalized != view.raw:
+                present |= self._automaton.find_all(view.normalized)
+            candidates = (p for p in self.patterns if p.literal_ids <= present)
+        else:
+            # No required literal anywhere in the command: only ungated patterns can match
+            candidates = self._ungated
+
+        for compiled in candidates:
+            if compiled.matches(view):
+                return compiled.pattern
+        return None
+
+    def match(self, command: str) -> Tuple[bool, Optional[str]]:
+        """
+        Match a command, with the same result as match_command().
+
+        Args:
+            command: The command string to match
+
+        Returns:
+            Tuple of (matched: bool, matched_pattern: str or None)
+        """
+        pattern = self.first_match(CommandView(command))
+        return pattern is not None, pattern
+
+
+class CompiledPolicy:
+    """Compiled allow and deny lists with the decision rules of check_permission()."""
+
+    def __init__(
+        self,
+        allow_patterns: Sequence[str],
+        deny_patterns: Sequence[str],
+        extended_syntax: bool = True,
+        hit_counts: Optional[Mapping[str, int]] = None,
+        settings: Optional[CompilerSettings] = None,
+    ):
+        """
+        Compile a policy.
+
+        Args:
+            allow_patterns: List of patterns that allow commands
+            deny_patterns: List of patterns that deny commands
+            extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+            hit_counts: Optional past match counts by allow pattern, to order
+                the allow list evaluation by usage
+            settings: Regex engine settings (None: those of the process)
+        """
+        self.allow = CompiledPatternList(allow_patterns, extended_syntax, hit_counts=hit_counts, settings=settings)
+        self.deny = CompiledPatternList(deny_patterns, extended_syntax, prefilter=True, settings=settings)
+        self.body_deny = compile_body_patterns(deny_patterns, extended_syntax, settings)
+
+    def decide(self, view: CommandView) -> Tuple[str, Optional[str]]:
+        """
+        Decide on a command by interpreting the pattern lists.
+
+        Args:
+            view: The command to check
+
+        Returns:
+            Tuple of (decision, pattern): the first matching deny pattern, else
+            the first matching allow pattern, else ('deny', None)
+        """
+        # Check deny list first - if it matches, reject immediately
+        pattern = self.deny.first_match(view)
+        if pattern is not None:
+            return 'deny', pattern
+
+        # Check if command is allowed
+        pattern = self.allow.first_match(view)
+        if pattern is not None:
+            return 'allow', pattern
+
+        # Default: deny (not explicitly allowed)
+        return 'deny', None
+
+    def decide_deny(self, view: CommandView) -> Tuple[str, Optional[str]]:
+        """
+        Decide on a command against the deny list only.
+
+        Args:
+            view: The command to check
+
+        Returns:
+            Tuple of (decision, pattern): ('deny', pattern) on a match, else ('allow', None)
+        """
+        pattern = self.deny.first_match(view)
+        if pattern is not None:
+            return 'deny', pattern
+        return 'allow', None
+
+    def check(
+        self, command: str, words: Optional[Sequence[str]] = None, home: Optional[Union[str, Path]] = None
+    ) -> Tuple[str, str]:
+        """
+        Check a command, with the same result as check_permission().
+
+        Args:
+            command: The bash command to check
+            words: The command's words from the parser, if known (see CommandView)
+            home: Home directory ~ stands for in the normalized command (None: the user's home)
+
+        Returns:
+            Tuple of (decision, reason)
+        """
+        try:
+            decision, pattern = self.decide(CommandView(command, words, home))
+        except RegexBudgetExceeded as e:
+            return 'deny', _budget_reason(e)
+        if pattern is None:
+            return decision, 'Command does not match any allow patterns'
+        return decision, f'Command matches {decision} pattern: {pattern}'
+
+    def check_deny(
+        self, command: str, words: Optional[Sequence[str]] = None, home: Optional[Union[str, Path]] = None
+    ) -> Tuple[str, str]:
+        """
+        Check a command against the deny list only, like check_deny_permission().
+
+        Args:
+            command: The bash command to check
+            words: The command's words from the parser, if known (see CommandView)
+            home: Home directory ~ stands for in the normalized command (None: the user's home)
+
+        Returns:
+            Tuple of (decision, reason) where decision is 'deny' on a match, else 'allow'
+        """
+        try:
+            decision, pattern = self.decide_deny(CommandView(command, words, home))
+        except RegexBudgetExceeded as e:
+            return 'deny', _budget_reason(e)
+        if pattern is None:
+            return decision, 'Command does not match any deny patterns'
+        return decision, f'Command matches deny pattern: {pattern}'
+
+    def check_body(self, body: str) -> Tuple[str, str]:
+        """
+        Check a here-document body, with the same result as check_body_permission().
+
+        Args:
+            body: The here-document body
+
+        Returns:
+            Tuple of (decision, reason) where decision is 'deny' on a match, else 'allow'
+        """
+        try:
+            for pattern, matches in self.body_deny:
+                if matches(body):
+                    return 'deny', f'Here-document body matches deny pattern: {pattern}'
+        except RegexBudgetExceeded as e:
+            return 'deny', _budget_reason(e)
+        return 'allow', 'Here-document body does not match any deny patterns'
+
+
+def compile_body_patterns(
+    patterns: Iterable[str], extended_syntax: bool = True, settings: Optional[CompilerSettings] = None
+) -> List[Tuple[str, Callable[[str], bool]]]:
+    """
+    Compile the [body] patterns of a pattern list.
+
+    Args:
+        patterns: Patterns in configured order
+        extended_syntax: If False, there are no [body] patterns
+        settings: Regex engine settings (None: those of the process)
+
+    Returns:
+        List of (pattern, matches) pairs, matches(body) -> bool
+    """
+    compiled = []
+    for pattern in patterns:
+        if not is_body_pattern(pattern, extended_syntax):
+            continue
+        pattern_type, actual_pattern = parse_body_pattern(pattern, extended_syntax)
+        if pattern_type == PatternType.REGEX:
+            try:
+                search = compile_regex_search(actual_pattern, settings)
+            except re.error:
+                # Invalid regex pattern - never matches, like match_pattern()
+                continue
+            compiled.append((pattern, lambda body, search=search: search(body) is not None))
+        else:
+            compiled.append((pattern, lambda body, t=pattern_type, p=actual_pattern: match_pattern(t, p, body)))
+    return compiled
+
+
+def _budget_reason(error: RegexBudgetExceeded) -> str:
+    """Reason for a command denied because a regex search ran over its budget (fail closed)."""
+    return f'Regex evaluation exceeded its {error.budget_ms:g} ms time budget: [regex]{error.pattern}'
+
+
+def compile_regex_search(pattern: str, settings: Optional[CompilerSettings] = None) -> Callable[[str], object]:
+    """
+    Compile the search function of a [regex] pattern with the configured engine.
+
+    Args:
+        pattern: Regex source
+        settings: Regex engine settings (None: those of the process)
+
+    Returns:
+        Function of a text returning None when the regex matches nowhere in it.
+        With the linear engine it raises RegexBudgetExceeded when a search
+        runs over the budget; regexes outside its subset are compiled by re
+    """
+    settings = settings or _settings
+    if settings.linear_regex:
+        linear = compile_linear(pattern, settings.regex_budget_ms)
+        if linear is not None:
+            return linear.search
+    return re.compile(pattern).search
+
+
+def configure_policy_compiler(
+    codegen: bool = True,
+    hit_counts: Optional[Mapping[str, int]] = None,
+    linear_regex: bool = False,
+    regex_budget_ms: Optional[float] = DEFAULT_REGEX_BUDGET_MS,
+) -> None:
+    """
+    Select how compile_policy() builds policies when it is passed no settings.
+
+    The arguments are those of CompilerSettings. Policies already compiled
+    stay cached: they are keyed by their settings.
+    """
+    global _settings
+    _settings = CompilerSettings(codegen, hit_counts, linear_regex, regex_budget_ms)
+
+
+def compile_policy(
+    allow_patterns: Sequence[str],
+    deny_patterns: Sequence[str],
+    extended_syntax: bool = True,
+    settings: Optional[CompilerSettings] = None,
+) -> CompiledPolicy:
+    """
+    Get the compiled policy for a pattern configuration.
+
+    Compiled policies are cached by their pattern lists and settings, so
+    repeated calls with the same configuration compile it only once.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        settings: How to build the policy (None: the settings of the process,
+            see configure_policy_compiler())
+
+    Returns:
+        The compiled policy
+    """
+    return _compile_policy(tuple(allow_patterns), tuple(deny_patterns), extended_syntax, settings or _settings)
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def _compile_policy(
+    allow_patterns: Tuple[str, ...], deny_patterns: Tuple[str, ...], extended_syntax: bool, settings: CompilerSettings
+) -> CompiledPolicy:
+    if settings.hit_counts is not None:
+        return CompiledPolicy(allow_patterns, deny_patterns, extended_syntax, settings.hit_counts, settings)
+    if settings.codegen:
+        # Imported here because the code generator builds on this module
+        from .policy_codegen import GeneratedPolicy
+
+        try:
+            return GeneratedPolicy(allow_patterns, deny_patterns, extended_syntax, settings)
+        except Exception as e:
+            logger.warning(f'Policy code generation failed, interpreting the policy instead: {e}')
+    return CompiledPolicy(allow_patterns, deny_patterns, extended_syntax, settings=settings)
+
+
+def plan_pattern(pattern_type: PatternType, actual_pattern: str) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """
+    Classify a parsed pattern by the cheapest matcher equivalent to match_parsed_pattern().
+
+    Follows the same dispatch: REGEX patterns are searched in the raw
+    command, path components are looked up in the raw command, and the
+    fnmatch test of the remaining DEFAULT patterns (colon syntax included)
+    is classified by shape (see fnmatch_shape()) and applied to each command
+    variant. GLOB patterns and the cases not modeled here keep the reference
+    matcher.
+
+    Args:
+        pattern_type: Type returned by parse_pattern()
+        actual_pattern: Pattern text returned by parse_pattern()
+
+    Returns:
+        Tuple of (shape, operand, guard, word):
+        - shape: One of the SHAPE_* constants
+        - operand: The literal, regex source or path component the shape tests
+        - guard: Base command that colon syntax `cmd:*` requires first, or None
+        - word: First word of every command the pattern can match, or None
+    """
+    if pattern_type == PatternType.REGEX:
+        try:
+            re.compile(actual_pattern)
+        except re.error:
+            # Invalid regex pattern - treat as non-matching, like match_pattern()
+            return SHAPE_NEVER, '', None, None
+        except Exception:
+            return SHAPE_REFERENCE, '', None, None
+        return SHAPE_REGEX, actual_pattern, None, None
+    if pattern_type == PatternType.GLOB or not _CASE_SENSITIVE_FNMATCH:
+        # GLOB tilde expansion happens per call, and case folding is left to fnmatch
+        return SHAPE_REFERENCE, '', None, None
+
+    if actual_pattern.startswith('**/') and actual_pattern.endswith('/**'):
+        return SHAPE_PATH_COMPONENT, actual_pattern[3:-3], None, None
+
+    pattern_normalized = actual_pattern.replace('**', '*')
+    guard = None
+    if ':' in pattern_normalized:
+        cmd_pattern, args_pattern = pattern_normalized.split(':', 1)
+        cmd_pattern = cmd_pattern.strip()
+        args_pattern = args_pattern.strip()
+        if args_pattern in ('*', '**', ''):
+            pattern_parts = cmd_pattern.split(None, 1)
+            if not pattern_parts:
+                return SHAPE_REFERENCE, '', None, None
+            guard = pattern_parts[0]
+            pattern_normalized = cmd_pattern + '*'
+        else:
+            pattern_normalized = cmd_pattern + ' ' + args_pattern
+
+    shape, operand = fnmatch_shape(pattern_normalized)
+    if guard is not None:
+        word = guard
+        if shape in (SHAPE_EXACT, SHAPE_PREFIX) and operand.startswith(guard + ' '):
+            # The literal already starts with the base command and a space
+            guard = None
+    else:
+        literal_prefix = re.split(r'[*?[]', pattern_normalized, maxsplit=1)[0]
+        word = _first_word(literal_prefix, complete=shape == SHAPE_EXACT)
+    return shape, operand, guard, word
+
+
+def specialize_pattern(
+    pattern_type: PatternType,
+    actual_pattern: str,
+    plan: Optional[Tuple[str, str, Optional[str], Optional[str]]] = None,
+    settings: Optional[CompilerSettings] = None,
+) -> Tuple[str, Callable[[CommandView], bool]]:
+    """
+    Bind the cheapest matcher equivalent to match_parsed_pattern() for a pattern.
+
+    Each command variant is only tried if the previous one did not match, so
+    the normalized command is not computed when the raw one already matches.
+
+    Args:
+        pattern_type: Type returned by parse_pattern()
+        actual_pattern: Pattern text returned by parse_pattern()
+        plan: The pattern's plan_pattern() result, if already computed
+        settings: Regex engine settings (None: those of the process)
+
+    Returns:
+        Tuple of (shape, matcher) where matcher takes a CommandView
+    """
+    shape, operand, guard, _ = plan or plan_pattern(pattern_type, actual_pattern)
+
+    if shape == SHAPE_REFERENCE:
+
+        def reference(view: CommandView) -> bool:
+            return match_parsed_pattern(pattern_type, actual_pattern, view.raw, view.variants, view.words)
+
+        return shape, reference
+    if shape == SHAPE_NEVER:
+        return shape, lambda view: False
+    if pattern_type == PatternType.REGEX:
+        search = compile_regex_search(operand, settings)
+        return shape, lambda view: search(view.raw) is not None
+    if shape == SHAPE_PATH_COMPONENT:
+        return shape, lambda view: contains_path_component(view.raw, operand, view.words)
+
+    test = _text_test(shape, operand)
+    if guard is not None:
+        test = _guarded(test, guard)
+
+    def matches(view: CommandView) -> bool:
+        return test(view.raw) or test(view.normalized)
+
+    return shape, matches
+
+
+def fnmatch_shape(pattern: str) -> Tuple[str, str]:
+    """
+    Classify an fnmatch pattern by the cheapest equivalent test (case-sensitive fnmatch).
+
+    Patterns whose only wildcards are `*` at the ends reduce to string
+    operations; `?`, `[...]` and inner `*` use fnmatch's regex.
+
+    Args:
+        pattern: An fnmatch pattern
+
+    Returns:
+        Tuple of (shape, operand): the literal to compare for exact, prefix,
+        suffix and contains, the regex source for regex, '' for any
+
+    Examples:
+        >>> fnmatch_shape('git *')
+        ('prefix', 'git ')
+        >>> fnmatch_shape('*secret*')
+        ('contains', 'secret')
+    """
+    if '?' not in pattern and '[' not in pattern:
+        # fnmatch.translate() collapses runs of stars the same way
+        segments = re.sub(r'\*+', '*', pattern).split('*')
+        if len(segments) == 1:
+            return SHAPE_EXACT, pattern
+        if len(segments) == 2:
+            head, tail = segments
+            if not head and not tail:
+                return SHAPE_ANY, ''
+            if not tail:
+                return SHAPE_PREFIX, head
+            if not head:
+                return SHAPE_SUFFIX, tail
+        if len(segments) == 3 and not segments[0] and not segments[2]:
+            return SHAPE_CONTAINS, segments[1]
+    return SHAPE_REGEX, fnmatch.translate(pattern)
+
+
+def specialize_fnmatch(pattern: str) -> Tuple[str, Callable[[str], bool]]:
+    """
+    Bind the cheapest test equivalent to fnmatch.fnmatch(text, pattern).
+
+    Where fnmatch folds case, the fnmatch call itself is kept.
+
+    Args:
+        pattern: An fnmatch pattern
+
+    Returns:
+        Tuple of (shape, test) where test takes the text to match
+
+    Examples:
+        >>> specialize_fnmatch('git *')[0]
+        'prefix'
+    """
+    if not _CASE_SENSITIVE_FNMATCH:
+        return SHAPE_REFERENCE, lambda text: fnmatch.fnmatch(text, pattern)
+    shape, operand = fnmatch_shape(pattern)
+    return shape, _text_test(shape, operand)
+
+
+def _text_test(shape: str, operand: str) -> Callable[[str], bool]:
+    """Build the text test for a shape returned by fnmatch_shape()."""
+    if shape == SHAPE_EXACT:
+        return operand.__eq__
+    if shape == SHAPE_ANY:
+        return lambda text: True
+    if shape == SHAPE_PREFIX:
+        return lambda text: text.startswith(operand)
+    if shape == SHAPE_SUFFIX:
+        return lambda text: text.endswith(operand)
+    if shape == SHAPE_CONTAINS:
+        return lambda text: operand in text
+    match = re.compile(operand).match
+    return lambda text: match(text) is not None
+
+
+def _guarded(test: Callable[[str], bool], base_cmd: str) -> Callable[[str], bool]:
+    """Require the base command of colon syntax `cmd:*` before a text test."""
+    base_prefix = base_cmd + ' '
+
+    def guarded(text: str) -> bool:
+        return (text.startswith(base_prefix) or text == base_cmd) and test(text)
+
+    return guarded
+
+
+def _first_word(literal_prefix: str, complete: bool) -> Optional[str]:
+    """
+    Get the first word of every text starting with a literal prefix.
+
+    Args:
+        literal_prefix: Literal text every matching text starts with
+        complete: True if matching texts equal the prefix (no wildcards follow)
+
+    Returns:
+        The word, or None if the prefix does not determine it
+    """
+    parts = literal_prefix.split(None, 1)
+    if not parts or literal_prefix[0].isspace():
+        return None
+    if complete or len(literal_prefix) > len(parts[0]):
+        # Either the text is the prefix, or whitespace ends the word inside the prefix
+        return parts[0]
+    return None
+
+
+def required_literal(pattern_type: PatternType, actual_pattern: str) -> Optional[str]:
+    """
+    Get the most selective (longest) of a parsed pattern's required literals.
+
+    Args:
+        pattern_type: Type returned by parse_pattern()
+        actual_pattern: Pattern text returned by parse_pattern()
+
+    Returns:
+        The literal, or None if the pattern has none that is safe to use
+    """
+    return _longest(required_literals(pattern_type, actual_pattern))
+
+
+def required_literals(pattern_type: PatternType, actual_pattern: str) -> Tuple[str, ...]:
+    """
+    Get the substrings that every command matching a parsed pattern must contain.
+
+    Mirrors the dispatch of match_parsed_pattern(): REGEX patterns are
+    searched in the raw command, GLOB patterns are not gated, and all other
+    patterns (including [native]) go through the DEFAULT rules (path
+    components, colon syntax and fnmatch), whose literal segments must all
+    occur in the matched command.
+
+    Args:
+        pattern_type: Type returned by parse_pattern()
+        actual_pattern: Pattern text returned by parse_pattern()
+
+    Returns:
+        Tuple of literals (empty if the pattern has none that is safe to use)
+    """
+    if pattern_type == PatternType.REGEX:
+        return _regex_literals(actual_pattern)
+    if pattern_type == PatternType.GLOB:
+        # Tilde expansion and path-level matching make GLOB literals unreliable
+        return ()
+
+    # Path component patterns like "**/.env/**" need the component in an argument
+    if actual_pattern.startswith('**/') and actual_pattern.endswith('/**'):
+        component = actual_pattern[3:-3]
+        return (component,) if component else ()
+
+    if not _CASE_SENSITIVE_FNMATCH:
+        return ()
+
+    pattern_normalized = actual_pattern.replace('**', '*')
+    if ':' in pattern_normalized:
+        cmd_pattern, args_pattern = pattern_normalized.split(':', 1)
+        cmd_pattern = cmd_pattern.strip()
+        args_pattern = args_pattern.strip()
+        if args_pattern in ('*', '**', ''):
+            return _fnmatch_literals(cmd_pattern + '*')
+        return _fnmatch_literals(cmd_pattern + ' ' + args_pattern)
+    return _fnmatch_literals(pattern_normalized)
+
+
+def _longest(runs: Iterable[str]) -> Optional[str]:
+    """Pick the longest non-empty literal run."""
+    return max(runs, key=len, default='') or None
+
+
+def _unique_runs(runs: Iterable[str]) -> Tuple[str, ...]:
+    """Drop empty and repeated literal runs, keeping their order."""
+    return tuple(dict.fromkeys(run for run in runs if run))
+
+
+def _fnmatch_literals(pattern: str) -> Tuple[str, ...]:
+    """Get the literal runs between the wildcards of an fnmatch pattern."""
+    if '[' in pattern:
+        # Character classes make the text between brackets non-literal
+        return ()
+    return _unique_runs(re.split(r'[*?]', pattern))
+
+
+def _regex_literals(pattern: str) -> Tuple[str, ...]:
+    """Get the runs of literal characters at the top level of a regex."""
+    if _sre_parser is None:
+        return ()
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except (re.error, RecursionError, OverflowError):
+        # Invalid regexes never match, gating them is pointless
+        return ()
+    if parsed.state.flags & re.IGNORECASE:
+        return ()
+
+    runs = []
+    current = []
+    for op, av in parsed:
+        if op is _sre_constants.LITERAL:
+            current.append(chr(av))
+        else:
+            # Anything else (repeats, groups, branches, classes, anchors) ends the run
+            runs.append(''.join(current))
+            current = []
+    runs.append(''.join(current))
+    return _unique_runs(runs)
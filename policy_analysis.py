@@ -0,0 +1,515 @@
+"""
+Static analysis of permission policies for toolguard.
+
+merge_permissions() only drops identical pattern strings, so merged policies
+often keep patterns that can never change a decision:
+
+- unreachable: the pattern never matches (an invalid [regex]), or every
+  command it matches already matches an earlier pattern of the same list,
+  so it is never the reported match
+- subsumed: every command it matches also matches a later, broader pattern
+  of the same list (`git log:*` before `git *`)
+- shadowed: an allow pattern whose every command matches a deny pattern,
+  so it never allows anything
+
+Regex patterns are also checked for shapes that make a backtracking search
+take exponential time (linear_regex.redos_risks()). These `redos` findings
+are warnings only; the pattern is kept.
+
+[body] patterns only match here-document bodies, so they are never compared
+with command patterns or pruned; their regexes are still checked.
+
+Coverage is decided on the shapes of policy.plan_pattern() and is
+conservative: a pattern is only reported when the broader pattern provably
+matches every command it matches. Pruning therefore never changes a
+decision. For subsumed patterns it only changes which pattern the reason
+names, to the broader pattern that also matches.
+
+A review takes milliseconds for a few hundred patterns, far more than a
+check, so review_policy_once() keeps reviews by a hash of the patterns, in
+process and as signed entries in the cache directory, and tells callers
+whether the findings are new.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .cache_trust import sign, verify
+from .error_log import log_warning
+from .linear_regex import redos_risks
+from .patterns import PatternType, is_body_pattern, parse_body_pattern, parse_pattern
+from .policy import (
+    SHAPE_ANY,
+    SHAPE_CONTAINS,
+    SHAPE_EXACT,
+    SHAPE_NEVER,
+    SHAPE_PATH_COMPONENT,
+    SHAPE_PREFIX,
+    SHAPE_REFERENCE,
+    SHAPE_REGEX,
+    SHAPE_SUFFIX,
+    plan_pattern,
+)
+
+logger = logging.getLogger(__name__)
+
+KIND_UNREACHABLE = 'unreachable'
+KIND_SUBSUMED = 'subsumed'
+KIND_SHADOWED = 'shadowed'
+KIND_REDOS = 'redos'
+
+# Shapes tested with a string operation or fnmatch regex on every command variant
+_TEXT_SHAPES = (SHAPE_EXACT, SHAPE_PREFIX, SHAPE_SUFFIX, SHAPE_CONTAINS, SHAPE_ANY)
+
+# Source files whose content defines the result of a review
+_VERSIONED_SOURCES = ('policy_analysis.py', 'policy.py', 'patterns.py', 'linear_regex.py')
+
+# A review: (allow_patterns, deny_patterns, findings), see review_policy()
+Review = Tuple[List[str], List[str], List[Dict[str, str]]]
+
+# Reviews of this process by policy hash
+_reviews: Dict[str, Review] = {}
+_reviews_lock = threading.Lock()
+_analysis_version: Optional[str] = None
+
+
+class _PatternInfo:
+    """A pattern with its plan_pattern() classification."""
+
+    __slots__ = (
+        'pattern',
+        'body',
+        'pattern_type',
+        'actual_pattern',
+        'shape',
+        'operand',
+        'guard',
+        'word',
+        'on_variants',
+    )
+
+    def __init__(self, pattern: str, extended_syntax: bool):
+        self.pattern = pattern
+        self.body = is_body_pattern(pattern, extended_syntax)
+        parse = parse_body_pattern if self.body else parse_pattern
+        self.pattern_type, self.actual_pattern = parse(pattern, extended_syntax)
+        self.shape, self.operand, self.guard, self.word = plan_pattern(self.pattern_type, self.actual_pattern)
+        # DEFAULT fnmatch tests run on the raw and the normalized command
+        self.on_variants = self.pattern_type != PatternType.REGEX and self.shape not in (
+            SHAPE_NEVER,
+            SHAPE_PATH_COMPONENT,
+            SHAPE_REFERENCE,
+        )
+
+
+def pattern_covers(general: str, specific: str, extended_syntax: bool = True) -> bool:
+    """
+    Check whether every command matching one pattern also matches another.
+
+    Conservative: False means coverage could not be proven, not that some
+    command tells the patterns apart.
+
+    Args:
+        general: The broader pattern
+        specific: The narrower pattern
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        True if `general` matches every command `specific` matches
+
+    Examples:
+        >>> pattern_covers('git *', 'git log:*')
+        True
+        >>> pattern_covers('git log:*', 'git *')
+        False
+    """
+    return _covers(_PatternInfo(general, extended_syntax), _PatternInfo(specific, extended_syntax))
+
+
+def _covers(general: _PatternInfo, specific: _PatternInfo) -> bool:
+    """Check coverage between classified patterns."""
+    if specific.shape == SHAPE_NEVER:
+        return True
+    if general.pattern_type == specific.pattern_type and general.actual_pattern == specific.actual_pattern:
+        return True
+    if general.on_variants and general.shape == SHAPE_ANY and general.guard is None:
+        # `*` matches every command text
+        return True
+    if general.on_variants and specific.on_variants:
+        if general.guard is not None and not _implies_guard(specific, general.guard):
+            return False
+        return _text_implies(specific.shape, specific.operand, general.shape, general.operand)
+    if general.shape == specific.shape == SHAPE_PATH_COMPONENT:
+        return general.operand == specific.operand
+    if general.pattern_type == specific.pattern_type == PatternType.REGEX:
+        return general.shape == specific.shape and general.operand == specific.operand
+    return False
+
+
+def _implies_guard(specific: _PatternInfo, base_cmd: str) -> bool:
+    """Check that every text matching a pattern passes the `cmd:*` base command check."""
+    if specific.guard == base_cmd:
+        return True
+    if specific.shape == SHAPE_EXACT and specific.operand == base_cmd:
+        return True
+    return specific.shape in (SHAPE_EXACT, SHAPE_PREFIX) and specific.operand.startswith(base_cmd + ' ')
+
+
+def _text_implies(specific_shape: str, specific_operand: str, general_shape: str, general_operand: str) -> bool:
+    """Check that every text passing one fnmatch test passes another."""
+    if general_shape == SHAPE_ANY:
+        return True
+    if specific_shape == general_shape and specific_operand == general_operand:
+        return True
+
+    if specific_shape == SHAPE_EXACT:
+        if general_shape == SHAPE_PREFIX:
+            return specific_operand.startswith(general_operand)
+        if general_shape == SHAPE_SUFFIX:
+            return specific_operand.endswith(general_operand)
+        if general_shape == SHAPE_CONTAINS:
+            return general_operand in specific_operand
+        if general_shape not in _TEXT_SHAPES:
+            # fnmatch regex: the only text is the literal itself
+            return re.match(general_operand, specific_operand) is not None
+        return False
+    if specific_shape == SHAPE_PREFIX:
+        if general_shape == SHAPE_PREFIX:
+            return specific_operand.startswith(general_operand)
+        return general_shape == SHAPE_CONTAINS and general_operand in specific_operand
+    if specific_shape == SHAPE_SUFFIX:
+        if general_shape == SHAPE_SUFFIX:
+            return specific_operand.endswith(general_operand)
+        return general_shape == SHAPE_CONTAINS and general_operand in specific_operand
+    if specific_shape == SHAPE_CONTAINS:
+        return general_shape == SHAPE_CONTAINS and general_operand in specific_operand
+    return False
+
+
+def _candidates(kept: Dict[Optional[str], List[_PatternInfo]], info: _PatternInfo) -> List[_PatternInfo]:
+    """Get the kept patterns that may cover a pattern, given the first words they match."""
+    if info.word is None:
+        return [candidate for bucket in kept.values() for candidate in bucket]
+    # Patterns bound to another first word match disjoint commands
+    return kept.get(info.word, []) + kept.get(None, [])
+
+
+def _finding(kind: str, list_name: str, pattern: str, covered_by: str = '', risk: str = '') -> Dict[str, str]:
+    """Build a finding in the format of config_validation.validate_permissions()."""
+    if kind == KIND_REDOS:
+        message = (
+            f'{list_name.capitalize()} pattern "{pattern}" can take exponential time on some commands: '
+            f'it has {risk}'
+        )
+        corrective_steps = (
+            f'Rewrite "{pattern}" without nested or overlapping repeats, '
+            'or set TOOLGUARD_LINEAR_REGEX=true to search it in linear time.'
+        )
+    elif kind == KIND_SHADOWED:
+        message = (
+            f'Allow pattern "{pattern}" is shadowed by deny pattern "{covered_by}": every command it matches is denied'
+        )
+        corrective_steps = (
+            f'Remove "{pattern}" from the allow list, or narrow "{covered_by}" if these commands should be allowed.'
+        )
+    elif kind == KIND_SUBSUMED:
+        message = f'{list_name.capitalize()} pattern "{pattern}" is subsumed by the broader pattern "{covered_by}"'
+        corrective_steps = f'Remove "{pattern}"; every command it matches still matches "{covered_by}".'
+    elif covered_by:
+        message = (
+            f'{list_name.capitalize()} pattern "{pattern}" is unreachable: every command it matches '
+            f'already matches the earlier pattern "{covered_by}"'
+        )
+        corrective_steps = f'Remove "{pattern}" from the {list_name} list.'
+    else:
+        message = f'{list_name.capitalize()} pattern "{pattern}" can never match'
+        corrective_steps = f'Fix "{pattern}" (for example an invalid [regex]) or remove it from the {list_name} list.'
+    return {
+        'level': 'warning',
+        'kind': kind,
+        'list': list_name,
+        'pattern': pattern,
+        'covered_by': covered_by,
+        'message': message,
+        'corrective_steps': corrective_steps,
+    }
+
+
+def _prune_list(list_name: str, infos: List[_PatternInfo]) -> Tuple[List[_PatternInfo], List[Dict[str, str]]]:
+    """Drop unreachable and subsumed patterns of one list, keeping every dropped one covered by a kept one."""
+    findings = []
+
+    # Forward: patterns covered by an earlier kept pattern are never the first match
+    forward: List[_PatternInfo] = []
+    earlier: Dict[Optional[str], List[_PatternInfo]] = {}
+    for info in infos:
+        if info.shape == SHAPE_NEVER:
+            findings.append(_finding(KIND_UNREACHABLE, list_name, info.pattern))
+            continue
+        cover = next((g for g in _candidates(earlier, info) if _covers(g, info)), None)
+        if cover is not None:
+            findings.append(_finding(KIND_UNREACHABLE, list_name, info.pattern, cover.pattern))
+            continue
+        forward.append(info)
+        earlier.setdefault(info.word, []).append(info)
+
+    # Backward: patterns covered by a later kept pattern are subsumed by it
+    kept: List[_PatternInfo] = []
+    later: Dict[Optional[str], List[_PatternInfo]] = {}
+    for info in reversed(forward):
+        cover = next((g for g in _candidates(later, info) if _covers(g, info)), None)
+        if cover is not None:
+            findings.append(_finding(KIND_SUBSUMED, list_name, info.pattern, cover.pattern))
+            continue
+        kept.append(info)
+        later.setdefault(info.word, []).append(info)
+    kept.reverse()
+    return kept, findings
+
+
+def _redos_findings(list_name: str, infos: List[_PatternInfo]) -> List[Dict[str, str]]:
+    """Warn about regex patterns that can backtrack catastrophically."""
+    findings = []
+    for info in infos:
+        if info.pattern_type == PatternType.REGEX and info.shape == SHAPE_REGEX:
+            for risk in redos_risks(info.actual_pattern):
+                findings.append(_finding(KIND_REDOS, list_name, info.pattern, risk=risk))
+    return findings
+
+
+def review_policy(
+    allow_patterns: Sequence[str], deny_patterns: Sequence[str], extended_syntax: bool = True
+) -> Tuple[List[str], List[str], List[Dict[str, str]]]:
+    """
+    Analyze a policy and prune it in one pass.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        Tuple of (allow_patterns, deny_patterns, findings), see prune_policy()
+        and analyze_policy()
+    """
+    deny_infos = [_PatternInfo(p, extended_syntax) for p in deny_patterns]
+    allow_infos = [_PatternInfo(p, extended_syntax) for p in allow_patterns]
+    findings = _redos_findings('deny', deny_infos) + _redos_findings('allow', allow_infos)
+
+    # [body] patterns are kept as they are, after the command patterns
+    deny_bodies = [info.pattern for info in deny_infos if info.body]
+    allow_bodies = [info.pattern for info in allow_infos if info.body]
+    deny_infos = [info for info in deny_infos if not info.body]
+    allow_infos = [info for info in allow_infos if not info.body]
+
+    deny, deny_findings = _prune_list('deny', deny_infos)
+    allow, allow_findings = _prune_list('allow', allow_infos)
+    findings.extend(deny_findings)
+    findings.extend(allow_findings)
+
+    deny_by_word: Dict[Optional[str], List[_PatternInfo]] = {}
+    for info in deny:
+        deny_by_word.setdefault(info.word, []).append(info)
+    live_allow = []
+    for info in allow:
+        cover = next((g for g in _candidates(deny_by_word, info) if _covers(g, info)), None)
+        if cover is not None:
+            findings.append(_finding(KIND_SHADOWED, 'allow', info.pattern, cover.pattern))
+        else:
+            live_allow.append(info)
+
+    return (
+        [info.pattern for info in live_allow] + allow_bodies,
+        [info.pattern for info in deny] + deny_bodies,
+        findings,
+    )
+
+
+def analyze_policy(
+    allow_patterns: Sequence[str], deny_patterns: Sequence[str], extended_syntax: bool = True
+) -> List[Dict[str, str]]:
+    """
+    Find unreachable, subsumed and shadowed patterns of a policy, and regex
+    patterns at risk of catastrophic backtracking.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        List of finding dictionaries with keys:
+        - level: Always 'warning'
+        - kind: 'unreachable', 'subsumed', 'shadowed' or 'redos'
+        - list: 'allow' or 'deny'
+        - pattern: The pattern that can be removed (or, for 'redos', rewritten)
+        - covered_by: The pattern that covers it ('' if it never matches, and for 'redos')
+        - message: Human-readable warning message
+        - corrective_steps: Suggested actions to fix the issue
+    """
+    return review_policy(allow_patterns, deny_patterns, extended_syntax)[2]
+
+
+def prune_policy(
+    allow_patterns: Sequence[str], deny_patterns: Sequence[str], extended_syntax: bool = True
+) -> Tuple[List[str], List[str]]:
+    """
+    Drop the unreachable, subsumed and shadowed patterns, keeping the configured order.
+
+    Decisions are unchanged. A command that matched a subsumed pattern is
+    reported as matching the broader pattern instead.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        Tuple of (allow_patterns, deny_patterns) without the removable patterns
+    """
+    allow, deny, _ = review_policy(allow_patterns, deny_patterns, extended_syntax)
+    return allow, deny
+
+
+def analysis_version() -> str:
+    """
+    Get a hash identifying the policy analysis implementation.
+
+    Returns:
+        Hex digest of the analysis and matcher sources
+    """
+    global _analysis_version
+    if _analysis_version is None:
+        digest = hashlib.sha256()
+        package_dir = Path(__file__).parent
+        for name in _VERSIONED_SOURCES:
+            try:
+                digest.update((package_dir / name).read_bytes())
+            except OSError:
+                digest.update(name.encode())
+        _analysis_version = digest.hexdigest()
+    return _analysis_version
+
+
+def review_policy_once(
+    allow_patterns: Sequence[str],
+    deny_patterns: Sequence[str],
+    extended_syntax: bool = True,
+    cache_dir: Optional[Union[str, Path]] = None,
+    key: Optional[bytes] = None,
+) -> Tuple[List[str], List[str], List[Dict[str, str]], bool]:
+    """
+    Review a policy, reusing an earlier review of the same patterns.
+
+    Reviews are kept in process, and in cache_dir when a key signing the
+    entries is given (see cache_trust.py), so a one-shot process reviews
+    each policy once per change.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+        cache_dir: Optional directory for persistent reviews (None keeps them in process only)
+        key: Key signing persistent reviews (None keeps them in process only)
+
+    Returns:
+        Tuple of (allow_patterns, deny_patterns, findings, new), see
+        review_policy(); new is False if the review was reused, so its
+        findings were already reported
+    """
+    policy = json.dumps([list(allow_patterns), list(deny_patterns), extended_syntax])
+    digest = hashlib.sha256(policy.encode('utf-8')).hexdigest()
+    with _reviews_lock:
+        review = _reviews.get(digest)
+    if review is not None:
+        return review[0], review[1], review[2], False
+
+    path = Path(cache_dir) / 'review' / analysis_version()[:16] / f'{digest}.json' if cache_dir and key else None
+    new = True
+    review = _read_review(path, key, policy) if path is not None else None
+    if review is not None:
+        new = False
+    else:
+        review = review_policy(allow_patterns, deny_patterns, extended_syntax)
+        if path is not None:
+            _write_review(path, key, policy, review)
+    with _reviews_lock:
+        _reviews[digest] = review
+    return review[0], review[1], review[2], new
+
+
+def apply_policy_review(
+    allow_patterns: List[str],
+    deny_patterns: List[str],
+    env_config: Mapping[str, Any],
+    cache_dir: Optional[Union[str, Path]] = None,
+    key: Optional[bytes] = None,
+) -> Tuple[List[str], List[str]]:
+    """
+    Report unreachable, subsumed and shadowed patterns, and prune them if enabled.
+
+    This is the review step of the hook and of PolicyEngine. Findings are
+    logged once per policy change (see review_policy_once()).
+
+    Args:
+        allow_patterns: Bash allow patterns
+        deny_patterns: Bash deny patterns
+        env_config: Environment configuration dict with log_dir, extended_syntax and prune_patterns
+        cache_dir: Trusted cache directory for reviews (see hook.load_evaluation_settings())
+        key: Key signing the reviews in cache_dir
+
+    Returns:
+        Tuple of (allow_patterns, deny_patterns) to check commands against
+    """
+    pruned_allow, pruned_deny, findings, new = review_policy_once(
+        allow_patterns, deny_patterns, env_config.get('extended_syntax', True), cache_dir, key
+    )
+
+    log_dir = env_config.get('log_dir')
+    if new and log_dir:
+        for finding in findings:
+            log_warning(finding['message'], finding['corrective_steps'], log_dir)
+
+    if env_config.get('prune_patterns', False):
+        return pruned_allow, pruned_deny
+    return allow_patterns, deny_patterns
+
+
+def _review_payload(policy: str, review: list) -> bytes:
+    """Serialize what the signature of a persistent review covers."""
+    return json.dumps([analysis_version(), policy, review]).encode('utf-8')
+
+
+def _read_review(path: Path, key: bytes, policy: str) -> Optional[Review]:
+    """Read a persistent review, ignoring missing, corrupt or unsigned files."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('policy') != policy:
+        return None
+    review = data.get('review')
+    if not verify(key, _review_payload(policy, review), data.get('signature')):
+        return None
+    allow, deny, findings = review
+    return allow, deny, findings
+
+
+def _write_review(path: Path, key: bytes, policy: str, review: Review) -> None:
+    """Write a persistent review atomically; failures only mean the next process reviews again."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        signature = sign(key, _review_payload(policy, list(review)))
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'policy': policy, 'review': list(review), 'signature': signature}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f'Failed to persist policy review: {e}')
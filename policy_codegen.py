@@ -0,0 +1,311 @@
+"""
+Policy code generation for toolguard.
+
+A CompiledPolicy (policy.py) interprets its pattern lists: every check walks
+the deny list, then the allow list, calling one matcher per pattern. This
+module compiles a whole policy into Python source instead, with two functions:
+
+- decide(view) -> (decision, pattern), the rules of CompiledPolicy.decide()
+- decide_deny(view) -> (decision, pattern), the rules of CompiledPolicy.decide_deny()
+
+Each pattern becomes one `if` on inlined string operations (`==`,
+`startswith`, `endswith`, `in`) or a regex constant compiled when the code
+is loaded, following the shapes of policy.plan_pattern(). Patterns whose
+matching commands all start with a known word (`git *`, `rm -rf:*`,
+`[native]npm * install`) are dispatched through a dict keyed by the first
+word of the command, so a command only runs the patterns of its own word
+plus those that can match any command, still in configured order.
+
+[body] patterns are not part of the generated code; they are compiled as in
+CompiledPolicy and checked by its check_body().
+
+The first word of the raw and normalized command is always the same (path
+normalization never rewrites the command word), so dispatching on the raw
+command is valid for both variants.
+
+Generated code is compiled in the process that uses it and never read
+from disk, since code loaded from a cache directory would run with the
+hook's authority. Compiling a policy costs tens of milliseconds, so code
+generation pays off in long-running processes (see PolicyEngine in
+engine.py), where compile_policy() compiles each policy once.
+"""
+
+import hashlib
+import json
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .patterns import PatternType, is_body_pattern, parse_pattern
+from .policy import (
+    SHAPE_ANY,
+    SHAPE_CONTAINS,
+    SHAPE_EXACT,
+    SHAPE_NEVER,
+    SHAPE_PATH_COMPONENT,
+    SHAPE_PREFIX,
+    SHAPE_REFERENCE,
+    SHAPE_SUFFIX,
+    CommandView,
+    CompiledPolicy,
+    CompilerSettings,
+    compile_body_patterns,
+    plan_pattern,
+)
+
+# Dispatch duplicates the word-independent rules into every word's function;
+# above this many emitted rules the policy is generated as one function instead
+MAX_DISPATCH_RULES = 20000
+
+_HEADER = '''\
+# Generated by toolguard.policy_codegen - do not edit
+import re as _re
+
+from toolguard.patterns import PatternType as _PatternType
+from toolguard.permissions import contains_path_component as _contains_path_component
+from toolguard.permissions import match_parsed_pattern as _match_parsed_pattern
+from toolguard.policy import compile_regex_search as _compile_regex_search
+
+# _SETTINGS, the CompilerSettings of the policy, is set before this code runs
+'''
+
+
+class _Rule:
+    """One pattern of the policy as a generated condition."""
+
+    __slots__ = ('decision', 'pattern', 'condition', 'word')
+
+    def __init__(self, decision: str, pattern: str, condition: str, word: Optional[str]):
+        self.decision = decision
+        self.pattern = pattern
+        self.condition = condition
+        self.word = word
+
+
+class _PolicySource:
+    """Builder for the source of a generated policy."""
+
+    def __init__(self, allow_patterns: Sequence[str], deny_patterns: Sequence[str], extended_syntax: bool):
+        self.constants: List[str] = []
+        self.deny = self._rules('deny', deny_patterns, extended_syntax)
+        self.allow = self._rules('allow', allow_patterns, extended_syntax)
+
+    def _constant(self, expression: str) -> str:
+        """Add a module-level constant and return its name."""
+        name = f'_C{len(self.constants)}'
+        self.constants.append(f'{name} = {expression}')
+        return name
+
+    def _rules(self, decision: str, patterns: Sequence[str], extended_syntax: bool) -> List[_Rule]:
+        """Build the rules of a pattern list, skipping patterns that never match."""
+        rules = []
+        for pattern in patterns:
+            if is_body_pattern(pattern, extended_syntax):
+                continue
+            pattern_type, actual_pattern = parse_pattern(pattern, extended_syntax)
+            shape, operand, guard, word = plan_pattern(pattern_type, actual_pattern)
+            if shape == SHAPE_NEVER:
+                continue
+            condition = self._condition(pattern_type, actual_pattern, shape, operand, guard)
+            rules.append(_Rule(decision, pattern, condition, word))
+        return rules
+
+    def _condition(
+        self, pattern_type: PatternType, actual_pattern: str, shape: str, operand: str, guard: Optional[str]
+    ) -> str:
+        """Build the condition of one pattern, in terms of `view` and `raw`."""
+        if shape == SHAPE_REFERENCE:
+            return (
+                f'_match_parsed_pattern(_PatternType.{pattern_type.name}, {actual_pattern!r}, raw, view.variants, '
+                'view.words)'
+            )
+        if pattern_type == PatternType.REGEX:
+            # Compiled when the code is loaded, with the engine of the policy's settings
+            search = self._constant(f'_compile_regex_search({operand!r}, _SETTINGS)')
+            return f'{search}(raw) is not None'
+        if shape == SHAPE_PATH_COMPONENT:
+            return f'_contains_path_component(raw, {operand!r}, view.words)'
+        if shape == SHAPE_ANY and guard is None:
+            return 'True'
+
+        if shape not in (SHAPE_EXACT, SHAPE_PREFIX, SHAPE_SUFFIX, SHAPE_CONTAINS, SHAPE_ANY):
+            match = self._constant(f'_re.compile({operand!r}).match')
+
+        def test(text: str) -> str:
+            if shape == SHAPE_EXACT:
+                condition = f'{text} == {operand!r}'
+            elif shape == SHAPE_PREFIX:
+                condition = f'{text}.startswith({operand!r})'
+            elif shape == SHAPE_SUFFIX:
+                condition = f'{text}.endswith({operand!r})'
+            elif shape == SHAPE_CONTAINS:
+                condition = f'{operand!r} in {text}'
+            elif shape == SHAPE_ANY:
+                condition = 'True'
+            else:
+                condition = f'{match}({text}) is not None'
+            if guard is not None:
+                guard_condition = f'({text}.startswith({guard + " "!r}) or {text} == {guard!r})'
+                if shape == SHAPE_PREFIX and guard.startswith(operand):
+                    # `cmd:*` - the base command check already implies the prefix
+                    return guard_condition
+                condition = f'{guard_condition} and {condition}'
+            return condition
+
+        # The normalized command is only computed when the raw one does not match
+        return f'({test("raw")}) or ({test("view.normalized")})'
+
+    def render(self) -> str:
+        """Render the module source."""
+        words = sorted({rule.word for rule in self.deny + self.allow if rule.word is not None})
+        generic_deny = [rule for rule in self.deny if rule.word is None]
+        generic_all = generic_deny + [rule for rule in self.allow if rule.word is None]
+        if len(words) * len(generic_all) > MAX_DISPATCH_RULES:
+            # One function with every rule
+            words = []
+            generic_deny = self.deny
+            generic_all = self.deny + self.allow
+
+        lines = [_HEADER]
+        lines.extend(self.constants)
+
+        decide_table = []
+        deny_table = []
+        for index, word in enumerate(words):
+            deny_rules = [rule for rule in self.deny if rule.word in (None, word)]
+            allow_rules = [rule for rule in self.allow if rule.word in (None, word)]
+            lines.append(_function(f'_decide_{index}', deny_rules + allow_rules, 'deny'))
+            decide_table.append(f'    {word!r}: _decide_{index},')
+            if any(rule.word == word for rule in deny_rules):
+                lines.append(_function(f'_decide_deny_{index}', deny_rules, 'allow'))
+                deny_table.append(f'    {word!r}: _decide_deny_{index},')
+
+        # Commands whose word no pattern names only run the word-independent rules
+        lines.append(_function('_decide_generic', generic_all, 'deny'))
+        lines.append(_function('_decide_deny_generic', generic_deny, 'allow'))
+        lines.append(_table('_DECIDE', decide_table))
+        lines.append(_table('_DECIDE_DENY', deny_table))
+        lines.append(_ENTRY_POINTS)
+        return '\n'.join(lines)
+
+
+_ENTRY_POINTS = '''
+
+def decide(view):
+    """Return (decision, pattern) like CompiledPolicy.decide()."""
+    return _DECIDE.get(view.first_word, _decide_generic)(view, view.raw)
+
+
+def decide_deny(view):
+    """Return (decision, pattern) like CompiledPolicy.decide_deny()."""
+    return _DECIDE_DENY.get(view.first_word, _decide_deny_generic)(view, view.raw)
+'''
+
+
+def _table(name: str, entries: List[str]) -> str:
+    """Render a dispatch table."""
+    if not entries:
+        return f'\n\n{name} = {{}}'
+    return f'\n\n{name} = {{\n' + '\n'.join(entries) + '\n}'
+
+
+def _function(name: str, rules: List[_Rule], default: str) -> str:
+    """Render one decide function: the rules in order, then the default decision."""
+    lines = ['', '', f'def {name}(view, raw):']
+    for rule in rules:
+        if rule.condition == 'True':
+            # Every later rule is unreachable
+            lines.append(f'    return {rule.decision!r}, {rule.pattern!r}')
+            return '\n'.join(lines)
+        lines.append(f'    if {rule.condition}:')
+        lines.append(f'        return {rule.decision!r}, {rule.pattern!r}')
+    lines.append(f'    return {default!r}, None')
+    return '\n'.join(lines)
+
+
+def generate_policy_source(
+    allow_patterns: Sequence[str], deny_patterns: Sequence[str], extended_syntax: bool = True
+) -> str:
+    """
+    Generate the Python source of a policy.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        Module source defining decide(view) and decide_deny(view)
+    """
+    return _PolicySource(allow_patterns, deny_patterns, extended_syntax).render()
+
+
+def compile_policy_code(
+    allow_patterns: Sequence[str], deny_patterns: Sequence[str], extended_syntax: bool = True
+) -> CodeType:
+    """
+    Generate and compile the code of a policy.
+
+    Args:
+        allow_patterns: List of patterns that allow commands
+        deny_patterns: List of patterns that deny commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        Code object of the generated module
+    """
+    key_source = json.dumps([list(allow_patterns), list(deny_patterns), extended_syntax])
+    key = hashlib.sha256(key_source.encode('utf-8', 'surrogatepass')).hexdigest()
+    source = generate_policy_source(allow_patterns, deny_patterns, extended_syntax)
+    return compile(source, f'<toolguard policy {key[:12]}>', 'exec')
+
+
+class GeneratedPolicy(CompiledPolicy):
+    """
+    A policy whose decide() and decide_deny() are generated Python code.
+
+    check() and check_deny() are inherited, so reasons are the same as with
+    the interpreted CompiledPolicy, which stays available as `interpreter`
+    for debugging.
+    """
+
+    def __init__(
+        self,
+        allow_patterns: Sequence[str],
+        deny_patterns: Sequence[str],
+        extended_syntax: bool = True,
+        settings: Optional[CompilerSettings] = None,
+    ):
+        """
+        Generate, compile and execute the code of a policy.
+
+        Args:
+            allow_patterns: List of patterns that allow commands
+            deny_patterns: List of patterns that deny commands
+            extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+            settings: Regex engine settings (None: those of the process)
+        """
+        self.allow_patterns = tuple(allow_patterns)
+        self.deny_patterns = tuple(deny_patterns)
+        self.extended_syntax = extended_syntax
+        self.settings = settings
+        self._interpreter: Optional[CompiledPolicy] = None
+
+        namespace: Dict[str, object] = {'__name__': 'toolguard.generated_policy', '_SETTINGS': settings}
+        exec(compile_policy_code(self.allow_patterns, self.deny_patterns, extended_syntax), namespace)
+        self.decide: Callable[[CommandView], Tuple[str, Optional[str]]] = namespace['decide']
+        self.decide_deny: Callable[[CommandView], Tuple[str, Optional[str]]] = namespace['decide_deny']
+        self.body_deny = compile_body_patterns(self.deny_patterns, extended_syntax, settings)
+
+    @property
+    def source(self) -> str:
+        """The generated source, for inspection."""
+        return generate_policy_source(self.allow_patterns, self.deny_patterns, self.extended_syntax)
+
+    @property
+    def interpreter(self) -> CompiledPolicy:
+        """The reference interpreter of the same policy."""
+        if self._interpreter is None:
+            self._interpreter = CompiledPolicy(
+                self.allow_patterns, self.deny_patterns, self.extended_syntax, settings=self.settings
+            )
+        return self._interpreter
@@ -8,7 +8,8 @@ and command substitutions.
 
 import unittest
 
-from toolguard.parser import bash_parser
+from toolguard.parser import bash_parser, bash_parser_fast
+from toolguard.parser.derive_parsers import SOURCE_PATH, FAST_PATH, derive_fast_parser
 
 
 class TestBashParserAST(unittest.TestCase):
@@ -195,5 +196,91 @@ class TestMixedConstructs(unittest.TestCase):
         self.assertIsNotNone(tree)
 
 
+class TestFastParser(unittest.TestCase):
+    """Test the diagnostics-free parser variant derived from the Canopy output."""
+
+    SAMPLES = [
+        'ls -la',
+        'git status && git log --oneline | head -5',
+        'cd src && uv run pytest -x; echo done &',
+        '(cd /tmp && rm file) || { echo failed; }',
+        'echo $(cat $(find . -name "*.txt")) > out.txt 2>&1',
+        "grep -r 'a && b' . | wc -l",
+        'cat <<EOF > file.py',
+    ]
+
+    def _texts(self, node):
+        """Flatten a parse tree into (offset, text) pairs."""
+        result = [(node.offset, node.text)]
+        for child in node.elements or []:
+            result.extend(self._texts(child))
+        return result
+
+    def test_derived_parser_is_up_to_date(self):
+        """Test that bash_parser_fast.py matches what derive_parsers generates."""
+        self.assertEqual(FAST_PATH.read_text(), derive_fast_parser(SOURCE_PATH.read_text()))
+
+    def test_same_tree_as_diagnostic_parser(self):
+        """Test that both parsers build identical trees for valid input."""
+        for sample in self.SAMPLES:
+            with self.subTest(sample=sample):
+                self.assertEqual(
+                    self._texts(bash_parser_fast.parse(sample)), self._texts(bash_parser.parse(sample))
+                )
+
+    def test_nodes_share_the_input(self):
+        """Test that fast parser nodes hold offsets into the input, not copies of their text."""
+        command = 'cd /tmp && (echo $(cat a.txt) | wc -l)'
+        stack = [bash_parser_fast.parse(command)]
+        while stack:
+            node = stack.pop()
+            self.assertIs(node.input, command)
+            self.assertFalse(hasattr(node, '__dict__'))
+            self.assertEqual(node.text, command[node.offset : node.end])
+            stack.extend(node.elements)
+
+    def test_memo_window(self):
+        """Test that the memo is dropped at top-level control operators without changing the tree."""
+        script = ' && '.join(f'cat log_{i}.txt | grep -v x > out_{i} || (echo $(date) {i}; true)' for i in range(50))
+        parser = bash_parser_fast.Parser(script, None, None)
+        tree = parser.parse()
+        self.assertEqual(self._texts(tree), self._texts(bash_parser.parse(script)))
+        # Only entries of the last top-level pipeline (and the rules after it) remain
+        self.assertLess(sum(len(entries) for entries in parser._cache.values()), 300)
+
+        for sample in self.SAMPLES + ['  a; b', '(a; b) && c']:
+            with self.subTest(sample=sample):
+                parser = bash_parser_fast.Parser(sample, None, None)
+                parser._memo_window = False
+                self.assertEqual(self._texts(parser.parse()), self._texts(bash_parser_fast.parse(sample)))
+
+    def test_nested_first(self):
+        """Test that parsing nested commands first builds the same tree and bounds the recursion."""
+        for sample in self.SAMPLES + ['echo "$(ls `pwd`)" && { (a; b) | c; }', 'echo \'$(\' "a { (b" ${y}']:
+            with self.subTest(sample=sample):
+                parser = bash_parser_fast.Parser(sample, None, None)
+                parser._nesting_limit = 0
+                self.assertEqual(self._texts(parser.parse()), self._texts(bash_parser_fast.parse(sample)))
+
+        command = 'ls'
+        for _ in range(300):
+            command = f'echo $({command}) | (cat; {{ wc; }})'
+        with self.assertRaises(RecursionError):
+            parser = bash_parser_fast.Parser(command, None, None)
+            parser._nesting_limit = len(command)
+            parser.parse()
+        tree = bash_parser_fast.parse(command)
+        self.assertEqual(tree.text, command)
+
+    def test_failure_raises_diagnostic_parse_error(self):
+        """Test that failures re-parse in diagnostic mode to build the message."""
+        with self.assertRaises(bash_parser.ParseError) as fast_error:
+            bash_parser_fast.parse('echo "unterminated')
+        with self.assertRaises(bash_parser.ParseError) as error:
+            bash_parser.parse('echo "unterminated')
+        self.assertEqual(str(fast_error.exception), str(error.exception))
+        self.assertIn('expected one of', str(fast_error.exception))
+
+
 if __name__ == '__main__':
     unittest.main()
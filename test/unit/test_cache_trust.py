@@ -0,0 +1,82 @@
+"""
+Unit tests for the trust checks of the persistent cache directory.
+"""
+
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from toolguard.cache_trust import KEY_FILE, check_cache_dir, load_cache_key, sign, trusted_cache, verify
+
+
+class TestCacheTrust(unittest.TestCase):
+    """Test cache directory checks and entry signatures against a temporary home and project."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.home = Path(tmpdir.name) / 'home'
+        self.project = Path(tmpdir.name) / 'project'
+        self.home.mkdir()
+        self.project.mkdir()
+
+    def test_private_directory_outside_the_project(self):
+        """Test that a directory only the user can write, outside the project, is trusted and created."""
+        cache_dir = self.home / '.cache' / 'toolguard'
+        self.assertIsNone(check_cache_dir(cache_dir, self.project))
+        self.assertTrue(cache_dir.is_dir())
+
+    def test_directory_inside_the_project(self):
+        """Test that a cache directory the agent works in is refused."""
+        for cache_dir in (self.project, self.project / '.toolguard-cache'):
+            with self.subTest(cache_dir=cache_dir):
+                self.assertIn('inside the project', check_cache_dir(cache_dir, self.project))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'POSIX permissions')
+    def test_group_writable_directory(self):
+        """Test that a directory others can write is refused."""
+        cache_dir = self.home / 'shared'
+        cache_dir.mkdir()
+        os.chmod(cache_dir, 0o775)
+        self.assertIn('writable by group or others', check_cache_dir(cache_dir, self.project))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'POSIX permissions')
+    def test_key_is_created_private(self):
+        """Test that the key is created once, readable only by the user."""
+        key = load_cache_key(self.home, self.project)
+        self.assertEqual(len(key), 32)
+        self.assertEqual(stat.S_IMODE(os.stat(self.home / KEY_FILE).st_mode), 0o600)
+        self.assertEqual(load_cache_key(self.home, self.project), key)
+
+        os.chmod(self.home / KEY_FILE, 0o644)
+        self.assertIsNone(load_cache_key(self.home, self.project))
+
+    def test_key_inside_the_project(self):
+        """Test that no key is kept in a home directory inside the project."""
+        self.assertIsNone(load_cache_key(self.project / 'home', self.project))
+
+    def test_trusted_cache(self):
+        """Test that a trusted directory comes with its key, and an untrusted one with the problem."""
+        cache_dir, key, problem = trusted_cache(self.home / 'cache', self.home, self.project)
+        self.assertEqual((cache_dir, problem), (self.home / 'cache', None))
+        self.assertIsNotNone(key)
+
+        cache_dir, key, problem = trusted_cache(self.project / 'cache', self.home, self.project)
+        self.assertEqual((cache_dir, key), (None, None))
+        self.assertIn('inside the project', problem)
+
+        self.assertEqual(trusted_cache(None, self.home, self.project), (None, None, None))
+
+    def test_signatures(self):
+        """Test that a signature only verifies for its payload and key."""
+        signature = sign(b'k' * 32, b'payload')
+        self.assertTrue(verify(b'k' * 32, b'payload', signature))
+        self.assertFalse(verify(b'k' * 32, b'payloaD', signature))
+        self.assertFalse(verify(b'x' * 32, b'payload', signature))
+        self.assertFalse(verify(b'k' * 32, b'payload', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Unit tests for structured command extraction (parser/command_ast.py).
+"""
+
+import shlex
+import unittest
+from pathlib import Path
+
+from toolguard.normalization import normalize_words
+from toolguard.parser.command_ast import DUPLICATE, HEREDOC, READ, WRITE, Redirect, split_words, unquote
+from toolguard.parser.command_extractor import (
+    CANOPY,
+    DESCENT,
+    LEAF,
+    WRAPPER,
+    extract_structured_commands,
+    extract_tagged_commands,
+    iter_structured_commands,
+)
+from toolguard.parser.grammar_fuzz import generated_commands
+from toolguard.permissions import contains_path_component, normalize_path_in_command
+from toolguard.policy import compile_policy
+
+
+def structure(command):
+    """Everything a structured command holds, for comparisons."""
+    return command.text, command.kind, command.argv, command.redirects, command.substitutions, command.words
+
+
+class TestSplitWords(unittest.TestCase):
+    """Test the quote-aware word splitter."""
+
+    def test_words(self):
+        """Test that quoting and escapes keep a word whole, with its quotes."""
+        cases = [
+            ('git  commit -m "x  y"', ['git', 'commit', '-m', '"x  y"']),
+            ("echo 'a b'c d", ['echo', "'a b'c", 'd']),
+            ("echo $'a\\' b' c", ['echo', "$'a\\' b'", 'c']),
+            ('cat my\\ file', ['cat', 'my\\ file']),
+            ('echo $(ls -la) x', ['echo', '$(ls -la)', 'x']),
+            ('', []),
+        ]
+        for command, expected in cases:
+            with self.subTest(command=command):
+                self.assertEqual(split_words(command), expected)
+
+    def test_unterminated_quote(self):
+        """Test that an unterminated quote splits like an ordinary character."""
+        self.assertEqual(split_words("echo 'a b"), ['echo', "'a", 'b'])
+        self.assertEqual(split_words('echo a\\'), ['echo', 'a\\'])
+
+    def test_matches_shlex(self):
+        """Test that unquoted words are those of shlex.split() on well-formed commands."""
+        for command in ['ls -la "my dir"', "grep -r 'a b' src/", 'cat a\\ b "c\\"d" e']:
+            with self.subTest(command=command):
+                self.assertEqual([unquote(word) for word in split_words(command)], shlex.split(command))
+
+
+class TestUnquote(unittest.TestCase):
+    """Test quote removal."""
+
+    def test_quotes(self):
+        """Test single quotes, double quotes, $'...' strings and escapes."""
+        cases = [
+            ('plain', 'plain'),
+            ("'a b'", 'a b'),
+            ('"a b"', 'a b'),
+            ('"a\\"b"', 'a"b'),
+            ('"a\\b"', 'a\\b'),
+            ('a\\ b', 'a b'),
+            ("$'a\\tb'", 'a\tb'),
+            ('pre"fix"\'ed\'', 'prefixed'),
+        ]
+        for word, expected in cases:
+            with self.subTest(word=word):
+                self.assertEqual(unquote(word), expected)
+
+    def test_substitution_kept(self):
+        """Test that a command substitution is kept as written, with its own quotes."""
+        self.assertEqual(unquote('"$(echo "x y")"'), '$(echo "x y")')
+
+
+class TestStructuredCommands(unittest.TestCase):
+    """Test extract_structured_commands()."""
+
+    def test_argv(self):
+        """Test that argv holds the quote-removed words."""
+        (command,) = extract_structured_commands('git commit -m "Fix the parser"')
+        self.assertEqual(command.argv, ('git', 'commit', '-m', 'Fix the parser'))
+        self.assertEqual(command.words, command.argv)
+        self.assertEqual(command.redirects, ())
+
+    def test_redirect_classification(self):
+        """Test that redirection targets are classified by access."""
+        (command,) = extract_structured_commands('sort < in.txt > "out file.txt" 2>> err.log 2>&1')
+        self.assertEqual(command.argv, ('sort',))
+        self.assertEqual(
+            command.redirects,
+            (
+                Redirect(None, '<', 'in.txt', READ),
+                Redirect(None, '>', 'out file.txt', WRITE),
+                Redirect(2, '>>', 'err.log', WRITE),
+                Redirect(2, '>&', '1', DUPLICATE),
+            ),
+        )
+        self.assertEqual(command.reads, ['in.txt'])
+        self.assertEqual(command.writes, ['out file.txt', 'err.log'])
+        self.assertEqual(command.words, ('sort', '<', 'in.txt', '>', 'out file.txt', '2>>', 'err.log', '2>&1'))
+
+    def test_heredoc(self):
+        """Test that a here-document delimiter is no path, and words after it are arguments."""
+        (command,) = extract_structured_commands("cat <<'EOF' -n\nbody\nEOF")
+        self.assertEqual(command.redirects, (Redirect(None, '<<', 'EOF', HEREDOC),))
+        self.assertEqual(command.argv, ('cat', '-n'))
+        self.assertEqual(command.writes, [])
+
+    def test_adjacent_items_form_one_word(self):
+        """Test that a substitution joined to a word is one argument."""
+        commands = extract_structured_commands('export x=$(ls "a b")')
+        self.assertEqual(commands[0].argv, ('export', 'x=$(ls "a b")'))
+        self.assertEqual(commands[0].substitutions, ('ls "a b"',))
+        self.assertEqual(
+            [(command.text, command.kind) for command in commands[1:]], [('ls "a b"', WRAPPER), ('ls "a b"', LEAF)]
+        )
+
+    def test_wrappers_have_no_words(self):
+        """Test that wrappers carry their text only."""
+        commands = extract_structured_commands('(cd /tmp && rm x)')
+        wrappers = [command for command in commands if command.kind == WRAPPER]
+        self.assertEqual([command.text for command in wrappers], ['(cd /tmp && rm x)', 'cd /tmp && rm x'])
+        self.assertTrue(all(command.words is None for command in wrappers))
+        leaves = [command.argv for command in commands if command.kind == LEAF]
+        self.assertEqual(leaves, [('cd', '/tmp'), ('rm', 'x')])
+
+    def test_parse_error_fallback(self):
+        """Test that a command line that does not parse is one command without words."""
+        (command,) = extract_structured_commands('echo $(a')
+        self.assertEqual((command.text, command.kind, command.words), ('echo $(a', LEAF, None))
+
+    def test_texts_match_tagged_extraction(self):
+        """Test that both backends yield the commands of extract_tagged_commands(), with the same structure."""
+        for command_line in generated_commands(200, seed=3):
+            with self.subTest(command_line=command_line):
+                canopy = list(iter_structured_commands(command_line, CANOPY))
+                descent = list(iter_structured_commands(command_line, DESCENT))
+                self.assertEqual([structure(command) for command in canopy], [structure(c) for c in descent])
+                tagged = extract_tagged_commands(command_line)
+                self.assertEqual([(command.text, command.kind) for command in canopy], tagged)
+
+
+class TestWordConsumers(unittest.TestCase):
+    """Test normalization and matching on parser words."""
+
+    def test_path_component_in_quoted_argument(self):
+        """Test that a quoted path with spaces is one argument."""
+        (command,) = extract_structured_commands('cat "my dir/.env"')
+        self.assertTrue(contains_path_component(command.text, '.env'))
+        self.assertTrue(contains_path_component(command.text, '.env', command.words))
+        self.assertFalse(contains_path_component('cat "my dir/.envrc"', '.env'))
+
+    def test_normalize_words(self):
+        """Test that words are normalized like the tokens of normalize_command()."""
+        home = str(Path.home())
+        self.assertEqual(normalize_words(['ls', '-la', home + '/my docs']), ['ls', '-la', '~/my docs'])
+        self.assertEqual(normalize_path_in_command('ls "my docs"', split_words('ls "my docs"')), 'ls ./"my docs"')
+
+    def test_policy_uses_words(self):
+        """Test that a compiled policy matches path components in parser words."""
+        policy = compile_policy(['cat *'], ['**/.env/**'])
+        (command,) = extract_structured_commands('cat "my dir/.env"')
+        self.assertEqual(policy.check(command.text)[0], 'deny')
+        self.assertEqual(policy.check(command.text, command.words)[0], 'deny')
+        self.assertEqual(policy.check('cat "my dir/.envrc"')[0], 'allow')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,13 +12,18 @@ from pathlib import Path
 from unittest.mock import patch
 
 from toolguard.config import (
+    classify_permissions,
     discover_config_files,
+    get_tool_patterns,
     load_governed_tools,
     load_governed_tools_from_file,
     load_permissions,
     load_permissions_from_file,
+    load_tool_permissions,
     merge_governed_tools,
     merge_permissions,
+    parse_permission_entry,
+    read_config_file,
 )
 from toolguard.patterns import PatternType, match_pattern, parse_pattern
 
@@ -409,6 +414,71 @@ class TestLoadGovernedToolsFromFile(unittest.TestCase):
             filepath.unlink()
 
 
+class TestClassifyPermissions(unittest.TestCase):
+    """Test single-pass classification of permission entries by tool."""
+
+    def test_parse_permission_entry(self):
+        """Test splitting entries into tool name and pattern."""
+        self.assertEqual(parse_permission_entry('Bash(git status:*)'), ('Bash', 'git status:*'))
+        self.assertEqual(parse_permission_entry('Read(/tmp/**)'), ('Read', '/tmp/**'))
+        self.assertEqual(parse_permission_entry('Bash(echo (x))'), ('Bash', 'echo (x)'))
+        self.assertIsNone(parse_permission_entry('WebSearch'))
+        self.assertIsNone(parse_permission_entry('Bash(unterminated'))
+        self.assertIsNone(parse_permission_entry(42))
+
+    def test_classify_buckets_all_tools(self):
+        """Test that every tool gets its own allow/deny/ask buckets."""
+        config = {
+            'permissions': {
+                'allow': ['Bash(git *)', 'Read(/tmp/**)', 'Write(/tmp/*)', 'WebSearch'],
+                'deny': ['Bash(rm *)', 'Read(**/.env)'],
+                'ask': ['Bash(alembic:*)'],
+            }
+        }
+        result = classify_permissions(config)
+        self.assertEqual(set(result), {'Bash', 'Read', 'Write'})
+        self.assertEqual(result['Bash'], {'allow': ['git *'], 'deny': ['rm *'], 'ask': ['alembic:*']})
+        self.assertEqual(result['Read'], {'allow': ['/tmp/**'], 'deny': ['**/.env'], 'ask': []})
+        self.assertEqual(get_tool_patterns(result, 'Write'), (['/tmp/*'], []))
+        self.assertEqual(get_tool_patterns(result, 'Edit'), ([], []))
+
+    def test_load_tool_permissions_reads_each_file_once(self):
+        """Test that all tools are served from one read of each config file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir) / 'project'
+            project_dir.mkdir()
+            (project_dir / '.git').mkdir()
+            claude_dir = project_dir / '.claude'
+            claude_dir.mkdir()
+
+            config = {'permissions': {'allow': ['Bash(git *)', 'Read(/tmp/**)'], 'deny': ['Write(/etc/**)']}}
+            (claude_dir / 'settings.local.json').write_text(json.dumps(config))
+            hook_config = {'permissions': {'allow': ['Bash(git *)', 'Bash(ls:*)']}}
+            (claude_dir / 'toolguard_hook.json').write_text(json.dumps(hook_config))
+
+            with patch('toolguard.config.find_project_root', return_value=project_dir):
+                with patch('toolguard.config.Path.home', return_value=Path(tmpdir) / 'home'):
+                    with patch('builtins.open', wraps=open) as mock_open:
+                        result = load_tool_permissions()
+                        load_tool_permissions()
+
+            self.assertEqual(result['Bash']['allow'], ['git *', 'ls:*'])
+            self.assertEqual(result['Read']['allow'], ['/tmp/**'])
+            self.assertEqual(result['Write']['deny'], ['/etc/**'])
+            opened = [call.args[0] for call in mock_open.call_args_list]
+            self.assertEqual(len(opened), 2)
+
+    def test_read_config_file_rereads_modified_file(self):
+        """Test that the parsed-file cache is invalidated when a file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'settings.json'
+            path.write_text(json.dumps({'permissions': {'allow': ['Bash(a)']}}))
+            self.assertEqual(read_config_file(path)['permissions']['allow'], ['Bash(a)'])
+
+            path.write_text(json.dumps({'permissions': {'allow': ['Bash(bb)']}}))
+            self.assertEqual(read_config_file(path)['permissions']['allow'], ['Bash(bb)'])
+
+
 class TestMergeGovernedTools(unittest.TestCase):
     """Test merging governed tools from multiple sources."""
 
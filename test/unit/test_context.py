@@ -0,0 +1,122 @@
+"""
+Unit tests for evaluation contexts (context.py) and the functions that take one.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from toolguard.compound import check_compound_permission, redirect_path
+from toolguard.config import discover_config_files, load_governed_tools, load_permissions
+from toolguard.context import EvaluationContext
+from toolguard.env_config import get_env_config
+from toolguard.normalization import expand_tilde, normalize_path
+from toolguard.permissions import check_file_path_permission
+
+
+class TestEvaluationContext(unittest.TestCase):
+    """Test the context value itself."""
+
+    def test_immutable(self):
+        """Test that attributes, the environment and the configuration cannot be changed."""
+        context = EvaluationContext('/home/a', '/work', env={'X': '1'}, config={'extended_syntax': True})
+        with self.assertRaises(AttributeError):
+            context.cwd = Path('/tmp')
+        with self.assertRaises(TypeError):
+            context.env['X'] = '2'
+        with self.assertRaises(TypeError):
+            context.config['extended_syntax'] = False
+
+    def test_snapshot(self):
+        """Test that the context keeps a copy of the environment it was given."""
+        env = {'X': '1'}
+        context = EvaluationContext('/home/a', '/work', env=env)
+        env['X'] = '2'
+        self.assertEqual(context.env['X'], '1')
+
+    def test_replace(self):
+        """Test that replace() returns a changed copy."""
+        context = EvaluationContext('/home/a', '/work', '/work', {'X': '1'})
+        moved = context.replace(cwd='/work/src')
+        self.assertEqual(moved.cwd, Path('/work/src'))
+        self.assertEqual(context.cwd, Path('/work'))
+        self.assertEqual(moved.home, Path('/home/a'))
+        self.assertEqual((moved.project_root, dict(moved.env)), (Path('/work'), {'X': '1'}))
+
+    def test_capture(self):
+        """Test that capture() reads the environment configuration for its own environment and cwd."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = Path(tmpdir) / 'project'
+            (project / '.git').mkdir(parents=True)
+            env = {'TOOLGUARD_LEAF_ONLY_ALLOW': 'true', 'TOOLGUARD_LOG_DIR': '~/logs'}
+            with patch('toolguard.config.Path.home', return_value=Path(tmpdir) / 'home'):
+                context = EvaluationContext.capture(project, env=env)
+        self.assertEqual(context.project_root, project)
+        self.assertTrue(context.config['leaf_only_allow'])
+        self.assertEqual(context.config['log_dir'], (Path(tmpdir) / 'home' / 'logs').resolve())
+
+
+class TestContextConsumers(unittest.TestCase):
+    """Test that functions given a context read nothing from the process."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmp = Path(tmpdir.name)
+        self.home = self.tmp / 'home'
+        (self.home / '.claude').mkdir(parents=True)
+        self.project = self.tmp / 'project'
+        (self.project / '.git').mkdir(parents=True)
+        (self.project / '.claude').mkdir()
+        self.write(self.home / '.claude' / 'settings.json', ['Bash(ls *)'])
+        self.write(self.project / '.claude' / 'settings.json', ['Bash(git *)'])
+        self.context = EvaluationContext(self.home, self.project, self.project, {})
+
+    def write(self, path, allow):
+        """Write a settings file with allow patterns."""
+        path.write_text(json.dumps({'permissions': {'allow': allow, 'deny': []}}))
+
+    def test_discovery_uses_context_home_and_cwd(self):
+        """Test that config files are discovered from the context's cwd and home."""
+        paths = [path for path, _source_type, _fmt in discover_config_files(context=self.context)]
+        self.assertEqual(paths, [self.project / '.claude' / 'settings.json', self.home / '.claude' / 'settings.json'])
+        with patch.dict(os.environ, {'CLAUDE_SETTINGS_PATH': str(self.tmp / 'missing.json')}):
+            allow, _deny = load_permissions(context=self.context)
+        self.assertEqual(sorted(allow), ['git *', 'ls *'])
+
+    def test_settings_path_from_context(self):
+        """Test that CLAUDE_SETTINGS_PATH is read from the context's environment."""
+        settings = self.tmp / 'settings.json'
+        self.write(settings, ['Bash(make *)'])
+        (self.tmp / 'toolguard_hook.json').write_text(json.dumps({'governed_tools': ['Bash', 'Read']}))
+        context = self.context.replace(env={'CLAUDE_SETTINGS_PATH': str(settings)})
+        self.assertEqual(load_permissions(context=context), (['make *'], []))
+        self.assertEqual(load_governed_tools(context=context), ['Bash', 'Read'])
+
+    def test_env_config_from_context(self):
+        """Test that get_env_config() reads the context's environment and cwd."""
+        with patch.dict(os.environ, {'TOOLGUARD_EXTENDED_SYNTAX': 'false'}):
+            config = get_env_config(self.context.replace(env={'TOOLGUARD_PARSER': 'descent'}))
+        self.assertTrue(config['extended_syntax'])
+        self.assertEqual(config['parser_backend'], 'descent')
+        self.assertEqual(config['project_root'], self.project)
+
+    def test_home_of_paths(self):
+        """Test that ~ in paths and path rules stands for the given home directory."""
+        self.assertEqual(expand_tilde('~/notes', Path('/home/a')), '/home/a/notes')
+        self.assertEqual(normalize_path('/home/a/notes.txt', home=Path('/home/a')), '~/notes.txt')
+        self.assertEqual(redirect_path('~/out.txt', '/work', '/home/a'), '/home/a/out.txt')
+        self.assertEqual(check_file_path_permission('/home/a/x', ['~/**'], [], Path('/home/a'))[0], 'allow')
+        self.assertEqual(check_file_path_permission('/home/b/x', ['~/**'], [], Path('/home/a'))[0], 'deny')
+        rules = {'Write': (['~/out/**'], [])}
+        decision, _reason = check_compound_permission(
+            'echo x > ~/out/log', ['echo *'], [], path_rules=rules, cwd='/work', home='/home/a'
+        )
+        self.assertEqual(decision, 'allow')
+
+
+if __name__ == '__main__':
+    unittest.main()
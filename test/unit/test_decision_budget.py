@@ -0,0 +1,86 @@
+"""
+Unit tests for the decision time budget.
+"""
+
+import signal
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from toolguard.decision_budget import DecisionBudget, DecisionBudgetExceeded
+
+
+class TestDecisionBudget(unittest.TestCase):
+    """Test deadlines, stage names and the timer."""
+
+    def test_disabled_budget(self):
+        """Test that a budget of None never expires."""
+        budget = DecisionBudget(start=time.perf_counter() - 3600)
+        budget.arm(None)
+        budget.enter('parsing')
+        self.assertIsNone(budget.remaining())
+        budget.disarm()
+
+    def test_spent_budget_names_running_stage(self):
+        """Test that entering a stage after the deadline reports the stage that overran."""
+        budget = DecisionBudget()
+        budget.arm(1000)
+        budget.enter('parsing')
+        budget.deadline = time.perf_counter() - 1
+        with self.assertRaises(DecisionBudgetExceeded) as raised:
+            budget.enter('matching')
+        self.assertEqual(raised.exception.stage, 'parsing')
+        self.assertEqual(str(raised.exception), 'Decision exceeded the 1000 ms time budget during parsing')
+        budget.disarm()
+
+    def test_budget_counts_from_start(self):
+        """Test that time spent before arm() counts against the budget."""
+        budget = DecisionBudget(start=time.perf_counter() - 1)
+        with self.assertRaises(DecisionBudgetExceeded):
+            budget.arm(500)
+
+    def test_wait_for_slow_background_stage(self):
+        """Test that waiting for a background stage stops at the deadline."""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(time.sleep, 0.5)
+            budget = DecisionBudget()
+            budget.arm(20)
+            try:
+                with self.assertRaises(DecisionBudgetExceeded) as raised:
+                    budget.wait(future, 'transcript scan')
+            finally:
+                budget.disarm()
+        self.assertEqual(raised.exception.stage, 'transcript scan')
+
+    @unittest.skipUnless(hasattr(signal, 'setitimer'), 'needs SIGALRM')
+    def test_timer_interrupts_busy_stage(self):
+        """Test that the timer interrupts a stage that never checks the deadline."""
+        previous = signal.getsignal(signal.SIGALRM)
+        budget = DecisionBudget()
+        budget.arm(20)
+        budget.enter('matching')
+        try:
+            with self.assertRaises(DecisionBudgetExceeded) as raised:
+                try:
+                    while True:
+                        pass
+                except Exception:
+                    # Fallbacks for ordinary errors must not swallow the overrun
+                    self.fail('caught by except Exception')
+        finally:
+            budget.disarm()
+        self.assertEqual(raised.exception.stage, 'matching')
+        self.assertIs(signal.getsignal(signal.SIGALRM), previous)
+
+    @unittest.skipUnless(hasattr(signal, 'setitimer'), 'needs SIGALRM')
+    def test_disarm_stops_timer(self):
+        """Test that a disarmed budget does not fire later."""
+        budget = DecisionBudget()
+        budget.arm(20)
+        budget.disarm()
+        time.sleep(0.05)
+        budget.enter('logging')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for the in-process policy engine (engine.py).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import toolguard
+from toolguard.context import EvaluationContext
+from toolguard.engine import PolicyEngine
+from toolguard.parser.command_extractor import get_parse_cache_stats
+from toolguard.policy import CompiledPolicy, compile_policy
+from toolguard.policy_codegen import GeneratedPolicy
+
+ENV_CONFIG = {'extended_syntax': True, 'policy_codegen': False}
+
+
+class TestPolicyEngine(unittest.TestCase):
+    """Test PolicyEngine against a temporary project."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name) / 'project'
+        (self.root / '.git').mkdir(parents=True)
+        (self.root / '.claude').mkdir()
+        # No user-level config: the project config is the whole configuration
+        home = patch('toolguard.config.Path.home', return_value=Path(tmpdir.name) / 'home')
+        home.start()
+        self.addCleanup(home.stop)
+        environ = patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop('CLAUDE_SETTINGS_PATH', None)
+        allow = ['Bash(git *)', 'Bash(echo *)', 'Read(/tmp/**)', f'Write({self.root}/out/**)']
+        self.write_settings(allow, ['Bash(git push *)'])
+        self.write_hook_config(['Bash', 'Read', 'Write'])
+
+    def write_settings(self, allow, deny):
+        """Write the project's .claude/settings.json."""
+        settings = {'permissions': {'allow': allow, 'deny': deny}}
+        (self.root / '.claude' / 'settings.json').write_text(json.dumps(settings))
+
+    def write_hook_config(self, governed_tools):
+        """Write the project's .claude/toolguard_hook.json."""
+        (self.root / '.claude' / 'toolguard_hook.json').write_text(json.dumps({'governed_tools': governed_tools}))
+
+    def test_check_command(self):
+        """Test that commands get the decisions of the hook."""
+        engine = PolicyEngine(self.root, ENV_CONFIG)
+        self.assertEqual(engine.check_command('git status')[0], 'allow')
+        self.assertEqual(engine.check_command('git status && git push origin main')[0], 'deny')
+        self.assertEqual(engine.check_command('rm -rf /')[0], 'deny')
+        self.assertEqual(engine.check_command(''), ('deny', 'No command provided in tool input'))
+
+    def test_generated_policy(self):
+        """Test that the engine compiles its policy to generated code unless policy_codegen is disabled."""
+        for env_config, policy_type in (({'extended_syntax': True}, GeneratedPolicy), (ENV_CONFIG, CompiledPolicy)):
+            with self.subTest(env_config=env_config):
+                engine = PolicyEngine(self.root, env_config)
+                self.assertEqual(engine.check_command('git status && git push origin main')[0], 'deny')
+                configuration = engine._configuration
+                policy = compile_policy(
+                    configuration.allow_patterns, configuration.deny_patterns, True, engine._settings.compiler
+                )
+                self.assertIs(type(policy), policy_type)
+
+    def test_settings_per_engine(self):
+        """Test that engines keep their own parsing and compilation settings, leaving the process's alone."""
+        self.write_settings(['Bash(echo *)'], ['Bash([regex](a|b)*c)'])
+        command = 'echo ' + 'ab' * 500 + ' c'
+        parse_stats = get_parse_cache_stats()
+        default = PolicyEngine(self.root, {'extended_syntax': True})
+        linear = PolicyEngine(
+            self.root,
+            {'extended_syntax': True, 'parser_backend': 'descent', 'linear_regex': True, 'regex_budget_ms': 0},
+        )
+        self.assertEqual(
+            linear.check_command(command),
+            ('deny', 'Regex evaluation exceeded its 0 ms time budget: [regex](a|b)*c'),
+        )
+        # The engine created last did not switch the first one, or compile_policy() without settings, to its engine
+        self.assertIn('matches deny pattern', default.check_command(command)[1])
+        self.assertIn('matches deny pattern', compile_policy(['echo *'], ['[regex](a|b)*c']).check(command)[1])
+        self.assertEqual(linear._settings.parser_backend, 'descent')
+        self.assertEqual(default._settings.parser_backend, 'canopy')
+        # Commands are parsed into each engine's own cache
+        self.assertEqual(get_parse_cache_stats(), parse_stats)
+        self.assertEqual(linear._parse_cache.stats()['entries'], 1)
+
+    def test_redirect_targets(self):
+        """Test that redirection targets are checked against Write() rules from the project root."""
+        engine = PolicyEngine(self.root, ENV_CONFIG)
+        self.assertEqual(engine.check_command('echo hi > out/log.txt')[0], 'allow')
+        self.assertEqual(engine.check_command('echo hi > notes.txt')[0], 'deny')
+        self.assertEqual(engine.check_command('echo hi > notes.txt', cwd=self.root / 'out')[0], 'allow')
+
+    def test_context_home_in_commands(self):
+        """Test that command paths under the context's home match ~ patterns, whatever the process home."""
+        self.write_settings(['Bash(cat ~/notes/*)'], [])
+        home = self.root.parent / 'alice'
+        self.assertNotEqual(str(home), os.environ.get('HOME'))
+        engine = PolicyEngine(self.root, context=EvaluationContext(home, self.root, self.root, {}, ENV_CONFIG))
+        self.assertEqual(engine.check_command(f'cat {home}/notes/a.txt')[0], 'allow')
+        self.assertEqual(engine.check_command(f'cat {home}/notes/a.txt && cat ~/notes/b.txt')[0], 'allow')
+        self.assertEqual(engine.check_command(f'cat {Path.home()}/notes/a.txt')[0], 'deny')
+
+    def test_check_path(self):
+        """Test that file paths get the decisions of the hook."""
+        engine = PolicyEngine(self.root, ENV_CONFIG)
+        self.assertEqual(engine.check_path('Read', '/tmp/notes.txt')[0], 'allow')
+        self.assertEqual(engine.check_path('Read', '/etc/passwd')[0], 'deny')
+        self.assertEqual(engine.check_path('Read', ''), ('deny', 'No file_path provided in tool input'))
+        decision, reason = engine.check_path('Edit', '/tmp/notes.txt')
+        self.assertEqual(decision, 'allow')
+        self.assertTrue(reason.startswith('Not a governed tool'))
+        with self.assertRaises(ValueError):
+            engine.check_path('Bash', '/tmp/notes.txt')
+
+    def test_no_allow_patterns(self):
+        """Test that a governed tool without allow patterns fails closed."""
+        self.write_settings([], [])
+        engine = PolicyEngine(self.root, ENV_CONFIG)
+        self.assertEqual(
+            engine.check_command('git status'),
+            ('deny', 'No Bash permissions found in settings - all commands blocked'),
+        )
+        self.assertEqual(
+            engine.check_path('Write', str(self.root / 'out' / 'x')),
+            ('deny', 'No Write permissions found in settings - all operations blocked'),
+        )
+
+    def test_reload_if_changed(self):
+        """Test that a reload happens only after a config file changes."""
+        engine = PolicyEngine(self.root, ENV_CONFIG)
+        self.assertFalse(engine.reload_if_changed())
+        self.write_settings(['Bash(git *)', 'Bash(rm -rf /tmp/build)'], [])
+        self.assertTrue(engine.reload_if_changed())
+        self.assertEqual(engine.check_command('rm -rf /tmp/build')[0], 'allow')
+        self.assertFalse(engine.reload_if_changed())
+
+    def test_reload_on_new_file(self):
+        """Test that a config file created after loading is picked up."""
+        engine = PolicyEngine(self.root, ENV_CONFIG)
+        self.assertEqual(engine.check_command('ls')[0], 'deny')
+        local = {'permissions': {'allow': ['Bash(ls)']}}
+        (self.root / '.claude' / 'settings.local.json').write_text(json.dumps(local))
+        self.assertTrue(engine.reload_if_changed())
+        self.assertEqual(engine.check_command('ls')[0], 'allow')
+
+    def test_projects_side_by_side(self):
+        """Test that engines with their own contexts check concurrently without mixing configurations."""
+        other = self.root.parent / 'other'
+        (other / '.git').mkdir(parents=True)
+        (other / '.claude').mkdir()
+        (other / '.claude' / 'settings.json').write_text(json.dumps({'permissions': {'allow': ['Bash(make *)']}}))
+        home = self.root.parent / 'home'
+        engines = {
+            root: PolicyEngine(root, context=EvaluationContext(home, root, root, {}, ENV_CONFIG))
+            for root in (self.root, other)
+        }
+        # The process environment changes after the engines were created
+        os.environ['CLAUDE_SETTINGS_PATH'] = str(self.root.parent / 'missing.json')
+        cases = [(self.root, 'git status', 'allow'), (self.root, 'make', 'deny'), (other, 'make all', 'allow')]
+        cases.append((other, 'git status', 'deny'))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            decisions = list(pool.map(lambda case: engines[case[0]].check_command(case[1])[0], cases * 25))
+        self.assertEqual(decisions, [decision for _root, _command, decision in cases * 25])
+        self.assertFalse(engines[other].reload_if_changed())
+
+    def test_package_export(self):
+        """Test that the engine is exported by the package."""
+        self.assertIs(toolguard.PolicyEngine, PolicyEngine)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ Tests environment variable loading, .env file parsing, and configuration merging
 
 import os
 import unittest
+from io import StringIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
@@ -249,6 +250,97 @@ class TestGetEnvConfig(unittest.TestCase):
                     # Resolve both paths for comparison (handles macOS /private/var vs /var symlink)
                     self.assertEqual(config['log_dir'], log_dir.resolve())
 
+    def test_cache_dir_disabled_by_default(self):
+        """Test that no persistent cache directory is configured by default."""
+        with TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {}, clear=True):
+                with patch('toolguard.env_config.find_project_root') as mock_find:
+                    mock_find.return_value = Path(tmpdir)
+
+                    config = get_env_config()
+
+                    self.assertIsNone(config['cache_dir'])
+
+    def test_cache_dir_relative_to_project_root(self):
+        """Test that a relative TOOLGUARD_CACHE_DIR resolves against the project root."""
+        with TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {'TOOLGUARD_CACHE_DIR': '.cache/toolguard'}):
+                with patch('toolguard.env_config.find_project_root') as mock_find:
+                    mock_find.return_value = Path(tmpdir)
+
+                    config = get_env_config()
+
+                    self.assertEqual(config['cache_dir'], Path(tmpdir) / '.cache' / 'toolguard')
+
+    def test_leaf_only_allow_opt_in(self):
+        """Test that leaf-only allow checks are off unless TOOLGUARD_LEAF_ONLY_ALLOW is set."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    self.assertFalse(get_env_config()['leaf_only_allow'])
+                with patch.dict(os.environ, {'TOOLGUARD_LEAF_ONLY_ALLOW': 'true'}):
+                    self.assertTrue(get_env_config()['leaf_only_allow'])
+
+    def test_policy_codegen_opt_out(self):
+        """Test that policy code generation is on unless TOOLGUARD_POLICY_CODEGEN disables it."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    self.assertTrue(get_env_config()['policy_codegen'])
+                with patch.dict(os.environ, {'TOOLGUARD_POLICY_CODEGEN': 'false'}):
+                    self.assertFalse(get_env_config()['policy_codegen'])
+
+    def test_prune_patterns_opt_in(self):
+        """Test that pattern pruning is off unless TOOLGUARD_PRUNE_PATTERNS is set."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    self.assertFalse(get_env_config()['prune_patterns'])
+                with patch.dict(os.environ, {'TOOLGUARD_PRUNE_PATTERNS': 'true'}):
+                    self.assertTrue(get_env_config()['prune_patterns'])
+
+    def test_usage_ordering_opt_in(self):
+        """Test that usage ordering is off unless TOOLGUARD_USAGE_ORDERING is set."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    self.assertFalse(get_env_config()['usage_ordering'])
+                with patch.dict(os.environ, {'TOOLGUARD_USAGE_ORDERING': 'true'}):
+                    self.assertTrue(get_env_config()['usage_ordering'])
+
+    def test_linear_regex_settings(self):
+        """Test the linear regex engine flag and its time budget, with invalid budgets falling back."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    config = get_env_config()
+                    self.assertFalse(config['linear_regex'])
+                    self.assertEqual(config['regex_budget_ms'], 50.0)
+                env = {'TOOLGUARD_LINEAR_REGEX': 'true', 'TOOLGUARD_REGEX_BUDGET_MS': '12.5'}
+                with patch.dict(os.environ, env):
+                    config = get_env_config()
+                    self.assertTrue(config['linear_regex'])
+                    self.assertEqual(config['regex_budget_ms'], 12.5)
+                for invalid in ('fast', '-1', 'nan'):
+                    with patch.dict(os.environ, {'TOOLGUARD_REGEX_BUDGET_MS': invalid}):
+                        with patch('sys.stderr', new_callable=StringIO):
+                            self.assertEqual(get_env_config()['regex_budget_ms'], 50.0)
+
+    def test_decision_budget_opt_in(self):
+        """Test that the decision budget is disabled unless TOOLGUARD_DECISION_BUDGET_MS is set."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    self.assertIsNone(get_env_config()['decision_budget_ms'])
+                with patch.dict(os.environ, {'TOOLGUARD_DECISION_BUDGET_MS': '250'}):
+                    self.assertEqual(get_env_config()['decision_budget_ms'], 250.0)
+
     def test_explicit_log_dir_relative(self):
         """Test using explicit relative TOOLGUARD_LOG_DIR."""
         with TemporaryDirectory() as tmpdir:
@@ -335,6 +427,20 @@ class TestGetEnvConfig(unittest.TestCase):
 
                     self.assertTrue(config['logging_enabled'])
 
+    def test_parser_backend(self):
+        """Test that TOOLGUARD_PARSER selects the parser backend, with invalid names falling back to canopy."""
+        with TemporaryDirectory() as tmpdir:
+            with patch('toolguard.env_config.find_project_root') as mock_find:
+                mock_find.return_value = Path(tmpdir)
+                with patch.dict(os.environ, {}, clear=True):
+                    self.assertEqual(get_env_config()['parser_backend'], 'canopy')
+                with patch.dict(os.environ, {'TOOLGUARD_PARSER': 'Descent'}):
+                    self.assertEqual(get_env_config()['parser_backend'], 'descent')
+                with patch.dict(os.environ, {'TOOLGUARD_PARSER': 'bison'}):
+                    with patch('sys.stderr', new_callable=StringIO) as stderr:
+                        self.assertEqual(get_env_config()['parser_backend'], 'canopy')
+                    self.assertIn('TOOLGUARD_PARSER', stderr.getvalue())
+
     def test_no_project_root_uses_cwd(self):
         """Test that current directory is used when no project root found."""
         with patch('toolguard.env_config.find_project_root') as mock_find:
@@ -0,0 +1,81 @@
+"""
+Unit tests for here-document body splitting.
+"""
+
+import unittest
+
+from toolguard.parser.command_extractor import extract_commands
+from toolguard.parser.heredoc import heredoc_bodies, split_heredocs
+
+
+class TestSplitHeredocs(unittest.TestCase):
+    """Test the head and bodies of command lines with here-documents."""
+
+    def test_bodies_are_cut_from_the_head(self):
+        """Test quoted, unquoted, tab-stripping and consecutive here-documents."""
+        cases = [
+            ("cat > notes.txt <<'EOF'\nhello\nworld\nEOF", "cat > notes.txt <<'EOF'", ['hello\nworld']),
+            ('cat <<EOF | sort\nb\na\nEOF', 'cat <<EOF | sort', ['b\na']),
+            ('cat <<EOF > f.txt\nhi\nEOF\ngit add f.txt', 'cat <<EOF > f.txt\ngit add f.txt', ['hi']),
+            ('cat <<-END\n\tindented\n\tEND', 'cat <<-END', ['\tindented']),
+            ('cat <<A <<"B"\na\nA\nb\nB\nls', 'cat <<A <<"B"\nls', ['a', 'b']),
+            ('cat <<\\EOF\n$(not run)\nEOF', 'cat <<\\EOF', ['$(not run)']),
+            ('cat <<EOF\nEOF', 'cat <<EOF', ['']),
+            ('cat <<EOF\n$HOME is fine\nEOF', 'cat <<EOF', ['$HOME is fine']),
+        ]
+        for command, head, bodies in cases:
+            with self.subTest(command=command):
+                split_head, heredocs = split_heredocs(command)
+                self.assertEqual(split_head, head)
+                self.assertEqual([heredoc.body for heredoc in heredocs], bodies)
+
+    def test_command_lines_without_bodies(self):
+        """Test that text which only looks like a here-document stays in the head."""
+        for command in [
+            'git status',
+            'cat <<EOF hello EOF',
+            'echo "<<EOF"\nrm -rf /\nEOF',
+            "echo '<<EOF'\nrm -rf /\nEOF",
+            'echo $((1<<x))\nrm -rf /\nx',
+            'echo hi # <<X\nrm -rf /\nX',
+            'cat <<<EOF\nrm -rf /\nEOF',
+            'cat <<EOF\nno terminator',
+        ]:
+            with self.subTest(command=command):
+                self.assertEqual(split_heredocs(command), (command, []))
+
+    def test_bodies_that_run_commands_stay(self):
+        """Test that an unquoted body with a command substitution is not treated as payload."""
+        for command in ['cat <<EOF\n$(rm -rf /)\nEOF', 'cat <<EOF\n`rm -rf /`\nEOF']:
+            with self.subTest(command=command):
+                self.assertEqual(split_heredocs(command), (command, []))
+        self.assertEqual(heredoc_bodies("cat <<'EOF'\n$(rm -rf /)\nEOF"), ['$(rm -rf /)'])
+
+    def test_bodies_read_by_interpreters_stay(self):
+        """Test that a body read by a shell or interpreter, directly or down a pipeline, is not split."""
+        for command in [
+            "bash <<'EOF'\nrm -rf ~\nEOF",
+            "cat <<'EOF' | sh\nrm -rf ~\nEOF",
+            'ssh host <<EOF\nrm -rf ~\nEOF',
+            "python3 - <<'EOF'\nimport os; os.system('rm -rf ~')\nEOF",
+            "/usr/bin/env node <<'EOF'\nrequire('fs')\nEOF",
+            "cat <<'EOF' | xargs rm\n/tmp/a\nEOF",
+            "eval \"$(cat <<'EOF'\nrm -rf ~\nEOF\n)\"",
+        ]:
+            with self.subTest(command=command):
+                self.assertEqual(split_heredocs(command), (command, []))
+
+    def test_heredoc_text_keeps_the_body(self):
+        """Test that the text of a split here-document is its command line with the body."""
+        heredoc = split_heredocs("cat > f <<'EOF'\nhi\nEOF\ngit add f")[1][0]
+        self.assertEqual(heredoc.text, "cat > f <<'EOF'\nhi\nEOF")
+
+    def test_extraction_skips_bodies(self):
+        """Test that extracted commands come from the head only."""
+        body = '\n'.join(f'line {i} && rm -rf /tmp/{i}' for i in range(2000))
+        command = f"cat > big.txt <<'EOF'\n{body}\nEOF"
+        self.assertEqual(extract_commands(command), ["cat > big.txt <<'EOF'"])
+
+
+if __name__ == '__main__':
+    unittest.main()
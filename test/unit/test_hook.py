@@ -6,15 +6,23 @@ Includes tests for file path tools (Read, Write, Edit) with GLOB pattern matchin
 """
 
 import json
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from io import StringIO
-from unittest.mock import patch
+from pathlib import Path
+from unittest.mock import DEFAULT, patch
 
 from toolguard.hook import (
     FILE_PATH_TOOLS,
     check_file_path_permission,
+    configure_evaluation,
     create_hook_output,
+    load_evaluation_settings,
     load_file_path_patterns,
+    load_redirect_rules,
     main,
     parse_hook_input,
 )
@@ -94,6 +102,168 @@ class TestHookToolGovernance(unittest.TestCase):
                     self.assertIn('Not a governed tool', output['hookSpecificOutput']['permissionDecisionReason'])
 
 
+class TestOverlappedStages(unittest.TestCase):
+    """Test that background I/O stages do not change decisions or logging."""
+
+    HOOK_INPUT = {
+        'tool_name': 'Bash',
+        'tool_input': {'command': 'git status && rm -rf /'},
+        'hook_event_name': 'PreToolUse',
+        'transcript_path': '/tmp/transcript.jsonl',
+    }
+
+    def _run_main(self, **patches):
+        """Run main() with the given hook attributes patched, returning the output and log mock."""
+        with patch('sys.stdin', StringIO(json.dumps(self.HOOK_INPUT))):
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                with patch('toolguard.hook.load_governed_tools', return_value=['Bash']):
+                    with patch('toolguard.hook.log_command') as mock_log:
+                        with patch.multiple('toolguard.hook', **patches):
+                            try:
+                                main()
+                            except SystemExit:
+                                pass
+        return json.loads(mock_stdout.getvalue()), mock_log
+
+    def test_transcript_scan_runs_in_background(self):
+        """Test that the agent is identified off the main thread and still logged."""
+        scan_threads = []
+
+        def identify(transcript_path):
+            scan_threads.append(threading.current_thread())
+            return {'agent_type': 'subagent', 'subagent_name': 'reviewer'}
+
+        output, mock_log = self._run_main(
+            identify_current_agent=identify, load_permissions=lambda cwd, context=None: (['git *'], ['rm *'])
+        )
+
+        self.assertEqual(output['hookSpecificOutput']['permissionDecision'], 'deny')
+        self.assertNotIn(threading.main_thread(), scan_threads)
+        self.assertEqual(mock_log.call_args.kwargs['extra_info'], 'reviewer')
+
+    def test_hook_interprets_policies(self):
+        """Test that the one-shot hook never generates policy code, with or without a cache directory."""
+        for cache_dir in (None, '/tmp/toolguard-cache'):
+            env = {'extended_syntax': True, 'policy_codegen': True, 'cache_dir': cache_dir}
+            trusted = (Path(cache_dir) if cache_dir else None, b'k' * 32 if cache_dir else None, None)
+            trusted_cache = patch('toolguard.hook.trusted_cache', return_value=trusted)
+            with self.subTest(cache_dir=cache_dir):
+                with trusted_cache, patch('toolguard.hook.configure_parse_cache'):
+                    with patch('toolguard.hook.configure_policy_compiler') as configure:
+                        output, _ = self._run_main(
+                            get_env_config=lambda: env, load_permissions=lambda cwd, context=None: (['git *'], ['rm *'])
+                        )
+                configure.assert_called_once_with(
+                    codegen=False, hit_counts=None, linear_regex=False, regex_budget_ms=50.0
+                )
+                self.assertEqual(output['hookSpecificOutput']['permissionDecision'], 'deny')
+
+    def test_usage_ordering_loads_hit_counts(self):
+        """Test that saved hit counts are passed to the policy compiler when usage ordering is enabled."""
+        env = {'extended_syntax': True, 'usage_ordering': True, 'cache_dir': '/tmp/toolguard-cache'}
+        trusted = (Path('/tmp/toolguard-cache'), b'k' * 32, None)
+        trusted_cache = patch('toolguard.hook.trusted_cache', return_value=trusted)
+        with trusted_cache, patch('toolguard.hook.configure_parse_cache'):
+            with patch('toolguard.hook.load_hit_counts', return_value={'git *': 7}) as load:
+                with patch('toolguard.hook.configure_policy_compiler') as configure:
+                    self._run_main(
+                        get_env_config=lambda: env, load_permissions=lambda cwd, context=None: (['git *'], ['rm *'])
+                    )
+        load.assert_called_once_with(Path('/tmp/toolguard-cache'))
+        self.assertEqual(configure.call_args.kwargs['hit_counts'], {'git *': 7})
+
+    def test_decision_budget_denies_slow_parse(self):
+        """Test that a stage running over the decision budget denies and records the stage and input."""
+
+        def slow_parse(command):
+            time.sleep(0.5)
+
+        env = {'extended_syntax': True, 'decision_budget_ms': 50, 'log_dir': '/tmp/logs'}
+        with patch('toolguard.hook.log_error') as mock_error:
+            output, mock_log = self._run_main(
+                get_env_config=lambda: env,
+                load_permissions=lambda cwd, context=None: (['git *'], []),
+                extract_structured_commands=slow_parse,
+            )
+
+        self.assertEqual(output['hookSpecificOutput']['permissionDecision'], 'deny')
+        self.assertEqual(
+            output['hookSpecificOutput']['permissionDecisionReason'],
+            'Decision exceeded the 50 ms time budget during parsing',
+        )
+        self.assertEqual(mock_log.call_args.args[1:], ('refused', ['decision time budget exceeded during parsing']))
+        message = mock_error.call_args.args[0]
+        self.assertIn('during parsing', message)
+        self.assertIn('git status && rm -rf /', message)
+
+    def test_decision_budget_bounds_transcript_scan(self):
+        """Test that a transcript scan running over the budget denies instead of stalling."""
+
+        def slow_identify(transcript_path):
+            time.sleep(0.5)
+            return {'agent_type': 'main'}
+
+        env = {'extended_syntax': True, 'decision_budget_ms': 50}
+        output, _ = self._run_main(
+            get_env_config=lambda: env,
+            load_permissions=lambda cwd, context=None: (['git *', 'rm *'], []),
+            identify_current_agent=slow_identify,
+        )
+        self.assertEqual(
+            output['hookSpecificOutput']['permissionDecisionReason'],
+            'Decision exceeded the 50 ms time budget during transcript scan',
+        )
+
+    def test_background_failure_denies(self):
+        """Test that an error while loading permissions in the background still fails closed."""
+
+        def broken_permissions(cwd, context=None):
+            raise RuntimeError('config unreadable')
+
+        with patch('sys.stderr', new_callable=StringIO):
+            with patch('sys.stdin', StringIO(json.dumps(self.HOOK_INPUT))):
+                with patch('sys.stdout', new_callable=StringIO):
+                    with patch('toolguard.hook.load_governed_tools', return_value=['Bash']):
+                        with patch('toolguard.hook.load_permissions', broken_permissions):
+                            with patch('toolguard.hook.identify_current_agent', return_value={'agent_type': 'main'}):
+                                try:
+                                    main()
+                                except SystemExit:
+                                    pass
+                stderr_output = sys.stderr.getvalue()
+
+        self.assertIn('Unexpected error in hook: config unreadable', stderr_output)
+
+
+class TestConfigureEvaluation(unittest.TestCase):
+    """Test the process configuration built from the environment configuration."""
+
+    def test_untrusted_cache_dir_is_not_used(self):
+        """Test that a cache directory inside the project is refused with a warning."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env_config = {'cache_dir': Path(tmpdir) / '.cache', 'project_root': Path(tmpdir), 'log_dir': '/tmp/logs'}
+            with patch('toolguard.hook.log_warning') as mock_warning, patch('toolguard.hook.configure_policy_compiler'):
+                with patch('toolguard.hook.configure_parse_cache') as configure_parse_cache:
+                    self.assertEqual(configure_evaluation(env_config, home=Path(tmpdir) / 'home'), (None, None))
+        configure_parse_cache.assert_not_called()
+        self.assertIn('inside the project', mock_warning.call_args.args[0])
+
+    def test_settings_leave_the_process_alone(self):
+        """Test that settings for an engine are built without configuring the process."""
+        env_config = {'parser_backend': 'descent', 'linear_regex': True, 'policy_codegen': True}
+        patches = {name: DEFAULT for name in ('configure_parse_cache', 'configure_parser_backend')}
+        with patch.multiple('toolguard.hook', configure_policy_compiler=DEFAULT, **patches) as configured:
+            settings = load_evaluation_settings(env_config, long_running=True)
+            with self.assertRaises(ValueError):
+                load_evaluation_settings({'parser_backend': 'yacc'})
+        for configure in configured.values():
+            configure.assert_not_called()
+        self.assertEqual((settings.cache_dir, settings.cache_key, settings.parser_backend), (None, None, 'descent'))
+        self.assertTrue(settings.compiler.codegen)
+        self.assertTrue(settings.compiler.linear_regex)
+        self.assertFalse(load_evaluation_settings(env_config).compiler.codegen)
+
+
 class TestHookInputParsing(unittest.TestCase):
     """Test hook input parsing."""
 
@@ -275,6 +445,40 @@ class TestLoadFilePathPatterns(unittest.TestCase):
                 self.assertIn('~/projects/**', allow)
 
 
+class TestRedirectRules(unittest.TestCase):
+    """Test that command redirections are checked against the file path rules of governed tools."""
+
+    CONFIG = {'permissions': {'allow': ['Bash(echo:*)', 'Write(/tmp/**)', 'Read(/tmp/**)'], 'deny': []}}
+    RULES = {'Write': (['/tmp/**'], [])}
+
+    def test_load_redirect_rules(self):
+        """Test that only governed tools with patterns get rules."""
+        with patch('toolguard.hook.discover_config_files', return_value=[('/fake/path', 'claude', 'json')]):
+            with patch('builtins.open', unittest.mock.mock_open(read_data=json.dumps(self.CONFIG))):
+                self.assertEqual(load_redirect_rules(['Bash', 'Write']), self.RULES)
+                self.assertEqual(load_redirect_rules(['Bash']), {})
+
+    def test_write_redirect_denied_in_main(self):
+        """Test that main() denies a command writing outside the Write() rules."""
+        for target, decision in (('/tmp/out.txt', 'allow'), ('~/.bashrc', 'deny')):
+            hook_input = {
+                'tool_name': 'Bash',
+                'tool_input': {'command': f'echo hi > {target}'},
+                'hook_event_name': 'PreToolUse',
+            }
+            with self.subTest(target=target):
+                with patch('sys.stdin', StringIO(json.dumps(hook_input))):
+                    with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                        with patch('toolguard.hook.load_governed_tools', return_value=['Bash', 'Write']):
+                            with patch('toolguard.hook.load_permissions', return_value=(['echo *'], [])):
+                                with patch('toolguard.hook.load_redirect_rules', return_value=self.RULES):
+                                    with patch('toolguard.hook.log_command'):
+                                        with self.assertRaises(SystemExit):
+                                            main()
+                output = json.loads(mock_stdout.getvalue())
+                self.assertEqual(output['hookSpecificOutput']['permissionDecision'], decision)
+
+
 class TestFilePathToolsInMain(unittest.TestCase):
     """Test that main() correctly handles file path tools."""
 
@@ -408,72 +612,50 @@ class TestStartupValidation(unittest.TestCase):
         import tempfile
         from pathlib import Path
 
-        import toolguard.hook as hook_module
-
-        # Reset validation flag for this test
-        original_flag = hook_module._validation_done
-        hook_module._validation_done = False
-
-        try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                project_dir = Path(tmpdir) / 'project'
-                project_dir.mkdir()
-                (project_dir / '.git').mkdir()
-                claude_dir = project_dir / '.claude'
-                claude_dir.mkdir()
-                logs_dir = project_dir / 'logs'
-                logs_dir.mkdir()
-
-                # Create settings.local.json with unsupported tools (should be IGNORED)
-                settings_local = {
-                    'permissions': {
-                        'allow': ['WebSearch', 'WebFetch', 'mcp__unknown__tool'],
-                    }
+        from toolguard.context import EvaluationContext
+        from toolguard.hook import _run_startup_validation
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir) / 'project'
+            project_dir.mkdir()
+            (project_dir / '.git').mkdir()
+            claude_dir = project_dir / '.claude'
+            claude_dir.mkdir()
+            logs_dir = project_dir / 'logs'
+            logs_dir.mkdir()
+
+            # Create settings.local.json with unsupported tools (should be IGNORED)
+            settings_local = {
+                'permissions': {
+                    'allow': ['WebSearch', 'WebFetch', 'mcp__unknown__tool'],
                 }
-                (claude_dir / 'settings.local.json').write_text(json.dumps(settings_local))
+            }
+            (claude_dir / 'settings.local.json').write_text(json.dumps(settings_local))
 
-                # Create toolguard_hook.toml with valid config (should be validated)
-                toolguard_toml = """
+            # Create toolguard_hook.toml with valid config (should be validated)
+            toolguard_toml = """
 governed_tools = ["Bash", "Read"]
 
 [permissions]
 allow = ["Bash(ls:*)", "Read(/tmp/**)"]
 """
-                (claude_dir / 'toolguard_hook.toml').write_text(toolguard_toml)
-
-                env_config = {'log_dir': logs_dir}
-
-                with patch('toolguard.hook.find_project_root', return_value=project_dir):
-                    with patch('toolguard.hook.discover_config_files') as mock_discover:
-                        # Return both settings.local.json and toolguard_hook.toml
-                        mock_discover.return_value = [
-                            (claude_dir / 'settings.local.json', 'claude', 'json'),
-                            (claude_dir / 'toolguard_hook.toml', 'toolguard_hook', 'toml'),
-                        ]
-
-                        # Reset flag again before calling
-                        hook_module._validation_done = False
-
-                        # Import and call the validation function
-                        from toolguard.hook import _run_startup_validation
-
-                        _run_startup_validation(env_config, str(project_dir))
-
-                # Check log file - should NOT have warnings for WebSearch, WebFetch
-                # because those are in settings.local.json which is ignored
-                log_files = list(logs_dir.glob('toolguard-error-*.md'))
-
-                if log_files:
-                    content = log_files[0].read_text()
-                    # These tools are in settings.local.json which should be ignored
-                    self.assertNotIn('WebSearch', content)
-                    self.assertNotIn('WebFetch', content)
-                    self.assertNotIn('mcp__unknown__tool', content)
-                # If no log file exists, that's also correct (no warnings generated)
-
-        finally:
-            # Restore original flag
-            hook_module._validation_done = original_flag
+            (claude_dir / 'toolguard_hook.toml').write_text(toolguard_toml)
+
+            # No user-level config: the home directory of the context is empty
+            context = EvaluationContext(Path(tmpdir) / 'home', project_dir, project_dir, {}, {'log_dir': logs_dir})
+            _run_startup_validation(context)
+
+            # Check log file - should NOT have warnings for WebSearch, WebFetch
+            # because those are in settings.local.json which is ignored
+            log_files = list(logs_dir.glob('toolguard-error-*.md'))
+
+            if log_files:
+                content = log_files[0].read_text()
+                # These tools are in settings.local.json which should be ignored
+                self.assertNotIn('WebSearch', content)
+                self.assertNotIn('WebFetch', content)
+                self.assertNotIn('mcp__unknown__tool', content)
+            # If no log file exists, that's also correct (no warnings generated)
 
 
 if __name__ == '__main__':
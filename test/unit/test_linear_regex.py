@@ -0,0 +1,117 @@
+"""
+Unit tests for the linear-time regex engine and ReDoS detection.
+"""
+
+import random
+import re
+import time
+import unittest
+
+from toolguard.linear_regex import LinearRegex, RegexBudgetExceeded, compile_linear, redos_risks
+
+
+class TestLinearRegex(unittest.TestCase):
+    """Test that LinearRegex.search() agrees with re.search()."""
+
+    PATTERNS = [
+        '^curl .*\\| *(ba)?sh',
+        'git (push|reset) --force',
+        '(?m)^rm -rf$',
+        '(?s)a.b',
+        'a.b',
+        '\\brm\\b',
+        '\\d{2,3}-\\w+',
+        '[^\\s/]+/\\.env\\Z',
+        '\\Aecho [a-c]*?x',
+        '(?x) sudo \\s+ (-u \\s+ \\w+ \\s+)? rm',
+        '(a|aa)*c',
+        '(\\w+\\s?)+$',
+        '',
+    ]
+
+    TEXTS = [
+        '',
+        'curl http://x | bash',
+        'git push --force',
+        'x\nrm -rf\ny',
+        'a\nb',
+        'a-b',
+        'frm rm',
+        '12-ab',
+        '123-é',
+        'app/.env',
+        'app/.env\n',
+        'echo abx',
+        'sudo  -u root  rm',
+        'aaac',
+        'word word!',
+        'rm -rf\n',
+    ]
+
+    ATOMS = ['a', 'b', '.', '[ab]', '[^a]', '\\d', '\\s', '\\w', '\\W', '(a|b)', '(ab|a)', '(?:a|)']
+    ANCHORS = ['^', '$', '\\A', '\\Z', '\\b']
+
+    def test_corpus(self):
+        """Test every corpus regex against every corpus text."""
+        for pattern in self.PATTERNS:
+            compiled = LinearRegex(pattern)
+            for text in self.TEXTS:
+                with self.subTest(pattern=pattern, text=text):
+                    self.assertEqual(compiled.search(text) is not None, re.search(pattern, text) is not None)
+
+    def test_random_regexes(self):
+        """Test random regexes built from supported atoms against random texts."""
+        rng = random.Random(39)
+        for _ in range(500):
+            parts = []
+            for _ in range(rng.randint(1, 5)):
+                if rng.random() < 0.2:
+                    parts.append(rng.choice(self.ANCHORS))
+                else:
+                    parts.append(rng.choice(self.ATOMS) + rng.choice(['', '*', '+', '?', '{1,3}', '*?']))
+            pattern = rng.choice(['', '(?m)', '(?s)']) + ''.join(parts)
+            compiled = LinearRegex(pattern)
+            for _ in range(5):
+                text = ''.join(rng.choice('ab1 \n_-é') for _ in range(rng.randint(0, 8)))
+                with self.subTest(pattern=pattern, text=text):
+                    self.assertEqual(compiled.search(text) is not None, re.search(pattern, text) is not None)
+
+    def test_unsupported_regexes(self):
+        """Test that regexes needing backtracking or other flags are left to re."""
+        for pattern in ['(a)\\1', '(?=a)', '(?<!a)b', '(?i)rm', '(?a)\\w', '(?i:rm)', 'a++', '(?>a)', '\\B', 'a{9999}']:
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(compile_linear(pattern))
+        self.assertIsNone(compile_linear('unbalanced('))
+
+    def test_adversarial_input_is_linear(self):
+        """Test that a catastrophic-backtracking regex finishes quickly on its worst-case input."""
+        start = time.perf_counter()
+        self.assertIsNone(LinearRegex('(a+)+$', None).search('a' * 2000 + 'b'))
+        self.assertLess(time.perf_counter() - start, 5)
+
+    def test_budget_exceeded(self):
+        """Test that a search over its budget raises instead of returning a result."""
+        with self.assertRaises(RegexBudgetExceeded) as raised:
+            LinearRegex('(a|b)*c', budget_ms=0).search('ab' * 1000)
+        self.assertEqual(raised.exception.pattern, '(a|b)*c')
+
+
+class TestRedosRisks(unittest.TestCase):
+    """Test the static catastrophic-backtracking check."""
+
+    def test_risky_shapes(self):
+        """Test nested overlapping repeats and overlapping alternatives inside repeats."""
+        for pattern in ['(a+)+$', '(\\w+\\s?)*$', '(.*a){20}', '(a|aa)*c', '(?i)(a+)+', '^(\\d|\\d\\d)+$']:
+            with self.subTest(pattern=pattern):
+                self.assertTrue(redos_risks(pattern))
+
+    def test_safe_shapes(self):
+        """Test repeats that cannot split the same text in several ways."""
+        safe = ['^curl .*\\| *(ba)?sh', '(\\d+\\.)+', '^[a-z]+( [a-z]+)*$', '(ab|a)*', '(x[ab]*)*', '(a{2})+', 'bad(']
+        for pattern in safe:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(redos_risks(pattern), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+Unit tests for the Aho-Corasick multi-literal matcher.
+"""
+
+import random
+import unittest
+
+from toolguard.literal_matcher import AhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Test literal search with the automaton."""
+
+    def test_finds_all_occurring_literals(self):
+        """Test that every occurring literal is reported, once."""
+        automaton = AhoCorasick(['rm', '.env', 'sudo', ' --force'])
+        self.assertEqual(automaton.find_all('cat dir/.env && rm x; rm y'), {0, 1})
+        self.assertEqual(automaton.find_all('git push --force'), {3})
+        self.assertEqual(automaton.find_all('git status'), set())
+
+    def test_overlapping_and_nested_literals(self):
+        """Test literals that are suffixes or infixes of other literals."""
+        automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+        self.assertEqual(automaton.find_all('ushers'), {0, 1, 3})
+        self.assertEqual(automaton.find_all('ahishe'), {0, 1, 2})
+
+    def test_rejects_empty_literal(self):
+        """Test that an empty literal is refused (it would match everything)."""
+        with self.assertRaises(ValueError):
+            AhoCorasick(['rm', ''])
+
+    def test_agrees_with_substring_search(self):
+        """Test random literal sets and texts against the in operator."""
+        rng = random.Random(7)
+        for _ in range(500):
+            literals = [''.join(rng.choice('ab.') for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+            text = ''.join(rng.choice('ab.c') for _ in range(rng.randint(0, 24)))
+            expected = {i for i, literal in enumerate(literals) if literal in text}
+            with self.subTest(literals=literals, text=text):
+                self.assertEqual(AhoCorasick(literals).find_all(text), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
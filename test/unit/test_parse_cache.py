@@ -0,0 +1,143 @@
+"""
+Unit tests for the parse-result cache in front of extract_commands().
+"""
+
+import ast
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from toolguard.parser import bash_parser, bash_parser_fast, command_extractor
+from toolguard.parser.command_extractor import configure_parse_cache, extract_commands, get_parse_cache_stats
+from toolguard.parser.parse_cache import _VERSIONED_SOURCES, ParseCache
+
+GIT_STATUS = [('git status', 'leaf')]
+KEY = b'k' * 32
+
+
+class TestParseCache(unittest.TestCase):
+    """Test the LRU parse cache on its own."""
+
+    def test_miss_then_hit(self):
+        """Test that a stored entry is served on the next lookup."""
+        cache = ParseCache(max_entries=4)
+        self.assertIsNone(cache.get('git status'))
+        cache.put('git status', GIT_STATUS)
+        self.assertEqual(cache.get('git status'), GIT_STATUS)
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_returns_independent_lists(self):
+        """Test that callers cannot corrupt cached entries."""
+        cache = ParseCache()
+        cache.put('a && b', [('a', 'leaf'), ('b', 'leaf')])
+        cache.get('a && b').append(('c', 'leaf'))
+        self.assertEqual(cache.get('a && b'), [('a', 'leaf'), ('b', 'leaf')])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ParseCache(max_entries=2)
+        cache.put('a', [('a', 'leaf')])
+        cache.put('b', [('b', 'leaf')])
+        cache.get('a')
+        cache.put('c', [('c', 'leaf')])
+
+        self.assertEqual(cache.get('a'), [('a', 'leaf')])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_disk_tier_survives_new_instance(self):
+        """Test that persisted entries are served by a fresh cache (a new hook process)."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            commands = [('cd src', 'leaf'), ('make', 'leaf')]
+            ParseCache(cache_dir=tmpdir, key=KEY).put('cd src && make', commands)
+
+            cache = ParseCache(cache_dir=tmpdir, key=KEY)
+            self.assertEqual(cache.get('cd src && make'), commands)
+            self.assertEqual(cache.stats()['disk_hits'], 1)
+            self.assertIsNone(cache.get('cd src && make -j4'))
+
+    def test_unsigned_disk_entries_are_ignored(self):
+        """Test that entries signed with another key, edited or unsigned are not served."""
+        command = 'git status && rm -rf /'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ParseCache(cache_dir=tmpdir, key=KEY).put(command, [('git status', 'leaf'), ('rm -rf /', 'leaf')])
+            self.assertIsNone(ParseCache(cache_dir=tmpdir, key=b'x' * 32).get(command))
+
+            (path,) = Path(tmpdir).rglob('*.json')
+            data = json.loads(path.read_text())
+            data['commands'] = [['git status', 'leaf']]
+            path.write_text(json.dumps(data))
+            self.assertIsNone(ParseCache(cache_dir=tmpdir, key=KEY).get(command))
+
+            del data['signature']
+            path.write_text(json.dumps(data))
+            self.assertIsNone(ParseCache(cache_dir=tmpdir, key=KEY).get(command))
+
+    def test_disk_tier_needs_a_key(self):
+        """Test that a cache directory without a key keeps entries in memory only."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ParseCache(cache_dir=tmpdir).put('git status', GIT_STATUS)
+            self.assertEqual(list(Path(tmpdir).iterdir()), [])
+
+    def test_disk_entries_are_partitioned_by_grammar_version(self):
+        """Test that a different grammar version does not see older entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ParseCache(cache_dir=tmpdir, key=KEY).put('ls | wc -l', [('ls', 'leaf'), ('wc -l', 'leaf')])
+
+            with patch('toolguard.parser.parse_cache.grammar_version', return_value='0' * 64):
+                self.assertIsNone(ParseCache(cache_dir=tmpdir, key=KEY).get('ls | wc -l'))
+
+    def test_extraction_modules_are_versioned(self):
+        """Test that every parser module command extraction builds on is part of the grammar version."""
+        parser_dir = Path(command_extractor.__file__).parent
+        pending, modules = ['command_extractor'], set()
+        while pending:
+            module = pending.pop()
+            if module in modules or module == 'parse_cache':
+                continue
+            modules.add(module)
+            for node in ast.walk(ast.parse((parser_dir / f'{module}.py').read_text())):
+                if isinstance(node, ast.ImportFrom) and node.module == 'toolguard.parser':
+                    pending.extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and (node.module or '').startswith('toolguard.parser.'):
+                    pending.append(node.module.rsplit('.', 1)[1])
+        self.assertLessEqual({f'{module}.py' for module in modules}, set(_VERSIONED_SOURCES))
+
+
+class TestExtractCommandsCache(unittest.TestCase):
+    """Test that extract_commands() consults the shared cache."""
+
+    def setUp(self):
+        self.original_cache = command_extractor._parse_cache
+        configure_parse_cache()
+
+    def tearDown(self):
+        command_extractor._parse_cache = self.original_cache
+
+    def test_repeat_command_skips_parse(self):
+        """Test that the PEG parser runs once for a repeated command line."""
+        with patch.object(bash_parser_fast, 'parse', wraps=bash_parser_fast.parse) as mock_parse:
+            first = extract_commands('git add -A && git commit -m "msg"')
+            second = extract_commands('git add -A && git commit -m "msg"')
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(get_parse_cache_stats()['hits'], 1)
+
+    def test_parse_failure_fallback_is_cached(self):
+        """Test that the fallback result for unparseable input is cached too."""
+        with patch.object(bash_parser_fast, 'parse', side_effect=bash_parser.ParseError('boom')) as mock_parse:
+            self.assertEqual(extract_commands('weird ((( input'), ['weird ((( input'])
+            self.assertEqual(extract_commands('weird ((( input'), ['weird ((( input'])
+
+        self.assertEqual(mock_parse.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,7 @@ Tests GLOB globstar support and NATIVE pattern matching.
 """
 
 import unittest
-from toolguard.patterns import PatternType, parse_pattern, match_pattern
+from toolguard.patterns import PatternType, is_body_pattern, match_pattern, parse_body_pattern, parse_pattern
 
 
 class TestParsePattern(unittest.TestCase):
@@ -42,6 +42,18 @@ class TestParsePattern(unittest.TestCase):
         self.assertEqual(pattern, 'npm *')
 
 
+class TestBodyPatterns(unittest.TestCase):
+    """Test [body] pattern parsing."""
+
+    def test_body_prefix(self):
+        """Test that [body] wraps the other pattern types."""
+        self.assertTrue(is_body_pattern(' [body][regex]KEY'))
+        self.assertFalse(is_body_pattern('[body]*', extended_syntax=False))
+        self.assertFalse(is_body_pattern('[regex]body'))
+        self.assertEqual(parse_body_pattern('[body][regex]KEY'), (PatternType.REGEX, 'KEY'))
+        self.assertEqual(parse_body_pattern('[body]*secret*'), (PatternType.DEFAULT, '*secret*'))
+
+
 class TestGlobGlobstar(unittest.TestCase):
     """Test GLOB pattern globstar support (** vs *)."""
 
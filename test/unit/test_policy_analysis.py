@@ -0,0 +1,239 @@
+"""
+Unit tests for policy analysis and pruning.
+"""
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from toolguard import policy_analysis
+from toolguard.permissions import check_permission, match_command
+from toolguard.policy_analysis import (
+    analyze_policy,
+    apply_policy_review,
+    pattern_covers,
+    prune_policy,
+    review_policy_once,
+)
+from toolguard.test.unit.test_policy import COMMANDS, PATTERNS
+
+
+class TestPatternCovers(unittest.TestCase):
+    """Test coverage between two patterns."""
+
+    def test_proven_coverage(self):
+        """Test pairs where the broader pattern matches everything the narrower one does."""
+        pairs = [
+            ('git *', 'git log:*'),
+            ('git *', 'git status'),
+            ('git log:*', 'git log --oneline'),
+            ('git log:*', 'git log'),
+            ('rm -rf:*', 'rm -rf build'),
+            ('*', '[regex]^curl'),
+            ('*secret*', '*my-secret*'),
+            ('*.py', 'python main.py'),
+            ('git *', '[native]git push *'),
+            ('python?3 *', 'python-3 -V'),
+            ('**/.env/**', '**/.env/**'),
+            ('[glob]*.py', '[glob]*.py'),
+        ]
+        for general, specific in pairs:
+            with self.subTest(general=general, specific=specific):
+                self.assertTrue(pattern_covers(general, specific))
+
+    def test_unproven_coverage(self):
+        """Test pairs that are not (or cannot be shown to be) covered."""
+        pairs = [
+            ('git log:*', 'git *'),
+            ('git *', 'git'),
+            ('ls:*', 'ls*'),
+            ('[regex]^git', 'git status'),
+            ('**/.env/**', 'cat .env'),
+            ('[glob]*.py', 'main.py'),
+            ('python?3 *', 'python*'),
+            ('git status', 'git log:*'),
+        ]
+        for general, specific in pairs:
+            with self.subTest(general=general, specific=specific):
+                self.assertFalse(pattern_covers(general, specific))
+
+    def test_coverage_is_sound(self):
+        """Test that every proven coverage holds for random patterns and commands."""
+        rng = random.Random(37)
+        words = ['git', 'ls', 'rm', 'x']
+        patterns = []
+        for _ in range(120):
+            parts = [rng.choice(words + ['*', '-f', 'a?', 'log'])]
+            for _ in range(rng.randint(0, 2)):
+                parts.append(rng.choice(words + ['*', '-f', 'a?', 'log']))
+            pattern = ' '.join(parts)
+            if rng.random() < 0.3:
+                pattern = pattern.replace(' ', ':', 1) if ' ' in pattern else pattern + ':*'
+            patterns.append(pattern)
+        commands = [
+            ' '.join(rng.choice(words + ['-f', 'ab', 'log', 'a.py']) for _ in range(rng.randint(1, 4)))
+            for _ in range(150)
+        ]
+        matches = {p: {c for c in commands if match_command(c, [p])[0]} for p in set(patterns)}
+        for general in matches:
+            for specific in matches:
+                if pattern_covers(general, specific):
+                    with self.subTest(general=general, specific=specific):
+                        self.assertLessEqual(matches[specific], matches[general])
+
+
+class TestAnalyzePolicy(unittest.TestCase):
+    """Test findings and pruning of whole policies."""
+
+    ALLOW = ['git log:*', 'git *', 'git status', 'rm -rf build', '[regex]bad(', 'ls:*']
+    DENY = ['rm -rf:*', 'sudo *', 'sudo apt:*']
+
+    def test_findings(self):
+        """Test the kind and covering pattern of each finding."""
+        findings = analyze_policy(self.ALLOW, self.DENY)
+        summary = {(f['kind'], f['list'], f['pattern'], f['covered_by']) for f in findings}
+        self.assertEqual(
+            summary,
+            {
+                ('unreachable', 'deny', 'sudo apt:*', 'sudo *'),
+                ('unreachable', 'allow', 'git status', 'git *'),
+                ('unreachable', 'allow', '[regex]bad(', ''),
+                ('subsumed', 'allow', 'git log:*', 'git *'),
+                ('shadowed', 'allow', 'rm -rf build', 'rm -rf:*'),
+            },
+        )
+        for finding in findings:
+            self.assertEqual(finding['level'], 'warning')
+            self.assertIn(finding['pattern'], finding['message'])
+
+    def test_redos_findings(self):
+        """Test that regex patterns prone to catastrophic backtracking are reported but kept."""
+        allow = ['git *', '[regex]^(\\w+\\s?)*$']
+        deny = ['[regex]^curl .*\\| *(ba)?sh', '[regex](a|aa)*c']
+        findings = analyze_policy(allow, deny)
+        self.assertEqual(
+            [(f['kind'], f['list'], f['pattern']) for f in findings],
+            [('redos', 'deny', '[regex](a|aa)*c'), ('redos', 'allow', '[regex]^(\\w+\\s?)*$')],
+        )
+        self.assertIn('TOOLGUARD_LINEAR_REGEX', findings[0]['corrective_steps'])
+        self.assertEqual(prune_policy(allow, deny), (allow, deny))
+
+    def test_body_patterns_kept(self):
+        """Test that [body] patterns are neither compared with command patterns nor pruned."""
+        allow = ['git *', '[body]*']
+        deny = ['[body]git status', '*', '[body][regex](a|aa)*c']
+        findings = analyze_policy(allow, deny)
+        self.assertEqual(
+            [(f['kind'], f['list'], f['pattern']) for f in findings],
+            [('redos', 'deny', '[body][regex](a|aa)*c'), ('shadowed', 'allow', 'git *')],
+        )
+        self.assertEqual(prune_policy(allow, deny), (['[body]*'], ['*', '[body]git status', '[body][regex](a|aa)*c']))
+
+    def test_prune_keeps_order(self):
+        """Test that pruning removes only reported patterns, in configured order."""
+        self.assertEqual(prune_policy(self.ALLOW, self.DENY), (['git *', 'ls:*'], ['rm -rf:*', 'sudo *']))
+
+    def test_equivalent_patterns_keep_one(self):
+        """Test that of two equivalent patterns the first one stays."""
+        self.assertEqual(prune_policy(['git *', '[native]git *'], []), (['git *'], []))
+
+    def test_pruning_keeps_decisions(self):
+        """Test that pruned policies decide alike and still name a matching pattern."""
+        rng = random.Random(370)
+        patterns = PATTERNS + ['git log:*', 'git status', 'rm *', 'cat *', 'ls -la', 'sudo apt:*']
+        for _ in range(30):
+            rng.shuffle(patterns)
+            split = rng.randint(0, len(patterns))
+            allow, deny = patterns[:split], patterns[split:]
+            pruned_allow, pruned_deny = prune_policy(allow, deny)
+            for command in COMMANDS:
+                with self.subTest(command=command, allow=allow, deny=deny):
+                    decision, reason = check_permission(command, pruned_allow, pruned_deny)
+                    self.assertEqual(decision, check_permission(command, allow, deny)[0])
+                    if ': ' in reason:
+                        pattern = reason.split(': ', 1)[1]
+                        self.assertTrue(match_command(command, [pattern])[0])
+
+
+class TestReviewPolicyOnce(unittest.TestCase):
+    """Test that reviews are reused in process and across processes through the cache directory."""
+
+    ALLOW = ['git log:*', 'git *']
+    DENY = ['rm -rf:*']
+    KEY = b'k' * 32
+
+    def setUp(self):
+        policy_analysis._reviews.clear()
+        self.addCleanup(policy_analysis._reviews.clear)
+
+    def test_reused_in_process(self):
+        """Test that the findings of an unchanged policy are only new once."""
+        first = review_policy_once(self.ALLOW, self.DENY)
+        self.assertEqual(first, (['git *'], ['rm -rf:*'], analyze_policy(self.ALLOW, self.DENY), True))
+        with patch.object(policy_analysis, 'review_policy') as review:
+            self.assertEqual(review_policy_once(self.ALLOW, self.DENY), first[:3] + (False,))
+        review.assert_not_called()
+        self.assertTrue(review_policy_once(self.ALLOW, ['rm *'])[3])
+
+    def test_reused_across_processes(self):
+        """Test that a signed review in the cache directory is reused by a new process."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = review_policy_once(self.ALLOW, self.DENY, True, tmpdir, self.KEY)
+            policy_analysis._reviews.clear()
+            with patch.object(policy_analysis, 'review_policy') as review:
+                second = review_policy_once(self.ALLOW, self.DENY, True, tmpdir, self.KEY)
+            self.assertEqual(second, first[:3] + (False,))
+        review.assert_not_called()
+
+    def test_planted_review_is_ignored(self):
+        """Test that an edited review, which could drop deny patterns, is not used."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            review_policy_once(self.ALLOW, self.DENY, True, tmpdir, self.KEY)
+            (path,) = Path(tmpdir).rglob('*.json')
+            data = json.loads(path.read_text())
+            data['review'][1] = []
+            path.write_text(json.dumps(data))
+            policy_analysis._reviews.clear()
+            _allow, deny, _findings, new = review_policy_once(self.ALLOW, self.DENY, True, tmpdir, self.KEY)
+        self.assertEqual((deny, new), (['rm -rf:*'], True))
+
+
+class TestApplyPolicyReview(unittest.TestCase):
+    """Test reporting and pruning of removable Bash patterns."""
+
+    ALLOW = ['git log:*', 'git *', 'rm -rf build']
+    DENY = ['rm -rf:*']
+
+    def setUp(self):
+        policy_analysis._reviews.clear()
+        self.addCleanup(policy_analysis._reviews.clear)
+
+    def test_findings_are_logged(self):
+        """Test that each finding is logged as a warning while the lists stay as configured."""
+        env_config = {'log_dir': '/tmp/logs', 'extended_syntax': True}
+        with patch('toolguard.policy_analysis.log_warning') as mock_warning:
+            lists = apply_policy_review(self.ALLOW, self.DENY, env_config)
+        self.assertEqual(lists, (self.ALLOW, self.DENY))
+        self.assertEqual(mock_warning.call_count, 2)
+        self.assertIn('git log:*', mock_warning.call_args_list[0].args[0])
+
+    def test_findings_are_logged_once(self):
+        """Test that the findings of an unchanged policy are not logged again."""
+        env_config = {'log_dir': '/tmp/logs', 'extended_syntax': True}
+        with patch('toolguard.policy_analysis.log_warning') as mock_warning:
+            apply_policy_review(self.ALLOW, self.DENY, env_config)
+            apply_policy_review(self.ALLOW, self.DENY, env_config)
+        self.assertEqual(mock_warning.call_count, 2)
+
+    def test_pruning_is_opt_in(self):
+        """Test that the lists are pruned when prune_patterns is enabled."""
+        env_config = {'log_dir': '/tmp/logs', 'extended_syntax': True, 'prune_patterns': True}
+        with patch('toolguard.policy_analysis.log_warning'):
+            self.assertEqual(apply_policy_review(self.ALLOW, self.DENY, env_config), (['git *'], ['rm -rf:*']))
+
+
+if __name__ == '__main__':
+    unittest.main()
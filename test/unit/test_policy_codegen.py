@@ -0,0 +1,112 @@
+"""
+Unit tests for generated policy code.
+
+Generated policies must decide exactly like the interpreted CompiledPolicy,
+which must in turn match check_permission(), so the tests compare all three.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+
+from toolguard import policy_codegen
+from toolguard.permissions import check_deny_permission, check_permission
+from toolguard.policy import CommandView, CompiledPolicy, compile_policy, configure_policy_compiler
+from toolguard.policy_codegen import GeneratedPolicy, compile_policy_code, generate_policy_source
+from toolguard.test.unit.test_policy import COMMANDS, PATTERNS
+
+
+class TestGeneratedPolicy(unittest.TestCase):
+    """Test generated decide functions against the reference implementations."""
+
+    def assert_equivalent(self, allow, deny, commands, extended_syntax=True):
+        generated = GeneratedPolicy(allow, deny, extended_syntax)
+        for command in commands:
+            with self.subTest(command=command, allow=allow, deny=deny):
+                view = CommandView(command)
+                self.assertEqual(generated.decide(view), generated.interpreter.decide(view))
+                self.assertEqual(generated.decide_deny(view), generated.interpreter.decide_deny(view))
+                self.assertEqual(generated.check(command), check_permission(command, allow, deny, extended_syntax))
+                self.assertEqual(generated.check_deny(command), check_deny_permission(command, deny, extended_syntax))
+
+    def test_matches_reference_on_corpus(self):
+        """Test every corpus command with the corpus split into allow and deny lists."""
+        for extended_syntax in (True, False):
+            self.assert_equivalent(PATTERNS[:6], PATTERNS[5:], COMMANDS, extended_syntax)
+            self.assert_equivalent(PATTERNS[::2], PATTERNS[1::2], COMMANDS, extended_syntax)
+
+    def test_matches_reference_in_any_order(self):
+        """Test that dispatch keeps the configured order across words."""
+        rng = random.Random(36)
+        patterns = PATTERNS + ['git log:*', 'git', 'rm *', 'make:*', 'cat *', '*', 'ls']
+        for _ in range(30):
+            rng.shuffle(patterns)
+            split = rng.randint(0, len(patterns))
+            self.assert_equivalent(patterns[:split], patterns[split:], COMMANDS)
+
+    def test_dispatch_on_first_word(self):
+        """Test that word-specific patterns only appear in their word's function."""
+        source = generate_policy_source(['git *', 'ls:*'], ['rm -rf:*', '**/.env/**'])
+        self.assertIn("'git': _decide_", source)
+        self.assertIn("'rm': _decide_deny_", source)
+        generic = source.split('def _decide_generic(view, raw):')[1].split('\n\n\n')[0]
+        self.assertIn('.env', generic)
+        self.assertNotIn('rm -rf', generic)
+        self.assertNotIn('git ', generic)
+
+    def test_without_dispatch(self):
+        """Test the single-function fallback for policies too large to dispatch."""
+        with patch.object(policy_codegen, 'MAX_DISPATCH_RULES', 0):
+            source = generate_policy_source(PATTERNS[:6], PATTERNS[5:])
+            self.assertIn('_DECIDE = {}', source)
+            self.assert_equivalent(PATTERNS[:6], PATTERNS[5:], COMMANDS)
+
+
+class TestPolicyCompiler(unittest.TestCase):
+    """Test policy compiler selection."""
+
+    def setUp(self):
+        configure_policy_compiler()
+
+    def tearDown(self):
+        configure_policy_compiler()
+
+    def test_codegen_by_default(self):
+        """Test that compile_policy() generates code unless configured otherwise."""
+        self.assertIsInstance(compile_policy(['git *'], ['rm *']), GeneratedPolicy)
+        configure_policy_compiler(codegen=False)
+        policy = compile_policy(['git *'], ['rm *'])
+        self.assertIs(type(policy), CompiledPolicy)
+
+    def test_falls_back_to_interpreter(self):
+        """Test that a code generation failure still yields a working policy."""
+        configure_policy_compiler()
+        with patch.object(policy_codegen, 'generate_policy_source', side_effect=RuntimeError('boom')):
+            # Patterns no other test compiles, so the policy is not in the cache yet
+            policy = compile_policy(['git *'], ['rm *', 'rm -rf *'])
+        self.assertIs(type(policy), CompiledPolicy)
+        self.assertEqual(policy.check('git status'), ('allow', 'Command matches allow pattern: git *'))
+
+    def test_linear_regex_engine(self):
+        """Test that generated policies search regexes with the engine configured when they are loaded."""
+        configure_policy_compiler(linear_regex=True, regex_budget_ms=0)
+        policy = compile_policy(['git *'], ['[regex](a|b)*c'])
+        self.assertIsInstance(policy, GeneratedPolicy)
+        self.assertEqual(policy.check('ab' * 500)[0], 'deny')
+        self.assertIn('time budget', policy.check('ab' * 500)[1])
+        configure_policy_compiler(linear_regex=True, regex_budget_ms=None)
+        self.assertEqual(compile_policy(['git *'], ['[regex](a|b)*c']).check('git abc')[0], 'deny')
+
+    def test_code_is_compiled_in_process(self):
+        """Test that policy code is generated for every compilation, not loaded from anywhere."""
+        code = compile_policy_code(['git *'], ['rm *'])
+        namespace = {}
+        exec(code, namespace)
+        self.assertEqual(namespace['decide'](CommandView('git status')), ('allow', 'git *'))
+        with patch.object(policy_codegen, 'generate_policy_source', wraps=generate_policy_source) as generate:
+            compile_policy_code(['git *'], ['rm *'])
+        generate.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Unit tests for the recursive-descent parser backend and its differential fuzzer.
+"""
+
+import random
+import unittest
+
+from toolguard.parser import bash_parser, recursive_descent
+from toolguard.parser.command_extractor import (
+    CANOPY,
+    DESCENT,
+    configure_parse_cache,
+    configure_parser_backend,
+    extract_commands,
+    extract_tagged_commands,
+)
+from toolguard.parser.grammar_fuzz import (
+    CommandGenerator,
+    differences,
+    extract_with,
+    generated_commands,
+    load_grammar,
+)
+
+# Inputs where a token-level parser could easily part ways with the PEG grammar
+EDGE_CASES = [
+    'ls -la',
+    'git add -A && git commit -m "Fix parser" && git push origin main',
+    '(cd /tmp && rm -rf build) || { echo failed; exit 1; }',
+    'echo $(date +%Y-%m-%d) >> log.txt; tail -n 5 log.txt',
+    'done',
+    'do.sh',
+    'if true',
+    'echo 2>$x',
+    'echo 2>&12',
+    '>&2',
+    '2>&1',
+    'cat <<<x',
+    'cat <<EOF x',
+    '{ a }',
+    '{ a; }',
+    'a;;',
+    'a &&',
+    'a &',
+    'a\nb',
+    'a \\',
+    '(a) b',
+    'a | | b',
+    'echo "${x:-"}"',
+    "echo $'a\\'",
+    'echo "$(a" b"',
+    'echo $(a',
+    'echo `a $(b`)',
+    'echo "`ls`"',
+    'x=$(ls) y',
+    'echo > "$(rm x)"',
+    'a 2>"$(b)"x',
+]
+
+
+class TestRecursiveDescentParser(unittest.TestCase):
+    """Test that the descent backend extracts what the Canopy backend extracts."""
+
+    def test_edge_cases(self):
+        """Test accepted and rejected edge cases against the Canopy backend."""
+        for command in EDGE_CASES:
+            with self.subTest(command=command):
+                self.assertEqual(extract_with(DESCENT, command), extract_with(CANOPY, command))
+
+    def test_generated_commands(self):
+        """Test a short differential fuzz run (python -m toolguard.parser.grammar_fuzz runs long ones)."""
+        self.assertEqual(list(differences(generated_commands(300, seed=0))), [])
+
+    def test_rejected_input_raises_parse_error(self):
+        """Test that rejected input raises the ParseError of the Canopy parser."""
+        with self.assertRaises(bash_parser.ParseError):
+            recursive_descent.parse('echo $(a')
+
+    def test_deep_nesting(self):
+        """Test that nesting deeper than the recursion limit allows is parsed nested first."""
+        command = 'ls'
+        for level in range(500):
+            command = f'echo {level} $({command})'
+        self.assertEqual(extract_with(DESCENT, command), extract_with(CANOPY, command))
+
+
+class TestParserBackendSelection(unittest.TestCase):
+    """Test configure_parser_backend()."""
+
+    def setUp(self):
+        configure_parse_cache(max_entries=0)
+
+    def tearDown(self):
+        configure_parser_backend()
+        configure_parse_cache()
+
+    def test_backends_extract_the_same_commands(self):
+        """Test extraction through the public API with each backend."""
+        command = 'git status && (cd /tmp; rm -rf x) | grep "$(whoami)"'
+        results = []
+        for backend in (CANOPY, DESCENT):
+            configure_parser_backend(backend)
+            results.append((extract_commands(command), extract_tagged_commands(command)))
+        self.assertEqual(results[0], results[1])
+        self.assertIn('rm -rf x', results[1][0])
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with self.assertRaises(ValueError):
+            configure_parser_backend('bison')
+
+
+class TestGrammarFuzz(unittest.TestCase):
+    """Test the grammar reader and command generator of the fuzzer."""
+
+    def test_grammar_rules(self):
+        """Test that every rule of bash_parser.peg is read and derivable."""
+        rules = load_grammar()
+        generator = CommandGenerator(rules, random.Random(0))
+        self.assertIn('command_line', rules)
+        self.assertIn('reserved_word', rules)
+        self.assertTrue(all(height < float('inf') for height in generator.heights.values()))
+
+    def test_negative_lookahead_narrows_any(self):
+        """Test that `!delimiter .` never generates a delimiter."""
+        generator = CommandGenerator(load_grammar(), random.Random(0))
+        for _ in range(200):
+            word = generator.generate('unquoted_word')
+            # Escapes and ${name:-default} may hold delimiters
+            if '\\' not in word and '${' not in word:
+                self.assertFalse(set(word) & set(' \t\n|&;<>(){}`"\''), word)
+
+    def test_generated_commands_are_reproducible(self):
+        """Test that a seed fixes the generated commands."""
+        self.assertEqual(list(generated_commands(20, seed=7)), list(generated_commands(20, seed=7)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for pattern usage statistics.
+"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from toolguard.log_writer import log_command
+from toolguard.usage_stats import count_pattern_hits, iter_logged_commands, load_hit_counts, save_hit_counts
+
+
+class TestLoggedCommands(unittest.TestCase):
+    """Test reading commands back from the decision logs."""
+
+    COMMANDS = ['git status', 'ls -la && cat `which python`', "python -c 'print(1)\nprint(2)'"]
+
+    def write_logs(self, log_dir, logging_format):
+        env = {'CHECKED_BASH_LOGGING_ON': 'true', 'CHECKED_BASH_LOGGING_FORMAT': logging_format}
+        with patch.dict('os.environ', env):
+            for command in self.COMMANDS:
+                log_command(command, 'executed', log_dir=log_dir, extra_info='main')
+            log_command('rm -rf /', 'refused', ['rm -rf:*'], log_dir=log_dir)
+
+    def test_markdown_logs(self):
+        """Test that executed commands are read from markdown logs, including multi-line ones."""
+        with TemporaryDirectory() as tmpdir:
+            self.write_logs(Path(tmpdir), 'markdown')
+            self.assertEqual(list(iter_logged_commands(tmpdir)), self.COMMANDS)
+            self.assertEqual(list(iter_logged_commands(tmpdir, 'refused')), ['rm -rf /'])
+
+    def test_jsonlines_logs(self):
+        """Test that executed commands are read from JSONLines logs."""
+        with TemporaryDirectory() as tmpdir:
+            self.write_logs(Path(tmpdir), 'jsonlines')
+            self.assertEqual(list(iter_logged_commands(tmpdir)), self.COMMANDS)
+
+    def test_missing_log_dir(self):
+        """Test that a missing log directory yields nothing."""
+        self.assertEqual(list(iter_logged_commands('/nonexistent/toolguard-logs')), [])
+
+
+class TestHitCounts(unittest.TestCase):
+    """Test counting and storing pattern hits."""
+
+    ALLOW = ['git log:*', 'git *', 'ls:*', 'cat *']
+
+    def test_first_match_per_sub_command(self):
+        """Test that each sub-command counts one hit for its first matching allow pattern."""
+        counts = count_pattern_hits(['git status', 'git log -1 | cat -n', 'ls && ls -la', 'rm x'], self.ALLOW)
+        self.assertEqual(counts, {'git *': 1, 'git log:*': 1, 'cat *': 1, 'ls:*': 2})
+
+    def test_round_trip(self):
+        """Test that saved counts load back, and that missing or invalid files load as None."""
+        with TemporaryDirectory() as tmpdir:
+            self.assertIsNone(load_hit_counts(tmpdir))
+            save_hit_counts(tmpdir, {'git *': 3})
+            self.assertEqual(load_hit_counts(tmpdir), {'git *': 3})
+            (Path(tmpdir) / 'usage_stats.json').write_text('[1, 2]')
+            self.assertIsNone(load_hit_counts(tmpdir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Benchmark sequential against thread-pool evaluation of compound commands.
+
+Compares check_compound_permission() with check_compound_permission_parallel()
+on workloads of different shapes, to show where parallelism pays off:
+
+- short: a typical 3-command line against a small policy
+- many-commands: a generated 60-command script against a small policy
+- big-policy: a 4-command line against a 2000-pattern policy
+
+The parallel evaluator only gains on a free-threaded build (python3.14t) with
+several cores; with the GIL it measures pure thread hand-off overhead.
+
+Usage:
+    python -m toolguard.tmp.bench_compound [iterations]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from toolguard.compound import check_compound_permission, check_compound_permission_parallel
+
+SMALL_ALLOW = ['git *', 'echo *', 'ls:*', 'cat *', 'grep *', 'cd *', 'uv run *', 'head', 'wc *']
+SMALL_DENY = ['rm -rf *', 'git push --force*', '[regex]^curl .*\\| *sh']
+
+BIG_ALLOW = [f'tool{i} --flag-{i}:*' for i in range(1000)] + SMALL_ALLOW
+BIG_DENY = [f'[regex]^danger{i} .*--force' for i in range(1000)] + SMALL_DENY
+
+WORKLOADS: Dict[str, Tuple[str, List[str], List[str]]] = {
+    'short': ('cd src && uv run pytest -x | head', SMALL_ALLOW, SMALL_DENY),
+    'many-commands': (' && '.join(f'echo step {i} | grep step' for i in range(30)), SMALL_ALLOW, SMALL_DENY),
+    'big-policy': ('git status && ls -la && cat README.md | wc -l', BIG_ALLOW, BIG_DENY),
+}
+
+
+def bench(check: Callable[[], Tuple[str, str]], iterations: int) -> float:
+    """
+    Time a check, keeping the best of three rounds.
+
+    Args:
+        check: Zero-argument callable running one permission check
+        iterations: Checks per round
+
+    Returns:
+        Microseconds per check
+    """
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            check()
+        best = min(best, (time.perf_counter() - start) / iterations * 1e6)
+    return best
+
+
+def main() -> None:
+    """Run all workloads and print a comparison table."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    gil = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print(f'Python {sys.version.split()[0]}, GIL {"enabled" if gil else "disabled"}, {os.cpu_count()} CPUs')
+    print(f'{"workload":<15} {"sequential":>12} {"1 worker":>12} {"2 workers":>12} {"4 workers":>12}')
+
+    for name, (command, allow, deny) in WORKLOADS.items():
+        expected = check_compound_permission(command, allow, deny)
+        row = [bench(lambda: check_compound_permission(command, allow, deny), iterations)]
+        for workers in (1, 2, 4):
+            # Long-lived pool, as a server embedding the evaluator would keep one
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                assert check_compound_permission_parallel(command, allow, deny, executor=pool) == expected
+                row.append(
+                    bench(lambda: check_compound_permission_parallel(command, allow, deny, executor=pool), iterations)
+                )
+        print(f'{name:<15}' + ''.join(f' {us:>9.0f} us' for us in row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark permission checks of commands writing files through here-documents.
+
+Times check_compound_permission() on `cat > file <<'EOF'` commands with
+bodies of growing length, with the parse cache disabled so every check
+parses. The payload column keeps the body as part of the command (an
+unquoted body with a command substitution, which is still matched as a
+command); the heredoc column lets the body be split off, so its cost should
+stay flat as the body grows. The last column adds a [body] deny pattern,
+which scans each body once.
+
+Usage:
+    python -m toolguard.tmp.bench_heredoc [iterations]
+"""
+
+import sys
+import time
+from typing import List
+
+from toolguard.compound import check_compound_permission
+from toolguard.parser.command_extractor import configure_parse_cache
+
+ALLOW = ['git *', 'cat *', 'ls:*', 'echo *', 'uv run *', 'python3 *']
+DENY = ['rm -rf *', '*/.env*', '[regex]^curl .*\\| *sh', 'git push --force*']
+BODY_DENY = DENY + ['[body][regex]BEGIN [A-Z ]*PRIVATE KEY']
+
+
+def body(lines: int) -> str:
+    """A Python-like file body of the given number of lines."""
+    return '\n'.join(f'    value_{i} = compute("./data/item_{i}.json", retries={i % 5})' for i in range(lines))
+
+
+def best_time(command: str, deny: List[str], iterations: int) -> float:
+    """Best-of-three time per check in milliseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            check_compound_permission(command, ALLOW, deny)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1000
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    configure_parse_cache(max_entries=0)
+
+    print(f'{"lines":>8}{"payload ms":>14}{"heredoc ms":>14}{"[body] ms":>14}')
+    for lines in (10, 100, 500, 2000):
+        text = body(lines)
+        payload = f'cat > gen.py <<EOF\n$(date)\n{text}\nEOF'
+        heredoc = f"cat > gen.py <<'EOF'\n{text}\nEOF"
+        print(
+            f'{lines:>8}{best_time(payload, DENY, iterations):>14.2f}'
+            f'{best_time(heredoc, DENY, iterations):>14.3f}{best_time(heredoc, BODY_DENY, iterations):>14.3f}'
+        )
+    configure_parse_cache()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark command extraction on deeply nested command lines.
+
+Builds command lines nesting command substitutions, double-quoted command
+substitutions, subshells and brace groups up to 500 levels deep, and times
+bash_parser_fast.parse() and extract_tagged_commands() (parse cache
+disabled, so every extraction parses). Inputs deeper than the parser's
+nesting limit are parsed nested first (see derive_parsers.py) and the tree
+is walked with an explicit stack, so both columns grow linearly with the
+depth; the per-level column should stay flat. Before, the walk visited
+every nested substitution twice per level (exponential time) and the parser
+raised RecursionError at around 170 levels.
+
+Usage:
+    python -m toolguard.tmp.bench_nesting [iterations]
+"""
+
+import sys
+import time
+from typing import Callable
+
+from toolguard.parser import bash_parser_fast
+from toolguard.parser.command_extractor import configure_parse_cache, extract_tagged_commands
+
+NESTINGS = {
+    'substitution': 'echo $({})',
+    'quoted': 'echo "$({})"',
+    'subshell': '(cd /tmp && {})',
+    'brace': '{{ {}; }}',
+}
+
+
+def nested(template: str, depth: int) -> str:
+    """A command line nesting `ls` depth levels deep."""
+    command = 'ls'
+    for _ in range(depth):
+        command = template.format(command)
+    return command
+
+
+def best_time(function: Callable[[str], object], command: str, iterations: int) -> float:
+    """Best-of-three time per call in milliseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function(command)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1000
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    configure_parse_cache(max_entries=0)
+
+    print(f'{"nesting":<14}{"depth":>7}{"parse ms":>11}{"extract ms":>12}{"us/level":>10}{"commands":>10}')
+    for name, template in NESTINGS.items():
+        for depth in (10, 50, 100, 200, 500):
+            command = nested(template, depth)
+            parse = best_time(bash_parser_fast.parse, command, iterations)
+            extract = best_time(extract_tagged_commands, command, iterations)
+            commands = len(extract_tagged_commands(command))
+            print(
+                f'{name:<14}{depth:>7}{parse:>11.2f}{extract:>12.2f}{extract / depth * 1000:>10.1f}{commands:>10}'
+            )
+    configure_parse_cache()
+
+
+if __name__ == '__main__':
+    main()
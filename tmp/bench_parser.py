@@ -0,0 +1,85 @@
+"""
+Benchmark the diagnostic and diagnostics-free bash parsers.
+
+Parses a corpus of typical (successfully parsing) command lines with
+bash_parser.parse() and bash_parser_fast.parse() and reports the time per
+parse for each.
+
+Usage:
+    python -m toolguard.tmp.bench_parser [iterations]
+"""
+
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from toolguard.parser import bash_parser, bash_parser_fast
+
+COMMANDS: List[str] = [
+    'ls -la',
+    'git status',
+    'git diff --stat HEAD~1',
+    'cd src && uv run pytest -x -q',
+    'git add -A && git commit -m "Fix parser" && git push origin main',
+    'find . -name "*.py" | xargs grep -l TODO | sort | uniq -c',
+    'cat README.md | head -20 > /tmp/out.txt 2>&1',
+    'echo $(date +%Y-%m-%d) >> log.txt; tail -n 5 log.txt',
+    '(cd /tmp && rm -rf build) || { echo failed; exit 1; }',
+    "python -c 'import sys; print(sys.version)'",
+]
+
+
+def bench(parse: Callable[[str], object], iterations: int) -> float:
+    """
+    Time a parse function over the corpus.
+
+    Args:
+        parse: Parser entry point
+        iterations: Number of passes over the corpus
+
+    Returns:
+        Mean microseconds per parse
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command in COMMANDS:
+            parse(command)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(COMMANDS)) * 1e6
+
+
+def best_of(repeats: int, iterations: int) -> Tuple[float, float]:
+    """
+    Time both parsers in interleaved rounds and keep the best round of each.
+
+    Args:
+        repeats: Number of rounds
+        iterations: Passes over the corpus per round
+
+    Returns:
+        (diagnostic, fast) microseconds per parse
+    """
+    diagnostic = fast = float('inf')
+    for _ in range(repeats):
+        diagnostic = min(diagnostic, bench(bash_parser.parse, iterations))
+        fast = min(fast, bench(bash_parser_fast.parse, iterations))
+    return diagnostic, fast
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeats = 5
+
+    # Warm up both parsers
+    best_of(1, 5)
+    diagnostic, fast = best_of(repeats, iterations)
+
+    print(f'{len(COMMANDS)} commands x {iterations} iterations, best of {repeats}')
+    print(f'bash_parser.parse:      {diagnostic:8.1f} us/parse')
+    print(f'bash_parser_fast.parse: {fast:8.1f} us/parse')
+    print(f'speedup:                {diagnostic / fast:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
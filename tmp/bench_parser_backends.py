@@ -0,0 +1,61 @@
+"""
+Benchmark the parser backends of command extraction.
+
+Extracts a corpus of typical command lines with both backends (see
+configure_parser_backend() in command_extractor.py), parse cache disabled
+so every extraction parses, and reports the time per command line. The
+`canopy` backend is the packrat parser generated from bash_parser.peg; the
+`descent` backend is the hand-written lexer and recursive-descent parser.
+
+Usage:
+    python -m toolguard.tmp.bench_parser_backends [iterations]
+"""
+
+import sys
+import time
+from typing import Dict
+
+from toolguard.parser.command_extractor import CANOPY, DESCENT, _parse_tagged
+from toolguard.tmp.bench_parser import COMMANDS
+
+
+def bench(backend: str, iterations: int) -> float:
+    """
+    Time extraction with one backend over the corpus.
+
+    Args:
+        backend: Parser backend name
+        iterations: Number of passes over the corpus
+
+    Returns:
+        Mean microseconds per command line
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command in COMMANDS:
+            list(_parse_tagged(command, backend))
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(COMMANDS)) * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeats = 5
+
+    for command in COMMANDS:
+        assert list(_parse_tagged(command, CANOPY)) == list(_parse_tagged(command, DESCENT)), command
+
+    best: Dict[str, float] = {CANOPY: float('inf'), DESCENT: float('inf')}
+    for _ in range(repeats):
+        for backend in best:
+            best[backend] = min(best[backend], bench(backend, iterations))
+
+    print(f'{len(COMMANDS)} commands x {iterations} iterations, best of {repeats}')
+    for backend, micros in best.items():
+        print(f'{backend:<8} {micros:8.1f} us/command line')
+    print(f'speedup: {best[CANOPY] / best[DESCENT]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the memory of the packrat memo on long command lines.
+
+Parses generated scripts of growing length (commands joined by `&&`, `;`
+and `|`) with bash_parser_fast.parse(), once keeping the whole memo and once
+with the windowed memo that is dropped at top-level control operators (see
+derive_parsers.py). For each, tracemalloc reports the peak allocated during
+the parse, the memory still held by the returned tree, and their difference,
+the transient memo overhead. With the window, that overhead stays flat as
+the input grows; only the tree, which the caller keeps, grows.
+
+Usage:
+    python -m toolguard.tmp.bench_parser_memory
+"""
+
+import gc
+import time
+import tracemalloc
+from typing import Tuple
+
+from toolguard.parser import bash_parser_fast
+
+STEPS = [
+    'cd build/step_{i}',
+    'cat ./logs/run_{i}.txt | grep -v DEBUG | sort | uniq -c > /tmp/summary_{i}.txt',
+    'echo "done {i}" >> progress.log',
+    'test -f out_{i}.o || make target_{i} 2>&1',
+]
+SEPARATORS = [' && ', '; ', ' && ', ' || ']
+
+
+def script(commands: int) -> str:
+    """A command line of the given number of top-level commands."""
+    parts = []
+    for i in range(commands):
+        if i:
+            parts.append(SEPARATORS[i % len(SEPARATORS)])
+        parts.append(STEPS[i % len(STEPS)].format(i=i))
+    return ''.join(parts)
+
+
+def measure(text: str, window: bool) -> Tuple[int, int, float]:
+    """
+    Parse once under tracemalloc.
+
+    Returns:
+        (peak bytes, bytes held by the tree, seconds)
+    """
+    bash_parser_fast.Parser._memo_window = window
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = bash_parser_fast.parse(text)
+    elapsed = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return peak, held, elapsed
+
+
+def main() -> None:
+    print(f'{"commands":>9}{"chars":>9}  {"memo":<8}{"peak KiB":>10}{"tree KiB":>10}{"memo KiB":>10}{"ms":>9}')
+    try:
+        for commands in (25, 100, 400, 1600):
+            text = script(commands)
+            for window in (False, True):
+                peak, held, elapsed = measure(text, window)
+                print(
+                    f'{commands:>9}{len(text):>9}  {"window" if window else "whole":<8}'
+                    f'{peak / 1024:>10.0f}{held / 1024:>10.0f}{(peak - held) / 1024:>10.0f}{elapsed * 1000:>9.1f}'
+                )
+    finally:
+        bash_parser_fast.Parser._memo_window = True
+
+
+if __name__ == '__main__':
+    main()
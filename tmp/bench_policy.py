@@ -0,0 +1,102 @@
+"""
+Benchmark compiled policies against the reference check_permission().
+
+Compares the interpreted CompiledPolicy and the GeneratedPolicy (generated
+Python code, see policy_codegen.py). Times checks of typical, allowed commands (which match no deny pattern)
+against two policies:
+
+- mixed: a realistic deny list (plain, colon-syntax, path component and regex
+  rules) plus a generated tail of tool-specific rules
+- native: 500 generated [native] rules sharing the segment ` --force`, so
+  the commands that contain it need the automaton to rule out every pattern
+
+Usage:
+    python -m toolguard.tmp.bench_policy [iterations]
+"""
+
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from toolguard.permissions import check_permission
+from toolguard.policy import CompiledPolicy
+from toolguard.policy_codegen import GeneratedPolicy
+
+ALLOW: List[str] = ['git *', 'ls:*', 'cat ./**:*', 'uv run *', 'echo *', 'grep *', 'head', 'wc *', 'make *']
+DENY: List[str] = [
+    'rm -rf:*',
+    'sudo *',
+    'chmod 777 *',
+    '**/.env/**',
+    '**/.ssh/**',
+    '[regex]^curl .*\\| *(ba)?sh',
+    '[regex]git (push|reset) --force',
+    'git clean -fdx*',
+    'dd if=*',
+] + [f'deploy-tool{i} --prod:*' for i in range(100)]
+
+NATIVE_DENY: List[str] = [f'[native]tool{i} * --force' for i in range(500)]
+
+COMMANDS: List[str] = [
+    'git status',
+    'ls -la src',
+    'cat ./README.md',
+    'uv run pytest -x -q',
+    'grep -rn TODO src',
+    'make test',
+    'git push --force-with-lease',
+]
+
+POLICIES: Dict[str, Tuple[List[str], List[str]]] = {
+    'mixed': (ALLOW, DENY),
+    'native': (ALLOW, NATIVE_DENY),
+}
+
+
+def bench(check: Callable[[str], object], iterations: int) -> float:
+    """
+    Time a check function over the corpus, keeping the best of three rounds.
+
+    Args:
+        check: Function checking one command
+        iterations: Passes over the corpus per round
+
+    Returns:
+        Microseconds per check
+    """
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for command in COMMANDS:
+                check(command)
+        best = min(best, (time.perf_counter() - start) / (iterations * len(COMMANDS)) * 1e6)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f'{len(COMMANDS)} commands, us/check')
+    print(
+        f'{"policy":<8} {"deny rules":>10} {"check_permission":>17} {"interpreted":>12} {"generated":>10}'
+        f' {"speedup":>8}'
+    )
+
+    for name, (allow, deny) in POLICIES.items():
+        interpreted = CompiledPolicy(allow, deny)
+        generated = GeneratedPolicy(allow, deny)
+        for command in COMMANDS:
+            assert generated.check(command) == interpreted.check(command) == check_permission(command, allow, deny)
+
+        reference = bench(lambda command: check_permission(command, allow, deny), iterations)
+        interpreted_us = bench(interpreted.check, iterations)
+        generated_us = bench(generated.check, iterations)
+        print(
+            f'{name:<8} {len(deny):>10} {reference:>17.1f} {interpreted_us:>12.1f} {generated_us:>10.1f}'
+            f' {reference / generated_us:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
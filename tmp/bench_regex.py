@@ -0,0 +1,61 @@
+"""
+Benchmark the linear-time regex engine against re.
+
+For a rule with nested quantifiers, times re.search() and LinearRegex.search()
+on adversarial commands of growing length (re's time doubles with each extra
+character), then both engines on typical commands with the usual deny regexes.
+
+Usage:
+    python -m toolguard.tmp.bench_regex [iterations]
+"""
+
+import re
+import sys
+import time
+from typing import Callable, List
+
+from toolguard.linear_regex import LinearRegex
+
+RISKY = '^(\\w+\\s?)*$'
+
+TYPICAL_PATTERNS: List[str] = ['^curl .*\\| *(ba)?sh', 'git (push|reset) --force', '(?m)^sudo\\s+rm\\b']
+TYPICAL_COMMANDS: List[str] = [
+    'git status',
+    'curl -s https://example.com/install.sh | bash',
+    'uv run pytest -q tests/unit/test_policy.py',
+    'git push --force-with-lease origin main',
+]
+
+
+def best_time(search: Callable[[str], object], texts: List[str], iterations: int) -> float:
+    """Best-of-three time per search in microseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                search(text)
+        best = min(best, time.perf_counter() - start)
+    return best / (iterations * len(texts)) * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f'adversarial: {RISKY}')
+    print(f'{"length":>8}{"re us":>14}{"linear us":>14}')
+    risky_re = re.compile(RISKY).search
+    risky_linear = LinearRegex(RISKY, None).search
+    for length in (14, 18, 22, 24):
+        text = 'a' * length + '!'
+        print(f'{length:>8}{best_time(risky_re, [text], 1):>14.0f}{best_time(risky_linear, [text], 1):>14.0f}')
+
+    print('typical commands, per search:')
+    for pattern in TYPICAL_PATTERNS:
+        re_time = best_time(re.compile(pattern).search, TYPICAL_COMMANDS, iterations)
+        linear_time = best_time(LinearRegex(pattern).search, TYPICAL_COMMANDS, iterations)
+        print(f'  {pattern:<28}re {re_time:8.2f} us   linear {linear_time:8.2f} us')
+
+
+if __name__ == '__main__':
+    main()
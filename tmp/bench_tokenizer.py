@@ -0,0 +1,86 @@
+"""
+Benchmark the word splitter of command matching.
+
+Splits the sub-commands of a corpus of typical command lines with
+split_words() (parser/command_ast.py), alone and followed by unquote() as
+for path component checks, and compares with str.split(), which it
+replaced, and shlex.split(), which gives the same words on well-formed
+input but raises on unterminated quotes.
+
+Usage:
+    python -m toolguard.tmp.bench_tokenizer [iterations]
+"""
+
+import shlex
+import sys
+import time
+from typing import Callable, Dict, List
+
+from toolguard.parser.command_ast import split_words, unquote
+from toolguard.parser.command_extractor import extract_commands
+from toolguard.tmp.bench_parser import COMMANDS
+
+
+def split_and_unquote(command: str) -> List[str]:
+    """Split a command and remove the quotes of its words."""
+    return [unquote(word) for word in split_words(command)]
+
+
+SPLITTERS: Dict[str, Callable[[str], List[str]]] = {
+    'str.split': str.split,
+    'split_words': split_words,
+    'split_words+unquote': split_and_unquote,
+    'shlex.split': shlex.split,
+}
+
+
+def bench(splitter: Callable[[str], List[str]], commands: List[str], iterations: int) -> float:
+    """
+    Time one splitter over the sub-commands.
+
+    Args:
+        splitter: Function splitting a command into words
+        commands: Sub-commands to split
+        iterations: Number of passes over the sub-commands
+
+    Returns:
+        Mean microseconds per sub-command
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command in commands:
+            splitter(command)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(commands)) * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = 5
+
+    commands = [command for line in COMMANDS for command in extract_commands(line)]
+    # shlex.split is only defined on well-formed words; the others must agree with it there
+    mismatches = 0
+    for command in commands:
+        try:
+            expected = shlex.split(command)
+        except ValueError:
+            continue
+        mismatches += split_and_unquote(command) != expected
+
+    best = {name: float('inf') for name in SPLITTERS}
+    for _ in range(repeats):
+        for name, splitter in SPLITTERS.items():
+            best[name] = min(best[name], bench(splitter, commands, iterations))
+
+    print(f'{len(commands)} sub-commands x {iterations} iterations, best of {repeats}')
+    # split_words keeps $(...) whole, where shlex.split cuts it at spaces
+    print(f'sub-commands split differently from shlex.split: {mismatches}')
+    for name, micros in best.items():
+        print(f'{name:<20} {micros:8.2f} us/sub-command')
+    print(f'split_words+unquote vs shlex.split: {best["shlex.split"] / best["split_words+unquote"]:.1f}x faster')
+
+
+if __name__ == '__main__':
+    main()
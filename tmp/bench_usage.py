@@ -0,0 +1,94 @@
+"""
+Benchmark usage-ordered allow lists against configured order.
+
+Builds an allow list of 200 rules whose most used patterns (`git *`,
+`ls:*`, `uv run *`) come last, as in merged policies where user-level rules
+follow project rules. Hit counts are computed from a simulated session with
+count_pattern_hits(), then the same session is replayed against the list in
+configured order and ordered by usage. Reports the average number of
+patterns evaluated per command and the time per check.
+
+Usage:
+    python -m toolguard.tmp.bench_usage [iterations]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+from toolguard.policy import CommandView, CompiledPatternList
+from toolguard.usage_stats import count_pattern_hits
+
+ALLOW: List[str] = (
+    [f'project-tool{i} --check:*' for i in range(190)]
+    + ['cat ./**:*', 'echo *', 'grep *', 'head', 'wc *', 'make *', 'git log:*']
+    + ['uv run *', 'ls:*', 'git *']
+)
+
+# Relative frequency of each command in the simulated session
+WEIGHTED_COMMANDS = [
+    ('git status', 30),
+    ('git diff --stat', 20),
+    ('ls -la', 20),
+    ('uv run pytest -q', 15),
+    ('git log --oneline -5', 5),
+    ('cat ./src/main.py', 5),
+    ('grep -rn TODO .', 3),
+    ('project-tool7 --check all', 1),
+    ('unknown-tool --flag', 1),
+]
+
+
+def session(size: int, seed: int) -> List[str]:
+    """Draw a session of commands from the weighted command list."""
+    commands, weights = zip(*WEIGHTED_COMMANDS)
+    return random.Random(seed).choices(commands, weights, k=size)
+
+
+def evaluated_per_command(compiled: CompiledPatternList, commands: List[str]) -> float:
+    """Average number of pattern matchers run per command."""
+    calls = [0]
+    for pattern in compiled.patterns:
+
+        def counting(view, matches=pattern.matches):
+            calls[0] += 1
+            return matches(view)
+
+        pattern.matches = counting
+    for command in commands:
+        compiled.first_match(CommandView(command))
+    return calls[0] / len(commands)
+
+
+def time_per_check(compiled: CompiledPatternList, commands: List[str], iterations: int) -> float:
+    """Best-of-five time per check in microseconds."""
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for command in commands:
+                compiled.first_match(CommandView(command))
+        best = min(best, time.perf_counter() - start)
+    return best / (iterations * len(commands)) * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    history = session(2000, seed=1)
+    replay = session(500, seed=2)
+    hit_counts = count_pattern_hits(history, ALLOW)
+
+    configured = CompiledPatternList(ALLOW)
+    by_usage = CompiledPatternList(ALLOW, hit_counts=hit_counts)
+    for command in replay:
+        assert configured.match(command) == by_usage.match(command), command
+
+    print(f'{"order":<12}{"us/check":>10}{"patterns/check":>16}')
+    for name, compiled in (('configured', configured), ('usage', by_usage)):
+        elapsed = time_per_check(compiled, replay, iterations)
+        print(f'{name:<12}{elapsed:>10.2f}{evaluated_per_command(compiled, replay):>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Pattern usage statistics from toolguard decision logs.
+
+Allow lists are matched first-match in configured order, so a command that
+matches the last of 200 patterns costs 200 match attempts. Real sessions
+match a few patterns most of the time (`git *`, `ls:*`, `uv run *`), and
+those are rarely listed first. With hit counts, CompiledPatternList tries
+the most-hit patterns first and still reports the first match in
+configured order (see policy.py).
+
+The logs do not record which pattern allowed a command, so hits are
+recomputed: each executed command in the logs is split into its
+sub-commands, and every sub-command counts one hit for the first allow
+pattern that matches it. Counts are stored as JSON in the cache directory.
+
+Usage (recompute the counts from the configured log directory):
+
+    python -m toolguard.usage_stats
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from .parser.command_extractor import extract_commands
+from .policy import CompiledPatternList
+
+# Hit count file, relative to the cache directory
+HIT_COUNTS_FILE = 'usage_stats.json'
+
+# A markdown log entry's status and command lines, see log_writer.log_command()
+_MARKDOWN_ENTRY_RE = re.compile(
+    r'^- \*\*Status\*\*: (?P<status>\w+)\n- \*\*Command\*\*: `(?P<command>.*?)`\n(?=- \*\*|\n|\Z)',
+    re.MULTILINE | re.DOTALL,
+)
+
+
+def iter_logged_commands(log_dir: Union[str, Path], status: str = 'executed') -> Iterator[str]:
+    """
+    Read the commands of one status from the markdown and JSONLines logs.
+
+    Unreadable files and malformed entries are skipped.
+
+    Args:
+        log_dir: Directory with toolguard-YYYY-MM-DD.md/.jsonlines files
+        status: Status of the entries to read ('executed' or 'refused')
+
+    Yields:
+        Logged command lines, oldest file first
+    """
+    log_dir = Path(log_dir)
+    if not log_dir.is_dir():
+        return
+    for log_file in sorted(log_dir.glob('toolguard-*')):
+        try:
+            text = log_file.read_text(encoding='utf-8')
+        except OSError:
+            continue
+        if log_file.suffix == '.md':
+            for match in _MARKDOWN_ENTRY_RE.finditer(text):
+                if match.group('status').lower() == status:
+                    yield match.group('command')
+        elif log_file.suffix == '.jsonlines':
+            for line in text.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict) and entry.get('status') == status and isinstance(entry.get('command'), str):
+                    yield entry['command']
+
+
+def count_pattern_hits(
+    command_lines: Iterable[str], allow_patterns: Sequence[str], extended_syntax: bool = True
+) -> Dict[str, int]:
+    """
+    Count how often each allow pattern is the first match of a sub-command.
+
+    Args:
+        command_lines: Command lines, as logged
+        allow_patterns: List of patterns that allow commands
+        extended_syntax: If False, skip parsing [regex]/[glob]/[native] prefixes
+
+    Returns:
+        Dictionary of pattern to hit count, for the patterns hit at least once
+    """
+    compiled = CompiledPatternList(allow_patterns, extended_syntax)
+    counts: Dict[str, int] = {}
+    for command_line in command_lines:
+        try:
+            commands = extract_commands(command_line)
+        except Exception:
+            # Unparseable lines were never allowed by the hook
+            continue
+        for command in commands:
+            matched, pattern = compiled.match(command)
+            if matched:
+                counts[pattern] = counts.get(pattern, 0) + 1
+    return counts
+
+
+def load_hit_counts(cache_dir: Union[str, Path]) -> Optional[Dict[str, int]]:
+    """
+    Load the hit counts saved by save_hit_counts().
+
+    Args:
+        cache_dir: The persistent cache directory
+
+    Returns:
+        Dictionary of pattern to hit count, or None if missing or unreadable
+    """
+    try:
+        with open(Path(cache_dir) / HIT_COUNTS_FILE, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {pattern: count for pattern, count in data.items() if isinstance(count, int)}
+
+
+def save_hit_counts(cache_dir: Union[str, Path], counts: Mapping[str, int]) -> None:
+    """
+    Save hit counts to the cache directory, replacing the file atomically.
+
+    Args:
+        cache_dir: The persistent cache directory
+        counts: Dictionary of pattern to hit count
+    """
+    path = Path(cache_dir) / HIT_COUNTS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(counts), f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def main() -> None:
+    """Recompute the hit counts from the configured log directory and save them."""
+    # Imported here to keep the library functions free of configuration discovery
+    from .config import load_permissions
+    from .env_config import get_env_config
+
+    env_config = get_env_config()
+    if not env_config.get('cache_dir'):
+        print('Error: TOOLGUARD_CACHE_DIR is not set; hit counts are stored in the cache directory', file=sys.stderr)
+        sys.exit(1)
+
+    allow_patterns, _ = load_permissions(env_config['project_root'])
+    counts = count_pattern_hits(
+        iter_logged_commands(env_config['log_dir']), allow_patterns, env_config.get('extended_syntax', True)
+    )
+    save_hit_counts(env_config['cache_dir'], counts)
+
+    for pattern, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f'{count:8d}  {pattern}')
+    print(f'Wrote {Path(env_config["cache_dir"]) / HIT_COUNTS_FILE}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()